@@ -0,0 +1,95 @@
+"""
+Micro-benchmark of the post processing of the bars fetched by the alpaca
+bundle: the vectorized ``process_bars`` against the symbol by symbol,
+day by day loop it replaced.
+
+    $ python etc/benchmark_alpaca_bars.py --symbols 200 --years 5
+"""
+from datetime import timedelta
+from timeit import default_timer
+
+import click
+from dateutil import tz
+import numpy as np
+import pandas as pd
+from trading_calendars import get_calendar
+
+from zipline.data.bundles.alpaca_api import NY, process_bars
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def legacy_process_bars(response, start, end):
+    calendar = get_calendar('NYSE')
+
+    def _fillna(df):
+        last_val = df.iloc[0]
+        current = start
+        while current <= end:
+            if calendar.is_session(current):
+                if current.replace(tzinfo=tz.gettz(NY)) in df.index:
+                    last_val = df.loc[current.replace(tzinfo=tz.gettz(NY))]
+                else:
+                    df.loc[current.replace(tzinfo=tz.gettz(NY))] = last_val
+            current += timedelta(days=1)
+        return df
+
+    response = response[start:end]
+    processed = pd.DataFrame([], columns=response.columns)
+    for sym in response.columns.levels[0]:
+        df = response[sym].dropna()
+        if not df.empty:
+            df = _fillna(df)
+        if processed.empty and not df.empty:
+            processed = processed.reindex(df.index.values)
+        if not df.empty:
+            processed[sym] = df
+    return processed
+
+
+def make_daily_bars(n_symbols, start, end, missing_ratio, seed=0):
+    sessions = get_calendar('NYSE').sessions_in_range(start, end)
+    index = sessions.tz_localize(None).tz_localize(NY)
+    columns = pd.MultiIndex.from_product(
+        [['S%d' % i for i in range(n_symbols)], FIELDS],
+    )
+    rand = np.random.RandomState(seed)
+    values = rand.uniform(1, 100, (len(index), len(columns)))
+    # drop some bars, the post processing has to fill them
+    missing = rand.uniform(size=(len(index), n_symbols)) < missing_ratio
+    values[np.repeat(missing, len(FIELDS), axis=1)] = np.nan
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def timed(f, *args):
+    before = default_timer()
+    f(*args)
+    return default_timer() - before
+
+
+@click.command()
+@click.option('--symbols', default=100, show_default=True)
+@click.option('--years', default=2, show_default=True)
+@click.option('--missing-ratio', default=0.01, show_default=True)
+def main(symbols, years, missing_ratio):
+    end = pd.Timestamp('2020-12-31', tz='utc')
+    start = end - pd.DateOffset(years=years)
+    response = make_daily_bars(symbols, start, end, missing_ratio)
+
+    legacy = timed(legacy_process_bars, response.copy(), start, end)
+    vectorized = timed(process_bars, response.copy(), 'day', start, end)
+    click.echo(
+        '{} symbols, {} sessions\n'
+        'legacy:     {:.3f}s\n'
+        'vectorized: {:.3f}s ({:.0f}x)'.format(
+            symbols,
+            len(response),
+            legacy,
+            vectorized,
+            legacy / vectorized,
+        ),
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmark of the two ways a CustomFactor is computed: ``compute`` on
+every date, and ``compute_all`` on blocks of stacked windows.
+
+    $ python etc/benchmark_custom_factor.py --dates 2520 --assets 8000
+"""
+from timeit import default_timer
+
+import click
+import numpy as np
+import pandas as pd
+
+from zipline.lib.adjusted_array import AdjustedArray
+from zipline.lib.adjustment import Float64Multiply
+from zipline.pipeline.data import EquityPricing
+from zipline.pipeline.factors import (
+    AnnualizedVolatility,
+    AverageDollarVolume,
+    EWMA,
+    Returns,
+    SimpleMovingAverage,
+    VWAP,
+)
+
+WINDOW_LENGTH = 20
+
+
+def make_factors():
+    return {
+        'SimpleMovingAverage': SimpleMovingAverage(
+            inputs=[EquityPricing.close], window_length=WINDOW_LENGTH,
+        ),
+        'Returns': Returns(window_length=WINDOW_LENGTH),
+        'VWAP': VWAP(window_length=WINDOW_LENGTH),
+        'AverageDollarVolume': AverageDollarVolume(
+            window_length=WINDOW_LENGTH,
+        ),
+        'AnnualizedVolatility': AnnualizedVolatility(
+            window_length=WINDOW_LENGTH,
+        ),
+        'EWMA': EWMA.from_span(
+            inputs=[EquityPricing.close],
+            window_length=WINDOW_LENGTH,
+            span=10,
+        ),
+    }
+
+
+def make_input(n_rows, n_assets, n_adjustments, rand):
+    data = rand.uniform(1, 100, (n_rows, n_assets))
+    # a split every few rows, applied to the rows before it.
+    adjustments = {}
+    for row in rand.choice(np.arange(1, n_rows), n_adjustments, replace=False):
+        asset = rand.randint(n_assets)
+        adjustments[row] = [
+            Float64Multiply(0, row - 1, asset, asset, 0.5),
+        ]
+    return AdjustedArray(data, adjustments, np.nan)
+
+
+def timed(factor, method, inputs, dates, assets, mask):
+    windows = [
+        array.traverse(factor.window_length, copy=True) for array in inputs
+    ]
+    before = default_timer()
+    method(windows, dates, assets, mask)
+    return default_timer() - before
+
+
+@click.command()
+@click.option('--dates', default=1260, show_default=True)
+@click.option('--assets', default=2000, show_default=True)
+@click.option('--adjustments', default=100, show_default=True)
+def main(dates, assets, adjustments):
+    rand = np.random.RandomState(0)
+    n_rows = dates + WINDOW_LENGTH - 1
+    inputs = [
+        make_input(n_rows, assets, adjustments, rand) for _ in range(2)
+    ]
+    date_index = pd.date_range('2010-01-04', periods=dates, freq='B')
+    sids = np.arange(assets, dtype='int64')
+    mask = np.ones((dates, assets), dtype=bool)
+
+    click.echo('{} dates, {} assets'.format(dates, assets))
+    for name, factor in sorted(make_factors().items()):
+        factor_inputs = inputs[:len(factor.inputs)]
+        by_date = timed(
+            factor, factor._compute_by_date, factor_inputs, date_index, sids,
+            mask,
+        )
+        all_dates = timed(
+            factor, factor._compute_all, factor_inputs, date_index, sids,
+            mask,
+        )
+        click.echo(
+            '{:<22} compute: {:.3f}s compute_all: {:.3f}s ({:.1f}x)'.format(
+                name, by_date, all_dates, by_date / all_dates,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
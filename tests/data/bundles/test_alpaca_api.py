@@ -0,0 +1,221 @@
+import os
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+from zipline.data.bundles.alpaca_api import (
+    MAX_PER_REQUEST_AMOUNT,
+    NY,
+    fetch_aggs_from_alpaca,
+    fetch_cache,
+    get_aggs_from_alpaca,
+    process_bars,
+)
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+from zipline.utils.cache import dataframe_cache
+
+FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+
+class FakeBarSet(object):
+    def __init__(self, df):
+        self.df = df
+
+    def __len__(self):
+        return 0 if self.df.empty else len(self.df.columns.levels[0])
+
+
+class FakeREST(object):
+    """
+    In memory stand-in for ``alpaca_trade_api.REST``, serving bars from a
+    frame ``page_size`` bars at a time, newest first like the real api.
+    """
+
+    def __init__(self, bars, page_size):
+        self.bars = bars
+        self.page_size = page_size
+        self.calls = 0
+        self._lock = Lock()
+
+    def get_barset(self, symbols, timeframe, limit, end):
+        with self._lock:
+            self.calls += 1
+        bars = self.bars.loc[:pd.Timestamp(end), list(symbols)]
+        bars.columns = bars.columns.remove_unused_levels()
+        return FakeBarSet(bars.iloc[-self.page_size:])
+
+
+class FailingREST(object):
+    def get_barset(self, *args, **kwargs):
+        raise AssertionError('all the data should have been cached')
+
+
+def make_minute_bars(symbols, day):
+    minutes = pd.date_range(
+        day + pd.Timedelta(hours=9, minutes=30),
+        periods=390,
+        freq='min',
+        tz='America/New_York',
+    )
+    columns = pd.MultiIndex.from_product([symbols, FIELDS])
+    values = np.arange(len(minutes) * len(columns), dtype=float).reshape(
+        len(minutes), len(columns),
+    )
+    return pd.DataFrame(values, index=minutes, columns=columns)
+
+
+class AlpacaApiFetchTestCase(WithInstanceTmpDir, ZiplineTestCase):
+    day = pd.Timestamp('2020-06-01')
+    start = pd.Timestamp('2020-06-01', tz='utc')
+    end = pd.Timestamp('2020-06-02', tz='utc')
+
+    def test_get_aggs_pages_backwards(self):
+        symbols = ['A', 'B']
+        bars = make_minute_bars(symbols, self.day)
+        client = FakeREST(bars, page_size=100)
+
+        result = get_aggs_from_alpaca(
+            symbols, self.start, self.end, 'minute', client=client,
+        )
+
+        # 390 bars served 100 at a time, the last call finds no more data.
+        assert_equal(client.calls, 5)
+        for symbol in symbols:
+            np.testing.assert_array_equal(
+                result[symbol][FIELDS].values.astype(float),
+                bars[symbol].values,
+            )
+
+    def test_fetch_concurrently_and_resume_from_cache(self):
+        symbols = ['S%d' % i for i in range(2 * MAX_PER_REQUEST_AMOUNT + 50)]
+        bars = make_minute_bars(symbols, self.day)
+        client = FakeREST(bars, page_size=200)
+        cache = {}
+
+        fetched = list(fetch_aggs_from_alpaca(
+            symbols,
+            self.start,
+            self.end,
+            'minute',
+            cache=cache,
+            client=client,
+            workers=2,
+            requests_per_minute=1000,
+        ))
+
+        # chunks come back in order, each chunk needed 2 pages and a last
+        # call which finds no more data.
+        assert_equal(
+            [chunk for chunk, _ in fetched],
+            [symbols[:200], symbols[200:400], symbols[400:]],
+        )
+        assert_equal(client.calls, 9)
+        assert_equal(len(cache), 3)
+        for chunk, df in fetched:
+            assert_equal(sorted(df.columns.levels[0]), sorted(chunk))
+
+        # a second run with the same cache does not hit the api at all.
+        resumed = list(fetch_aggs_from_alpaca(
+            symbols,
+            self.start,
+            self.end,
+            'minute',
+            cache=cache,
+            client=FailingREST(),
+            workers=2,
+            requests_per_minute=1000,
+        ))
+        assert_equal(
+            [chunk for chunk, _ in resumed],
+            [chunk for chunk, _ in fetched],
+        )
+
+    def test_resume_from_ingest_cache(self):
+        symbols = ['A', 'B']
+        bars = make_minute_bars(symbols, self.day)
+        path = self.instance_tmpdir.getpath('ingest_cache')
+
+        def fetch(client):
+            # a new ingest cache in the same directory, like the ingest of a
+            # new run.
+            cache = dataframe_cache(path, clean_on_failure=False)
+            return list(fetch_aggs_from_alpaca(
+                symbols,
+                self.start,
+                self.end,
+                'minute',
+                cache=fetch_cache(cache),
+                client=client,
+                workers=1,
+                requests_per_minute=1000,
+            ))
+
+        fetched = fetch(FakeREST(bars, page_size=200))
+        resumed = fetch(FailingREST())
+
+        # the chunks are only stored in the directory of the alpaca fetch.
+        assert_equal(os.listdir(path), ['alpaca_api'])
+        assert_equal(len(resumed), 1)
+        assert_equal(resumed[0][0], fetched[0][0])
+        assert_equal(resumed[0][1], fetched[0][1])
+
+
+class AlpacaApiProcessBarsTestCase(ZiplineTestCase):
+    start = pd.Timestamp('2020-06-01', tz='utc')
+    end = pd.Timestamp('2020-06-11', tz='utc')
+
+    def test_fill_daily_gaps(self):
+        days = pd.date_range('2020-06-01', '2020-06-10', freq='B', tz=NY)
+        columns = pd.MultiIndex.from_product([['A', 'B'], FIELDS])
+        bars = pd.DataFrame(
+            np.arange(len(days) * len(columns), dtype=float).reshape(
+                len(days), len(columns),
+            ),
+            index=days,
+            columns=columns,
+        )
+        # a missing session, an incomplete bar, a late first bar and no bar
+        # for the last session.
+        bars = bars.drop(days[3])
+        bars.loc[days[5], ('A', 'close')] = np.nan
+        bars.loc[days[:2], 'B'] = np.nan
+
+        result = process_bars(bars, 'day', self.start, self.end)
+
+        assert_equal(
+            result.index,
+            pd.date_range('2020-06-01', '2020-06-11', freq='B', tz=NY),
+        )
+        assert_equal(
+            result[('A', 'close')].values,
+            np.array([3., 13., 23., 23., 43., 43., 63., 73., 73.]),
+        )
+        assert_equal(
+            result[('A', 'open')].values,
+            np.array([0., 10., 20., 20., 40., 40., 60., 70., 70.]),
+        )
+        assert_equal(
+            result[('B', 'open')].values,
+            np.array([25., 25., 25., 25., 45., 55., 65., 75., 75.]),
+        )
+
+    def test_market_hours(self):
+        minutes = pd.date_range(
+            '2020-06-01 09:00', '2020-06-01 16:30', freq='min', tz=NY,
+        )
+        columns = pd.MultiIndex.from_product([['A'], FIELDS])
+        bars = pd.DataFrame(1.0, index=minutes, columns=columns)
+        symbols = list(columns.levels[0])
+
+        result = get_aggs_from_alpaca(
+            symbols,
+            self.start,
+            self.end,
+            'minute',
+            client=FakeREST(bars, page_size=1000),
+        )
+        assert_equal(result.index[0], pd.Timestamp('2020-06-01 09:30', tz=NY))
+        assert_equal(result.index[-1], pd.Timestamp('2020-06-01 16:00', tz=NY))
+        assert_equal(len(result), 391)
@@ -13,8 +13,18 @@ from zipline.assets.asset_writer import check_version_info
 from zipline.assets.synthetic import make_simple_equity_info
 from zipline.data.bundles import UnknownBundle, from_bundle_ingest_dirname, \
     ingestions_for_bundle
+from zipline.data.bundles.common import missing_tail_start_sessions
 from zipline.data.bundles.core import _make_bundle_core, BadClean, \
-    to_bundle_ingest_dirname, asset_db_path
+    to_bundle_ingest_dirname, asset_db_path, minute_equity_path, \
+    minute_equity_mmap_path
+from zipline.data.minute_bars import (
+    BcolzMinuteBarMetadata,
+    BcolzMinuteBarReader,
+)
+from zipline.data.mmap_minute_bars import (
+    MmapMinuteBarReader,
+    convert_bcolz_minute_bars,
+)
 from zipline.lib.adjustment import Float64Multiply
 from zipline.pipeline.loaders.synthetic import (
     make_bar_data,
@@ -265,6 +275,303 @@ class BundleCoreTestCase(WithInstanceTmpDir,
             msg='volume',
         )
 
+    def test_ingest_incremental(self):
+        calendar = get_calendar('XNYS')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        daily_bar_data = dict(make_bar_data(equities, sessions))
+
+        # the sessions the "remote" has data for, and the first session the
+        # bundle fetched for every sid.
+        available = [sessions[2]]
+        fetched = []
+
+        @self.register(
+            'bundle',
+            calendar_name='NYSE',
+            start_session=self.START_DATE,
+            end_session=self.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          calendar,
+                          start_session,
+                          end_session,
+                          cache,
+                          show_progress,
+                          output_dir):
+            starts = missing_tail_start_sessions(
+                sids,
+                calendar,
+                start_session,
+                end_session,
+                daily_bar_writer,
+            )
+            fetched.append(starts.to_dict())
+
+            asset_db_writer.write(equities=equities)
+            daily_bar_writer.write(
+                (sid, daily_bar_data[sid].loc[start:available[0]])
+                for sid, start in starts.iteritems()
+            )
+            adjustment_writer.write()
+
+        with assert_raises(ValueError):
+            self.ingest('bundle', environ=self.environ, incremental=True)
+
+        self.ingest('bundle', environ=self.environ)
+        available[0] = sessions[-1]
+        self.ingest('bundle', environ=self.environ, incremental=True)
+
+        # the second ingest only fetched the missing sessions, and updated the
+        # first ingestion in place.
+        assert_equal(
+            fetched,
+            [dict.fromkeys(sids, sessions[0]), dict.fromkeys(sids, sessions[3])],
+        )
+        assert_equal(len(ingestions_for_bundle('bundle', self.environ)), 1)
+
+        bundle = self.load('bundle', environ=self.environ)
+        assert_equal(set(bundle.asset_finder.sids), set(sids))
+
+        columns = 'open', 'high', 'low', 'close', 'volume'
+        actual = bundle.equity_daily_bar_reader.load_raw_arrays(
+            columns,
+            self.START_DATE,
+            self.END_DATE,
+            sids,
+        )
+        for actual_column, colname in zip(actual, columns):
+            assert_equal(
+                actual_column,
+                expected_bar_values_2d(sessions, sids, equities, colname),
+                msg=colname,
+            )
+
+    def test_ingest_incremental_failure(self):
+        calendar = get_calendar('XNYS')
+        sessions = calendar.sessions_in_range(self.START_DATE, self.END_DATE)
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        daily_bar_data = dict(make_bar_data(equities, sessions))
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE, self.END_DATE,
+        )
+        minute_bar_data = dict(make_bar_data(equities, minutes))
+        # the first ingest has the first 3 sessions of sids 0 and 1, the
+        # second one fails after writing the rest.
+        stored = sessions[2]
+        stored_minute = calendar.session_close(stored)
+        failing = [False]
+
+        @self.register(
+            'bundle',
+            calendar_name='NYSE',
+            start_session=self.START_DATE,
+            end_session=self.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          calendar,
+                          start_session,
+                          end_session,
+                          cache,
+                          show_progress,
+                          output_dir):
+            ingested = sids if failing[0] else sids[:2]
+            asset_db_writer.write(equities=equities.loc[list(ingested)])
+            if failing[0]:
+                daily_bar_writer.write(
+                    (sid, daily_bar_data[sid]) for sid in ingested
+                )
+                minute_bar_writer.write(
+                    (sid, minute_bar_data[sid].loc[stored_minute:][1:])
+                    if sid in sids[:2] else (sid, minute_bar_data[sid])
+                    for sid in ingested
+                )
+                adjustment_writer.write()
+                raise ValueError('the ingest failed')
+
+            daily_bar_writer.write(
+                (sid, daily_bar_data[sid].loc[:stored]) for sid in ingested
+            )
+            minute_bar_writer.write(
+                (sid, minute_bar_data[sid].loc[:stored_minute])
+                for sid in ingested
+            )
+            adjustment_writer.write()
+
+        self.ingest('bundle', environ=self.environ)
+        failing[0] = True
+        with assert_raises(ValueError):
+            self.ingest('bundle', environ=self.environ, incremental=True)
+
+        # the stored bars are unchanged.
+        bundle = self.load('bundle', environ=self.environ)
+        assert_equal(set(bundle.asset_finder.sids), set(sids[:2]))
+        assert_equal(
+            bundle.equity_daily_bar_reader.get_stored_session_bounds(),
+            pd.DataFrame(
+                {
+                    'first_session': [sessions[0]] * 2,
+                    'last_session': [stored] * 2,
+                },
+                index=list(sids[:2]),
+                columns=['first_session', 'last_session'],
+            ),
+        )
+        minute_reader = bundle.equity_minute_bar_reader
+        for sid in sids[:2]:
+            assert_equal(
+                minute_reader.get_last_traded_dt(
+                    bundle.asset_finder.retrieve_asset(sid),
+                    minutes[-1],
+                ),
+                stored_minute,
+            )
+
+        ingestion, = (
+            path
+            for path in os.listdir(
+                pth.data_path(['bundle'], environ=self.environ),
+            )
+            if not pth.hidden(path)
+        )
+        assert_equal(
+            sorted(os.listdir(pth.data_path(
+                ['bundle', ingestion], environ=self.environ,
+            ))),
+            [
+                'adjustments.sqlite',
+                'assets-%d.sqlite' % ASSET_DB_VERSION,
+                'daily_equities.bcolz',
+                'minute_equities.bcolz',
+            ],
+        )
+        assert_false(os.path.exists(pth.data_path(
+            ['bundle', ingestion, 'minute_equities.bcolz', '00', '00',
+             '000002.bcolz'],
+            environ=self.environ,
+        )))
+
+    def test_load_converted_minute_bars(self):
+        calendar = get_calendar('XNYS')
+        sids = tuple(range(3))
+        equities = make_simple_equity_info(
+            sids,
+            self.START_DATE,
+            self.END_DATE,
+        )
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE, self.END_DATE,
+        )
+        minute_bar_data = dict(make_bar_data(equities, minutes))
+        # the first ingest has the first 3 sessions, the incremental one
+        # appends the rest.
+        stored_minute = calendar.session_close(
+            calendar.sessions_in_range(self.START_DATE, self.END_DATE)[2],
+        )
+        appending = [False]
+
+        @self.register(
+            'bundle',
+            calendar_name='NYSE',
+            start_session=self.START_DATE,
+            end_session=self.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          calendar,
+                          start_session,
+                          end_session,
+                          cache,
+                          show_progress,
+                          output_dir):
+            asset_db_writer.write(equities=equities)
+            if appending[0]:
+                minute_bar_writer.write(
+                    (sid, minute_bar_data[sid].loc[stored_minute:][1:])
+                    for sid in sids
+                )
+            else:
+                minute_bar_writer.write(
+                    (sid, minute_bar_data[sid].loc[:stored_minute])
+                    for sid in sids
+                )
+            daily_bar_writer.write(())
+            adjustment_writer.write()
+
+        def load():
+            bundle = self.load('bundle', environ=self.environ)
+            return bundle, type(bundle.equity_minute_bar_reader)
+
+        def last_traded_dts(bundle):
+            reader = bundle.equity_minute_bar_reader
+            return [
+                reader.get_last_traded_dt(
+                    bundle.asset_finder.retrieve_asset(sid),
+                    minutes[-1],
+                )
+                for sid in sids
+            ]
+
+        self.ingest('bundle', environ=self.environ)
+        timestr, = (
+            path
+            for path in os.listdir(
+                pth.data_path(['bundle'], environ=self.environ),
+            )
+            if not pth.hidden(path)
+        )
+        bcolz_path = minute_equity_path('bundle', timestr, self.environ)
+        mmap_path = minute_equity_mmap_path('bundle', timestr, self.environ)
+
+        convert_bcolz_minute_bars(bcolz_path, mmap_path)
+        bundle, reader_type = load()
+        assert_is(reader_type, MmapMinuteBarReader)
+
+        # the appended bars are read from the bcolz tables until the bars are
+        # converted again.
+        appending[0] = True
+        self.ingest('bundle', environ=self.environ, incremental=True)
+        assert_false(os.path.exists(mmap_path))
+        bundle, reader_type = load()
+        assert_is(reader_type, BcolzMinuteBarReader)
+        assert_equal(last_traded_dts(bundle), [minutes[-1]] * len(sids))
+
+        convert_bcolz_minute_bars(bcolz_path, mmap_path)
+        bundle, reader_type = load()
+        assert_is(reader_type, MmapMinuteBarReader)
+        assert_equal(last_traded_dts(bundle), [minutes[-1]] * len(sids))
+
+        # a conversion whose metadata doesn't match the bcolz metadata is
+        # stale.
+        metadata = BcolzMinuteBarMetadata.read(mmap_path)
+        metadata.end_session = calendar.previous_session_label(
+            metadata.end_session,
+        )
+        metadata.write(mmap_path)
+        bundle, reader_type = load()
+        assert_is(reader_type, BcolzMinuteBarReader)
+
     def test_ingest_assets_versions(self):
         versions = (1, 2)
 
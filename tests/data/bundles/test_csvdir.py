@@ -2,16 +2,18 @@ from __future__ import division
 
 import numpy as np
 import pandas as pd
+from parameterized import parameterized
 from trading_calendars import get_calendar
 
 from zipline.data.bundles import ingest, load, bundles
+from zipline.data.bundles.csvdir import _symbol_files
 from zipline.testing import test_resource_path
-from zipline.testing.fixtures import ZiplineTestCase
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
 from zipline.testing.predicates import assert_equal
 from zipline.utils.functional import apply
 
 
-class CSVDIRBundleTestCase(ZiplineTestCase):
+class CSVDIRBundleTestCase(WithInstanceTmpDir, ZiplineTestCase):
     symbols = 'AAPL', 'IBM', 'KO', 'MSFT'
     asset_start = pd.Timestamp('2012-01-03', tz='utc')
     asset_end = pd.Timestamp('2014-12-31', tz='utc')
@@ -95,9 +97,11 @@ class CSVDIRBundleTestCase(ZiplineTestCase):
 
         return pricing, adjustments
 
-    def test_bundle(self):
+    @parameterized.expand([('serial', '1'), ('parallel', '2')])
+    def test_bundle(self, name, workers):
         environ = {
-            'CSVDIR': test_resource_path('csvdir_samples', 'csvdir')
+            'CSVDIR': test_resource_path('csvdir_samples', 'csvdir'),
+            'CSVDIR_WORKERS': workers,
         }
 
         ingest('csvdir', environ=environ)
@@ -129,3 +133,13 @@ class CSVDIRBundleTestCase(ZiplineTestCase):
         )
         assert_equal([sorted(adj.keys()) for adj in adjs_for_cols],
                      expected_adjustments)
+
+    def test_symbol_files(self):
+        for fname in ['A.csv', 'AA.csv.gz', 'BA.csv', 'A.csv.gz', 'notes']:
+            self.instance_tmpdir.write(fname, b'')
+
+        # symbols match their file exactly, not a file containing them.
+        assert_equal(
+            _symbol_files(self.instance_tmpdir.path),
+            {'A': 'A.csv', 'AA': 'AA.csv.gz', 'BA': 'BA.csv'},
+        )
@@ -0,0 +1,135 @@
+"""
+Tests for the memory-mapped minute bars converted from bcolz minute bars.
+"""
+import os
+
+import numpy as np
+from pandas import DataFrame, Timestamp
+
+from zipline.data.bar_reader import NoDataForSid
+from zipline.data.minute_bars import (
+    BcolzMinuteBarReader,
+    BcolzMinuteBarWriter,
+    US_EQUITIES_MINUTES_PER_DAY,
+)
+from zipline.data.mmap_minute_bars import (
+    convert_bcolz_minute_bars,
+    MmapMinuteBarReader,
+)
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+# Covers the early close of 2015-11-27.
+TEST_CALENDAR_START = Timestamp('2015-11-23', tz='UTC')
+TEST_CALENDAR_STOP = Timestamp('2015-12-04', tz='UTC')
+
+
+class MmapMinuteBarTestCase(WithTradingCalendars,
+                            WithAssetFinder,
+                            WithInstanceTmpDir,
+                            ZiplineTestCase):
+
+    ASSET_FINDER_EQUITY_SIDS = 1, 2, 3
+
+    def init_instance_fixtures(self):
+        super(MmapMinuteBarTestCase, self).init_instance_fixtures()
+
+        bcolz_dir = self.instance_tmpdir.getpath('minute_bars')
+        os.makedirs(bcolz_dir)
+        writer = BcolzMinuteBarWriter(
+            bcolz_dir,
+            self.trading_calendar,
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+            US_EQUITIES_MINUTES_PER_DAY,
+            ohlc_ratios_per_sid={2: 100000},
+        )
+
+        minutes = self.trading_calendar.minutes_for_sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        rand = np.random.RandomState(0)
+        for sid in (1, 2, 3):
+            # sids 2 and 3 start trading later and don't trade every minute.
+            sid_minutes = minutes[(sid - 1) * 1000:]
+            volume = rand.randint(0, 100, len(sid_minutes))
+            if sid == 3:
+                volume[volume < 90] = 0
+            close = rand.uniform(1, 100, len(sid_minutes)).round(2)
+            close[volume == 0] = np.nan
+            writer.write_sid(sid, DataFrame(
+                {
+                    'open': close,
+                    'high': close + 1,
+                    'low': close - 1,
+                    'close': close,
+                    'volume': volume,
+                },
+                index=sid_minutes,
+            ))
+
+        mmap_dir = self.instance_tmpdir.getpath('minute_bars.mmap')
+        convert_bcolz_minute_bars(bcolz_dir, mmap_dir)
+
+        self.bcolz_reader = BcolzMinuteBarReader(bcolz_dir)
+        self.reader = MmapMinuteBarReader(mmap_dir)
+
+    def test_load_raw_arrays(self):
+        fields = list(MmapMinuteBarReader.FIELDS)
+        windows = [
+            # one session.
+            (Timestamp('2015-11-23 14:31', tz='UTC'),
+             Timestamp('2015-11-23 21:00', tz='UTC')),
+            # around the early close.
+            (Timestamp('2015-11-25 20:00', tz='UTC'),
+             Timestamp('2015-12-01 15:00', tz='UTC')),
+            (Timestamp('2015-11-23 14:31', tz='UTC'),
+             Timestamp('2015-12-04 21:00', tz='UTC')),
+        ]
+        for start, end in windows:
+            for sids in ([1], [3, 1, 2]):
+                assert_equal(
+                    self.reader.load_raw_arrays(fields, start, end, sids),
+                    self.bcolz_reader.load_raw_arrays(
+                        fields, start, end, sids,
+                    ),
+                )
+
+    def test_get_value(self):
+        minutes = self.trading_calendar.minutes_for_sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        for minute in minutes[::97]:
+            for sid in (1, 2, 3):
+                for field in ('close', 'volume'):
+                    assert_equal(
+                        self.reader.get_value(sid, minute, field),
+                        self.bcolz_reader.get_value(sid, minute, field),
+                    )
+
+    def test_get_last_traded_dt(self):
+        minutes = self.trading_calendar.minutes_for_sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        for minute in minutes[::97]:
+            for sid in (1, 2, 3):
+                asset = self.asset_finder.retrieve_asset(sid)
+                assert_equal(
+                    self.reader.get_last_traded_dt(asset, minute),
+                    self.bcolz_reader.get_last_traded_dt(asset, minute),
+                )
+
+    def test_no_minute_bars_for_sid(self):
+        minute = Timestamp('2015-11-23 14:31', tz='UTC')
+        with self.assertRaises(NoDataForSid):
+            self.reader.get_value(1337, minute, 'close')
+        with self.assertRaises(NoDataForSid):
+            self.reader.load_raw_arrays(['close'], minute, minute, [1, 1337])
@@ -0,0 +1,282 @@
+#
+# Copyright 2020 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from parameterized import parameterized
+import numpy as np
+import pandas as pd
+from pandas import NaT, Timestamp
+
+from zipline.data.bar_reader import NoDataAfterDate, NoDataBeforeDate
+from zipline.data.psql_daily_bars import (
+    PSQLDailyBarReader,
+    PSQLDailyBarWriter,
+)
+from zipline.testing.fixtures import (
+    WithInstanceTmpDir,
+    WithTradingCalendars,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+TEST_CALENDAR_START = Timestamp('2015-06-01', tz='UTC')
+TEST_CALENDAR_STOP = Timestamp('2015-06-30', tz='UTC')
+
+
+class PSQLDailyBarTestCase(WithInstanceTmpDir,
+                           WithTradingCalendars,
+                           ZiplineTestCase):
+    """
+    Round trip daily bars through the psql writer and reader, using a sqlite
+    database as a stand-in for postgres.
+    """
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(PSQLDailyBarTestCase, cls).init_class_fixtures()
+        cls.sessions = cls.trading_calendar.sessions_in_range(
+            TEST_CALENDAR_START,
+            TEST_CALENDAR_STOP,
+        )
+        # sid 1 trades over the whole range, sid 2 starts mid-month and has a
+        # session without volume.
+        cls.frames = {
+            1: cls.make_frame(1, cls.sessions),
+            2: cls.make_frame(2, cls.sessions[7:]),
+        }
+        cls.frames[2].loc[cls.sessions[-1], 'volume'] = 0
+
+    @classmethod
+    def make_frame(cls, sid, sessions):
+        values = np.arange(len(sessions), dtype=float) + 100 * sid
+        return pd.DataFrame(
+            {
+                'open': values,
+                'high': values + 2,
+                'low': values - 1,
+                'close': values + 1,
+                'volume': values * 1000,
+            },
+            index=sessions,
+        )
+
+    def init_instance_fixtures(self):
+        super(PSQLDailyBarTestCase, self).init_instance_fixtures()
+        self.db_path = self.instance_tmpdir.getpath('ohlcv.sqlite')
+
+    def make_writer(self, **kwargs):
+        return PSQLDailyBarWriter(
+            self.db_path,
+            self.trading_calendar,
+            self.sessions[0],
+            self.sessions[-1],
+            **kwargs
+        )
+
+    def write(self, frames, **kwargs):
+        self.make_writer(**kwargs).write(
+            (sid, frame.copy()) for sid, frame in sorted(frames.items())
+        )
+
+    def stored_rows(self):
+        return pd.read_sql(
+            'SELECT id, COUNT(day) AS ct FROM ohlcv_daily GROUP BY id',
+            self.make_writer().conn,
+            index_col='id',
+        )['ct']
+
+    @parameterized.expand([
+        ('single_batch', {}),
+        ('many_batches', {'batch_size': 5}),
+        ('rebuild_indexes', {'batch_size': 5, 'rebuild_indexes': True}),
+    ])
+    def test_write(self, name, kwargs):
+        self.write(self.frames, **kwargs)
+        assert_equal(
+            self.stored_rows().to_dict(),
+            {sid: len(frame) for sid, frame in self.frames.items()},
+        )
+
+    def test_append_to_existing_data(self):
+        # write the middle of the data first, then write everything. only the
+        # sessions before and after the existing data should be added.
+        self.write({
+            sid: frame.iloc[3:-3] for sid, frame in self.frames.items()
+        })
+        self.write(self.frames, batch_size=5)
+
+        assert_equal(
+            self.stored_rows().to_dict(),
+            {sid: len(frame) for sid, frame in self.frames.items()},
+        )
+
+    def test_get_stored_session_bounds(self):
+        self.write({1: self.frames[1].iloc[:10], 2: self.frames[2]})
+        reader = PSQLDailyBarReader(self.db_path)
+
+        assert_equal(
+            reader.get_stored_session_bounds([1, 2, 3]),
+            pd.DataFrame(
+                {
+                    'first_session': [
+                        self.sessions[0], self.sessions[7], NaT,
+                    ],
+                    'last_session': [
+                        self.sessions[9], self.sessions[-1], NaT,
+                    ],
+                },
+                index=[1, 2, 3],
+                columns=['first_session', 'last_session'],
+            ),
+        )
+
+    def test_data_version(self):
+        self.write({1: self.frames[1]})
+        reader = PSQLDailyBarReader(self.db_path)
+        version = reader.data_version()
+        assert_equal(reader.data_version(), version)
+
+        # new sids change the version even without new sessions
+        self.write({2: self.frames[2]})
+        self.assertNotEqual(reader.data_version(), version)
+
+    @parameterized.expand([('windowed', True), ('full_columns', False)])
+    def test_read(self, name, windowed_reads):
+        self.write(self.frames)
+        reader = PSQLDailyBarReader(
+            self.db_path,
+            windowed_reads=windowed_reads,
+            block_size=4,
+        )
+        columns = ['open', 'high', 'low', 'close', 'volume']
+        start, end = self.sessions[5], self.sessions[15]
+        results = reader.load_raw_arrays(columns, start, end, [1, 2, 3])
+
+        for column, result in zip(columns, results):
+            expected = np.full((11, 3), np.nan if column != 'volume' else 0.0)
+            for asset_ix, sid in enumerate([1, 2]):
+                frame = self.frames[sid]
+                values = frame.loc[start:end, column]
+                expected[
+                    self.sessions[5:16].get_indexer(values.index),
+                    asset_ix,
+                ] = values.values
+            assert_equal(result, expected)
+
+        assert_equal(reader.get_value(2, self.sessions[10], 'close'), 204.0)
+        with self.assertRaises(NoDataBeforeDate):
+            reader.get_value(2, self.sessions[0], 'close')
+
+        assert_equal(
+            reader.get_last_traded_dt(2, self.sessions[-1]),
+            self.sessions[-2],
+        )
+        assert_equal(reader.get_last_traded_dt(2, self.sessions[0]), NaT)
+
+    def test_windowed_read_after_end(self):
+        self.write({1: self.frames[1].iloc[:10], 2: self.frames[2]})
+        reader = PSQLDailyBarReader(self.db_path, block_size=4)
+
+        with self.assertRaises(NoDataAfterDate):
+            reader.get_value(1, self.sessions[12], 'close')
+        assert_equal(
+            reader.get_last_traded_dt(1, self.sessions[12]),
+            self.sessions[9],
+        )
+
+    def count_calls(self, reader, name, result=None):
+        """Count the calls to a method of ``reader``, optionally replacing
+        its result.
+        """
+        calls = []
+        method = getattr(reader, name)
+
+        def counted(*args):
+            calls.append(args)
+            out = method(*args)
+            return out if result is None else result
+
+        setattr(reader, name, counted)
+        return calls
+
+    def test_windowed_reads_use_block_cache(self):
+        self.write(self.frames)
+        reader = PSQLDailyBarReader(self.db_path, block_size=4)
+        fetches = self.count_calls(reader, '_fetch_blocks')
+        columns = ['close', 'volume']
+
+        expected = PSQLDailyBarReader(self.db_path).load_raw_arrays(
+            columns, self.sessions[5], self.sessions[15], [1, 2],
+        )
+
+        def load(start_ix, end_ix):
+            return reader.load_raw_arrays(
+                columns,
+                self.sessions[start_ix],
+                self.sessions[end_ix],
+                [1, 2],
+            )
+
+        # sessions 5 through 15 are in blocks 1 through 3.
+        assert_equal(load(5, 15), expected)
+        assert_equal(fetches, [([1, 2], 1, 3)])
+        assert_equal(
+            sorted(reader._blocks.keys()),
+            [(sid, block) for sid in (1, 2) for block in (1, 2, 3)],
+        )
+
+        # a window inside the cached blocks doesn't query the database.
+        assert_equal(load(6, 9), [e[1:5] for e in expected])
+        assert_equal(reader.get_value(1, self.sessions[12], 'close'), 113.0)
+        assert_equal(len(fetches), 1)
+
+        # only the blocks which are missing are read.
+        load(10, 17)
+        assert_equal(fetches[1:], [([1, 2], 4, 4)])
+
+    def test_windowed_reads_evict_blocks(self):
+        self.write(self.frames)
+        reader = PSQLDailyBarReader(
+            self.db_path,
+            block_size=4,
+            block_cache_size=2,
+        )
+        reference = PSQLDailyBarReader(self.db_path, block_size=4)
+
+        for start, end in (5, 15), (0, 20), (8, 9):
+            args = (
+                ['open', 'volume'],
+                self.sessions[start],
+                self.sessions[end],
+                [2, 1],
+            )
+            assert_equal(
+                reader.load_raw_arrays(*args),
+                reference.load_raw_arrays(*args),
+            )
+            self.assertLessEqual(len(reader._blocks), 2)
+
+    def test_asset_bounds_computed_once(self):
+        self.write(self.frames)
+        reader = PSQLDailyBarReader(self.db_path)
+        # an empty result is cached like any other.
+        calls = self.count_calls(reader, '_get_asset_bounds', result={})
+
+        for _ in range(2):
+            assert_equal(
+                reader.load_raw_arrays(
+                    ['close'], self.sessions[0], self.sessions[1], [1],
+                ),
+                [np.full((2, 1), np.nan)],
+            )
+        assert_equal(len(calls), 1)
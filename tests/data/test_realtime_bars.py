@@ -0,0 +1,78 @@
+from queue import Queue
+
+import numpy as np
+import pandas as pd
+
+from zipline.data.realtime_bars import BarQueueConsumer, MinuteBarRingBuffer
+from zipline.testing.fixtures import ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+
+OHLCV = ['open', 'high', 'low', 'close', 'volume']
+
+
+class MinuteBarRingBufferTestCase(ZiplineTestCase):
+    minutes = pd.date_range('2020-06-01 13:30', periods=10, freq='min',
+                            tz='UTC')
+
+    def bar(self, i):
+        return (self.minutes[i],) + tuple(float(i) + d for d in range(5))
+
+    def test_wraps_around(self):
+        buffer = MinuteBarRingBuffer(capacity=4)
+        for i in range(6):
+            buffer.update('A', *self.bar(i))
+
+        bars = buffer.bars(['A', 'B'])
+        assert_equal(bars.index, self.minutes[2:6])
+        assert_equal(bars['A', 'open'].values, np.arange(2., 6.))
+        assert_equal(bars['A', 'volume'].values, np.arange(6., 10.))
+        assert bars['B'].isnull().all().all()
+        assert_equal(len(buffer.bars(['A'], bar_count=2)), 2)
+
+        assert_equal(buffer.spot_value('A', 'price'), 8.0)
+        assert_equal(buffer.spot_value('A', 'volume'), 9)
+        assert_equal(buffer.last_traded_dt('A'), self.minutes[5])
+        assert 'B' not in buffer
+        with self.assertRaises(KeyError):
+            buffer.spot_value('B', 'price')
+
+    def test_update_and_late_bars(self):
+        buffer = MinuteBarRingBuffer(capacity=4)
+        buffer.update('A', *self.bar(1))
+        # an update of the current minute replaces it, older bars are ignored
+        buffer.update('A', self.minutes[1], 1., 2., 0., 1.5, 10.)
+        buffer.update('A', *self.bar(0))
+
+        bars = buffer.bars(['A'])
+        assert_equal(bars.index, self.minutes[1:2])
+        assert_equal(bars['A'].values, np.array([[1., 2., 0., 1.5, 10.]]))
+
+    def test_extend(self):
+        buffer = MinuteBarRingBuffer(capacity=4)
+        buffer.update('A', *self.bar(2))
+        frame = pd.DataFrame(
+            [self.bar(i)[1:] for i in range(6)],
+            index=self.minutes[:6].tz_convert('America/New_York'),
+            columns=OHLCV,
+        )
+        buffer.extend('A', frame)
+
+        bars = buffer.bars(['A'])
+        assert_equal(bars.index, self.minutes[2:6])
+        assert_equal(bars['A', 'close'].values, np.arange(5., 9.))
+
+    def test_queue_consumer(self):
+        queue = Queue()
+        buffer = MinuteBarRingBuffer(capacity=4)
+        consumer = BarQueueConsumer(queue, buffer)
+        consumer.start()
+
+        for i in range(3):
+            queue.put(('A',) + self.bar(i))
+        queue.put(('B', 'not a date', 1., 1., 1., 1., 1.))
+        queue.join()
+
+        assert_equal(buffer.spot_value('A', 'open'), 2.0)
+        assert 'B' not in buffer
+        consumer.stop()
+        assert not consumer.is_alive()
@@ -13,16 +13,18 @@
 # limitations under the License.
 from collections import OrderedDict
 from numbers import Real
+import os
 
 from parameterized import parameterized
 from numpy.testing import assert_almost_equal
-from numpy import nan, array, full, isnan
+from numpy import nan, array, full, isnan, uint32, zeros
 import pandas as pd
 from pandas import DataFrame
 from six import iteritems
 
 from zipline.data.resample import (
     minute_frame_to_session_frame,
+    minute_to_session,
     DailyHistoryAggregator,
     MinuteResampleSessionBarReader,
     ReindexMinuteBarReader,
@@ -35,8 +37,10 @@ from zipline.testing.fixtures import (
     WithBcolzEquityMinuteBarReader,
     WithBcolzEquityDailyBarReader,
     WithBcolzFutureMinuteBarReader,
+    WithInstanceTmpDir,
     ZiplineTestCase,
 )
+from zipline.testing.predicates import assert_equal
 
 OHLC = ['open', 'high', 'low', 'close']
 OHLCV = OHLC + ['volume']
@@ -523,6 +527,26 @@ class MinuteToDailyAggregationTestCase(WithBcolzEquityMinuteBarReader,
                     err_msg='sid={0} field={1} dt={2}'.format(
                         asset, field, minute))
 
+    @parameterized.expand(OHLCV)
+    def test_skip_minutes_new_asset(self, field):
+        # Add an asset in the middle of the day, to exercise backfilling
+        # assets which were aggregated up to different minutes at once.
+        method_name = field + 's'
+        assets = self.asset_finder.retrieve_all([1, 2])
+        minutes = EQUITY_CASES[1].index
+        for i, minute_assets in [(1, assets[:1]), (2, assets), (5, assets)]:
+            minute = minutes[i]
+            values = getattr(self.equity_daily_aggregator, method_name)(
+                minute_assets, minute)
+            for j, asset in enumerate(minute_assets):
+                value = values[j]
+                self.assertIsInstance(value, Real)
+                assert_almost_equal(
+                    value,
+                    EXPECTED_AGGREGATION[asset][field][i],
+                    err_msg='sid={0} field={1} dt={2}'.format(
+                        asset, field, minute))
+
 
 class TestMinuteToSession(WithEquityMinuteBarData,
                           ZiplineTestCase):
@@ -565,6 +589,7 @@ class TestMinuteToSession(WithEquityMinuteBarData,
 
 
 class TestResampleSessionBars(WithBcolzFutureMinuteBarReader,
+                              WithInstanceTmpDir,
                               ZiplineTestCase):
 
     TRADING_CALENDAR_STRS = ('us_futures',)
@@ -619,6 +644,67 @@ class TestResampleSessionBars(WithBcolzFutureMinuteBarReader,
                     result[i],
                     err_msg="sid={0} field={1}".format(sid, field))
 
+    def test_resample_many_sids(self):
+        calendar = self.trading_calendar
+        sids = list(self.ASSET_FINDER_FUTURE_SIDS)
+        result = self.session_bar_reader.load_raw_arrays(
+            OHLCV, self.START_DATE, self.END_DATE, sids)
+
+        minute_data = self.bcolz_future_minute_bar_reader.load_raw_arrays(
+            OHLCV,
+            calendar.session_open(self.START_DATE),
+            calendar.session_close(self.END_DATE),
+            sids,
+        )
+        minutes = calendar.minutes_for_sessions_in_range(
+            self.START_DATE, self.END_DATE)
+        close_locs = minutes.searchsorted(pd.to_datetime(
+            calendar.session_closes_in_range(
+                self.START_DATE, self.END_DATE).values,
+            utc=True,
+        ))
+        for i, field in enumerate(OHLCV):
+            for j, sid in enumerate(sids):
+                if field != 'volume':
+                    expected = full(self.NUM_SESSIONS, nan)
+                else:
+                    expected = zeros(self.NUM_SESSIONS, dtype=uint32)
+                minute_to_session(
+                    field, close_locs, minute_data[i][:, j], expected)
+                assert_equal(
+                    result[i][:, j],
+                    expected,
+                    msg="sid={0} field={1}".format(sid, field),
+                )
+
+    def test_cache_dir(self):
+        cache_dir = self.instance_tmpdir.getpath('session_bars')
+        sids = list(self.ASSET_FINDER_FUTURE_SIDS)
+        expected = self.session_bar_reader.load_raw_arrays(
+            OHLCV, self.START_DATE, self.END_DATE, sids)
+
+        for _ in range(2):
+            # The second reader reads the bars written by the first one.
+            reader = MinuteResampleSessionBarReader(
+                self.trading_calendar,
+                self.bcolz_future_minute_bar_reader,
+                cache_dir=cache_dir,
+            )
+            assert_equal(
+                reader.load_raw_arrays(
+                    OHLCV, self.START_DATE, self.END_DATE, sids),
+                expected,
+            )
+            assert_equal(
+                reader.load_raw_arrays(
+                    ['close'], self.END_DATE, self.END_DATE, sids[::-1]),
+                [expected[3][-1:, ::-1]],
+            )
+            assert_equal(
+                sorted(os.listdir(cache_dir)),
+                sorted(str(sid) for sid in sids),
+            )
+
     def test_sessions(self):
         sessions = self.session_bar_reader.sessions
 
@@ -1,5 +1,6 @@
 from textwrap import dedent
 
+import numpy as np
 from parameterized import parameterized
 from pandas import DataFrame
 
@@ -19,6 +20,7 @@ from zipline.finance.order import Order
 from zipline.finance.transaction import Transaction
 from zipline.testing import ZiplineTestCase
 from zipline.testing.fixtures import WithAssetFinder, WithMakeAlgo
+from zipline.testing.predicates import assert_equal
 
 
 class CommissionUnitTests(WithAssetFinder, ZiplineTestCase):
@@ -291,6 +293,35 @@ class CommissionUnitTests(WithAssetFinder, ZiplineTestCase):
         self.assertAlmostEqual(25.755, model.calculate(order, txns[1]))
         self.assertAlmostEqual(15.3, model.calculate(order, txns[2]))
 
+    @parameterized.expand([
+        ('per_share', PerShare(cost=0.0075, min_trade_cost=1), 1),
+        ('per_trade', PerTrade(cost=5), 2),
+        ('per_dollar', PerDollar(cost=0.0015), 1),
+        ('per_contract', PerContract(cost=0.01, exchange_fee=0.3), 1000),
+        ('per_future_trade', PerFutureTrade(cost={'CL': 3, 'FV': 2}), 1001),
+    ])
+    def test_calculate_batch(self, name, model, sid):
+        fills = []
+        # orders which have and haven't paid a commission yet, some of them
+        # under the minimum cost.
+        for commission, filled, amount in [(0, 0, 230),
+                                           (0, 0, 10),
+                                           (1.5, 100, -70),
+                                           (0.2, 20, 5),
+                                           (1.0, 500, 100)]:
+            order, txns = self.generate_order_and_txns(
+                sid, 1000, [amount, 0, 0],
+            )
+            order.commission = commission
+            order.filled = filled
+            fills.append((order, txns[0]))
+
+        orders, txns = zip(*fills)
+        assert_equal(
+            model.calculate_batch(orders, txns),
+            np.array([model.calculate(o, t) for o, t in fills], dtype=float),
+        )
+
 
 class CommissionAlgorithmTests(WithMakeAlgo, ZiplineTestCase):
     # make sure order commissions are properly incremented
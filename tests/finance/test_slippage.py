@@ -1345,3 +1345,99 @@ class FixedBasisPointsSlippageTestCase(WithCreateBarData,
             open_orders,
         ))
         self.assertEqual(0, len(orders_txns))
+
+
+class SimulateBatchTestCase(WithCreateBarData, ZiplineTestCase):
+
+    START_DATE = pd.Timestamp('2006-01-05', tz='utc')
+    END_DATE = pd.Timestamp('2006-01-05', tz='utc')
+
+    ASSET_FINDER_EQUITY_SIDS = (133, 134, 135)
+
+    first_minute = (
+        pd.Timestamp('2006-01-05 9:31', tz='US/Eastern').tz_convert('UTC')
+    )
+
+    @classmethod
+    def make_equity_minute_bar_data(cls):
+        # 135 doesn't trade in the first minute.
+        for sid, close, volume in [(133, 3.0, 200),
+                                   (134, 10.0, 1000),
+                                   (135, np.nan, 0)]:
+            yield sid, pd.DataFrame(
+                {
+                    'open': [close],
+                    'high': [close],
+                    'low': [close],
+                    'close': [close],
+                    'volume': [volume],
+                },
+                index=[cls.first_minute],
+            )
+
+    def make_open_orders(self):
+        amounts_and_limits = [
+            (133, [(100, None), (-15, None), (30, 2.5), (10, None)]),
+            (134, [(-30, 9.0), (-50, 10.5), (40, None), (-600, None)]),
+            (135, [(10, None)]),
+        ]
+        return [
+            (
+                self.asset_finder.retrieve_asset(sid),
+                [
+                    Order(
+                        dt=datetime.datetime(2006, 1, 5, 14, 30,
+                                             tzinfo=pytz.utc),
+                        amount=amount,
+                        filled=0,
+                        asset=self.asset_finder.retrieve_asset(sid),
+                        limit=limit,
+                    )
+                    for amount, limit in orders
+                ],
+            )
+            for sid, orders in amounts_and_limits
+        ]
+
+    @parameterized.expand([
+        ('fixed_bps', FixedBasisPointsSlippage(basis_points=5,
+                                               volume_limit=0.1)),
+        ('volume_share', VolumeShareSlippage(volume_limit=0.1)),
+        ('volume_share_unlimited', VolumeShareSlippage(volume_limit=1,
+                                                       price_impact=0.3)),
+    ])
+    def test_simulate_batch(self, name, slippage_model):
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.first_minute,
+        )
+
+        expected = [
+            (txn.amount, txn.price)
+            for asset, open_orders in self.make_open_orders()
+            for _, txn in slippage_model.simulate(
+                bar_data,
+                asset,
+                open_orders,
+            )
+        ]
+        result = [
+            (txn.amount, txn.price)
+            for _, txn in slippage_model.simulate_batch(
+                bar_data,
+                self.make_open_orders(),
+            )
+        ]
+
+        self.assertTrue(expected)
+        self.assertEqual(result, expected)
+
+    def test_simulate_batch_without_fill_orders(self):
+        class CloseSlippage(SlippageModel):
+            def process_order(self, data, order):
+                return data.current(order.asset, 'close'), order.amount
+
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.first_minute,
+        )
+        with self.assertRaises(NotImplementedError):
+            CloseSlippage().simulate_batch(bar_data, self.make_open_orders())
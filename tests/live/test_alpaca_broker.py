@@ -1,3 +1,4 @@
+from collections import namedtuple
 import unittest
 import pandas as pd
 
@@ -7,7 +8,7 @@ try:                                    # Python 3
 except ImportError:                     # Python 2
     from itertools import izip_longest as zip_longest
 
-from mock import patch
+from mock import MagicMock, call, patch
 import alpaca_trade_api.rest as apca
 
 from zipline.gens.brokers.alpaca_broker import ALPACABroker
@@ -18,8 +19,13 @@ from zipline.finance.execution import (StopLimitOrder,
                                        LimitOrder)
 from zipline.finance.order import ORDER_STATUS
 from zipline.testing.fixtures import (ZiplineTestCase,
+                                      WithAssetFinder,
                                       WithDataPortal)
 
+Bar = namedtuple('Bar', 't o h l c v')
+Position = namedtuple('Position', 'symbol qty avg_entry_price current_price')
+Trade = namedtuple('Trade', 'timestamp')
+
 
 @unittest.skip("Failing on CI - fix later")
 class TestALPACABroker(WithSimParams,
@@ -362,3 +368,200 @@ class TestALPACABroker(WithSimParams,
         assert broker.subscribe_to_market_data(None) is None
         assert broker.subscribed_assets() == []
         assert broker.time_skew == pd.Timedelta('0sec')
+
+
+class TestALPACABrokerQuoteCache(WithAssetFinder, ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = (1, 2, 3)
+    ASSET_FINDER_EQUITY_SYMBOLS = ("SPY", "XIV", "QQQ")
+
+    @staticmethod
+    def get_barset(symbols, timeframe, limit):
+        return {
+            symbol: [Bar(t='2017-06-17T10:31:00-0400',
+                         o=100.0 + i,
+                         h=102.0 + i,
+                         l=99.0 + i,
+                         c=101.0 + i,
+                         v=1000 + i)]
+            for i, symbol in enumerate(symbols)
+            if symbol != 'QQQ'
+        }
+
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_get_spot_value_batched(self, tradeapi):
+        api = tradeapi.REST()
+        api.get_barset.side_effect = self.get_barset
+        spy, xiv, qqq = self.asset_finder.retrieve_all(
+            self.ASSET_FINDER_EQUITY_SIDS,
+        )
+        broker = ALPACABroker()
+        broker.subscribe_to_market_data(xiv)
+
+        # one request for all the symbols
+        assert broker.get_spot_value(spy, 'price', None, 'minute') == 101.0
+        assert broker.get_spot_value(xiv, 'price', None, 'minute') == 102.0
+        assert api.get_barset.call_count == 1
+        assert api.get_barset.call_args[0][0] == ['SPY', 'XIV']
+
+        assert broker.get_spot_value(
+            [spy, xiv], 'volume', None, 'minute') == [1000, 1001]
+        assert broker.get_spot_value(spy, 'last_traded', None, 'minute') == \
+            pd.Timestamp('2017-06-17T10:31:00-0400')
+        assert api.get_barset.call_count == 1
+        assert (broker.quote_cache_hits, broker.quote_cache_misses) == (3, 1)
+
+        # a new symbol needs a new snapshot, missing bars are nan
+        assert pd.isnull(broker.get_spot_value(qqq, 'close', None, 'minute'))
+        assert api.get_barset.call_count == 2
+        assert api.get_barset.call_args[0][0] == ['QQQ', 'SPY', 'XIV']
+
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_quotes_expire(self, tradeapi):
+        api = tradeapi.REST()
+        api.get_barset.side_effect = self.get_barset
+        spy = self.asset_finder.retrieve_asset(1)
+        broker = ALPACABroker(quote_ttl=pd.Timedelta(0))
+
+        broker.get_spot_value(spy, 'open', None, 'minute')
+        broker.get_spot_value(spy, 'open', None, 'minute')
+        assert api.get_barset.call_count == 2
+        assert broker.quote_cache_misses == 2
+
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_failed_snapshot_is_retried(self, tradeapi):
+        api = tradeapi.REST()
+        api.get_barset.side_effect = Exception('timeout')
+        spy = self.asset_finder.retrieve_asset(1)
+        # the cli passes the broker uri positionally
+        broker = ALPACABroker('alpaca://')
+
+        assert pd.isnull(broker.get_spot_value(spy, 'close', None, 'minute'))
+        api.get_barset.side_effect = self.get_barset
+        assert broker.get_spot_value(spy, 'close', None, 'minute') == 101.0
+        assert api.get_barset.call_count == 2
+        assert broker.quote_cache_misses == 2
+
+    @patch('zipline.gens.brokers.alpaca_broker.symbol_lookup')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_sync_positions(self, tradeapi, symbol_lookup):
+        api = tradeapi.REST()
+        api.get_barset.side_effect = self.get_barset
+        api.get_last_trade.return_value = Trade(
+            pd.Timestamp('2017-06-17T10:30:00-0400'),
+        )
+        api.list_positions.return_value = [
+            Position('SPY', '10', '100.0', '101.0'),
+            Position('QQQ', '-5', '50.0', '49.0'),
+        ]
+        spy, xiv, qqq = self.asset_finder.retrieve_all(
+            self.ASSET_FINDER_EQUITY_SIDS,
+        )
+        symbol_lookup.side_effect = {
+            asset.symbol: asset for asset in (spy, xiv, qqq)
+        }.get
+
+        tracker = MagicMock()
+        tracker.positions = {xiv: None}
+        broker = ALPACABroker()
+        broker.set_metrics_tracker(tracker)
+        broker._get_positions_from_broker()
+
+        tracker.update_position.assert_has_calls([
+            call(spy,
+                 amount=10,
+                 last_sale_price=101.0,
+                 last_sale_date=pd.Timestamp('2017-06-17T10:31:00-0400'),
+                 cost_basis=100.0),
+            # no bar for QQQ, falls back to its last trade
+            call(qqq,
+                 amount=-5,
+                 last_sale_price=49.0,
+                 last_sale_date=pd.Timestamp('2017-06-17T10:30:00-0400'),
+                 cost_basis=50.0),
+            call(xiv, amount=0),
+        ])
+        assert api.get_barset.call_count == 1
+        api.get_last_trade.assert_called_once_with('QQQ')
+
+class TestALPACABrokerStreaming(WithAssetFinder, ZiplineTestCase):
+    ASSET_FINDER_EQUITY_SIDS = (1,)
+    ASSET_FINDER_EQUITY_SYMBOLS = ("SPY",)
+
+    @staticmethod
+    def seed_bars(end):
+        minutes = pd.date_range(end=end, periods=3, freq='min')
+        return minutes, pd.DataFrame(
+            [[1.0, 2.0, 0.5, 1.5, 100.0]] * 3,
+            index=minutes,
+            columns=pd.MultiIndex.from_product(
+                [['SPY'], ['open', 'high', 'low', 'close', 'volume']],
+            ),
+        )
+
+    @patch('zipline.gens.brokers.alpaca_broker.AlpacaBarStream')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_served_from_stream(self, tradeapi, stream):
+        minutes, seed = self.seed_bars(
+            pd.Timestamp('2020-06-01 09:32', tz='America/New_York'),
+        )
+        api = tradeapi.REST()
+        api.get_barset.return_value.df = seed
+        spy = self.asset_finder.retrieve_asset(1)
+        # the bars are historical, don't let them get stale
+        broker = ALPACABroker(stream_bars=True, bar_buffer_size=10,
+                              max_bar_age=pd.Timedelta(days=365 * 100))
+
+        # the first lookup seeds the buffer and subscribes to the stream
+        assert broker.get_spot_value(spy, 'close', None, 'minute') == 1.5
+        stream.return_value.subscribe.assert_called_once_with(['SPY'])
+
+        # streamed bars end up in the buffer
+        queue = stream.call_args[0][0]
+        queue.put(('SPY', minutes[-1] + pd.Timedelta('1 min'),
+                   1.5, 2.5, 1.0, 2.0, 200.0))
+        queue.join()
+        assert broker.get_spot_value(spy, 'price', None, 'minute') == 2.0
+        assert broker.get_last_traded_dt(spy) == \
+            minutes[-1] + pd.Timedelta('1 min')
+        bars = broker.get_realtime_bars([spy], '1m')
+        assert len(bars) == 4
+        assert bars['SPY', 'volume'].tolist() == [100.0] * 3 + [200.0]
+
+        assert api.get_barset.call_count == 1
+        stream.return_value.subscribe.assert_called_once_with(['SPY'])
+
+    @patch('zipline.gens.brokers.alpaca_broker.AlpacaBarStream')
+    @patch('zipline.gens.brokers.alpaca_broker.tradeapi')
+    def test_stale_stream_falls_back_to_rest(self, tradeapi, stream):
+        minutes, seed = self.seed_bars(
+            pd.Timestamp.utcnow().floor('min') - pd.Timedelta('10 min'),
+        )
+
+        def get_barset(symbols, timeframe, limit):
+            if limit == 1:
+                return {'SPY': [Bar(t=minutes[-1], o=1.0, h=2.0, l=0.5,
+                                    c=3.0, v=100)]}
+            return MagicMock(df=seed)
+
+        api = tradeapi.REST()
+        api.get_barset.side_effect = get_barset
+        spy = self.asset_finder.retrieve_asset(1)
+        broker = ALPACABroker(stream_bars=True, bar_buffer_size=10)
+
+        # the buffer is seeded, but its bars are too old to be served
+        assert broker.get_spot_value(spy, 'close', None, 'minute') == 3.0
+        assert [c[1]['limit'] for c in api.get_barset.call_args_list] == \
+            [10, 1]
+        # the stale symbols are subscribed again, once per max_bar_age
+        assert stream.return_value.subscribe.call_args_list == \
+            [call(['SPY'])] * 2
+        broker.get_spot_value(spy, 'close', None, 'minute')
+        assert stream.return_value.subscribe.call_count == 2
+
+        # a fresh streamed bar is served from the buffer again
+        queue = stream.call_args[0][0]
+        queue.put(('SPY', pd.Timestamp.utcnow().floor('min'),
+                   1.5, 2.5, 1.0, 2.0, 200.0))
+        queue.join()
+        assert broker.get_spot_value(spy, 'close', None, 'minute') == 2.0
+        assert api.get_barset.call_count == 2
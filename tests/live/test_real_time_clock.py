@@ -1,7 +1,5 @@
-import unittest
 from unittest import TestCase
 from datetime import time
-from collections import defaultdict
 
 import pandas as pd
 # fix to allow zip_longest on Python 2.X and 3.X
@@ -10,15 +8,42 @@ try:                                    # Python 3
 except ImportError:                     # Python 2
     from itertools import izip_longest as zip_longest
 
-from mock import patch
 from zipline.gens.realtimeclock import (RealtimeClock,
                                         SESSION_START,
                                         BEFORE_TRADING_START_BAR)
-from zipline.gens.sim_engine import MinuteSimulationClock
+from zipline.gens.sim_engine import BAR, SESSION_END, MinuteSimulationClock
 from zipline.utils.calendars import get_calendar
 from trading_calendars.utils.pandas_utils import days_at_time
 
 
+class FakeTimeSource(object):
+    """
+    Time source for RealtimeClock, sleeping advances the current time.
+    """
+
+    def __init__(self, now, on_sleep=None):
+        self.current = now
+        self.origin = now
+        self.on_sleep = on_sleep
+        self.sleeps = []
+
+    def now(self):
+        return self.current
+
+    def monotonic(self):
+        return (self.current - self.origin).total_seconds()
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.current += pd.Timedelta(seconds=seconds)
+        if self.on_sleep is not None:
+            self.on_sleep(self)
+        return False
+
+    def wake(self):
+        pass
+
+
 class TestRealtimeClock(TestCase):
     @classmethod
     def setUpClass(cls):
@@ -33,28 +58,23 @@ class TestRealtimeClock(TestCase):
         cls.opens = trading_o_and_c['market_open']
         cls.closes = trading_o_and_c['market_close']
 
-    def setUp(self):
-        self.internal_clock = None
-        self.events = defaultdict(list)
-
-    def advance_clock(self, x):
-        """Mock function for sleep. Advances the internal clock by 1 min"""
-        # The internal clock advance time must be 1 minute to match
-        # MinutesSimulationClock's update frequency
-        self.internal_clock += pd.Timedelta('1 min')
-
-    def get_clock(self, arg, *args, **kwargs):
-        """Mock function for pandas.to_datetime which is used to query the
-        current time in RealtimeClock"""
-        assert arg == "now"
-        return self.internal_clock
+    def make_clock(self, now, bts_time=time(8, 45), minute_emission=False,
+                   **kwargs):
+        time_source = FakeTimeSource(pd.Timestamp(now, tz='UTC'))
+        clock = RealtimeClock(
+            self.sessions,
+            self.opens,
+            self.closes,
+            days_at_time(self.sessions, bts_time, "US/Eastern"),
+            minute_emission,
+            time_source=time_source,
+            **kwargs
+        )
+        return clock, time_source
 
-    @unittest.skip("Failing on CI - Fix later")
     def test_crosscheck_realtimeclock_with_minutesimulationclock(self):
         """Tests that RealtimeClock behaves like MinuteSimulationClock"""
         for minute_emission in (False, True):
-            # MinuteSimulationClock also relies on to_datetime, shall not be
-            # created in the patch block
             msc = MinuteSimulationClock(
                 self.sessions,
                 self.opens,
@@ -64,54 +84,30 @@ class TestRealtimeClock(TestCase):
             )
             msc_events = list(msc)
 
-            with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
-                    patch('zipline.gens.realtimeclock.sleep') as sleep:
-                rtc = iter(RealtimeClock(
-                    self.sessions,
-                    self.opens,
-                    self.closes,
-                    days_at_time(self.sessions, time(8, 45), "US/Eastern"),
-                    minute_emission
-                ))
-                self.internal_clock = \
-                    pd.Timestamp("2017-04-20 00:00", tz='UTC')
-                to_dt.side_effect = self.get_clock
-                sleep.side_effect = self.advance_clock
-
-                rtc_events = list(rtc)
+            rtc, _ = self.make_clock("2017-04-20 00:00",
+                                     minute_emission=minute_emission)
+            rtc_events = list(rtc)
 
             for rtc_event, msc_event in zip_longest(rtc_events, msc_events):
                 self.assertEquals(rtc_event, msc_event)
 
             self.assertEquals(len(rtc_events), len(msc_events))
 
-    @unittest.skip("Failing on CI - Fix later")
     def test_time_skew(self):
         """Tests that RealtimeClock's time_skew parameter behaves as
         expected"""
         for time_skew in (pd.Timedelta("2 hour"), pd.Timedelta("-120 sec")):
-            with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
-                    patch('zipline.gens.realtimeclock.sleep') as sleep:
-                clock = RealtimeClock(
-                    self.sessions,
-                    self.opens,
-                    self.closes,
-                    days_at_time(self.sessions, time(11, 31), "US/Eastern"),
-                    False,
-                    time_skew
-                )
-                to_dt.side_effect = self.get_clock
-                sleep.side_effect = self.advance_clock
-                start_time = pd.Timestamp("2017-04-20 15:31", tz='UTC')
-                self.internal_clock = start_time
-
-                events = list(clock)
-
-                # Event 0 is SESSION_START which always happens at 00:00.
-                ts, event_type = events[1]
-                self.assertEquals(ts, start_time + time_skew)
-
-    @unittest.skip("Failing on CI - Fix later")
+            start_time = pd.Timestamp("2017-04-20 15:31", tz='UTC')
+            clock, _ = self.make_clock("2017-04-20 15:31",
+                                       bts_time=time(11, 31),
+                                       time_skew=time_skew)
+
+            events = list(clock)
+
+            # Event 0 is SESSION_START which always happens at 00:00.
+            ts, event_type = events[1]
+            self.assertEquals(ts, start_time + time_skew)
+
     def test_midday_start(self):
         """Tests that RealtimeClock is able to execute if started mid-day"""
         msc = MinuteSimulationClock(
@@ -123,21 +119,8 @@ class TestRealtimeClock(TestCase):
         )
         msc_events = list(msc)
 
-        with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
-                patch('zipline.gens.realtimeclock.sleep') as sleep:
-            rtc = RealtimeClock(
-                self.sessions,
-                self.opens,
-                self.closes,
-                days_at_time(self.sessions, time(8, 45), "US/Eastern"),
-                False
-            )
-
-            to_dt.side_effect = self.get_clock
-            sleep.side_effect = self.advance_clock
-            self.internal_clock = pd.Timestamp("2017-04-20 15:00", tz='UTC')
-
-            rtc_events = list(rtc)
+        rtc, _ = self.make_clock("2017-04-20 15:00")
+        rtc_events = list(rtc)
 
         # Count the mid-day position in the MinuteSimulationClock's events:
         # Simulation Tick: 2017-04-20 00:00:00+00:00 - 1 (SESSION_START)
@@ -154,32 +137,78 @@ class TestRealtimeClock(TestCase):
 
         self.assertEquals(rtc_events[2:], msc_events[msc_midday_position:])
 
-    @unittest.skip("Failing on CI - Fix later")
     def test_afterhours_start(self):
         """Tests that RealtimeClock returns immediately if started after RTH"""
-        with patch('zipline.gens.realtimeclock.pd.to_datetime') as to_dt, \
-                patch('zipline.gens.realtimeclock.sleep') as sleep:
-            rtc = RealtimeClock(
-                self.sessions,
-                self.opens,
-                self.closes,
-                days_at_time(self.sessions, time(8, 45), "US/Eastern"),
-                False
-            )
+        rtc, time_source = self.make_clock("2017-04-20 20:05")
+
+        events = list(rtc)
+        self.assertEquals(len(events), 2)
+        self.assertEquals(time_source.sleeps, [])
 
-            to_dt.side_effect = self.get_clock
-            sleep.side_effect = self.advance_clock
-            self.internal_clock = pd.Timestamp("2017-04-20 20:05", tz='UTC')
+        # SESSION_START & which always triggered.
+        _, event_type = events[0]
+        self.assertEquals(event_type, SESSION_START)
 
-            events = list(rtc)
-            self.assertEquals(len(events), 2)
+        event_time, event_type = events[1]
+        self.assertEquals(event_time,
+                          pd.Timestamp("2017-04-20 20:05", tz='UTC'))
+        self.assertEquals(event_type, BEFORE_TRADING_START_BAR)
+
+    def test_sleeps_until_the_next_bar(self):
+        """Tests that RealtimeClock sleeps once per bar, until the bar"""
+        rtc, time_source = self.make_clock("2017-04-20 19:57:30")
+        events = iter(rtc)
+
+        self.assertEquals(next(events)[1], SESSION_START)
+        self.assertEquals(next(events), (
+            pd.Timestamp("2017-04-20 19:57", tz='UTC'),
+            BEFORE_TRADING_START_BAR,
+        ))
+        self.assertEquals(next(events), (
+            pd.Timestamp("2017-04-20 19:57", tz='UTC'),
+            BAR,
+        ))
+        self.assertEquals(rtc.last_bar_delay, pd.Timedelta('30s'))
+
+        self.assertEquals(next(events), (
+            pd.Timestamp("2017-04-20 19:58", tz='UTC'),
+            BAR,
+        ))
+        self.assertEquals(time_source.sleeps, [30.0])
+        self.assertEquals(rtc.last_bar_delay, pd.Timedelta(0))
+
+        # the algorithm takes 150 seconds, the 19:59 bar is skipped
+        time_source.current += pd.Timedelta('150s')
+        self.assertEquals(next(events), (
+            pd.Timestamp("2017-04-20 20:00", tz='UTC'),
+            BAR,
+        ))
+        self.assertEquals(rtc.last_bar_delay, pd.Timedelta('30s'))
+        self.assertEquals(rtc.max_bar_delay, pd.Timedelta('30s'))
+        self.assertEquals(list(events), [
+            (pd.Timestamp("2017-04-20 20:00", tz='UTC'), SESSION_END),
+        ])
+
+    def test_stop_while_sleeping(self):
+        """Tests that RealtimeClock stops when asked to while sleeping"""
+        stop_at = pd.Timestamp("2017-04-20 10:00", tz='UTC')
+
+        def stop_execution(execution_id):
+            return time_source.current >= stop_at
+
+        rtc, time_source = self.make_clock(
+            "2017-04-20 00:00",
+            stop_execution_callback=stop_execution,
+            stop_poll_interval=pd.Timedelta('1 hour'),
+        )
+        events = list(rtc)
 
-            # SESSION_START & which always triggered.
-            _, event_type = events[0]
-            self.assertEquals(event_type, SESSION_START)
+        self.assertEquals([event for _, event in events], [SESSION_START])
+        self.assertEquals(time_source.sleeps, [3600.0] * 10)
 
-            event_time, event_type = events[1]
-            self.assertEquals(event_time,
-                              pd.Timestamp("2017-04-20 20:05", tz='UTC'))
-            self.assertEquals(event_type, BEFORE_TRADING_START_BAR)
+        rtc, time_source = self.make_clock("2017-04-20 00:00")
+        time_source.on_sleep = lambda _: rtc.shutdown()
+        events = list(rtc)
+        self.assertEquals([event for _, event in events], [SESSION_START])
+        self.assertEquals(len(time_source.sleeps), 1)
 
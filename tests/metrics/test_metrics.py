@@ -1,5 +1,6 @@
 import unittest
 
+import empyrical
 import numpy as np
 import pandas as pd
 
@@ -8,6 +9,12 @@ from zipline.assets import Equity, Future
 from zipline.assets.synthetic import make_commodity_future_info
 from zipline.data.data_portal import DataPortal
 from zipline.data.resample import MinuteResampleSessionBarReader
+from zipline.finance.metrics import (
+    AlphaBeta,
+    ReturnsStatistic,
+    RunningAlphaBeta,
+    RunningReturnsStatistics,
+)
 from zipline.testing import (
     parameter_space,
     prices_generating_returns,
@@ -2338,3 +2345,76 @@ class TestFixedReturns(WithMakeAlgo, WithWerror, ZiplineTestCase):
             check_names=False,
             check_dtype=False,
         )
+
+
+class RunningRiskMetricsTestCase(ZiplineTestCase):
+    sessions = pd.date_range('2014-01-02', periods=30, freq='B', tz='UTC')
+
+    def init_instance_fixtures(self):
+        super(RunningRiskMetricsTestCase, self).init_instance_fixtures()
+
+        rand = np.random.RandomState(0)
+        n = len(self.sessions)
+        self.returns = rand.normal(0.001, 0.02, (n, 4))
+        # no trading on the first sessions.
+        self.returns[:3] = 0.0
+        self.returns[10, -1] = np.nan
+        self.benchmark_returns = pd.Series(
+            rand.normal(0.0005, 0.01, n),
+            index=self.sessions,
+        )
+        self.benchmark_returns.iloc[12] = np.nan
+
+    def benchmark_source(self):
+        benchmark_returns = self.benchmark_returns
+
+        class BenchmarkSource(object):
+            def daily_returns(self, start, end):
+                return benchmark_returns[start:end]
+
+        return BenchmarkSource()
+
+    def test_matches_exact_metrics(self):
+        class Ledger(object):
+            daily_returns_array = np.full(len(self.sessions), np.nan)
+
+        ledger = Ledger()
+        running = [RunningReturnsStatistics(), RunningAlphaBeta()]
+        exact = [
+            ReturnsStatistic(empyrical.annual_volatility, 'algo_volatility'),
+            ReturnsStatistic(empyrical.sharpe_ratio, 'sharpe'),
+            ReturnsStatistic(empyrical.sortino_ratio, 'sortino'),
+            ReturnsStatistic(empyrical.max_drawdown),
+            AlphaBeta(),
+        ]
+        for metric in running + exact:
+            if hasattr(metric, 'start_of_simulation'):
+                metric.start_of_simulation(
+                    ledger,
+                    'minute',
+                    None,
+                    self.sessions,
+                    self.benchmark_source(),
+                )
+
+        for session_ix, session in enumerate(self.sessions):
+            # the returns of the session change at every bar, the last one is
+            # the end of session.
+            for bar_ix, todays_return in enumerate(self.returns[session_ix]):
+                ledger.daily_returns_array[session_ix] = todays_return
+
+                packets = []
+                for metrics in running, exact:
+                    packet = {'cumulative_risk_metrics': {}}
+                    for metric in metrics:
+                        if bar_ix == self.returns.shape[1] - 1:
+                            metric.end_of_session(
+                                packet, ledger, session, session_ix, None,
+                            )
+                        else:
+                            metric.end_of_bar(
+                                packet, ledger, session, session_ix, None,
+                            )
+                    packets.append(packet)
+
+                assert_equal(*packets, msg=str((session_ix, bar_ix)))
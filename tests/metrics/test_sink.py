@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from zipline.finance.metrics.sink import DailyPerfSink
+from zipline.testing.fixtures import WithInstanceTmpDir, ZiplineTestCase
+from zipline.testing.predicates import assert_equal
+
+
+class DailyPerfSinkTestCase(WithInstanceTmpDir, ZiplineTestCase):
+    sessions = pd.date_range('2014-01-02', periods=7, freq='B', tz='UTC')
+
+    def make_packets(self):
+        packets = []
+        for i, session in enumerate(self.sessions):
+            close = session + pd.Timedelta(hours=21)
+            positions = [
+                {
+                    'sid': sid,
+                    'amount': 100 * sid,
+                    'cost_basis': 10.0 + i,
+                    'last_sale_price': 11.0 + i,
+                }
+                for sid in range(i % 3)
+            ]
+            orders = [{'id': 'order_{}'.format(i), 'limit': None}]
+            if i >= 4:
+                # a key which only shows up later in the simulation.
+                orders[0]['reason'] = 'canceled'
+            recorded_vars = {'x': i} if i else {}
+            if i >= 2:
+                recorded_vars['label'] = 'session {}'.format(i)
+            packets.append({
+                'daily_perf': {
+                    'period_open': session,
+                    'period_close': close,
+                    'returns': 0.01 * i,
+                    'positions': positions,
+                    'orders': orders,
+                    'transactions': [],
+                    'recorded_vars': recorded_vars,
+                },
+                'cumulative_risk_metrics': {
+                    'sharpe': None if i < 2 else 0.5 * i,
+                    'alpha': None,
+                    'trading_days': i + 1,
+                },
+            })
+        return packets
+
+    def expected_daily_stats(self, packets):
+        rows = [DailyPerfSink.daily_row(packet) for packet in packets]
+        return pd.DataFrame(
+            rows,
+            index=pd.DatetimeIndex([row['period_close'] for row in rows]),
+        )
+
+    def test_matches_rows(self):
+        packets = self.make_packets()
+        # the scalar columns grow past the capacity.
+        sink = DailyPerfSink(capacity=2)
+        for packet in packets:
+            sink.append(packet)
+
+        result = sink.daily_stats()
+        assert_equal(len(sink), len(packets))
+        assert_equal(result, self.expected_daily_stats(packets))
+        assert_equal(result['sharpe'].dtype, np.dtype('float64'))
+
+    def test_spill(self):
+        packets = self.make_packets()
+        path = self.instance_tmpdir.getpath('perf.h5')
+        sink = DailyPerfSink(spill_path=path, spill_every=3)
+        try:
+            for packet in packets:
+                sink.append(packet)
+            # the records of the first sessions are only on disk.
+            columns, _ = sink._records['orders'].chunk()
+            assert_equal(columns['id'], ['order_6'])
+
+            assert_equal(
+                sink.daily_stats(),
+                self.expected_daily_stats(packets),
+            )
+        finally:
+            sink.close()
@@ -0,0 +1,224 @@
+"""
+Tests for the on disk cache of pipeline results.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from zipline.pipeline import CustomFactor, Pipeline
+from zipline.pipeline.cache import PipelineResultCache, pipeline_fingerprint
+from zipline.pipeline.data import USEquityPricing
+from zipline.pipeline.domain import US_EQUITIES
+from zipline.pipeline.factors import SimpleMovingAverage
+from zipline.testing.fixtures import (
+    WithAssetFinder,
+    WithInstanceTmpDir,
+    ZiplineTestCase,
+)
+from zipline.testing.predicates import assert_equal
+
+
+def make_pipeline(window_length=5):
+    sma = SimpleMovingAverage(
+        inputs=[USEquityPricing.close],
+        window_length=window_length,
+    )
+    return Pipeline(
+        {'sma': sma, 'up': USEquityPricing.close.latest > sma},
+        screen=USEquityPricing.volume.latest > 0,
+    )
+
+
+class PipelineFingerprintTestCase(ZiplineTestCase):
+
+    def test_equal_pipelines(self):
+        assert_equal(
+            pipeline_fingerprint(make_pipeline()),
+            pipeline_fingerprint(make_pipeline()),
+        )
+        self.assertNotEqual(
+            pipeline_fingerprint(make_pipeline()),
+            pipeline_fingerprint(make_pipeline(window_length=10)),
+        )
+
+    def test_compute_code(self):
+        def make_factor(offset):
+            class Offset(CustomFactor):
+                inputs = [USEquityPricing.close]
+                window_length = 1
+
+                if offset:
+                    def compute(self, today, assets, out, close):
+                        out[:] = close[-1] + 1
+                else:
+                    def compute(self, today, assets, out, close):
+                        out[:] = close[-1]
+
+            return Pipeline({'offset': Offset()})
+
+        assert_equal(
+            pipeline_fingerprint(make_factor(True)),
+            pipeline_fingerprint(make_factor(True)),
+        )
+        self.assertNotEqual(
+            pipeline_fingerprint(make_factor(True)),
+            pipeline_fingerprint(make_factor(False)),
+        )
+
+    def test_compute_dependencies(self):
+        def make_factor(scale, shift):
+            def offset(close):
+                return close + shift
+
+            class Scaled(CustomFactor):
+                inputs = [USEquityPricing.close]
+                window_length = 1
+                factor = scale
+
+                def compute(self, today, assets, out, close):
+                    out[:] = offset(close[-1]) * self.factor
+
+            return Pipeline({'scaled': Scaled()})
+
+        fingerprint = pipeline_fingerprint(make_factor(2, 1))
+        assert_equal(pipeline_fingerprint(make_factor(2, 1)), fingerprint)
+        # the class attributes, and the closures of compute
+        self.assertNotEqual(
+            pipeline_fingerprint(make_factor(3, 1)),
+            fingerprint,
+        )
+        self.assertNotEqual(
+            pipeline_fingerprint(make_factor(2, 2)),
+            fingerprint,
+        )
+
+
+class PipelineResultCacheTestCase(WithAssetFinder,
+                                  WithInstanceTmpDir,
+                                  ZiplineTestCase):
+    dates = pd.date_range('2020-06-01', periods=10, freq='B', tz='UTC')
+
+    def make_result(self, dates):
+        assets = np.array(self.asset_finder.retrieve_all(
+            self.ASSET_FINDER_EQUITY_SIDS,
+        ))
+        # the first asset doesn't pass the screen on the first date.
+        mask = np.ones((len(dates), len(assets)), dtype=bool)
+        mask[0, 0] = False
+        date_codes, asset_codes = np.nonzero(mask)
+        index = pd.MultiIndex(
+            levels=[dates, assets],
+            codes=[date_codes, asset_codes],
+        )
+        n = len(index)
+        return pd.DataFrame(
+            {
+                'sma': np.arange(n, dtype=float),
+                'up': np.arange(n) % 2 == 0,
+                'sector': pd.Categorical(
+                    np.where(np.arange(n) % 3 == 0, 'a', 'b'),
+                ),
+            },
+            index=index,
+            columns=['sma', 'up', 'sector'],
+        )
+
+    def make_cache(self, data_version='v1', **kwargs):
+        return PipelineResultCache(
+            self.instance_tmpdir.getpath('pipeline'),
+            data_version,
+            **kwargs
+        )
+
+    def test_round_trip(self):
+        cache = self.make_cache()
+        pipeline = make_pipeline()
+        result = self.make_result(self.dates)
+        cache.set(pipeline, US_EQUITIES, self.dates[0], self.dates[-1], result)
+
+        assert_equal(
+            cache.get(
+                pipeline,
+                US_EQUITIES,
+                self.dates[0],
+                self.dates[-1],
+                self.asset_finder,
+            ),
+            result,
+        )
+
+        # any range covered by a stored result is read from it.
+        start, end = self.dates[3], self.dates[5]
+        assert_equal(
+            cache.get(pipeline, US_EQUITIES, start, end, self.asset_finder),
+            result.loc[start:end],
+        )
+        assert_equal(cache.hits, 2)
+
+        with self.assertRaises(KeyError):
+            cache.get(
+                pipeline,
+                US_EQUITIES,
+                self.dates[5],
+                self.dates[-1] + pd.Timedelta(days=1),
+                self.asset_finder,
+            )
+        with self.assertRaises(KeyError):
+            cache.get(
+                make_pipeline(window_length=10),
+                US_EQUITIES,
+                start,
+                end,
+                self.asset_finder,
+            )
+        with self.assertRaises(KeyError):
+            self.make_cache('v2').get(
+                pipeline, US_EQUITIES, start, end, self.asset_finder,
+            )
+
+    def test_sub_range_ending_without_rows(self):
+        cache = self.make_cache()
+        pipeline = make_pipeline()
+        # the date level of a concatenation of chunk results doesn't have the
+        # sessions without rows.
+        result = self.make_result(self.dates.delete(5))
+        cache.set(pipeline, US_EQUITIES, self.dates[0], self.dates[-1], result)
+
+        start, end = self.dates[2], self.dates[5]
+        assert_equal(
+            cache.get(pipeline, US_EQUITIES, start, end, self.asset_finder),
+            result.loc[start:end],
+        )
+
+    def test_evict_least_recently_used(self):
+        cache = self.make_cache()
+        pipeline = make_pipeline()
+        chunks = [self.dates[:5], self.dates[5:]]
+        for dates in chunks:
+            cache.set(
+                pipeline,
+                US_EQUITIES,
+                dates[0],
+                dates[-1],
+                self.make_result(dates),
+            )
+        for path, _, _ in cache._entries():
+            os.utime(os.path.join(path, 'meta.json'), (1, 1))
+        # reading the first chunk makes the second one the least recently
+        # used.
+        cache.get(
+            pipeline,
+            US_EQUITIES,
+            self.dates[0],
+            self.dates[4],
+            self.asset_finder,
+        )
+
+        cache.max_size = cache.size - 1
+        cache.evict()
+
+        assert_equal(
+            [(start, end) for _, start, end in cache._entries()],
+            [(self.dates[0], self.dates[4])],
+        )
@@ -3,9 +3,12 @@ Tests for SimplePipelineEngine
 """
 from __future__ import division
 from collections import OrderedDict
+from functools import partial
 from itertools import product
+from multiprocessing import get_all_start_methods
 from operator import add, sub
 from unittest import skipIf
+import warnings
 
 from parameterized import parameterized
 import numpy as np
@@ -38,8 +41,13 @@ from pandas.compat.chainmap import ChainMap
 from pandas.testing import assert_frame_equal
 from six import iteritems, itervalues
 from toolz import merge
+from trading_calendars import get_calendar
 
-from zipline.assets.synthetic import make_rotating_equity_info
+from zipline.assets.synthetic import (
+    make_rotating_equity_info,
+    make_simple_equity_info,
+)
+from zipline.data.bundles import ingest, register, unregister
 from zipline.errors import NoFurtherDataError
 from zipline.lib.adjustment import MULTIPLY
 from zipline.lib.labelarray import LabelArray
@@ -54,7 +62,10 @@ from zipline.pipeline.domain import (
     JP_EQUITIES,
     US_EQUITIES,
 )
-from zipline.pipeline.engine import SimplePipelineEngine
+from zipline.pipeline.engine import (
+    BundlePipelineEngine,
+    SimplePipelineEngine,
+)
 from zipline.pipeline.factors import (
     AverageDollarVolume,
     EWMA,
@@ -65,6 +76,7 @@ from zipline.pipeline.factors import (
     SimpleMovingAverage,
 )
 from zipline.pipeline.filters import CustomFilter
+from zipline.pipeline.hooks.testing import TestingHooks
 from zipline.pipeline.loaders.equity_pricing_loader import (
     EquityPricingLoader,
 )
@@ -85,11 +97,13 @@ from zipline.testing import (
     OpenPrice,
     parameter_space,
     product_upper_triangle,
+    str_to_seconds,
 )
 import zipline.testing.fixtures as zf
 from zipline.utils.exploding_object import NamedExplodingObject
 from zipline.testing.core import create_simple_domain
 from zipline.testing.predicates import assert_equal
+from zipline.utils.date_utils import compute_date_range_chunks
 from zipline.utils.memoize import lazyval
 from zipline.utils.numpy_utils import bool_dtype, datetime64ns_dtype
 from zipline.utils.pandas_utils import new_pandas, skip_pipeline_new_pandas
@@ -1544,6 +1558,53 @@ class ChunkedPipelineTestCase(zf.WithSeededRandomPipelineEngine,
         )
         self.assertTrue(chunked_result.equals(pipeline_result))
 
+    @skipIf('fork' not in get_all_start_methods(), 'requires fork')
+    def test_run_chunked_pipeline_in_processes(self):
+        pipe = Pipeline(
+            columns={
+                'float': TestingDataSet.float_col.latest,
+                'custom_factor': SimpleMovingAverage(
+                    inputs=[TestingDataSet.float_col],
+                    window_length=10,
+                ),
+            },
+            domain=US_EQUITIES,
+        )
+        hooks = TestingHooks()
+
+        # the in memory data of the seeded random loader is safe to share
+        # between the processes.
+        with self.assertWarnsRegex(RuntimeWarning, 'does not override'):
+            chunked_result = self.seeded_random_engine.run_chunked_pipeline(
+                pipe,
+                self.PIPELINE_START_DATE,
+                self.END_DATE,
+                chunksize=22,
+                hooks=[hooks],
+                workers=3,
+            )
+        pipeline_result = self.run_pipeline(
+            pipe,
+            start_date=self.PIPELINE_START_DATE,
+            end_date=self.END_DATE,
+        )
+        self.assertTrue(chunked_result.equals(pipeline_result))
+
+        # The chunks are reported in date order.
+        chunks = [
+            call.args[1:] for call in hooks.trace
+            if call.method_name == 'computing_chunk' and call.state == 'enter'
+        ]
+        assert_equal(
+            chunks,
+            list(compute_date_range_chunks(
+                US_EQUITIES.all_sessions(),
+                self.PIPELINE_START_DATE,
+                self.END_DATE,
+                22,
+            )),
+        )
+
     def test_concatenate_empty_chunks(self):
         # Test that we correctly handle concatenating chunked pipelines when
         # some of the chunks are empty. This is slightly tricky b/c pandas
@@ -1583,6 +1644,212 @@ class ChunkedPipelineTestCase(zf.WithSeededRandomPipelineEngine,
         )
 
 
+class ConcurrentPipelineTestCase(zf.WithSeededRandomPipelineEngine,
+                                 zf.ZiplineTestCase):
+
+    PIPELINE_START_DATE = Timestamp('2006-01-05', tz='UTC')
+    END_DATE = Timestamp('2006-03-31', tz='UTC')
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    def make_pipeline(self):
+        float_col = TestingDataSet.float_col
+        sma = SimpleMovingAverage(inputs=[float_col], window_length=10)
+        pipe = Pipeline(
+            columns={
+                'float': float_col.latest,
+                'sma': sma,
+                'ewma': EWMA.from_span(
+                    inputs=[float_col], window_length=10, span=5,
+                ),
+                'spread': (float_col.latest - sma) / sma,
+                'above_sma': float_col.latest > sma,
+                'bool': TestingDataSet.bool_col.latest,
+            },
+            screen=TestingDataSet.bool_col.latest,
+            domain=US_EQUITIES,
+        )
+        if not new_pandas:
+            # Categoricals only work on old pandas.
+            pipe.add(TestingDataSet.categorical_col.latest, 'categorical')
+        return pipe
+
+    @parameter_space(workers=[2, 4])
+    def test_matches_serial_execution(self, workers):
+        engine = SimplePipelineEngine(
+            get_loader=lambda column: self.seeded_random_loader,
+            asset_finder=self.asset_finder,
+            workers=workers,
+        )
+        pipe = self.make_pipeline()
+        hooks = TestingHooks()
+
+        result = engine.run_pipeline(
+            pipe,
+            self.PIPELINE_START_DATE,
+            self.END_DATE,
+            hooks=[hooks],
+        )
+        assert_frame_equal(
+            result,
+            self.run_pipeline(pipe, self.PIPELINE_START_DATE, self.END_DATE),
+        )
+
+        # Every term is loaded or computed once, each hook context is exited
+        # after it is entered.
+        computing_chunk = hooks.trace[1]
+        calls = hooks.trace[2:-2]
+        entered = [c.call for c in calls if c.state == 'enter']
+        exited = [c.call for c in calls if c.state == 'exit']
+        self.assertEqual(len(entered), len(calls) // 2)
+        self.assertEqual(sorted(entered, key=repr), sorted(exited, key=repr))
+        for call in entered:
+            self.assertLess(calls.index(('enter', call)),
+                            calls.index(('exit', call)))
+
+        expected_terms = set(computing_chunk.args[0])
+        computed_terms = set()
+        for call in entered:
+            if call.method_name == 'loading_terms':
+                computed_terms.update(call.args[0])
+            else:
+                computed_terms.add(call.args[0])
+        self.assertEqual(computed_terms, expected_terms)
+
+
+class ConcurrentEquityPricingTestCase(zf.WithUSEquityPricingPipelineEngine,
+                                      zf.ZiplineTestCase):
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    @classmethod
+    def make_splits_data(cls):
+        return DataFrame.from_records([
+            {
+                'effective_date': str_to_seconds('2006-12-20'),
+                'ratio': 0.5,
+                'sid': cls.ASSET_FINDER_EQUITY_SIDS[0],
+            },
+        ])
+
+    def test_matches_serial_execution(self):
+        # the different window lengths put the columns in different loader
+        # groups, which read the bars and the adjustments db concurrently
+        # from the worker threads.
+        pipe = Pipeline({
+            'close': USEquityPricing.close.latest,
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close],
+                window_length=10,
+            ),
+            'volume': SimpleMovingAverage(
+                inputs=[USEquityPricing.volume],
+                window_length=5,
+            ),
+            'adv': AverageDollarVolume(window_length=20),
+            'drawdown': MaxDrawdown(
+                inputs=[USEquityPricing.open],
+                window_length=15,
+            ),
+        })
+        engine = SimplePipelineEngine(
+            get_loader=self.pipeline_engine._get_loader,
+            asset_finder=self.asset_finder,
+            default_domain=US_EQUITIES,
+            workers=4,
+        )
+        start, end = self.trading_days[[-20, -1]]
+
+        assert_frame_equal(
+            engine.run_pipeline(pipe, start, end),
+            self.pipeline_engine.run_pipeline(pipe, start, end),
+        )
+
+
+@skipIf('fork' not in get_all_start_methods(), 'requires fork')
+class BundlePipelineEngineTestCase(zf.WithTmpDir, zf.ZiplineTestCase):
+    START_DATE = Timestamp('2014-01-02', tz='utc')
+    END_DATE = Timestamp('2014-02-28', tz='utc')
+    BUNDLE = 'test-pipeline-engine'
+
+    @classmethod
+    def init_class_fixtures(cls):
+        super(BundlePipelineEngineTestCase, cls).init_class_fixtures()
+        cls.environ = {'ZIPLINE_ROOT': cls.tmpdir.path}
+        sessions = get_calendar('XNYS').sessions_in_range(
+            cls.START_DATE,
+            cls.END_DATE,
+        )
+        equities = make_simple_equity_info(
+            (0, 1, 2),
+            cls.START_DATE,
+            cls.END_DATE,
+            exchange='NYSE',
+        )
+
+        @register(
+            cls.BUNDLE,
+            calendar_name='NYSE',
+            start_session=cls.START_DATE,
+            end_session=cls.END_DATE,
+        )
+        def bundle_ingest(environ,
+                          asset_db_writer,
+                          minute_bar_writer,
+                          daily_bar_writer,
+                          adjustment_writer,
+                          *args):
+            asset_db_writer.write(
+                equities=equities,
+                exchanges=DataFrame({
+                    'exchange': ['NYSE'],
+                    'country_code': ['US'],
+                }),
+            )
+            daily_bar_writer.write(make_bar_data(equities, sessions))
+            adjustment_writer.write(splits=DataFrame.from_records([
+                {
+                    'effective_date': str_to_seconds('2014-02-03'),
+                    'ratio': 0.5,
+                    'sid': 0,
+                },
+            ]))
+
+        cls.add_class_callback(partial(unregister, cls.BUNDLE))
+        ingest(cls.BUNDLE, cls.environ)
+
+    def test_run_chunked_pipeline_in_processes(self):
+        engine = BundlePipelineEngine(self.BUNDLE, environ=self.environ)
+        pipe = Pipeline({
+            'close': USEquityPricing.close.latest,
+            'sma': SimpleMovingAverage(
+                inputs=[USEquityPricing.close],
+                window_length=5,
+            ),
+        })
+        start = Timestamp('2014-01-13', tz='utc')
+
+        # every process reopens the bundle, there is nothing to warn about.
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            chunked_result = engine.run_chunked_pipeline(
+                pipe,
+                start,
+                self.END_DATE,
+                chunksize=10,
+                workers=2,
+            )
+        assert_equal(
+            [w for w in caught if issubclass(w.category, RuntimeWarning)],
+            [],
+        )
+        assert_frame_equal(
+            chunked_result,
+            engine.run_pipeline(pipe, start, self.END_DATE),
+        )
+        self.assertEqual(len(chunked_result), 3 * len(
+            get_calendar('XNYS').sessions_in_range(start, self.END_DATE),
+        ))
+
+
 class MaximumRegressionTest(zf.WithSeededRandomPipelineEngine,
                             zf.ZiplineTestCase):
     ASSET_FINDER_EQUITY_SIDS = (1, 2, 3, 4, 5, 6, 7, 8, 9, 10)
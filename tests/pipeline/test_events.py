@@ -287,6 +287,55 @@ class EventIndexerTestCase(ZiplineTestCase):
                 # Neither event is eligible.  Return -1 as a sentinel.
                 self.assertEqual(computed_index, -1)
 
+    def test_loader_indexers_for_subsets(self):
+        loader = EventsLoader(self.events, {}, {})
+
+        all_dates = pd.date_range('2014', '2014-01-31', tz='UTC')
+        all_sids = np.unique(loader.events[SID_FIELD_NAME])
+        domain = EquitySessionDomain(
+            all_dates,
+            'US',
+            time(8, 45, tzinfo=pytz.timezone('US/Eastern')),
+        )
+        data_query_cutoff = domain.data_query_cutoff_for_sessions(all_dates)
+
+        # The indices are positions in the events of the loader, which only
+        # looks at the events of the requested sids and dates.
+        expected_next = next_event_indexer(
+            all_dates,
+            data_query_cutoff,
+            all_sids,
+            loader.events[EVENT_DATE_FIELD_NAME],
+            loader.events[TS_FIELD_NAME],
+            loader.events[SID_FIELD_NAME],
+        )
+        expected_previous = previous_event_indexer(
+            data_query_cutoff,
+            all_sids,
+            loader.events[EVENT_DATE_FIELD_NAME],
+            loader.events[TS_FIELD_NAME],
+            loader.events[SID_FIELD_NAME],
+        )
+
+        for rows in slice(None), slice(5, 6), slice(10, 20), slice(25, None):
+            for cols in slice(None), slice(0, 1), slice(2, 4), [0, 3, 5]:
+                sids = all_sids[cols]
+                assert_equal(
+                    loader.next_event_indexer(
+                        all_dates[rows],
+                        data_query_cutoff[rows],
+                        sids,
+                    ),
+                    expected_next[rows][:, cols],
+                )
+                assert_equal(
+                    loader.previous_event_indexer(
+                        data_query_cutoff[rows],
+                        sids,
+                    ),
+                    expected_previous[rows][:, cols],
+                )
+
 
 class EventsLoaderEmptyTestCase(WithAssetFinder,
                                 WithTradingSessions,
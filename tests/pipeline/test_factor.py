@@ -25,29 +25,44 @@ from numpy import (
 )
 from numpy.random import randn, seed
 import pandas as pd
+from scipy.stats import rankdata
 from scipy.stats.mstats import winsorize as scipy_winsorize
 
 from zipline.errors import BadPercentileBounds, UnknownRankMethod
 from zipline.lib.labelarray import LabelArray
-from zipline.lib.rank import masked_rankdata_2d
-from zipline.lib.normalize import naive_grouped_rowwise_apply as grouped_apply
+from zipline.lib.rank import masked_rankdata_2d, rankdata_1d_descending
+from zipline.lib.normalize import (
+    naive_grouped_rowwise_apply as grouped_apply,
+    segmented_grouped_rowwise_apply,
+)
 from zipline.pipeline import Classifier, Factor, Filter, Pipeline
 from zipline.pipeline.data import DataSet, Column, EquityPricing
 from zipline.pipeline.factors import (
+    AnnualizedVolatility,
+    AverageDollarVolume,
     CustomFactor,
     DailyReturns,
+    EWMA,
+    EWMSTD,
     Returns,
     PercentChange,
+    SimpleMovingAverage,
+    VWAP,
 )
 from zipline.pipeline.factors.factor import (
+    _GROUPED_ROW_TRANSFORMS_2D,
+    demean as zp_demean,
     summary_funcs,
     winsorize as zp_winsorize,
+    zscore as zp_zscore,
 )
+from zipline.pipeline.filters import StaticSids
 from zipline.testing import (
     check_allclose,
     check_arrays,
     parameter_space,
     permute_rows,
+    str_to_seconds,
 )
 from zipline.testing.fixtures import (
     WithUSEquityPricingPipelineEngine,
@@ -1542,6 +1557,59 @@ class TestSpecialCases(WithUSEquityPricingPipelineEngine,
         })
 
 
+class ComputeAllTestCase(WithUSEquityPricingPipelineEngine,
+                         ZiplineTestCase):
+    ASSET_FINDER_COUNTRY_CODE = 'US'
+
+    @classmethod
+    def make_splits_data(cls):
+        return pd.DataFrame.from_records([
+            {
+                'effective_date': str_to_seconds('2006-12-20'),
+                'ratio': 0.5,
+                'sid': cls.ASSET_FINDER_EQUITY_SIDS[0],
+            },
+        ])
+
+    @parameterized.expand([
+        ('sma', SimpleMovingAverage, {'inputs': [EquityPricing.close]}),
+        ('returns', Returns, {}),
+        ('daily_returns', DailyReturns, {}),
+        ('vwap', VWAP, {}),
+        ('adv', AverageDollarVolume, {}),
+        ('volatility', AnnualizedVolatility, {}),
+        ('ewma', EWMA, {'inputs': [EquityPricing.close], 'decay_rate': 0.5}),
+        ('ewmstd', EWMSTD, {'inputs': [EquityPricing.close],
+                            'decay_rate': 0.5}),
+    ])
+    def test_compute_all_matches_compute(self, name, factor_type, kwargs):
+        # a subclass overriding compute doesn't use the inherited
+        # compute_all.
+        by_date_type = type(
+            factor_type.__name__ + 'ByDate',
+            (factor_type,),
+            {'compute': factor_type.compute},
+        )
+        kwargs = dict(kwargs)
+        if factor_type is not DailyReturns:
+            kwargs['window_length'] = 10
+        kwargs['mask'] = ~StaticSids([self.ASSET_FINDER_EQUITY_SIDS[-1]])
+
+        factor = factor_type(**kwargs)
+        by_date = by_date_type(**kwargs)
+        self.assertTrue(factor._uses_compute_all())
+        self.assertFalse(by_date._uses_compute_all())
+
+        start, end = self.trading_days[[-10, -1]]
+        results = self.pipeline_engine.run_pipeline(
+            Pipeline({'all': factor, 'by_date': by_date}),
+            start,
+            end,
+        )
+        assert results['all'].notnull().any()
+        assert_equal(results['all'], results['by_date'], check_names=False)
+
+
 class SummaryTestCase(BaseUSEquityPipelineTestCase, ZiplineTestCase):
 
     @parameter_space(
@@ -1767,3 +1835,47 @@ class SummaryTestCase(BaseUSEquityPipelineTestCase, ZiplineTestCase):
                 summarized.recursive_repr(),
                 "MyFactor().{}()".format(method),
             )
+
+
+class GroupedRowTransform2DTestCase(ZiplineTestCase):
+
+    @parameter_space(
+        seed=[1, 2, 3],
+        transform_and_args=[
+            (zp_demean, ()),
+            (zp_zscore, ()),
+            (zp_winsorize, (0.1, 0.9)),
+            (zp_winsorize, (0.0, 0.75)),
+            (zp_winsorize, (0.25, 1.0)),
+        ] + [
+            (rank, (method,))
+            for rank in (rankdata, rankdata_1d_descending)
+            for method in ('ordinal', 'min', 'max', 'dense', 'average')
+        ],
+        __fail_fast=True,
+    )
+    def test_matches_naive_grouped_rowwise_apply(self,
+                                                 seed,
+                                                 transform_and_args):
+        transform, args = transform_and_args
+        rand = np.random.RandomState(seed)
+        shape = (10, 30)
+
+        # Include ties, and nans for the normalizations.
+        data = rand.randn(*shape)
+        data[:, ::7] = 1.0
+        if transform not in (rankdata, rankdata_1d_descending):
+            data[rand.uniform(size=shape) < 0.2] = nan
+
+        # Include labels which only show up in some rows.
+        labels = rand.randint(-1, 4, shape).astype(int64_dtype)
+        labels[::3] *= 1000
+
+        expected = grouped_apply(data, labels, transform, args)
+        result = segmented_grouped_rowwise_apply(
+            data,
+            labels,
+            _GROUPED_ROW_TRANSFORMS_2D[transform],
+            args,
+        )
+        assert_equal(result, expected)
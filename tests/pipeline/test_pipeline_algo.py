@@ -61,6 +61,7 @@ from zipline.testing.fixtures import (
     WithBcolzEquityDailyBarReaderFromCSVs,
     ZiplineTestCase,
 )
+from zipline.testing.predicates import assert_equal
 from zipline.utils.pandas_utils import normalize_date
 
 TEST_RESOURCE_PATH = join(
@@ -364,6 +365,48 @@ class ClosesAndVolumes(WithMakeAlgo, ZiplineTestCase):
         # Run for a week in the middle of our data.
         algo.run()
 
+    @parameterized.expand([('day', 1, 0.0),
+                           ('week', 5, 0.5),
+                           ('week_end_of_chunk', 5, 1.0)])
+    def test_prefetch_matches_serial(self, test_name, chunks, prefetch):
+        """
+        Assert that prefetching the next chunk in the background returns the
+        same pipeline outputs as computing each chunk when it is needed.
+        """
+        def run(pipeline_prefetch):
+            outputs = []
+
+            def initialize(context):
+                p = attach_pipeline(Pipeline(), 'test', chunks=chunks)
+                p.add(USEquityPricing.close.latest, 'close')
+
+            def before_trading_start(context, data):
+                outputs.append(pipeline_output('test'))
+
+            algo = self.make_algo(
+                initialize=initialize,
+                before_trading_start=before_trading_start,
+                pipeline_prefetch=pipeline_prefetch,
+            )
+            algo.run()
+            return algo, outputs
+
+        _, expected = run(None)
+        algo, outputs = run(prefetch)
+
+        assert_equal(len(outputs), len(expected))
+        for result, expected_result in zip(outputs, expected):
+            assert_equal(result, expected_result)
+        # the chunks after the first one were prefetched, and nothing is left
+        # running once the simulation is done.
+        self.assertGreater(algo._pipeline_prefetch_hits, 0)
+        assert_equal(algo._pipeline_prefetches, {})
+        self.assertIsNone(algo._pipeline_prefetch_executor)
+
+    def test_invalid_prefetch(self):
+        with self.assertRaises(ValueError):
+            self.make_algo(pipeline_prefetch=1.5)
+
     def test_multiple_pipelines(self):
         """
         Test that we can attach multiple pipelines and access the correct
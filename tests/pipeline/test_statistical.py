@@ -1,6 +1,8 @@
 """
 Tests for statistical pipeline terms.
 """
+from functools import partial
+
 import numpy as np
 from numpy import (
     arange,
@@ -36,7 +38,9 @@ from zipline.pipeline.factors import (
 )
 from zipline.pipeline.factors.statistical import (
     vectorized_beta,
+    vectorized_linregress,
     vectorized_pearson_r,
+    vectorized_spearman_r,
 )
 from zipline.pipeline.loaders.frame import DataFrameLoader
 from zipline.pipeline.sentinels import NotSpecified
@@ -1143,3 +1147,111 @@ class VectorizedCorrelationTestCase(zf.ZiplineTestCase):
         # array with the column tiled 3 times.
         do_check(_independent)
         do_check(np.tile(_independent, 3))
+
+    @parameter_space(seed=[1, 2, 42], __fail_fast=True)
+    def test_spearman_matches_scipy(self, seed):
+        rand = np.random.RandomState(seed)
+        # Draw from a few values so that there are ties to rank.
+        dependents = rand.randint(0, 5, (20, 6)).astype(float)
+        independents = rand.randint(0, 5, (20, 6)).astype(float)
+        dependents[3, 0] = nan
+        independents[7, 1] = nan
+
+        result = vectorized_spearman_r(dependents, independents)
+        expected = np.array([
+            spearmanr(dependents[:, i], independents[:, i])[0]
+            for i in range(6)
+        ])
+        self.assertTrue(np.isnan(result[:2]).all())
+        np.testing.assert_allclose(result[2:], expected[2:])
+
+    def test_stacked_windows(self):
+        rand = np.random.RandomState(0)
+        dependents = rand.randn(3, 10, 4)
+        independents = rand.randn(3, 10, 1)
+
+        pearson_r = partial(vectorized_pearson_r, allowed_missing=0)
+        for func in pearson_r, vectorized_spearman_r:
+            stacked = func(dependents, independents, out=np.empty((3, 4)))
+            for i in range(3):
+                np.testing.assert_allclose(
+                    stacked[i],
+                    func(dependents[i], independents[i], out=np.empty(4)),
+                )
+
+
+class VectorizedLinregressTestCase(zf.ZiplineTestCase):
+
+    @parameter_space(
+        seed=[1, 2, 42],
+        regression_length=[2, 3, 10],
+        __fail_fast=True,
+    )
+    def test_matches_linregress(self, seed, regression_length):
+        rand = np.random.RandomState(seed)
+        independent = rand.randn(regression_length, 1)
+        dependents = (
+            rand.uniform(-2, 2, 4) * independent +
+            rand.randn(regression_length, 4)
+        )
+        # A missing observation gives nans.
+        dependents[-1, 3] = nan
+
+        results = vectorized_linregress(dependents, independent)
+        for i in range(3):
+            expected = linregress(x=independent[:, 0], y=dependents[:, i])
+            np.testing.assert_allclose(
+                [result[i] for result in results],
+                [
+                    expected.intercept,
+                    expected.slope,
+                    expected.rvalue,
+                    expected.pvalue,
+                    expected.stderr,
+                ],
+                atol=1e-12,
+            )
+        for result in results[:3]:
+            self.assertTrue(np.isnan(result[3]))
+
+    @parameter_space(regression_length=[2, 3, 10])
+    def test_constant_dependent(self, regression_length):
+        rand = np.random.RandomState(0)
+        independent = rand.randn(regression_length, 1)
+        dependents = np.column_stack([
+            np.full(regression_length, 3.0),
+            rand.randn(regression_length),
+        ])
+
+        results = vectorized_linregress(dependents, independent)
+        expected = linregress(x=independent[:, 0], y=dependents[:, 0])
+        # a constant column has no correlation, not an undefined one.
+        np.testing.assert_allclose(
+            [result[0] for result in results],
+            [3.0, 0.0, 0.0, 1.0, 0.0],
+            atol=1e-12,
+        )
+        np.testing.assert_allclose(
+            [result[0] for result in results],
+            [
+                expected.intercept,
+                expected.slope,
+                expected.rvalue,
+                expected.pvalue,
+                expected.stderr,
+            ],
+            atol=1e-12,
+        )
+
+    def test_stacked_windows(self):
+        rand = np.random.RandomState(0)
+        dependents = rand.randn(3, 10, 4)
+        independents = rand.randn(3, 10, 1)
+
+        stacked = vectorized_linregress(dependents, independents)
+        for i in range(3):
+            for stacked_result, result in zip(
+                stacked,
+                vectorized_linregress(dependents[i], independents[i]),
+            ):
+                np.testing.assert_allclose(stacked_result[i], result)
@@ -2451,6 +2451,45 @@ class TestWrite(WithInstanceTmpDir, ZiplineTestCase):
             expected_exchange = 'EXCHANGE-%d-%d' % (eq.sid, len(dates) - 1)
             assert_equal(eq.exchange, expected_exchange)
 
+    def test_write_again(self):
+        # an incremental ingest writes the assets of the previous ingest
+        # again with a later end date, along with new assets.
+        start = pd.Timestamp('2014-01-02', tz='UTC')
+
+        def equities(sids, end):
+            return pd.DataFrame({
+                'sid': sids,
+                'symbol': ['S%d' % sid for sid in sids],
+                'start_date': start,
+                'end_date': end,
+                'exchange': 'NYSE',
+            })
+
+        self.writer.write(
+            equities=equities([0, 1], pd.Timestamp('2014-01-10', tz='UTC')),
+        )
+        # writing the same mappings doesn't store them again.
+        self.writer.write(
+            equities=equities([0, 1], pd.Timestamp('2014-01-10', tz='UTC')),
+        )
+        end = pd.Timestamp('2014-02-10', tz='UTC')
+        self.writer.write(equities=equities([0, 1, 2], end))
+
+        mappings = pd.read_sql(
+            'SELECT sid, symbol, end_date FROM equity_symbol_mappings '
+            'ORDER BY id',
+            sa.create_engine('sqlite:///' + self.assets_db_path),
+        )
+        assert_equal(mappings['sid'].tolist(), [0, 1, 2])
+        assert_equal(mappings['symbol'].tolist(), ['S0', 'S1', 'S2'])
+        assert_equal(mappings['end_date'].tolist(), [end.value] * 3)
+
+        finder = self.new_asset_finder()
+        assert_equal(
+            finder.lookup_symbol('S2', end),
+            finder.retrieve_asset(2),
+        )
+
     def test_write_direct(self):
         # don't include anything with a default to test that those work.
         equities = pd.DataFrame({
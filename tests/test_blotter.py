@@ -30,8 +30,10 @@ from zipline.finance.order import ORDER_STATUS, Order
 from zipline.finance.slippage import (
     DEFAULT_EQUITY_VOLUME_SLIPPAGE_BAR_LIMIT,
     FixedSlippage,
+    SlippageModel,
     VolumeShareSlippage,
 )
+from zipline.finance.transaction import create_transaction
 from zipline.gens.sim_engine import BAR, SESSION_END
 from zipline.testing.fixtures import (
     WithCreateBarData,
@@ -410,3 +412,37 @@ class BlotterTestCase(WithCreateBarData,
             bar_data.current(future_txn.asset, 'price') + 1.0,
         )
         self.assertEqual(commissions[1]['cost'], 2.0)
+
+    def test_custom_slippage_fills_an_order_more_than_once(self):
+        class LotSlippage(SlippageModel):
+            """Fills orders in lots of 10 shares, up to twice a bar.
+            """
+            def process_order(self, data, order):
+                raise AssertionError('process_order should not be called')
+
+            def simulate(self, data, asset, orders_for_asset):
+                price = data.current(asset, 'close')
+                for order in orders_for_asset:
+                    for _ in range(2):
+                        amount = min(order.open_amount, 10)
+                        if amount:
+                            yield order, create_transaction(
+                                order,
+                                data.current_dt,
+                                price,
+                                amount,
+                            )
+
+        blotter = SimulationBlotter(equity_slippage=LotSlippage())
+        blotter.order(self.asset_24, 15, MarketOrder())
+        order = blotter.open_orders[self.asset_24][0]
+
+        bar_data = self.create_bardata(
+            simulation_dt_func=lambda: self.sim_params.sessions[-1],
+        )
+        txns, _, closed_orders = blotter.get_transactions(bar_data)
+
+        # the second fill sees the first one in ``order.filled``.
+        self.assertEqual([txn.amount for txn in txns], [10, 5])
+        self.assertEqual(order.filled, 15)
+        self.assertEqual(closed_orders, [order])
@@ -398,6 +398,57 @@ class DataPortalTestBase(WithDataPortal,
         ]
         assert_almost_equal(expected.values.tolist(), result)
 
+    def test_get_spot_prices(self):
+        assets = array(self.asset_finder.retrieve_all(
+            self.ASSET_FINDER_EQUITY_SIDS + (10000,),
+        ))
+        trading_calendar = self.trading_calendars[Equity]
+
+        def check(dt, data_frequency):
+            assert_almost_equal(
+                self.data_portal.get_spot_prices(assets, dt, data_frequency),
+                [
+                    self.data_portal.get_spot_value(
+                        asset, 'price', dt, data_frequency,
+                    )
+                    for asset in assets
+                ],
+            )
+
+        for session in self.trading_days[:4]:
+            dts = trading_calendar.minutes_for_session(session)
+            # asset 1 doesn't trade on every minute, its price is forward
+            # filled.
+            for dt in (dts[0], dts[1], dts[4], dts[100], dts[-1]):
+                check(dt, 'minute')
+            check(session, 'daily')
+
+    def test_get_spot_prices_extra_source(self):
+        # the prices of fetch_csv identifiers come from the fetched data.
+        equity = self.asset_finder.retrieve_asset(
+            self.ASSET_FINDER_EQUITY_SIDS[0],
+        )
+        session = self.trading_days[2]
+        sources = self.data_portal._augmented_sources_map
+        sources['price'] = {
+            'palladium': pd.DataFrame({'price': [5.5]}, index=[session]),
+        }
+        self.add_instance_callback(sources.clear)
+
+        assert_almost_equal(
+            self.data_portal.get_spot_prices(
+                array([equity, 'palladium'], dtype=object),
+                session,
+                'daily',
+            ),
+            [
+                self.data_portal.get_spot_value(
+                    equity, 'price', session, 'daily',
+                ),
+                5.5,
+            ],
+        )
+
     @parameter_space(data_frequency=['daily', 'minute'],
                      field=['close', 'price'])
     def test_get_adjustments(self, data_frequency, field):
@@ -11,7 +11,7 @@ from six import text_type
 import zipline
 from zipline.data import bundles as bundles_module
 from trading_calendars import get_calendar
-from zipline.utils.compat import wraps
+from zipline.utils.compat import getargspec, wraps
 from zipline.utils.cli import Date, Timestamp
 from zipline.utils.run_algo import _run, BenchmarkSpec, load_extensions
 from zipline.extensions import create_args
@@ -260,6 +260,12 @@ DEFAULT_BUNDLE = 'quantopian-quandl'
     show_default=True,
     help='Connection to broker',
 )
+@click.option(
+    '--stream-bars',
+    is_flag=True,
+    help='Stream the minute bars of the live assets from the broker instead '
+         'of polling them'
+)
 @click.option(
     '--state-file',
     default=None,
@@ -272,6 +278,32 @@ DEFAULT_BUNDLE = 'quantopian-quandl'
     metavar='DIRNAME',
     help='Directory where the realtime collected minutely bars are saved'
 )
+@click.option(
+    '--pipeline-cache-dir',
+    default=None,
+    metavar='DIRNAME',
+    help='Directory where pipeline results are cached between runs'
+)
+@click.option(
+    '--pipeline-cache-size',
+    default=2048,
+    show_default=True,
+    help='The size of the pipeline cache in MiB'
+)
+@click.option(
+    '--pipeline-prefetch',
+    type=float,
+    default=None,
+    help='Start computing the next chunk of a pipeline in the background '
+         'once this fraction of the current chunk is consumed'
+)
+@click.option(
+    '--perf-spill-path',
+    default=None,
+    metavar='FILENAME',
+    help='HDF5 file where the positions, orders and transactions of the '
+         'daily performance are written instead of being held in memory'
+)
 @click.option(
     '--list-brokers',
     is_flag=True,
@@ -300,8 +332,13 @@ def run(ctx,
         blotter,
         broker,
         broker_uri,
+        stream_bars,
         state_file,
         realtime_bar_target,
+        pipeline_cache_dir,
+        pipeline_cache_size,
+        pipeline_prefetch,
+        perf_spill_path,
         list_brokers):
     """Run a backtest for the given algorithm.
     """
@@ -350,7 +387,12 @@ def run(ctx,
         except AttributeError:
             ctx.fail("unsupported broker: can't import class %s from %s" %
                      (cl_name, mod_name))
-        brokerobj = bclass(broker_uri)
+        broker_kwargs = {}
+        if stream_bars:
+            if 'stream_bars' not in getargspec(bclass.__init__).args:
+                ctx.fail("broker %s can't stream bars" % broker)
+            broker_kwargs['stream_bars'] = True
+        brokerobj = bclass(broker_uri, **broker_kwargs)
     if end is None:
             end = pd.Timestamp.utcnow() + pd.Timedelta(days=1, seconds=1)  # Add 1-second to assure that end is > 1day
 
@@ -397,7 +439,11 @@ def run(ctx,
         realtime_bar_target=realtime_bar_target,
         performance_callback=None,
         stop_execution_callback=None,
-        execution_id=None
+        execution_id=None,
+        pipeline_cache_dir=pipeline_cache_dir,
+        pipeline_cache_size=pipeline_cache_size * 1024 ** 2,
+        pipeline_prefetch=pipeline_prefetch,
+        perf_spill_path=perf_spill_path,
     )
 
 
@@ -454,7 +500,13 @@ def zipline_magic(line, cell=None):
     default=True,
     help='Print progress information to the terminal.'
 )
-def ingest(bundle, assets_version, show_progress):
+@click.option(
+    '--incremental/--no-incremental',
+    default=False,
+    help='Only fetch the data missing since the last ingestion, and add it'
+    ' to that ingestion instead of creating a new one.',
+)
+def ingest(bundle, assets_version, show_progress, incremental):
     """Ingest the data for the given bundle.
     """
     bundles_module.ingest(
@@ -463,6 +515,7 @@ def ingest(bundle, assets_version, show_progress):
         pd.Timestamp.utcnow(),
         assets_version,
         show_progress,
+        incremental=incremental,
     )
 
 
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from collections import Iterable, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from copy import copy
 import warnings
 from datetime import tzinfo, time, timedelta
@@ -82,6 +83,7 @@ from zipline.finance.asset_restrictions import (
 from zipline.assets import Asset, Equity, Future
 from zipline.gens.tradesimulation import AlgorithmSimulator
 from zipline.finance.metrics import MetricsTracker, load as load_metrics_set
+from zipline.finance.metrics.sink import DailyPerfSink
 from zipline.pipeline import Pipeline
 import zipline.pipeline.domain as domain
 from zipline.pipeline.engine import (
@@ -208,6 +210,17 @@ class TradingAlgorithm(object):
         equities_metadata, but will be traded by this TradingAlgorithm.
     get_pipeline_loader : callable[BoundColumn -> PipelineLoader], optional
         The function that maps pipeline columns to their loaders.
+    pipeline_result_cache : PipelineResultCache, optional
+        On disk cache of pipeline results shared between runs. By default
+        pipeline results are only cached for the duration of the run.
+    pipeline_prefetch : float, optional
+        The fraction of the sessions of a pipeline chunk after which the next
+        chunk starts being computed on a background thread, between 0 and 1.
+        By default chunks are computed when they are first needed.
+    perf_spill_path : str, optional
+        The path of an HDF5 file where the positions, orders and transactions
+        of the daily perf packets are written during the simulation instead
+        of being held in memory.
     create_event_context : callable[BarData -> context manager], optional
         A function used to create a context mananger that wraps the
         execution of all events that are scheduled for a bar.
@@ -251,6 +264,9 @@ class TradingAlgorithm(object):
                  create_event_context=None,
                  performance_callback=None,
                  stop_execution_callback=None,
+                 pipeline_result_cache=None,
+                 pipeline_prefetch=None,
+                 perf_spill_path=None,
                  **initialize_kwargs):
         # List of trading controls to be used to validate orders.
         self.trading_controls = []
@@ -326,6 +342,24 @@ class TradingAlgorithm(object):
         self._pipeline_cache = ExpiringCache(
             cleanup=clear_dataframe_indexer_caches
         )
+        self._pipeline_result_cache = pipeline_result_cache
+
+        if pipeline_prefetch is not None and not 0 <= pipeline_prefetch <= 1:
+            raise ValueError(
+                "pipeline_prefetch must be between 0 and 1, got {}".format(
+                    pipeline_prefetch,
+                )
+            )
+        self._pipeline_prefetch = pipeline_prefetch
+        # The (start, end) sessions of the cached chunk of each pipeline, and
+        # the (start, end, future) of the chunk computed after it.
+        self._pipeline_chunk_bounds = {}
+        self._pipeline_prefetches = {}
+        self._pipeline_prefetch_executor = None
+        # The number of chunks served from a prefetch.
+        self._pipeline_prefetch_hits = 0
+
+        self._perf_spill_path = perf_spill_path
 
         if blotter is not None:
             self.blotter = blotter
@@ -663,20 +697,28 @@ class TradingAlgorithm(object):
                 "Have data portal without asset_finder."
 
         # Create zipline and loop through simulated_trading.
-        # Each iteration returns a perf dictionary
+        # Each iteration returns a perf dictionary, the daily ones are stored
+        # in columns as they come.
+        sink = DailyPerfSink(
+            capacity=len(self.sim_params.sessions),
+            spill_path=self._perf_spill_path,
+        )
         try:
-            perfs = []
             for perf in self.get_generator():
-                perfs.append(perf)
                 if self._performance_callback:
                     # this is called daily
                     self._performance_callback(perf)
+                if perf and 'daily_perf' in perf:
+                    sink.append(perf)
+                else:
+                    self.risk_report = perf
 
-            # convert perf dict to pandas dataframe
-            daily_stats = self._create_daily_stats(perfs)
+            daily_stats = sink.daily_stats()
 
             self.analyze(daily_stats)
         finally:
+            sink.close()
+            self._stop_pipeline_prefetch()
             self.data_portal = None
             self.metrics_tracker = None
 
@@ -684,26 +726,16 @@ class TradingAlgorithm(object):
 
     def _create_daily_stats(self, perfs):
         # create daily and cumulative stats dataframe
-        daily_perfs = []
-        # TODO: the loop here could overwrite expected properties
-        # of daily_perf. Could potentially raise or log a
-        # warning.
+        # TODO: the recorded variables and cumulative risk metrics could
+        # overwrite expected properties of daily_perf. Could potentially raise
+        # or log a warning.
+        sink = DailyPerfSink(capacity=len(perfs))
         for perf in perfs:
             if perf and 'daily_perf' in perf:
-
-                perf['daily_perf'].update(
-                    perf['daily_perf'].pop('recorded_vars')
-                )
-                perf['daily_perf'].update(perf['cumulative_risk_metrics'])
-                daily_perfs.append(perf['daily_perf'])
+                sink.append(perf)
             else:
                 self.risk_report = perf
-
-        daily_dts = pd.DatetimeIndex(
-            [p['period_close'] for p in daily_perfs]
-        )
-        daily_stats = pd.DataFrame(daily_perfs, index=daily_dts)
-        return daily_stats
+        return sink.daily_stats()
 
     def calculate_capital_changes(self, dt, emission_rate, is_interday,
                                   portfolio_value_adjustment=0.0):
@@ -2362,11 +2394,14 @@ class TradingAlgorithm(object):
             data = self._pipeline_cache.get(name, today)
         except KeyError:
             # Calculate the next block.
-            data, valid_until = self.run_pipeline(
-                pipeline, today, next(chunks),
+            data, valid_until = self._next_pipeline_chunk(
+                pipeline, chunks, name, today,
             )
             self._pipeline_cache.set(name, data, valid_until)
 
+        if self._pipeline_prefetch is not None:
+            self._prefetch_pipeline_chunk(pipeline, chunks, name, today)
+
         # Now that we have a cached result, try to return the data for today.
         try:
             return data.loc[today]
@@ -2375,23 +2410,77 @@ class TradingAlgorithm(object):
             # day.
             return pd.DataFrame(index=[], columns=data.columns)
 
-    def run_pipeline(self, pipeline, start_session, chunksize):
+    def _next_pipeline_chunk(self, pipeline, chunks, name, start_session):
         """
-        Compute `pipeline`, providing values for at least `start_date`.
+        Compute the chunk of ``pipeline`` starting at ``start_session``, or
+        wait for the prefetched chunk if it covers ``start_session``.
+        """
+        prefetch = self._pipeline_prefetches.pop(name, None)
+        if prefetch is not None:
+            start, end, future = prefetch
+            if start <= start_session <= end:
+                self._pipeline_chunk_bounds[name] = (start, end)
+                self._pipeline_prefetch_hits += 1
+                return future.result()
+            # The sessions of the prefetched chunk were skipped.
+            future.cancel()
 
-        Produces a DataFrame containing data for days between `start_date` and
-        `end_date`, where `end_date` is defined by:
+        data, end = self.run_pipeline(pipeline, start_session, next(chunks))
+        self._pipeline_chunk_bounds[name] = (start_session, end)
+        return data, end
 
-            `end_date = min(start_date + chunksize trading days,
-                            simulation_end)`
+    def _prefetch_pipeline_chunk(self, pipeline, chunks, name, today):
+        """
+        Start computing the chunk of ``pipeline`` after the cached one on a
+        background thread, once ``self._pipeline_prefetch`` of the cached
+        chunk has been consumed.
 
-        Returns
-        -------
-        (data, valid_until) : tuple (pd.DataFrame, pd.Timestamp)
+        At most one chunk is prefetched per pipeline, so that no more than
+        two chunks of results are held at once.
+        """
+        if name in self._pipeline_prefetches:
+            return
 
-        See Also
-        --------
-        PipelineEngine.run_pipeline
+        sessions = self.trading_calendar.all_sessions
+        start, end = self._pipeline_chunk_bounds[name]
+        start_loc = sessions.get_loc(start)
+        end_loc = sessions.get_loc(end)
+        if end_loc >= sessions.get_loc(self.sim_params.end_session):
+            return
+        consumed = sessions.get_loc(today) - start_loc
+        if consumed < self._pipeline_prefetch * (end_loc - start_loc):
+            return
+
+        if self._pipeline_prefetch_executor is None:
+            self._pipeline_prefetch_executor = ThreadPoolExecutor(1)
+
+        next_start = sessions[end_loc + 1]
+        chunksize = next(chunks)
+        future = self._pipeline_prefetch_executor.submit(
+            self.run_pipeline, pipeline, next_start, chunksize,
+        )
+        self._pipeline_prefetches[name] = (
+            next_start,
+            self._pipeline_chunk_end(next_start, chunksize),
+            future,
+        )
+
+    def _stop_pipeline_prefetch(self):
+        """
+        Cancel the prefetches which weren't used, and shut the prefetch thread
+        down without waiting for a chunk being computed.
+        """
+        for _, _, future in self._pipeline_prefetches.values():
+            future.cancel()
+        self._pipeline_prefetches.clear()
+        if self._pipeline_prefetch_executor is not None:
+            self._pipeline_prefetch_executor.shutdown(wait=False)
+            self._pipeline_prefetch_executor = None
+
+    def _pipeline_chunk_end(self, start_session, chunksize):
+        """
+        The last session of the pipeline chunk of ``chunksize`` sessions
+        starting at ``start_session``.
         """
         sessions = self.trading_calendar.all_sessions
 
@@ -2407,11 +2496,51 @@ class TradingAlgorithm(object):
             sessions.get_loc(sim_end_session)
         )
 
-        end_session = sessions[end_loc]
+        return sessions[end_loc]
+
+    def run_pipeline(self, pipeline, start_session, chunksize):
+        """
+        Compute `pipeline`, providing values for at least `start_date`.
+
+        Produces a DataFrame containing data for days between `start_date` and
+        `end_date`, where `end_date` is defined by:
+
+            `end_date = min(start_date + chunksize trading days,
+                            simulation_end)`
 
-        return \
-            self.engine.run_pipeline(pipeline, start_session, end_session), \
-            end_session
+        Returns
+        -------
+        (data, valid_until) : tuple (pd.DataFrame, pd.Timestamp)
+
+        See Also
+        --------
+        PipelineEngine.run_pipeline
+        """
+        end_session = self._pipeline_chunk_end(start_session, chunksize)
+
+        cache = self._pipeline_result_cache
+        if cache is None or isinstance(self.engine, ExplodingPipelineEngine):
+            data = self.engine.run_pipeline(
+                pipeline, start_session, end_session,
+            )
+            return data, end_session
+
+        # Reuse the results of a previous run over the same data.
+        domain = self.engine.resolve_domain(pipeline)
+        try:
+            data = cache.get(
+                pipeline,
+                domain,
+                start_session,
+                end_session,
+                self.asset_finder,
+            )
+        except KeyError:
+            data = self.engine.run_pipeline(
+                pipeline, start_session, end_session,
+            )
+            cache.set(pipeline, domain, start_session, end_session, data)
+        return data, end_session
 
     @staticmethod
     def default_pipeline_domain(calendar):
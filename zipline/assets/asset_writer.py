@@ -867,12 +867,7 @@ class AssetDBWriter(object):
         # otherwise we'll fail because of non-matched constraints
         if asset_type == 'equity':
             # write the symbol mapping data.
-            self._write_df_to_table(
-                equity_symbol_mappings,
-                mapping_data,
-                txn,
-                chunk_size,
-            )
+            self._write_symbol_mappings(mapping_data, txn, chunk_size)
 
         router_df = pd.DataFrame({
             asset_router.c.sid.name: assets.index.values,
@@ -881,6 +876,62 @@ class AssetDBWriter(object):
 
         self._write_df_to_table(asset_router, router_df, txn, chunk_size)
 
+    def _write_symbol_mappings(self, mappings, txn, chunk_size):
+        """
+        Write the symbol mappings of equities into a db which may already
+        hold mappings, e.g. when a bundle is ingested incrementally.
+
+        Mappings which are already stored are skipped, and stored mappings
+        whose end date changed are updated, so writing the same assets again
+        doesn't add another copy of their mappings.
+        """
+        stored = pd.read_sql(
+            sa.select([equity_symbol_mappings]),
+            txn,
+        )
+        if stored.empty:
+            self._write_df_to_table(
+                equity_symbol_mappings,
+                mappings,
+                txn,
+                chunk_size,
+            )
+            return
+
+        new = mappings.copy()
+        for column in 'start_date', 'end_date':
+            new[column] = np.asarray(_dt_to_epoch_ns(new[column]))
+
+        key = ['sid', 'start_date'] + sorted(symbol_columns)
+        new = new.merge(
+            stored[key + ['id', 'end_date']],
+            how='left',
+            on=key,
+            suffixes=('', '_stored'),
+        )
+        is_stored = new['id'].notnull()
+
+        changed = new[is_stored & (new['end_date'] != new['end_date_stored'])]
+        for id_, end_date in zip(changed['id'], changed['end_date']):
+            txn.execute(
+                equity_symbol_mappings.update().where(
+                    equity_symbol_mappings.c.id == int(id_),
+                ).values(end_date=int(end_date)),
+            )
+
+        added = new.loc[~is_stored, ['sid'] + sorted(mapping_columns)]
+        if len(added):
+            added.index = pd.RangeIndex(
+                stored['id'].max() + 1,
+                stored['id'].max() + 1 + len(added),
+            )
+            self._write_df_to_table(
+                equity_symbol_mappings,
+                added,
+                txn,
+                chunk_size,
+            )
+
     def _all_tables_present(self, txn):
         """
         Checks if any tables are present in the current assets database.
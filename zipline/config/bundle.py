@@ -48,6 +48,35 @@ class AlpacaConfig:
         else:
             return os.environ.get('ZT_CUSTOM_ASSET_LIST')
 
+    @property
+    def max_requests_per_minute(self):
+        """
+        max api calls the bundle ingestion may do per minute, shared by all
+        fetching threads. alpaca allows 200 per minute.
+        you could define it in the config file or override it with env variable
+        :return:
+        """
+        val = 200
+        if os.environ.get('ZT_MAX_REQUESTS_PER_MINUTE'):
+            val = int(os.environ.get('ZT_MAX_REQUESTS_PER_MINUTE'))
+        elif CONFIG_PATH and self.al.get('max_requests_per_minute'):
+            val = int(self.al.get('max_requests_per_minute'))
+        return val
+
+    @property
+    def fetch_workers(self):
+        """
+        amount of threads used to fetch data during bundle ingestion.
+        you could define it in the config file or override it with env variable
+        :return:
+        """
+        val = 4
+        if os.environ.get('ZT_FETCH_WORKERS'):
+            val = int(os.environ.get('ZT_FETCH_WORKERS'))
+        elif CONFIG_PATH and self.al.get('fetch_workers'):
+            val = int(self.al.get('fetch_workers'))
+        return val
+
 
 
 class AlphaVantage:
@@ -1,6 +1,7 @@
 from collections import namedtuple
 from errno import ENOENT
 from os import remove
+from threading import Lock
 
 import sqlalchemy as sa
 from sqlalchemy.engine.reflection import Inspector
@@ -144,6 +145,8 @@ class SQLiteAdjustmentReader(object):
     @preprocess(conn=coerce_string_to_conn(require_exists=True))
     def __init__(self, conn):
         self.conn = conn
+        # pipeline terms are loaded concurrently from several threads
+        self._lock = Lock()
         self._dividend_cache = {}
         self._stock_dividend_cache = {}
 
@@ -188,15 +191,16 @@ class SQLiteAdjustmentReader(object):
             A dictionary containing price and/or volume adjustment mappings
             from index to adjustment objects to apply at that index.
         """
-        return load_adjustments_from_sqlite(
-            self.conn,
-            dates,
-            assets,
-            should_include_splits,
-            should_include_mergers,
-            should_include_dividends,
-            adjustment_type,
-        )
+        with self._lock:
+            return load_adjustments_from_sqlite(
+                self.conn,
+                dates,
+                assets,
+                should_include_splits,
+                should_include_mergers,
+                should_include_dividends,
+                adjustment_type,
+            )
 
     def load_pricing_adjustments(self, columns, dates, assets):
         if 'volume' not in set(columns):
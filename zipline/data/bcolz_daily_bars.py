@@ -24,6 +24,7 @@ from numpy import (
     nan,
 )
 from pandas import (
+    DataFrame,
     DatetimeIndex,
     NaT,
     read_csv,
@@ -709,6 +710,50 @@ class BcolzDailyBarReader(CurrencyAwareSessionBarReader):
         else:
             return price
 
+    def get_stored_session_bounds(self, sids=None):
+        """
+        Parameters
+        ----------
+        sids : iterable[int], optional
+            The asset identifiers. By default all the sids with stored data.
+
+        Returns
+        -------
+        bounds : pd.DataFrame
+            Frame indexed by sid with the ``first_session`` and
+            ``last_session`` of the data stored for each sid. Both are NaT for
+            sids with no stored data.
+        """
+        sessions = self.sessions
+        first_rows = self._first_rows
+        last_rows = self._last_rows
+        calendar_offsets = self._calendar_offsets
+
+        sids = list(sids) if sids is not None else sorted(calendar_offsets)
+        first = np.full(len(sids), iNaT, dtype='int64')
+        last = np.full(len(sids), iNaT, dtype='int64')
+        for i, sid in enumerate(sids):
+            try:
+                offset = calendar_offsets[sid]
+            except KeyError:
+                continue
+            if last_rows[sid] < first_rows[sid]:
+                # written without any bars
+                continue
+            first[i] = sessions[offset].value
+            last[i] = sessions[
+                offset + last_rows[sid] - first_rows[sid]
+            ].value
+
+        return DataFrame(
+            {
+                'first_session': DatetimeIndex(first, tz='UTC'),
+                'last_session': DatetimeIndex(last, tz='UTC'),
+            },
+            index=sids,
+            columns=['first_session', 'last_session'],
+        )
+
     def currency_codes(self, sids):
         # XXX: This is pretty inefficient. This reader doesn't really support
         # country codes, so we always either return USD or None if we don't
@@ -10,6 +10,7 @@ from .core import (
     clean,
     from_bundle_ingest_dirname,
     ingest,
+    ingestion_version,
     ingestions_for_bundle,
     load,
     register,
@@ -24,6 +25,7 @@ __all__ = [
     'clean',
     'from_bundle_ingest_dirname',
     'ingest',
+    'ingestion_version',
     'ingestions_for_bundle',
     'load',
     'register',
@@ -1,18 +1,26 @@
 import collections
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import os
 import alpaca_trade_api as tradeapi
-from datetime import timedelta, time as dtime
+from datetime import timedelta
 import numpy as np
 from pathlib import Path
 import pandas as pd
 import pytz
 from alpaca_trade_api.common import URL
-from dateutil import tz
-from trading_calendars import TradingCalendar
+from ratelimit import limits, sleep_and_retry
+from trading_calendars import TradingCalendar, get_calendar
 
 import zipline.config
 from zipline.data.bundles import core as bundles
-from zipline.data.bundles.common import asset_to_sid_map
+from zipline.data.bundles.common import (
+    asset_to_sid_map,
+    existing_start_date,
+    missing_tail_start_sessions,
+)
 from zipline.data.bundles.universe import Universe, all_alpaca_assets, get_sp500, get_sp100, get_nasdaq100
+from zipline.utils.cache import dataframe_cache
 from dateutil.parser import parse as date_parse
 
 user_home = str(Path.home())
@@ -67,11 +75,29 @@ def iso_date(date_str):
     return date_parse(date_str).date().isoformat()
 
 
+class RateLimitedClient(object):
+    """
+    Wraps an alpaca REST client so that all threads sharing it stay within a
+    budget of ``requests_per_minute`` calls to ``get_barset``. Calls over the
+    budget sleep until the current window resets.
+    """
+
+    def __init__(self, client, requests_per_minute):
+        self._client = client
+        self.get_barset = sleep_and_retry(
+            limits(calls=requests_per_minute, period=60)(client.get_barset)
+        )
+
+    def __getattr__(self, item):
+        return getattr(self._client, item)
+
+
 def get_aggs_from_alpaca(symbols,
                          start,
                          end,
                          granularity,
-                         compression=1):
+                         compression=1,
+                         client=None):
     """
     https://alpaca.markets/docs/api-documentation/api-v2/market-data/bars/
     Alpaca API as a limit of 1000 records per api call. meaning, we need to
@@ -93,7 +119,11 @@ def get_aggs_from_alpaca(symbols,
       it is not a documented API. barset on the other hand does
       but we need to manipulate it to be able to work with it
       smoothly and return data the same way polygon does
+
+    client is the REST client to use, by default the module level CLIENT.
     """
+    if client is None:
+        client = CLIENT
 
     def _iterate_api_calls():
         """
@@ -105,7 +135,9 @@ def get_aggs_from_alpaca(symbols,
         """
         got_all = False
         curr = end
-        response: pd.DataFrame = pd.DataFrame([])
+        # pages are collected and concatenated once at the end, growing the
+        # frame page by page is quadratic in the number of pages.
+        pages = []
         while not got_all:
             if granularity == 'minute' and compression == 5:
                 timeframe = "5Min"
@@ -113,59 +145,31 @@ def get_aggs_from_alpaca(symbols,
                 timeframe = "15Min"
             else:
                 timeframe = granularity
-            r = CLIENT.get_barset(symbols,
+            r = client.get_barset(symbols,
                                   timeframe,
                                   limit=1000,
                                   end=curr.isoformat()
                                   )
             if r:
-                response = r.df if response.empty else pd.concat([r.df, response])
-                response.sort_index(inplace=True)
-                if response.index[0] <= (pytz.timezone(NY).localize(
+                page = r.df
+                pages.append(page)
+                earliest = page.index.min()
+                if earliest <= (pytz.timezone(NY).localize(
                         start) if not start.tzname() else start):
                     got_all = True
                 else:
                     delta = timedelta(days=1) if granularity == "day" \
                         else timedelta(minutes=1)
-                    curr = response.index[0] - delta
+                    curr = earliest - delta
             else:
                 # no more data is available, let's return what we have
                 break
+        if not pages:
+            return pd.DataFrame([])
+        response = pd.concat(pages[::-1])
+        response.sort_index(inplace=True)
         return response
 
-    def _fillna(df, granularity, start, end):
-        if granularity != 'day':
-            return df
-        if df.empty:
-            return df
-        calendar: TradingCalendar = trading_calendars.get_calendar("NYSE")
-        last_val = df.iloc[0]
-        current = start
-        while current <= end:
-            if calendar.is_session(current):
-                if current.replace(tzinfo=tz.gettz(NY)) in df.index:
-                    last_val = df.loc[current.replace(tzinfo=tz.gettz(NY))]
-                else:
-                    # df.loc[pytz.timezone(NY).localize(current)] = last_val
-                    df.loc[current.replace(tzinfo=tz.gettz(NY))] = last_val
-            current += timedelta(days=1)
-        return df
-
-    def _clear_out_of_market_hours(df):
-        """
-        only interested in samples between 9:30, 16:00 NY time
-        """
-        return df.between_time("09:30", "16:00")
-
-    def _drop_early_samples(df):
-        """
-        samples from server don't start at 9:30 NY time
-        let's drop earliest samples
-        """
-        for i, b in df.iterrows():
-            if i.time() >= dtime(9, 30):
-                return df[i:]
-
     def _resample(df):
         """
         samples returned with certain window size (1 day, 1 minute) user
@@ -186,71 +190,214 @@ def get_aggs_from_alpaca(symbols,
             ])
         )
         if granularity == 'minute':
-            return df.between_time("09:30", "16:00")
+            return df[_market_hours_mask(df.index)]
         else:
             return df
 
     if not start:
-        response = CLIENT.get_barset(symbols,
+        response = client.get_barset(symbols,
                                      granularity,
                                      limit=1000,
                                      end=end).df
     else:
         response = _iterate_api_calls()
+    if response.empty:
+        return response
 
-    cdl = response
     if granularity == 'minute':
-        cdl = _clear_out_of_market_hours(cdl)
-        cdl = _drop_early_samples(cdl)
+        response = response[_market_hours_mask(response.index)]
     if compression != 1:
-        response = _resample(cdl)
-    # response = _back_to_aggs(cdl)
-    else:
-        response = cdl
+        response = _resample(response)
+    return process_bars(response, granularity, start, end)
+
+
+def _market_hours_mask(index):
+    """
+    only interested in samples between 9:30, 16:00 NY time
+    """
+    minute_of_day = index.hour * 60 + index.minute
+    return (minute_of_day >= 9 * 60 + 30) & (minute_of_day <= 16 * 60)
+
+
+def _mask_incomplete_bars(df):
+    """
+    a bar of a symbol with any missing field is dropped altogether. the bars
+    of all symbols share the frame, so they are nulled out instead.
+    """
+    incomplete = df.isnull().T.groupby(level=0).any().T
+    return df.mask(incomplete.reindex(columns=df.columns, level=0).values)
+
+
+def _fill_daily_gaps(df, start, end):
+    """
+    reindex the daily bars onto all the sessions between start and end.
+    missing sessions get the previous bar of the symbol, the sessions
+    before its first bar get that first bar.
+    """
+    calendar: TradingCalendar = get_calendar("NYSE")
+    # bars are labeled with midnight NY time
+    sessions = calendar.sessions_in_range(start, end).tz_localize(
+        None).tz_localize(NY)
+    df = df.reindex(df.index.union(sessions))
+    return df.fillna(method='ffill').fillna(method='bfill')
+
+
+def process_bars(response, granularity, start, end):
+    """
+    post process the bars of all symbols at once: drop the incomplete bars
+    and, for daily bars, fill the sessions without a bar.
+    """
     if granularity == 'day':
         response = response[start:end]  # we only want data between dates
-    processed = pd.DataFrame([], columns=response.columns)
-    for sym in response.columns.levels[0]:
-        df: pd.DataFrame = response[sym]
-        df = df.dropna()
-        df = _fillna(df, granularity, start, end)
-        if processed.empty and not df.empty:
-            processed = processed.reindex(df.index.values)
-        if not df.empty:
-            processed[sym] = df
-
-    return processed
+    response = _mask_incomplete_bars(response)
+    if granularity == 'day' and start is not None:
+        response = _fill_daily_gaps(response, start, end)
+    return response.dropna(how='all')
 
 MAX_PER_REQUEST_AMOUNT = 200  # Alpaca max symbols per 1 http request
-def df_generator(interval, start, end, assets_to_sids):
+
+
+def _fetch_cache_key(symbols, start, end, granularity):
+    """
+    the name under which the bars of a chunk of symbols are stored in the
+    ingest cache. it is unique per symbols, date range and granularity.
+    """
+    digest = hashlib.md5(','.join(sorted(symbols)).encode()).hexdigest()
+    return f"alpaca-{granularity}-{start.date()}-{end.date()}-{digest}"
+
+
+def fetch_aggs_from_alpaca(symbols,
+                           start,
+                           end,
+                           granularity,
+                           cache=None,
+                           client=None,
+                           workers=None,
+                           requests_per_minute=None):
+    """
+    fetch the bars of many symbols concurrently.
+    symbols are split to chunks of MAX_PER_REQUEST_AMOUNT, and each chunk is
+    fetched by get_aggs_from_alpaca on a bounded thread pool. all threads
+    share one rate limiter, so we never do more than requests_per_minute
+    api calls.
+    if cache (e.g the dataframe_cache passed to ingest) is given, every
+    completed chunk is stored in it, and chunks already in the cache are not
+    fetched again. that way a crashed ingest resumes where it stopped.
+
+    :return: generator of (chunk symbols, df) in the order of symbols. at most
+      2 * workers chunks are held in memory at any time.
+    """
+    conf = zipline.config.bundle.AlpacaConfig()
+    if client is None:
+        client = CLIENT
+    if workers is None:
+        workers = conf.fetch_workers
+    if requests_per_minute is None:
+        requests_per_minute = conf.max_requests_per_minute
+    client = RateLimitedClient(client, requests_per_minute)
+
+    chunks = [symbols[i:i + MAX_PER_REQUEST_AMOUNT]
+              for i in range(0, len(symbols), MAX_PER_REQUEST_AMOUNT)]
+
+    def _fetch(chunk):
+        key = _fetch_cache_key(chunk, start, end, granularity)
+        if cache is not None:
+            try:
+                return cache[key]
+            except KeyError:
+                pass
+        df = get_aggs_from_alpaca(chunk, start, end, granularity, 1, client=client)
+        if cache is not None:
+            cache[key] = df
+        return df
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(_fetch, chunk)))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def _fetch_groups(asset_list, start, assets_to_sids, start_sessions):
+    """
+    group the symbols by the session we need to start fetching them from.
+    without start_sessions all the symbols start at start. symbols missing
+    from start_sessions are already up to date and are not fetched.
+    """
+    if start_sessions is None:
+        return [(start, asset_list)]
+    groups = collections.OrderedDict()
+    for symbol in asset_list:
+        sid = assets_to_sids[symbol]
+        if sid in start_sessions.index:
+            groups.setdefault(start_sessions[sid], []).append(symbol)
+    return list(groups.items())
+
+
+def df_generator(interval,
+                 start,
+                 end,
+                 assets_to_sids,
+                 cache=None,
+                 start_sessions=None,
+                 asset_finder=None):
+    """
+    start_sessions (sid -> first session to fetch) is used by incremental
+    ingests to only fetch the bars missing after the stored ones. the
+    asset_finder of an incremental ingest is used to keep the original
+    start dates of existing assets.
+    """
     exchange = 'NYSE'
     asset_list = list_assets()
     base_sid = 0
     # some symbols from alpaca are duplicated, which causes an issue with zipline
     # ingest process. for now, we make sure we serve one of them (for now the first one)
     already_ingested = {}
-    for i in range(len(asset_list[::MAX_PER_REQUEST_AMOUNT])):
-        partial = asset_list[MAX_PER_REQUEST_AMOUNT*i:MAX_PER_REQUEST_AMOUNT*(i+1)]
-        df: pd.DataFrame = get_aggs_from_alpaca(partial, start, end, 'day' if interval == '1d' else 'minute', 1)
-        for _, symbol in enumerate(df.columns.levels[0]):
-            try:
-                sid = assets_to_sids[symbol]
-                # doing this makes sure not all data in df is null
-                # isnull returns 0 and 1 matrix.
-                # doing sum twice, makes sure there isn't even one NaN value
-                # and since we do ffill of the data, that should not happen
-                # if df[symbol].isnull().sum().sum() == 0:
-                if not df[symbol].isnull().all().all():
-                    if symbol not in already_ingested:
-                        first_traded = start
-                        auto_close_date = end + pd.Timedelta(days=1)
-                        yield (sid, df[symbol].sort_index()), symbol, start, end, first_traded, auto_close_date, exchange
-                        already_ingested[symbol] = True
-
-            except Exception as e:
-                import traceback
-                traceback.print_exc()
-                print(f"error while processig {(sid + base_sid, symbol)}: {e}")
+    for group_start, symbols in _fetch_groups(asset_list, start, assets_to_sids, start_sessions):
+        fetched = fetch_aggs_from_alpaca(symbols,
+                                         group_start,
+                                         end,
+                                         'day' if interval == '1d' else 'minute',
+                                         cache=cache)
+        for _, df in fetched:
+            if df.empty:
+                continue
+            for _, symbol in enumerate(df.columns.levels[0]):
+                try:
+                    sid = assets_to_sids[symbol]
+                    # doing this makes sure not all data in df is null
+                    # isnull returns 0 and 1 matrix.
+                    # doing sum twice, makes sure there isn't even one NaN value
+                    # and since we do ffill of the data, that should not happen
+                    # if df[symbol].isnull().sum().sum() == 0:
+                    if not df[symbol].isnull().all().all():
+                        if symbol not in already_ingested:
+                            first_traded = existing_start_date(asset_finder, sid, group_start)
+                            auto_close_date = end + pd.Timedelta(days=1)
+                            yield (sid, df[symbol].sort_index()), symbol, first_traded, end, first_traded, \
+                                auto_close_date, exchange
+                            already_ingested[symbol] = True
+
+                except Exception as e:
+                    import traceback
+                    traceback.print_exc()
+                    print(f"error while processig {(sid + base_sid, symbol)}: {e}")
+
+
+def fetch_cache(cache):
+    """
+    the cache of the fetched chunks, in a directory of the ingest cache.
+    the chunks are pickled, the default serialization of the ingest cache
+    can't write them with the supported pandas versions.
+    """
+    return dataframe_cache(os.path.join(cache.path, 'alpaca_api'),
+                           clean_on_failure=False,
+                           serialization='pickle')
 
 
 def metadata_df():
@@ -284,25 +431,35 @@ def api_to_bundle(interval=['1m']):
                ):
 
         assets_to_sids = asset_to_sid_map(asset_db_writer.asset_finder, list_assets())
+        chunk_cache = fetch_cache(cache)
+
+        def data_generator(_interval, bar_writer):
+            # on incremental ingests, only the bars missing after the stored
+            # ones are fetched.
+            start_sessions = missing_tail_start_sessions(
+                assets_to_sids.values(),
+                calendar,
+                start_session,
+                end_session,
+                bar_writer,
+            )
+            return (sid_df for (sid_df, *metadata.iloc[sid_df[0]]) in df_generator(
+                interval=_interval,
+                start=start_session,
+                end=end_session,
+                assets_to_sids=assets_to_sids,
+                cache=chunk_cache,
+                start_sessions=start_sessions,
+                asset_finder=asset_db_writer.asset_finder))
 
-        def minute_data_generator():
-            return (sid_df for (sid_df, *metadata.iloc[sid_df[0]]) in df_generator(interval='1m',
-                                                                                   start=start_session,
-                                                                                   end=end_session,
-                                                                                   assets_to_sids=assets_to_sids))
-
-        def daily_data_generator():
-            return (sid_df for (sid_df, *metadata.iloc[sid_df[0]]) in df_generator(interval='1d',
-                                                                                   start=start_session,
-                                                                                   end=end_session,
-                                                                                   assets_to_sids=assets_to_sids))
         for _interval in interval:
             metadata = metadata_df()
             if _interval == '1d':
-                daily_bar_writer.write(daily_data_generator(), assets=assets_to_sids.values(), show_progress=True)
+                daily_bar_writer.write(data_generator('1d', daily_bar_writer),
+                                       assets=assets_to_sids.values(),
+                                       show_progress=True)
             elif _interval == '1m':
-                minute_bar_writer.write(
-                    minute_data_generator(), assets=assets_to_sids.values(), show_progress=True)
+                minute_bar_writer.write(data_generator('1m', minute_bar_writer), show_progress=True)
 
             # Drop the ticker rows which have missing sessions in their data sets
             metadata.dropna(inplace=True)
@@ -28,7 +28,11 @@ from ratelimit import limits, sleep_and_retry
 
 import zipline.config
 from zipline.data.bundles import core as bundles
-from zipline.data.bundles.common import asset_to_sid_map
+from zipline.data.bundles.common import (
+    asset_to_sid_map,
+    existing_start_date,
+    missing_tail_start_sessions,
+)
 from zipline.data.bundles.universe import Universe, get_sp500, get_sp100, get_nasdaq100, all_alpaca_assets
 
 from zipline.data import bundles as bundles_module
@@ -44,6 +48,12 @@ os.environ["ALPHAVANTAGE_API_KEY"] = av_config.api_key  # make sure it's set in
 
 UNIVERSE = Universe.NASDAQ100
 
+# the amount of data points in a 'compact' daily response and the days
+# covered by each slice of the extended intraday api.
+COMPACT_OUTPUT_SIZE = 100
+DAYS_PER_SLICE = 30
+MAX_SLICES = 24
+
 ASSETS = None
 def list_assets():
     global ASSETS
@@ -118,7 +128,7 @@ def fill_daily_gaps(df):
 # function to be able to properly do rate-limiting.
 @sleep_and_retry
 @limits(calls=AV_CALLS_PER_FREQ, period=AV_FREQ_SEC + AV_TOLERANCE_SEC)
-def av_api_wrapper(symbol, interval, _slice=None):
+def av_api_wrapper(symbol, interval, _slice=None, outputsize='full'):
     if interval == '1m':
         ts = TimeSeries(output_format='csv')
         data_slice, meta_data = ts.get_intraday_extended(symbol, interval='1min', slice=_slice, adjusted='false')
@@ -126,27 +136,46 @@ def av_api_wrapper(symbol, interval, _slice=None):
 
     else:
         ts = TimeSeries()
-        data, meta_data = ts.get_daily_adjusted(symbol, outputsize='full')
+        data, meta_data = ts.get_daily_adjusted(symbol, outputsize=outputsize)
         return data
 
 
+def _days_back(start):
+    return (pd.Timestamp.utcnow().normalize() - start).days
+
+
+def minute_slices(start):
+    """
+    the extended intraday slices (most recent first) covering start until now.
+    every slice covers 30 days, year1month1 being the most recent one.
+    """
+    n_slices = int(np.clip(np.ceil((_days_back(start) + 1) / DAYS_PER_SLICE), 1, MAX_SLICES))
+    return ['year' + str(i // 12 + 1) + 'month' + str(i % 12 + 1) for i in range(n_slices)]
+
+
+def daily_outputsize(start):
+    """
+    'compact' holds the last 100 data points, that is enough when start is
+    less than 100 days ago.
+    """
+    return 'compact' if _days_back(start) < COMPACT_OUTPUT_SIZE else 'full'
+
+
 def av_get_data_for_symbol(symbol, start, end, interval):
     if interval == '1m':
         data = []
-        for i in range(1, 3):
-            for j in range(1, 13):
-                _slice = 'year' + str(i) + 'month' + str(j)
-                # print('requesting slice ' + _slice + ' for ' + symbol)
-                data_slice = av_api_wrapper(symbol, interval=interval, slice=_slice)
+        for _slice in minute_slices(start):
+            # print('requesting slice ' + _slice + ' for ' + symbol)
+            data_slice = av_api_wrapper(symbol, interval=interval, _slice=_slice)
 
-                # dont know better way to convert _csv.reader to list or DataFrame
-                table = []
-                for line in data_slice:
-                    table.append(line)
+            # dont know better way to convert _csv.reader to list or DataFrame
+            table = []
+            for line in data_slice:
+                table.append(line)
 
-                # strip header-row from csv
-                table = table[1:]
-                data = data + table
+            # strip header-row from csv
+            table = table[1:]
+            data = data + table
 
         df = pd.DataFrame(data, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
 
@@ -156,7 +185,7 @@ def av_get_data_for_symbol(symbol, start, end, interval):
         df.sort_index(inplace=True)
 
     else:
-        data = av_api_wrapper(symbol, interval)
+        data = av_api_wrapper(symbol, interval, outputsize=daily_outputsize(start))
 
         df = pd.DataFrame.from_dict(data, orient='index')
         df.index = pd.to_datetime(df.index).tz_localize('UTC')
@@ -237,7 +266,13 @@ def calc_dividend(sid, df, sessions):
     return div
 
 
-def df_generator(interval, start, end, divs_splits, assets_to_sids={}):
+def df_generator(interval, start, end, divs_splits, assets_to_sids={}, start_sessions=None, asset_finder=None):
+    """
+    start_sessions (sid -> first session to fetch) is used by incremental
+    ingests to only fetch the bars missing after the stored ones, symbols
+    not in there are already up to date. the asset_finder of an incremental
+    ingest is used to keep the original start dates of existing assets.
+    """
     exchange = 'NYSE'
 
     # get calendar and extend it to 20 days to the future to be able
@@ -249,11 +284,23 @@ def df_generator(interval, start, end, divs_splits, assets_to_sids={}):
 
     for symbol in asset_list:
         try:
-            df = av_get_data_for_symbol(symbol, start, end, interval)
-
             sid = assets_to_sids[symbol]
-
-            first_traded = df.index[0]
+            symbol_start = start
+            if start_sessions is not None:
+                if sid not in start_sessions.index:
+                    continue
+                symbol_start = start_sessions[sid]
+
+            df = av_get_data_for_symbol(symbol, symbol_start, end, interval)
+            if start_sessions is not None:
+                # only keep the tail we're missing, so we don't write the
+                # stored bars or their adjustments again.
+                df = df[df.index >= symbol_start]
+                if df.empty:
+                    continue
+
+            first_traded = existing_start_date(asset_finder, sid, df.index[0])
+            asset_start = existing_start_date(asset_finder, sid, start)
             auto_close_date = df.index[-1] + pd.Timedelta(days=1)
 
             if 'split' in df.columns:
@@ -264,7 +311,7 @@ def df_generator(interval, start, end, divs_splits, assets_to_sids={}):
                 div = calc_dividend(sid, df, sessions)
                 divs_splits['divs'] = pd.concat([divs_splits['divs'], div])
 
-            yield (sid, df), symbol, symbol, start, end, first_traded, auto_close_date, exchange
+            yield (sid, df), symbol, symbol, asset_start, end, first_traded, auto_close_date, exchange
 
         except KeyboardInterrupt:
             exit()
@@ -331,7 +378,10 @@ def api_to_bundle(interval=['1m']):
                         start=start_session,
                         end=end_session,
                         assets_to_sids=assets_to_sids,
-                        divs_splits=divs_splits))
+                        divs_splits=divs_splits,
+                        start_sessions=missing_tail_start_sessions(
+                            assets_to_sids.values(), calendar, start_session, end_session, minute_bar_writer),
+                        asset_finder=asset_db_writer.asset_finder))
 
         def daily_data_generator():
             return (sid_df for (sid_df, *metadata.loc[sid_df[0]])
@@ -340,7 +390,10 @@ def api_to_bundle(interval=['1m']):
                 start=start_session,
                 end=end_session,
                 assets_to_sids=assets_to_sids,
-                divs_splits=divs_splits))
+                divs_splits=divs_splits,
+                start_sessions=missing_tail_start_sessions(
+                    assets_to_sids.values(), calendar, start_session, end_session, daily_bar_writer),
+                asset_finder=asset_db_writer.asset_finder))
 
         metadata = metadata_df(assets_to_sids)
 
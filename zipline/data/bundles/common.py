@@ -21,3 +21,175 @@ def asset_to_sid_map(asset_finder, symbols):
     for i in range(len(symbols)):
         assets_to_sids[symbols[i]] = i
     return assets_to_sids
+
+
+def existing_start_date(asset_finder, sid, default):
+    """
+    The start date of ``sid`` in the assets db of ``asset_finder``, or
+    ``default`` for assets which are not in there yet.
+    """
+    if asset_finder:
+        asset = asset_finder.retrieve_all([sid], default_none=True)[0]
+        if asset is not None:
+            return asset.start_date
+    return default
+
+
+def _session_labels(index):
+    """
+    Midnight UTC labels of the (local) days of ``index``.
+    """
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize().tz_localize('UTC')
+
+
+class IncrementalDailyBarWriter(object):
+    """
+    Daily bar writer used by incremental ingests.
+
+    Bundles can ask it for the sessions already stored for their assets
+    (see ``missing_tail_start_sessions``) and only fetch the missing tail.
+
+    Parameters
+    ----------
+    writer : BcolzDailyBarWriter or PSQLDailyBarWriter
+        The writer to write the data with.
+    existing_reader : BcolzDailyBarReader or PSQLDailyBarReader
+        Reader of the data already stored for the bundle.
+    merge_existing : bool
+        Whether ``writer`` writes a complete new table, and the stored data
+        must be written along with the new bars (bcolz), or it appends the
+        new bars to the existing data itself (postgres).
+    """
+    FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, writer, existing_reader, merge_existing):
+        self._writer = writer
+        self._existing_reader = existing_reader
+        self._merge_existing = merge_existing
+        self.written = False
+
+    def get_stored_session_bounds(self, sids):
+        return self._existing_reader.get_stored_session_bounds(sids)
+
+    def _existing_frame(self, sid, first_session, last_session):
+        sessions = self._existing_reader.sessions
+        sessions = sessions[sessions.slice_indexer(first_session,
+                                                   last_session)]
+        arrays = self._existing_reader.load_raw_arrays(
+            self.FIELDS,
+            first_session,
+            last_session,
+            [sid],
+        )
+        # the readers report the prices of sessions without trades as nan,
+        # they are stored as 0.
+        return pd.DataFrame(
+            {field: array[:, 0] for field, array in zip(self.FIELDS, arrays)},
+            index=sessions,
+            columns=self.FIELDS,
+        ).fillna(0)
+
+    def _merged(self, data):
+        """
+        Prepend the stored bars of every sid to its new bars, and add the
+        sids without new bars unchanged.
+        """
+        bounds = self._existing_reader.get_stored_session_bounds()
+        # sids written without any bars have no stored sessions, there is
+        # nothing to carry over for them.
+        bounds = bounds.dropna()
+
+        for sid, df in data:
+            if sid in bounds.index:
+                first_session, last_session = bounds.loc[sid]
+                stored = self._existing_frame(sid, first_session, last_session)
+                new = df[list(self.FIELDS)].copy()
+                new.index = _session_labels(new.index)
+                df = pd.concat([stored, new[new.index > last_session]])
+            yield sid, df
+
+        # the sids without new bars keep their stored data.
+        for sid, (first_session, last_session) in bounds.iterrows():
+            if sid not in self._seen:
+                yield sid, self._existing_frame(
+                    sid, first_session, last_session,
+                )
+
+    def _track_seen(self, data):
+        for sid, df in data:
+            self._seen.add(sid)
+            yield sid, df
+
+    def write(self,
+              data,
+              assets=None,
+              show_progress=False,
+              invalid_data_behavior='warn'):
+        self.written = True
+        if self._merge_existing:
+            self._seen = set()
+            data = self._merged(self._track_seen(data))
+            # the stored sids are written as well.
+            assets = None
+        return self._writer.write(
+            data,
+            assets=assets,
+            show_progress=show_progress,
+            invalid_data_behavior=invalid_data_behavior,
+        )
+
+
+def missing_tail_start_sessions(sids,
+                                calendar,
+                                start_session,
+                                end_session,
+                                bar_writer):
+    """
+    Find the first session to fetch for each sid, so that an ingest only
+    fetches the data missing after the bars already stored by ``bar_writer``.
+
+    The writers of a regular ingest have no stored data, so every sid starts
+    at ``start_session``.
+
+    Parameters
+    ----------
+    sids : iterable[int]
+        The assets to ingest.
+    calendar : TradingCalendar
+        The calendar of the bundle.
+    start_session, end_session : pd.Timestamp
+        The sessions the bundle is ingested for.
+    bar_writer : IncrementalDailyBarWriter or BcolzMinuteBarWriter
+        The writer the bundle writes into.
+
+    Returns
+    -------
+    starts : pd.Series
+        The first session to fetch for every sid. Sids which are already up
+        to date are not included.
+    """
+    sids = list(sids)
+    if hasattr(bar_writer, 'get_stored_session_bounds'):
+        last_sessions = bar_writer.get_stored_session_bounds(sids)[
+            'last_session'
+        ]
+    elif hasattr(bar_writer, 'last_date_in_output_for_sid'):
+        last_sessions = pd.Series(
+            [bar_writer.last_date_in_output_for_sid(sid) for sid in sids],
+            index=sids,
+        )
+    else:
+        last_sessions = pd.Series(pd.NaT, index=sids)
+
+    starts = {}
+    for sid, last_session in last_sessions.iteritems():
+        if pd.isnull(last_session):
+            starts[sid] = start_session
+        elif last_session < end_session:
+            starts[sid] = max(
+                calendar.next_session_label(last_session),
+                start_session,
+            )
+    return pd.Series(starts, dtype=object)
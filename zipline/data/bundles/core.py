@@ -1,9 +1,12 @@
 from collections import namedtuple
+from contextlib import contextmanager
 import errno
+from glob import glob
 import os
 import shutil
 import warnings
 
+import bcolz
 import click
 from logbook import Logger
 import pandas as pd
@@ -13,10 +16,13 @@ from toolz import curry, complement, take
 from ..adjustments import SQLiteAdjustmentReader, SQLiteAdjustmentWriter
 from ..bcolz_daily_bars import BcolzDailyBarReader, BcolzDailyBarWriter
 from ..minute_bars import (
+    BcolzMinuteBarMetadata,
     BcolzMinuteBarReader,
     BcolzMinuteBarWriter,
 )
+from ..mmap_minute_bars import MmapMinuteBarReader
 from ..psql_daily_bars import PSQLDailyBarReader, PSQLDailyBarWriter
+from .common import IncrementalDailyBarWriter
 from zipline.assets import (
     AssetDBWriter,
     AssetFinder,
@@ -53,6 +59,13 @@ def minute_equity_path(bundle_name, timestr, environ=None):
     )
 
 
+def minute_equity_mmap_path(bundle_name, timestr, environ=None):
+    return pth.data_path(
+        minute_equity_mmap_relative(bundle_name, timestr),
+        environ=environ,
+    )
+
+
 def daily_equity_path(bundle_name, timestr, environ=None):
     return pth.data_path(
         daily_equity_relative(bundle_name, timestr),
@@ -90,6 +103,11 @@ def minute_equity_relative(bundle_name, timestr):
     return bundle_name, timestr, 'minute_equities.bcolz'
 
 
+def minute_equity_mmap_relative(bundle_name, timestr):
+    # written by zipline.data.mmap_minute_bars.convert_bcolz_minute_bars
+    return bundle_name, timestr, 'minute_equities.mmap'
+
+
 def asset_db_relative(bundle_name, timestr, db_version=None):
     db_version = ASSET_DB_VERSION if db_version is None else db_version
 
@@ -119,6 +137,114 @@ def external_db_path(bundle_name, environ):
     return path
 
 
+def _minute_bar_sid_paths(rootdir):
+    # the sid directories are laid out as 00/00/000001.bcolz.
+    return glob(os.path.join(rootdir, '*', '*', '*.bcolz'))
+
+
+def _metadata_key(metadata):
+    return (
+        metadata.calendar.name,
+        metadata.start_session,
+        metadata.end_session,
+        metadata.minutes_per_day,
+        metadata.default_ohlc_ratio,
+        metadata.ohlc_ratios_per_sid,
+    )
+
+
+def _is_current_conversion(mmap_rootdir, bcolz_rootdir):
+    """
+    Whether the minute bars at ``mmap_rootdir`` were converted from the
+    minute bars at ``bcolz_rootdir`` as they are now.
+
+    A directory without metadata is an incomplete conversion. A conversion
+    whose metadata differs from the bcolz metadata is missing the bars
+    written to the bcolz tables since it was made.
+    """
+    if not os.path.exists(BcolzMinuteBarMetadata.metadata_path(mmap_rootdir)):
+        return False
+    return (
+        _metadata_key(BcolzMinuteBarMetadata.read(mmap_rootdir)) ==
+        _metadata_key(BcolzMinuteBarMetadata.read(bcolz_rootdir))
+    )
+
+
+@contextmanager
+def _appending_minute_bars(rootdir, end_session):
+    """
+    Open the minute bars at ``rootdir`` to append the sessions up to
+    ``end_session`` to them in place.
+
+    The bars are appended to the stored ones directly, copying them to the
+    working dir of the ingest would mean copying the whole minute history.
+    If the ingest fails, the tables of the sids are cut back to their stored
+    length, the tables of new sids are removed and the metadata is restored.
+    """
+    metadata = BcolzMinuteBarMetadata.read(rootdir)
+    stored_lengths = {
+        path: len(bcolz.open(rootdir=path, mode='r'))
+        for path in _minute_bar_sid_paths(rootdir)
+    }
+    writer = BcolzMinuteBarWriter.open(rootdir, end_session)
+    try:
+        yield writer
+    except BaseException:
+        log.warn(
+            'Ingest failed, removing the minute bars appended to {}.',
+            rootdir,
+        )
+        for path in _minute_bar_sid_paths(rootdir):
+            try:
+                length = stored_lengths[path]
+            except KeyError:
+                shutil.rmtree(path)
+                continue
+            table = bcolz.open(rootdir=path, mode='a')
+            if len(table) > length:
+                table.resize(length)
+        metadata.write(rootdir)
+        raise
+
+
+@contextmanager
+def _replacing_daily_bars(path):
+    """
+    Replace the daily bars at ``path`` with the ones written to
+    ``path + '.new'`` once the ingest succeeded.
+
+    The stored bars are only moved aside once the new ones are in place,
+    and removed after they replaced them, so a failed ingest keeps the
+    stored bars.
+    """
+    new_path = path + '.new'
+    old_path = path + '.old'
+    # left over by an ingest which failed while replacing the bars.
+    if os.path.exists(old_path):
+        if os.path.exists(path):
+            shutil.rmtree(old_path)
+        else:
+            os.rename(old_path, path)
+    if os.path.exists(new_path):
+        shutil.rmtree(new_path)
+
+    try:
+        yield new_path
+    except BaseException:
+        # the new bars may have been copied in part.
+        if os.path.exists(new_path):
+            shutil.rmtree(new_path)
+        raise
+
+    os.rename(path, old_path)
+    try:
+        os.rename(new_path, path)
+    except BaseException:
+        os.rename(old_path, path)
+        raise
+    shutil.rmtree(old_path)
+
+
 def to_bundle_ingest_dirname(ts):
     """Convert a pandas Timestamp into the name of the directory for the
     ingestion.
@@ -162,6 +288,44 @@ def ingestions_for_bundle(bundle, environ=None):
     )
 
 
+def ingestion_version(bundle, bundle_data, environ=None):
+    """Identify the data of the most recent ingestion of a bundle.
+
+    Parameters
+    ----------
+    bundle : str
+        The name of the bundle.
+    bundle_data : BundleData
+        The loaded bundle.
+    environ : mapping, optional
+        The environment variables.
+
+    Returns
+    -------
+    version : str
+        A string which changes with every ingestion, including incremental
+        ingestions which update the most recent ingestion in place. For
+        bundles stored in an external database this is the number of daily
+        bars and the last day with daily bars.
+    """
+    if external_db_path(bundle, environ):
+        return '{}@{}'.format(
+            bundle,
+            bundle_data.equity_daily_bar_reader.data_version(),
+        )
+
+    timestr = max(
+        (ing for ing in os.listdir(pth.data_path([bundle], environ))
+         if not pth.hidden(ing)),
+        key=from_bundle_ingest_dirname,
+    )
+    modified = max(
+        os.path.getmtime(daily_equity_path(bundle, timestr, environ=environ)),
+        os.path.getmtime(adjustment_db_path(bundle, timestr, environ=environ)),
+    )
+    return '{}@{}'.format(timestr, modified)
+
+
 RegisteredBundle = namedtuple(
     'RegisteredBundle',
     ['calendar_name',
@@ -371,7 +535,8 @@ def _make_bundle_core():
                environ=os.environ,
                timestamp=None,
                assets_versions=(),
-               show_progress=False):
+               show_progress=False,
+               incremental=False):
         """Ingest data for a given bundle.
 
         Parameters
@@ -387,11 +552,21 @@ def _make_bundle_core():
             Versions of the assets db to which to downgrade.
         show_progress : bool, optional
             Tell the ingest function to display the progress where possible.
+        incremental : bool, optional
+            Update the most recent ingestion in place instead of writing a new
+            one. The daily bar writer passed to the ingest function can then
+            tell which sessions are already stored for each asset (see
+            ``zipline.data.bundles.common.missing_tail_start_sessions``), the
+            new bars are appended to the stored ones, and the assets and
+            adjustments are written into the existing dbs.
         """
         try:
             bundle = bundles[name]
         except KeyError:
             raise UnknownBundle(name)
+        if incremental and not bundle.create_writers:
+            raise ValueError('Need to ingest a bundle that creates writers '
+                             'in order to ingest incrementally.')
 
         calendar = get_calendar(bundle.calendar_name)
 
@@ -418,6 +593,12 @@ def _make_bundle_core():
         # to make it possible to get ids for asset-symbols
         db_path_external = external_db_path(name, environ)
 
+        if incremental and not db_path_external:
+            # update the most recent ingestion instead of creating a new one
+            timestr = os.path.basename(
+                most_recent_data(name, timestamp, environ=environ),
+            )
+
         # needs to be checkout outside of 'with' in case create_writers is false
         # only 'sqlite-bcolz'-backend needs to ensure local folders
         if not db_path_external:
@@ -428,6 +609,34 @@ def _make_bundle_core():
             # we use `cleanup_on_failure=False` so that we don't purge the
             # cache directory if the load fails in the middle
             if bundle.create_writers:
+                if incremental and not db_path_external:
+                    mmap_path = minute_equity_mmap_path(
+                        name, timestr, environ=environ,
+                    )
+                    if os.path.exists(mmap_path):
+                        # the converted minute bars don't get the appended
+                        # bars, the bcolz tables are read until they are
+                        # converted again.
+                        log.info(
+                            'Removing the converted minute bars at {}.',
+                            mmap_path,
+                        )
+                        shutil.rmtree(mmap_path)
+
+                    # entered before the working dir, so that the stored bars
+                    # are only replaced, and the appended minute bars only
+                    # kept, once the working dir is committed.
+                    minute_bar_writer = stack.enter_context(
+                        _appending_minute_bars(
+                            minute_equity_path(name, timestr, environ=environ),
+                            end_session,
+                        ),
+                    )
+                    new_daily_bars_path = stack.enter_context(
+                        _replacing_daily_bars(
+                            daily_equity_path(name, timestr, environ=environ),
+                        ),
+                    )
 
                 wd = stack.enter_context(working_dir(
                     pth.data_path([], environ=environ))
@@ -450,6 +659,53 @@ def _make_bundle_core():
                     except InvalidRequestError:
                         asset_finder = None
 
+                    # Do an empty write to ensure that the daily table exists.
+                    daily_bar_writer.write(())
+                    if incremental:
+                        # the postgres writer appends to the stored bars
+                        daily_bar_writer = IncrementalDailyBarWriter(
+                            daily_bar_writer,
+                            PSQLDailyBarReader(db_path_external),
+                            merge_existing=False,
+                        )
+
+                elif incremental:
+                    assets_db_path = wd.getpath(*asset_db_relative(name, timestr))
+                    adjustments_db_path = wd.getpath(*adjustment_db_relative(name, timestr))
+                    wd.ensure_dir(name, timestr)
+                    # the assets and adjustments are updated in copies of
+                    # the existing dbs, which replace them on success.
+                    shutil.copy2(
+                        asset_db_path(name, timestr, environ=environ),
+                        assets_db_path,
+                    )
+                    shutil.copy2(
+                        adjustment_db_path(name, timestr, environ=environ),
+                        adjustments_db_path,
+                    )
+                    asset_finder = AssetFinder(assets_db_path)
+
+                    # the daily table is rewritten with the new bars appended
+                    # to the stored ones, it replaces them once committed.
+                    daily_bars_path = wd.ensure_dir(os.path.relpath(
+                        new_daily_bars_path,
+                        pth.data_path([], environ=environ),
+                    ))
+                    daily_bar_writer = BcolzDailyBarWriter(
+                        daily_bars_path,
+                        calendar,
+                        start_session,
+                        end_session,
+                    )
+                    daily_bar_writer.write(())
+                    daily_bar_reader = BcolzDailyBarReader(daily_bars_path)
+                    daily_bar_writer = IncrementalDailyBarWriter(
+                        daily_bar_writer,
+                        BcolzDailyBarReader(
+                            daily_equity_path(name, timestr, environ=environ),
+                        ),
+                        merge_existing=True,
+                    )
 
                 else:
                     pth.ensure_directory(pth.data_path([name, timestr], environ=environ))
@@ -474,11 +730,11 @@ def _make_bundle_core():
                         minutes_per_day=bundle.minutes_per_day,
                     )
 
-                # Do an empty write to ensure that the daily ctables exist
-                # when we create the SQLiteAdjustmentWriter below. The
-                # SQLiteAdjustmentWriter needs to open the daily ctables so
-                # that it can compute the adjustment ratios for the dividends.
-                daily_bar_writer.write(())
+                    # Do an empty write to ensure that the daily ctables exist
+                    # when we create the SQLiteAdjustmentWriter below. The
+                    # SQLiteAdjustmentWriter needs to open the daily ctables so
+                    # that it can compute the adjustment ratios for the dividends.
+                    daily_bar_writer.write(())
 
                 asset_db_writer = AssetDBWriter(assets_db_path, asset_finder)
 
@@ -486,7 +742,7 @@ def _make_bundle_core():
                     SQLiteAdjustmentWriter(
                         adjustments_db_path,
                         daily_bar_reader,
-                        overwrite=True,
+                        overwrite=not incremental,
                     )
                 )
             else:
@@ -513,6 +769,11 @@ def _make_bundle_core():
                 pth.data_path([name, timestr], environ=environ),
             )
 
+            if incremental and not db_path_external:
+                if not daily_bar_writer.written:
+                    # carry over the stored daily bars unchanged.
+                    daily_bar_writer.write(())
+
             for version in sorted(set(assets_versions), reverse=True):
                 version_path = wd.getpath(*asset_db_relative(
                     name, timestr, db_version=version,
@@ -594,7 +855,15 @@ def _make_bundle_core():
             assets_db_path = asset_db_path(name, timestr, environ=environ)
             adjustments_db_path = adjustment_db_path(name, timestr, environ=environ)
             daily_bar_reader = BcolzDailyBarReader(daily_equity_path(name, timestr, environ=environ))
-            minute_bar_reader = BcolzMinuteBarReader(minute_equity_path(name, timestr, environ=environ))
+            minute_path = minute_equity_path(name, timestr, environ=environ)
+            mmap_path = minute_equity_mmap_path(
+                name, timestr, environ=environ,
+            )
+            if _is_current_conversion(mmap_path, minute_path):
+                # the minute bars were converted to the memory-mapped layout.
+                minute_bar_reader = MmapMinuteBarReader(mmap_path)
+            else:
+                minute_bar_reader = BcolzMinuteBarReader(minute_path)
 
         return BundleData(
             asset_finder=AssetFinder(
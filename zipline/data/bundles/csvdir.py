@@ -1,12 +1,13 @@
 """
 Module for building a complete dataset from local directory with csv files.
 """
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import os
 import sys
 
 from logbook import Logger, StreamHandler
-from numpy import empty
-from pandas import DataFrame, read_csv, Index, Timedelta, NaT
+from pandas import DataFrame, concat, read_csv, Timedelta, NaT
 from trading_calendars import register_calendar_alias
 
 from zipline.utils.cli import maybe_show_progress
@@ -19,7 +20,7 @@ logger = Logger(__name__)
 logger.handlers.append(handler)
 
 
-def csvdir_equities(tframes=None, csvdir=None):
+def csvdir_equities(tframes=None, csvdir=None, workers=None):
     """
     Generate an ingest function for custom data bundle
     This function can be used in ~/.zipline/extension.py
@@ -38,6 +39,9 @@ def csvdir_equities(tframes=None, csvdir=None):
         <directory>/<timeframe2>/<symbol1>.csv
         <directory>/<timeframe2>/<symbol2>.csv
         <directory>/<timeframe2>/<symbol3>.csv
+    workers : int, optional, default: CSVDIR_WORKERS environment variable
+        The number of processes parsing the csv files, defaults to the
+        number of cpus.
 
     Returns
     -------
@@ -54,7 +58,7 @@ def csvdir_equities(tframes=None, csvdir=None):
                 '/full/path/to/the/csvdir/directory'))
     """
 
-    return CSVDIRBundle(tframes, csvdir).ingest
+    return CSVDIRBundle(tframes, csvdir, workers).ingest
 
 
 class CSVDIRBundle:
@@ -63,9 +67,10 @@ class CSVDIRBundle:
     list of time frames and a path to the csvdir directory
     """
 
-    def __init__(self, tframes=None, csvdir=None):
+    def __init__(self, tframes=None, csvdir=None, workers=None):
         self.tframes = tframes
         self.csvdir = csvdir
+        self.workers = workers
 
     def ingest(self,
                environ,
@@ -92,7 +97,8 @@ class CSVDIRBundle:
                       show_progress,
                       output_dir,
                       self.tframes,
-                      self.csvdir)
+                      self.csvdir,
+                      self.workers)
 
 
 @bundles.register("csvdir")
@@ -108,7 +114,8 @@ def csvdir_bundle(environ,
                   show_progress,
                   output_dir,
                   tframes=None,
-                  csvdir=None):
+                  csvdir=None,
+                  workers=None):
     """
     Build a zipline data bundle from the directory with csv files.
     """
@@ -127,25 +134,19 @@ def csvdir_bundle(environ,
             raise ValueError("'daily' and 'minute' directories "
                              "not found in '%s'" % csvdir)
 
-    divs_splits = {'divs': DataFrame(columns=['sid', 'amount',
-                                              'ex_date', 'record_date',
-                                              'declared_date', 'pay_date']),
-                   'splits': DataFrame(columns=['sid', 'ratio',
-                                                'effective_date'])}
+    if workers is None:
+        workers = int(environ.get('CSVDIR_WORKERS', os.cpu_count() or 1))
+
+    divs_splits = {'divs': [], 'splits': []}
     for tframe in tframes:
         ddir = os.path.join(csvdir, tframe)
 
-        symbols = sorted(item.split('.csv')[0]
-                         for item in os.listdir(ddir)
-                         if '.csv' in item)
+        files = _symbol_files(ddir)
+        symbols = sorted(files)
         if not symbols:
             raise ValueError("no <symbol>.csv* files found in %s" % ddir)
 
-        dtype = [('start_date', 'datetime64[ns]'),
-                 ('end_date', 'datetime64[ns]'),
-                 ('auto_close_date', 'datetime64[ns]'),
-                 ('symbol', 'object')]
-        metadata = DataFrame(empty(len(symbols), dtype=dtype))
+        metadata = []
 
         if tframe == 'minute':
             writer = minute_bar_writer
@@ -155,9 +156,16 @@ def csvdir_bundle(environ,
         assets_to_sids = asset_to_sid_map(asset_db_writer.asset_finder, symbols)
 
         writer.write(_pricing_iter(ddir, symbols, metadata,
-                     divs_splits, show_progress, assets_to_sids = assets_to_sids),
+                     divs_splits, show_progress, assets_to_sids=assets_to_sids,
+                     files=files, workers=workers),
                      show_progress=show_progress)
 
+        metadata = DataFrame.from_records(
+            metadata,
+            index='sid',
+            columns=['sid', 'start_date', 'end_date', 'auto_close_date',
+                     'symbol'],
+        )
         # Hardcode the exchange to "CSVDIR" for all assets and (elsewhere)
         # register "CSVDIR" to resolve to the NYSE calendar, because these
         # are all equities and thus can use the NYSE calendar.
@@ -165,67 +173,139 @@ def csvdir_bundle(environ,
 
         asset_db_writer.write(equities=metadata)
 
-        divs_splits['divs']['sid'] = divs_splits['divs']['sid'].astype(int)
-        divs_splits['splits']['sid'] = divs_splits['splits']['sid'].astype(int)
-        adjustment_writer.write(splits=divs_splits['splits'],
-                                dividends=divs_splits['divs'])
+        divs = _concat(divs_splits['divs'], ['sid', 'amount', 'ex_date',
+                                             'record_date', 'declared_date',
+                                             'pay_date'])
+        splits = _concat(divs_splits['splits'], ['sid', 'ratio',
+                                                 'effective_date'])
+        divs['sid'] = divs['sid'].astype(int)
+        splits['sid'] = splits['sid'].astype(int)
+        adjustment_writer.write(splits=splits, dividends=divs)
+
+
+def _concat(frames, columns):
+    """
+    Concatenate the per symbol adjustments at once.
+    """
+    if not frames:
+        return DataFrame(columns=columns)
+    return concat(frames, ignore_index=True)[columns]
+
+
+def _symbol_files(csvdir):
+    """
+    Map the symbols in ``csvdir`` to their <symbol>.csv or e.g.
+    <symbol>.csv.gz file.
+    """
+    files = {}
+    for fname in sorted(os.listdir(csvdir)):
+        if '.csv' not in fname:
+            continue
+        symbol = fname.split('.csv')[0]
+        if symbol in files:
+            logger.warn('%s: ignoring %s, using %s' % (
+                symbol, fname, files[symbol]))
+            continue
+        files[symbol] = fname
+    return files
+
+
+PRICING_DTYPES = {
+    'open': 'float64',
+    'high': 'float64',
+    'low': 'float64',
+    'close': 'float64',
+    'volume': 'float64',
+    'dividend': 'float64',
+    'split': 'float64',
+}
+
+
+def _read_symbol_file(path):
+    """
+    Parse a csv file of a symbol, along with the splits and dividends in it.
 
+    This runs in the worker processes, so it must be a module level function.
+    """
+    dfr = read_csv(path,
+                   parse_dates=[0],
+                   index_col=0,
+                   dtype=PRICING_DTYPES).sort_index()
+
+    split = None
+    if 'split' in dfr.columns:
+        tmp = 1. / dfr.loc[dfr['split'] != 1.0, 'split']
+        split = DataFrame({
+            'effective_date': tmp.index.values,
+            'ratio': tmp.values,
+        })
+
+    div = None
+    if 'dividend' in dfr.columns:
+        # ex_date   amount  sid record_date declared_date pay_date
+        tmp = dfr.loc[dfr['dividend'] != 0.0, 'dividend']
+        div = DataFrame({
+            'ex_date': tmp.index.values,
+            'record_date': NaT,
+            'declared_date': NaT,
+            'pay_date': NaT,
+            'amount': tmp.values,
+        })
+
+    return dfr, split, div
+
+
+def _ordered_map(func, items, workers):
+    """
+    Lazily map ``func`` over ``items`` on a pool of ``workers`` processes,
+    yielding the results in the order of ``items``. At most 2 * workers
+    results are held in memory at any time.
+    """
+    if workers <= 1:
+        for item in items:
+            yield func(item)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pricing_iter(csvdir, symbols, metadata, divs_splits, show_progress,
+                  assets_to_sids={}, files=None, workers=1):
+    if files is None:
+        files = _symbol_files(csvdir)
+    for symbol in symbols:
+        if symbol not in files:
+            raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
+    paths = [os.path.join(csvdir, files[symbol]) for symbol in symbols]
 
-def _pricing_iter(csvdir, symbols, metadata, divs_splits, show_progress, assets_to_sids={}):
     with maybe_show_progress(symbols, show_progress,
                              label='Loading custom pricing data: ') as it:
-        files = os.listdir(csvdir)
-        for symbol in it:
+        parsed = _ordered_map(_read_symbol_file, paths, workers)
+        for symbol, (dfr, split, div) in zip(it, parsed):
             sid = assets_to_sids[symbol]
             logger.debug('%s: sid %s' % (symbol, sid))
 
-            try:
-                fname = [fname for fname in files
-                         if '%s.csv' % symbol in fname][0]
-            except IndexError:
-                raise ValueError("%s.csv file is not in %s" % (symbol, csvdir))
-
-            dfr = read_csv(os.path.join(csvdir, fname),
-                           parse_dates=[0],
-                           infer_datetime_format=True,
-                           index_col=0).sort_index()
-
             start_date = dfr.index[0]
             end_date = dfr.index[-1]
 
-            #print(dfr)
-            #exit()
             # The auto_close date is the day after the last trade.
             ac_date = end_date + Timedelta(days=1)
-            metadata.loc[sid] = start_date, end_date, ac_date, symbol
+            metadata.append((sid, start_date, end_date, ac_date, symbol))
 
-            if 'split' in dfr.columns:
-                tmp = 1. / dfr[dfr['split'] != 1.0]['split']
-                split = DataFrame(data=tmp.index.tolist(),
-                                  columns=['effective_date'])
-                split['ratio'] = tmp.tolist()
+            if split is not None:
                 split['sid'] = sid
+                divs_splits['splits'].append(split)
 
-                splits = divs_splits['splits']
-                index = Index(range(splits.shape[0],
-                                    splits.shape[0] + split.shape[0]))
-                split.set_index(index, inplace=True)
-                divs_splits['splits'] = splits.append(split)
-
-            if 'dividend' in dfr.columns:
-                # ex_date   amount  sid record_date declared_date pay_date
-                tmp = dfr[dfr['dividend'] != 0.0]['dividend']
-                div = DataFrame(data=tmp.index.tolist(), columns=['ex_date'])
-                div['record_date'] = NaT
-                div['declared_date'] = NaT
-                div['pay_date'] = NaT
-                div['amount'] = tmp.tolist()
+            if div is not None:
                 div['sid'] = sid
-
-                divs = divs_splits['divs']
-                ind = Index(range(divs.shape[0], divs.shape[0] + div.shape[0]))
-                div.set_index(ind, inplace=True)
-                divs_splits['divs'] = divs.append(div)
+                divs_splits['divs'].append(div)
 
             yield sid, dfr
 
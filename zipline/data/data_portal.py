@@ -572,6 +572,97 @@ class DataPortal(object):
             data_frequency,
         )
 
+    def get_spot_prices(self, assets, dt, data_frequency):
+        """
+        Returns the prices of many assets at the given dt, reading the bars of
+        all of the assets from the pricing reader at once.
+
+        Parameters
+        ----------
+        assets : np.ndarray[Asset]
+            The assets whose prices are desired. These cannot be arbitrary
+            AssetConvertibles, but may be the identifiers of fetch_csv
+            sources.
+        dt : pd.Timestamp
+            The timestamp for the desired prices.
+        data_frequency : str
+            The frequency of the data to query; i.e. whether the data is
+            'daily' or 'minute' bars
+
+        Returns
+        -------
+        prices : np.ndarray[float64]
+            The same values as ``get_scalar_asset_spot_value`` with the
+            'price' field for each asset.
+        """
+        session_label = self.trading_calendar.minute_to_session_label(dt)
+        prices = np.full(len(assets), nan)
+        get_single_asset_value = self._get_single_asset_value
+
+        # The prices of fetch_csv sources aren't in the pricing readers.
+        extra = np.array(
+            [
+                self._is_extra_source(
+                    asset, 'price', self._augmented_sources_map,
+                )
+                for asset in assets
+            ],
+            dtype=bool,
+        )
+        for ix in np.flatnonzero(extra):
+            prices[ix] = get_single_asset_value(
+                session_label,
+                assets[ix],
+                'price',
+                dt,
+                data_frequency,
+            )
+
+        alive = np.array(
+            [
+                not is_extra and
+                asset.start_date <= dt and session_label <= asset.end_date
+                for asset, is_extra in zip(assets, extra)
+            ],
+            dtype=bool,
+        )
+        if not alive.any():
+            return prices
+
+        if data_frequency == 'daily':
+            bar_dt = session_label
+        else:
+            bar_dt = dt
+        try:
+            closes = self._get_pricing_reader(
+                data_frequency,
+            ).load_raw_arrays(
+                ['close'],
+                bar_dt,
+                bar_dt,
+                [asset.sid for asset in assets[alive]],
+            )[0]
+        except (NoDataOnDate, ValueError):
+            # dt isn't a bar of one of the readers, e.g. an equity asset
+            # outside of its market hours: price every asset one at a time.
+            pass
+        else:
+            if len(closes):
+                prices[alive] = closes[-1]
+
+        # The assets which didn't trade at dt are forward filled one at a
+        # time, these are the least liquid ones.
+        for ix in np.flatnonzero(alive & np.isnan(prices)):
+            prices[ix] = get_single_asset_value(
+                session_label,
+                assets[ix],
+                'price',
+                dt,
+                data_frequency,
+            )
+
+        return prices
+
     def get_adjustments(self, assets, field, dt, perspective_dt):
         """
         Returns a list of adjustments between the dt and perspective_dt for the
@@ -12,6 +12,7 @@
 # limitations under the License.
 from datetime import timedelta
 
+import numpy as np
 import pandas as pd
 from zipline.data.data_portal import DataPortal
 
@@ -85,6 +86,18 @@ class DataPortalLive(DataPortal):
         realtime_bars.columns = assets
         return realtime_bars[-bar_count:]
 
+    def get_spot_prices(self, assets, dt, data_frequency):
+        # the prices come from the broker, one asset at a time.
+        return np.array(
+            [
+                self.get_scalar_asset_spot_value(
+                    asset, 'price', dt, data_frequency,
+                )
+                for asset in assets
+            ],
+            dtype='float64',
+        )
+
     def get_scalar_asset_spot_value(self, asset, field, dt, data_frequency):
         """
         Public API method that returns a scalar value representing the value
@@ -114,7 +127,9 @@ class DataPortalLive(DataPortal):
             'last_traded' the value will be a Timestamp.
         """
         if data_frequency == 'minute':
-            data_frequency = '1m'
+            # served from the broker's latest quotes, the realtime bars are
+            # only needed for the daily values.
+            return self.broker.get_spot_value(asset, field, dt, data_frequency)
         elif data_frequency == 'daily':
             data_frequency = '1d'
         prices = self.broker.get_realtime_bars([asset], data_frequency)
@@ -0,0 +1,357 @@
+# Copyright 2016 Quantopian, Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Minute bars stored as uncompressed, memory-mapped uint32 columns.
+
+Each field is one ``.npy`` file holding a ``(sids, positions)`` array, with
+the minutes of a sid contiguous and ``minutes_per_day`` positions per session
+like the bcolz minute bars. A window of many sids is read with a single
+gather from the map instead of decompressing one bcolz carray per sid, at the
+cost of storing every minute of every sid uncompressed.
+"""
+from glob import glob
+import os
+
+import bcolz
+import numpy as np
+import pandas as pd
+
+from zipline.data.bar_reader import NoDataForSid, NoDataOnDate
+from zipline.data.minute_bars import (
+    BcolzMinuteBarMetadata,
+    BcolzMinuteBarReader,
+    MinuteBarReader,
+)
+from zipline.gens.sim_engine import NANOS_IN_MINUTE
+from zipline.utils.cli import maybe_show_progress
+from zipline.utils.memoize import lazyval
+
+FIELDS = BcolzMinuteBarReader.FIELDS
+
+SIDS_FILENAME = 'sids.npy'
+
+# The number of minutes of volume read at once when looking for the last
+# traded minute of a sid.
+_LAST_TRADED_CHUNK_SESSIONS = 20
+
+
+def _column_filename(field):
+    return '{}.npy'.format(field)
+
+
+def _market_open_and_close_values(metadata):
+    """
+    The market opens and closes of the sessions of the minute bars described
+    by ``metadata``, as minutes since the epoch.
+    """
+    calendar = metadata.calendar
+    slicer = calendar.schedule.index.slice_indexer(
+        metadata.start_session,
+        metadata.end_session,
+    )
+    schedule = calendar.schedule[slicer]
+    return (
+        schedule.market_open.values.astype('datetime64[m]').astype(np.int64),
+        schedule.market_close.values.astype('datetime64[m]').astype(np.int64),
+    )
+
+
+def convert_bcolz_minute_bars(bcolz_rootdir, rootdir, show_progress=False):
+    """
+    Write the minute bars of a bcolz minute bar directory in the layout read
+    by :class:`MmapMinuteBarReader`.
+
+    Parameters
+    ----------
+    bcolz_rootdir : str
+        The root directory of data written by ``BcolzMinuteBarWriter``.
+    rootdir : str
+        The directory to write to, it is created if it doesn't exist.
+    show_progress : bool, optional
+        Show a progress bar over the sids.
+
+    Notes
+    -----
+    ``zipline.data.bundles.load`` reads the minute bars of an ingestion from a
+    ``minute_equities.mmap`` directory next to its ``minute_equities.bcolz``
+    one when it exists and its metadata matches the bcolz metadata. An
+    incremental ingest removes it, convert the bars again afterwards.
+    """
+    metadata = BcolzMinuteBarMetadata.read(bcolz_rootdir)
+
+    # The sid directories are laid out as 00/00/000001.bcolz.
+    sid_paths = sorted(
+        (int(os.path.basename(path)[:-len('.bcolz')]), path)
+        for path in glob(os.path.join(bcolz_rootdir, '*', '*', '*.bcolz'))
+    )
+    sids = np.array([sid for sid, _ in sid_paths], dtype='int64')
+
+    minutes_per_day = metadata.minutes_per_day
+    market_opens, market_closes = _market_open_and_close_values(metadata)
+    num_positions = minutes_per_day * len(market_opens)
+
+    # The positions past the early closes. The bcolz writer stores bars
+    # written after an early close there, the readers never return them.
+    sessions, deltas = np.divmod(np.arange(num_positions), minutes_per_day)
+    after_close = deltas > (market_closes - market_opens)[sessions]
+
+    if not os.path.isdir(rootdir):
+        os.makedirs(rootdir)
+
+    columns = {
+        field: np.lib.format.open_memmap(
+            os.path.join(rootdir, _column_filename(field)),
+            mode='w+',
+            dtype='uint32',
+            shape=(len(sids), num_positions),
+        )
+        for field in FIELDS
+    }
+
+    ctx = maybe_show_progress(
+        enumerate(sid_paths),
+        show_progress=show_progress,
+        item_show_func=lambda e: e if e is None else str(e[1][0]),
+        label='Converting minute bars:',
+    )
+    with ctx as it:
+        for row, (_, path) in it:
+            for field in FIELDS:
+                carray = bcolz.carray(
+                    rootdir=os.path.join(path, field),
+                    mode='r',
+                )
+                size = min(len(carray), num_positions)
+                column = columns[field]
+                column[row, :size] = carray[:size]
+                column[row, after_close] = 0
+
+    for column in columns.values():
+        column.flush()
+    np.save(os.path.join(rootdir, SIDS_FILENAME), sids)
+
+    # Written last, a directory without metadata is an incomplete conversion.
+    metadata.write(rootdir)
+
+
+class MmapMinuteBarReader(MinuteBarReader):
+    """
+    Reader for minute bars converted with :func:`convert_bcolz_minute_bars`.
+
+    Parameters
+    ----------
+    rootdir : string
+        The root directory containing the metadata, the sids and the column
+        files.
+
+    See Also
+    --------
+    zipline.data.minute_bars.BcolzMinuteBarReader
+    """
+    FIELDS = FIELDS
+
+    def __init__(self, rootdir):
+        self._rootdir = rootdir
+
+        metadata = BcolzMinuteBarMetadata.read(rootdir)
+
+        self._start_session = metadata.start_session
+        self._end_session = metadata.end_session
+
+        self.calendar = metadata.calendar
+        self._market_open_values, self._market_close_values = \
+            _market_open_and_close_values(metadata)
+        # The last position of each session, relative to its first one.
+        self._session_lengths = \
+            self._market_close_values - self._market_open_values
+
+        self._minutes_per_day = metadata.minutes_per_day
+
+        self._sids = np.load(os.path.join(rootdir, SIDS_FILENAME))
+
+        ohlc_inverses = np.full(
+            len(self._sids),
+            1.0 / metadata.default_ohlc_ratio,
+        )
+        for sid, ratio in (metadata.ohlc_ratios_per_sid or {}).items():
+            row = np.searchsorted(self._sids, sid)
+            if row < len(self._sids) and self._sids[row] == sid:
+                ohlc_inverses[row] = 1.0 / ratio
+        self._ohlc_inverses = ohlc_inverses
+
+        self._columns = {
+            field: np.load(
+                os.path.join(rootdir, _column_filename(field)),
+                mmap_mode='r',
+            )
+            for field in self.FIELDS
+        }
+
+    @property
+    def trading_calendar(self):
+        return self.calendar
+
+    @lazyval
+    def last_available_dt(self):
+        _, close = self.calendar.open_and_close_for_session(self._end_session)
+        return close
+
+    @property
+    def first_trading_day(self):
+        return self._start_session
+
+    def _rows_for_sids(self, sids):
+        # the sids may be assets.
+        sids = np.array([int(sid) for sid in sids], dtype='int64')
+        rows = np.searchsorted(self._sids, sids)
+        found = rows < len(self._sids)
+        found[found] = self._sids[rows[found]] == sids[found]
+        missing = ~found
+        if missing.any():
+            raise NoDataForSid(
+                'No minute data for sid {}.'.format(sids[missing][0]),
+            )
+        return rows
+
+    def _find_position_of_minute(self, minute_dt, forward_fill=False):
+        """
+        The position of the given minute in the list of every trading minute
+        since market open of the first trading day, see
+        ``BcolzMinuteBarReader._find_position_of_minute``.
+        """
+        minute_val = minute_dt.value // NANOS_IN_MINUTE
+        session = np.searchsorted(
+            self._market_open_values,
+            minute_val,
+            side='right',
+        ) - 1
+        if session < 0:
+            raise ValueError("Given minute is before the first market open")
+
+        delta = minute_val - self._market_open_values[session]
+        if not forward_fill and delta >= self._minutes_per_day:
+            raise ValueError("Given minute is not between an open and a close")
+
+        return (
+            session * self._minutes_per_day +
+            min(delta, self._session_lengths[session])
+        )
+
+    def _pos_to_minute(self, pos):
+        session, delta = divmod(pos, self._minutes_per_day)
+        return pd.Timestamp(
+            self._market_open_values[session] + delta,
+            tz='UTC',
+            unit='m',
+        )
+
+    def get_value(self, sid, dt, field):
+        """
+        Retrieve the pricing info for the given sid, dt, and field, see
+        ``BcolzMinuteBarReader.get_value``.
+        """
+        try:
+            minute_pos = self._find_position_of_minute(dt)
+        except ValueError:
+            raise NoDataOnDate()
+
+        row = self._rows_for_sids([sid])[0]
+        value = self._columns[field][row, minute_pos]
+        if value == 0:
+            if field == 'volume':
+                return 0
+            else:
+                return np.nan
+
+        if field != 'volume':
+            value *= self._ohlc_inverses[row]
+        return value
+
+    def get_last_traded_dt(self, asset, dt):
+        row = self._rows_for_sids([asset.sid])[0]
+        volumes = self._columns['volume'][row]
+
+        try:
+            end = self._find_position_of_minute(dt, forward_fill=True) + 1
+        except ValueError:
+            return pd.NaT
+
+        start_minute = asset.start_date.value // NANOS_IN_MINUTE
+        try:
+            start = self._find_position_of_minute(
+                pd.Timestamp(start_minute, unit='m', tz='UTC'),
+                forward_fill=True,
+            )
+        except ValueError:
+            start = 0
+        else:
+            # the asset starts after the position of start_minute if it isn't
+            # a market minute.
+            if self._pos_to_minute(start) < asset.start_date:
+                start += 1
+
+        # The positions past early closes are zeroed by the conversion, so
+        # any position with volume is a market minute.
+        chunk = _LAST_TRADED_CHUNK_SESSIONS * self._minutes_per_day
+        while end > start:
+            chunk_start = max(end - chunk, start)
+            traded = np.flatnonzero(volumes[chunk_start:end])
+            if len(traded):
+                return self._pos_to_minute(chunk_start + traded[-1])
+            end = chunk_start
+
+        return pd.NaT
+
+    def load_raw_arrays(self, fields, start_dt, end_dt, sids):
+        """
+        Parameters
+        ----------
+        fields : list of str
+           'open', 'high', 'low', 'close', or 'volume'
+        start_dt: Timestamp
+           Beginning of the window range.
+        end_dt: Timestamp
+           End of the window range.
+        sids : list of int
+           The asset identifiers in the window.
+
+        Returns
+        -------
+        list of np.ndarray
+            A list with an entry per field of ndarrays with shape
+            (minutes in range, sids) with a dtype of float64, containing the
+            values for the respective field over start and end dt range.
+        """
+        start_idx = self._find_position_of_minute(start_dt)
+        end_idx = self._find_position_of_minute(end_dt)
+
+        # Drop the positions past the early closes in the window.
+        positions = np.arange(start_idx, end_idx + 1)
+        sessions, deltas = np.divmod(positions, self._minutes_per_day)
+        market_minutes = deltas <= self._session_lengths[sessions]
+        if market_minutes.all():
+            market_minutes = slice(None)
+
+        rows = self._rows_for_sids(sids)
+        results = []
+        for field in fields:
+            values = self._columns[field][rows, start_idx:end_idx + 1]
+            values = values[:, market_minutes].T
+            if field != 'volume':
+                out = values * self._ohlc_inverses[rows]
+                out[values == 0] = np.nan
+            else:
+                out = np.ascontiguousarray(values)
+            results.append(out)
+        return results
@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from functools import partial
+from io import StringIO
 
+from lru import LRU
 import psycopg2
 import sqlalchemy as sa
 
@@ -41,6 +43,7 @@ from zipline.data.bar_reader import (
     NoDataBeforeDate,
     NoDataOnDate,
 )
+from zipline.utils.db_utils import group_into_chunks
 from zipline.utils.functional import apply
 from zipline.utils.input_validation import expect_element
 from zipline.utils.numpy_utils import float64_dtype
@@ -59,6 +62,31 @@ UINT32_MAX = iinfo(np.uint32).max
 
 TABLE = 'ohlcv_daily'
 
+# Fields stored in a cached block, in block-row order.
+BLOCK_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+_BLOCK_FIELD_IX = {field: ix for ix, field in enumerate(BLOCK_FIELDS)}
+
+# Number of sessions covered by a single cached (sid, block) entry.
+DEFAULT_BLOCK_SIZE = 256
+# Number of (sid, block) entries kept in memory. Each block holds
+# len(BLOCK_FIELDS) * block_size float64 values (~10KB with the defaults).
+DEFAULT_BLOCK_CACHE_SIZE = 20000
+# Number of rows pulled from the server-side cursor per round trip.
+DEFAULT_FETCH_SIZE = 50000
+
+# Number of rows buffered by the writer before they are flushed to the db.
+DEFAULT_WRITE_BATCH_SIZE = 500000
+# Column order of the rows sent to the db by the writer.
+WRITE_COLUMNS = ('id', 'day', 'open', 'high', 'low', 'close', 'volume')
+
+
+def _days_to_ns(days):
+    """
+    Convert a column of dates read from the database to an array of epoch
+    nanoseconds of the corresponding (midnight UTC) sessions.
+    """
+    return pd.DatetimeIndex(pd.to_datetime(days, utc=True)).normalize().asi8
+
 
 class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
     """
@@ -75,6 +103,20 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         all of the data for all assets into memory and then indexing into that
         array for each day and asset pair.  Used to tune performance of reads
         when using a small or large number of equities.
+        Only used when ``windowed_reads`` is False.
+    windowed_reads : bool, optional
+        If True (the default), only the requested sids and sessions are read
+        from the database, with all OHLCV fields fetched in a single query
+        through a server-side cursor, and the results are kept in a bounded
+        block cache. If False, every requested column is read in full for all
+        sids and days and kept in memory for the lifetime of the reader.
+    block_size : int, optional
+        The number of sessions per cached block when ``windowed_reads`` is
+        True.
+    block_cache_size : int, optional
+        The maximum number of (sid, block) entries kept in the block cache.
+    fetch_size : int, optional
+        The number of rows fetched per round trip from the server-side cursor.
 
     Attributes
     ----------
@@ -132,9 +174,24 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
     zipline.data.bcolz_daily_bars.BcolzDailyBarWriter
     """
 
-    def __init__(self, path, read_all_threshold=3000):
+    def __init__(self,
+                 path,
+                 read_all_threshold=3000,
+                 windowed_reads=True,
+                 block_size=DEFAULT_BLOCK_SIZE,
+                 block_cache_size=DEFAULT_BLOCK_CACHE_SIZE,
+                 fetch_size=DEFAULT_FETCH_SIZE):
         self.conn = check_and_create_engine(path, False)
 
+        self._windowed_reads = windowed_reads
+        self._block_size = block_size
+        self._fetch_size = fetch_size
+        # Map from (sid, block_ix) -> ndarray of shape
+        # (len(BLOCK_FIELDS), block_size) holding the raw values of the
+        # sessions [block_ix * block_size, (block_ix + 1) * block_size).
+        self._blocks = LRU(block_cache_size)
+        self._asset_bounds_c = None
+
         # Cache of fully read np.array for the carrays in the daily bar table.
         # raw_array does not use the same cache, but it could.
         # Need to test keeping the entire array in memory for the course of a
@@ -182,6 +239,22 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
     def last_available_dt(self):
         return self.sessions[-1]
 
+    def data_version(self):
+        """
+        Identifies the stored bars, it changes whenever bars are added to the
+        table. Unlike the other properties it is queried on every call.
+
+        Returns
+        -------
+        version : str
+            The number of rows and the last day of the table.
+        """
+        info = pd.read_sql(
+            'SELECT COUNT(*) AS ct, MAX(day) AS last_day FROM ohlcv_daily',
+            self.conn,
+        )
+        return '{}:{}'.format(info['ct'][0], info['last_day'][0])
+
     @property
     def _calendar_offsets(self):
         if not self._calendar_offsets_c:
@@ -295,6 +368,11 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
             raise NoDataOnDate(date)
 
     def load_raw_arrays(self, columns, start_date, end_date, assets):
+        if self._windowed_reads:
+            return self._load_raw_arrays_windowed(
+                columns, start_date, end_date, assets,
+            )
+
         for col in columns:
             self._spot_col(col)
 
@@ -365,7 +443,259 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
             col = self._spot_cols[colname] = np.array(result)
         return col
 
+    @property
+    def _asset_bounds(self):
+        if self._asset_bounds_c is None:
+            self._asset_bounds_c = self._get_asset_bounds()
+        return self._asset_bounds_c
+
+    def _get_asset_bounds(self):
+        """
+        Map from sid -> (first session index, last session index) of the
+        data stored for that sid, computed with a single aggregate query.
+        """
+        info = pd.read_sql(
+            'SELECT id, MIN(day) AS first_day, MAX(day) AS last_day '
+            'FROM ohlcv_daily GROUP BY id',
+            self.conn,
+        )
+        sessions = self.sessions
+        if len(sessions) == 0 or info.empty:
+            return {}
+
+        first = np.searchsorted(sessions.asi8, _days_to_ns(info['first_day']))
+        last = np.searchsorted(sessions.asi8, _days_to_ns(info['last_day']))
+        return {
+            int(sid): (int(first_ix), int(last_ix))
+            for sid, first_ix, last_ix in zip(info['id'], first, last)
+        }
+
+    def _empty_block(self):
+        return np.zeros(
+            (len(BLOCK_FIELDS), self._block_size),
+            dtype=float64_dtype,
+        )
+
+    def _fetch_blocks(self, sids, first_block, last_block):
+        """
+        Read all OHLCV fields for ``sids`` over the sessions covered by
+        blocks ``first_block`` through ``last_block`` (inclusive).
+
+        Rows are streamed from a server-side cursor ``fetch_size`` rows at a
+        time and scattered directly into per-(sid, block) arrays, so the full
+        result set is never materialized as Python objects at once.
+
+        Returns
+        -------
+        blocks : dict[(int, int) -> np.ndarray]
+            The freshly read blocks. Blocks for which the database has no rows
+            are returned zero-filled.
+        """
+        sessions = self.sessions
+        session_ns = sessions.asi8
+        block_size = self._block_size
+
+        start_ix = first_block * block_size
+        end_ix = min((last_block + 1) * block_size, len(sessions)) - 1
+
+        blocks = {
+            (sid, block_ix): self._empty_block()
+            for sid in sids
+            for block_ix in range(first_block, last_block + 1)
+        }
+
+        table = sa.table(
+            TABLE,
+            sa.column('id'),
+            sa.column('day', sa.Date),
+            *(sa.column(field) for field in BLOCK_FIELDS)
+        )
+        columns = [table.c.id, table.c.day]
+        columns.extend(table.c[field] for field in BLOCK_FIELDS)
+
+        with self.conn.connect() as conn:
+            # stream_results makes psycopg2 use a named (server-side) cursor.
+            conn = conn.execution_options(stream_results=True)
+            for sid_chunk in group_into_chunks(sids):
+                query = sa.select(columns).where(
+                    table.c.id.in_(sid_chunk)
+                ).where(
+                    table.c.day.between(
+                        sessions[start_ix].date(),
+                        sessions[end_ix].date(),
+                    )
+                )
+                result = conn.execute(query)
+                try:
+                    while True:
+                        rows = result.fetchmany(self._fetch_size)
+                        if not rows:
+                            break
+                        self._scatter_rows(rows, blocks, session_ns)
+                finally:
+                    result.close()
+
+        return blocks
+
+    def _scatter_rows(self, rows, blocks, session_ns):
+        frame = pd.DataFrame.from_records(
+            rows,
+            columns=('id', 'day') + BLOCK_FIELDS,
+        )
+        days = _days_to_ns(frame['day'])
+        positions = np.searchsorted(session_ns, days)
+        # Ignore rows which do not fall on a session of the calendar.
+        on_session = positions < len(session_ns)
+        on_session[on_session] = (
+            session_ns[positions[on_session]] == days[on_session]
+        )
+
+        sids = frame['id'].values[on_session].astype(np.int64)
+        positions = positions[on_session]
+        values = frame[list(BLOCK_FIELDS)].values[on_session].astype(
+            float64_dtype,
+        )
+        block_ixs, offsets = np.divmod(positions, self._block_size)
+
+        # Rows come back in no particular order; group them by block so each
+        # block is written with a single fancy-indexed assignment.
+        keys = np.stack([sids, block_ixs], axis=1)
+        unique_keys, inverse = np.unique(keys, axis=0, return_inverse=True)
+        order = np.argsort(inverse, kind='mergesort')
+        splits = np.flatnonzero(np.diff(inverse[order])) + 1
+        for (sid, block_ix), group in zip(unique_keys,
+                                          np.split(order, splits)):
+            block = blocks[int(sid), int(block_ix)]
+            block[:, offsets[group]] = values[group].T
+
+    def _get_blocks(self, sids, first_block, last_block):
+        """
+        Get the blocks for ``sids`` over ``first_block`` through
+        ``last_block``, reading the ones not in the block cache with a single
+        multi-sid query.
+        """
+        cache = self._blocks
+        blocks = {}
+        missing_sids = set()
+        missing_first = last_block + 1
+        missing_last = first_block - 1
+        for sid in sids:
+            for block_ix in range(first_block, last_block + 1):
+                key = (sid, block_ix)
+                try:
+                    blocks[key] = cache[key]
+                except KeyError:
+                    missing_sids.add(sid)
+                    missing_first = min(missing_first, block_ix)
+                    missing_last = max(missing_last, block_ix)
+
+        if missing_sids:
+            fetched = self._fetch_blocks(
+                sorted(missing_sids),
+                missing_first,
+                missing_last,
+            )
+            for key, block in iteritems(fetched):
+                cache[key] = block
+            blocks.update(fetched)
+
+        return blocks
+
+    def _load_raw_arrays_windowed(self, columns, start_date, end_date, assets):
+        start_idx = self._load_raw_arrays_date_to_index(start_date)
+        end_idx = self._load_raw_arrays_date_to_index(end_date)
+
+        bounds = self._asset_bounds
+        sids = [int(asset) for asset in assets]
+        known_sids = sorted({
+            sid for sid in sids
+            if sid in bounds and
+            bounds[sid][0] <= end_idx and bounds[sid][1] >= start_idx
+        })
+
+        block_size = self._block_size
+        first_block = start_idx // block_size
+        last_block = end_idx // block_size
+        blocks = self._get_blocks(known_sids, first_block, last_block)
+
+        shape = (end_idx - start_idx + 1, len(sids))
+        results = []
+        for column in columns:
+            field_ix = _BLOCK_FIELD_IX[column]
+            outbuf = np.zeros(shape, dtype=float64_dtype)
+            for asset_ix, sid in enumerate(sids):
+                if sid not in bounds:
+                    # This is an unknown asset, leave its slot empty.
+                    continue
+                for block_ix in range(first_block, last_block + 1):
+                    try:
+                        block = blocks[sid, block_ix]
+                    except KeyError:
+                        # The asset has no data in the requested window.
+                        break
+                    block_start = block_ix * block_size
+                    lo = max(start_idx, block_start)
+                    hi = min(end_idx, block_start + block_size - 1)
+                    outbuf[lo - start_idx:hi - start_idx + 1, asset_ix] = \
+                        block[field_ix, lo - block_start:hi - block_start + 1]
+
+            if column in OHLC:
+                outbuf[outbuf == 0] = nan
+            results.append(outbuf)
+
+        return results
+
+    def _windowed_day_loc(self, sid, day):
+        try:
+            day_loc = self.sessions.get_loc(day)
+        except Exception:
+            raise NoDataOnDate("day={0} is outside of calendar={1}".format(
+                day, self.sessions))
+        first, last = self._asset_bounds[sid]
+        if day_loc < first:
+            raise NoDataBeforeDate(
+                "No data on or before day={0} for sid={1}".format(
+                    day, sid))
+        if day_loc > last:
+            raise NoDataAfterDate(
+                "No data on or after day={0} for sid={1}".format(
+                    day, sid))
+        return day_loc
+
+    def _get_value_windowed(self, sid, dt, field):
+        day_loc = self._windowed_day_loc(sid, dt)
+        block_ix, offset = divmod(day_loc, self._block_size)
+        block = self._get_blocks([sid], block_ix, block_ix)[sid, block_ix]
+        return block[_BLOCK_FIELD_IX[field], offset]
+
+    def _get_last_traded_dt_windowed(self, asset, day):
+        sid = int(asset)
+        try:
+            day_loc = self._windowed_day_loc(sid, day)
+        except (NoDataBeforeDate, NoDataOnDate):
+            return NaT
+        except NoDataAfterDate:
+            day_loc = self._asset_bounds[sid][1]
+
+        first = self._asset_bounds[sid][0]
+        block_size = self._block_size
+        volume_ix = _BLOCK_FIELD_IX['volume']
+        block_ix = day_loc // block_size
+        while block_ix >= first // block_size:
+            block = self._get_blocks([sid], block_ix, block_ix)[sid, block_ix]
+            block_start = block_ix * block_size
+            hi = day_loc - block_start + 1
+            traded = np.flatnonzero(block[volume_ix, :hi])
+            if len(traded):
+                return self.sessions[block_start + traded[-1]]
+            day_loc = block_start - 1
+            block_ix -= 1
+        return NaT
+
     def get_last_traded_dt(self, asset, day):
+        if self._windowed_reads:
+            return self._get_last_traded_dt_windowed(asset, day)
+
         volumes = self._spot_col('volume')
 
         search_day = day
@@ -446,9 +776,11 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
             Returns -1 if the day is within the date range, but the price is
             0.
         """
-        ix = self.sid_day_index(sid, dt)
-
-        price = self._spot_col(field)[ix]
+        if self._windowed_reads:
+            price = self._get_value_windowed(sid, dt, field)
+        else:
+            ix = self.sid_day_index(sid, dt)
+            price = self._spot_col(field)[ix]
         if field != 'volume':
             if price == 0:
                 return nan
@@ -457,11 +789,53 @@ class PSQLDailyBarReader(CurrencyAwareSessionBarReader):
         else:
             return price
 
+    def get_stored_session_bounds(self, sids=None):
+        """
+        Parameters
+        ----------
+        sids : iterable[int], optional
+            The asset identifiers. By default all the sids with stored data.
+
+        Returns
+        -------
+        bounds : pd.DataFrame
+            Frame indexed by sid with the ``first_session`` and
+            ``last_session`` of the data stored for each sid. Both are NaT for
+            sids with no stored data.
+        """
+        sessions = self.sessions
+        asset_bounds = self._asset_bounds
+
+        sids = list(sids) if sids is not None else sorted(asset_bounds)
+        first = []
+        last = []
+        for sid in sids:
+            try:
+                first_ix, last_ix = asset_bounds[sid]
+            except KeyError:
+                first.append(NaT)
+                last.append(NaT)
+            else:
+                first.append(sessions[first_ix])
+                last.append(sessions[last_ix])
+
+        return pd.DataFrame(
+            {
+                'first_session': pd.DatetimeIndex(first, tz='UTC'),
+                'last_session': pd.DatetimeIndex(last, tz='UTC'),
+            },
+            index=sids,
+            columns=['first_session', 'last_session'],
+        )
+
     def currency_codes(self, sids):
         # XXX: This is pretty inefficient. This reader doesn't really support
         # country codes, so we always either return USD or None if we don't
         # know about the sid at all.
-        first_rows = self._first_rows
+        if self._windowed_reads:
+            first_rows = self._asset_bounds
+        else:
+            first_rows = self._first_rows
         out = []
         for sid in sids:
             if sid in first_rows:
@@ -486,6 +860,13 @@ class PSQLDailyBarWriter(object):
         Midnight UTC session label.
     end_session: pd.Timestamp
         Midnight UTC session label.
+    batch_size : int, optional
+        The number of rows buffered before they are flushed to the db. On
+        postgres each flush is a single ``COPY ... FROM STDIN``.
+    rebuild_indexes : bool, optional
+        Whether to drop the table indexes before a write and rebuild them
+        once all the data is loaded. This is faster for large initial loads,
+        but makes the table slow to query while the write is in progress.
 
     See Also
     --------
@@ -499,8 +880,16 @@ class PSQLDailyBarWriter(object):
         'volume': float64_dtype,
     }
 
-    def __init__(self, db_path, calendar, start_session, end_session):
+    def __init__(self,
+                 db_path,
+                 calendar,
+                 start_session,
+                 end_session,
+                 batch_size=DEFAULT_WRITE_BATCH_SIZE,
+                 rebuild_indexes=False):
         self.conn = check_and_create_engine(db_path, False)
+        self._batch_size = batch_size
+        self._rebuild_indexes = rebuild_indexes
 
         if start_session != end_session:
             if not calendar.is_session(start_session):
@@ -566,7 +955,9 @@ class PSQLDailyBarWriter(object):
             sa.Column('volume', sa.BigInteger()),
         )
 
-        sa.Index('id_day', ohlcv_daily.c.id, ohlcv_daily.c.day)
+        self._indexes = [
+            sa.Index('id_day', ohlcv_daily.c.id, ohlcv_daily.c.day),
+        ]
 
         metadata.create_all(self.conn)
 
@@ -603,9 +994,17 @@ class PSQLDailyBarWriter(object):
         table : bcolz.ctable
             The newly-written table.
         """
+        # Look up the dates already stored for every sid with one query up
+        # front, instead of one round trip per sid.
+        existing_edge_days = self._get_existing_data_dates_for_all_sids()
         ctx = maybe_show_progress(
             (
-                (sid, self._write_to_postgres(sid, df, invalid_data_behavior))
+                (sid, self._write_to_postgres(
+                    sid,
+                    df,
+                    invalid_data_behavior,
+                    existing_edge_days,
+                ))
                 for sid, df in data
             ),
             show_progress=show_progress,
@@ -662,11 +1061,84 @@ class PSQLDailyBarWriter(object):
 
                     yield asset_id, table
 
-        for asset_id, table in iterator:
-            # when writing to db, drop timezone, will crash otherwise
-            if not table.empty:
+        batch = []
+        batch_len = 0
+        drop_indexes = self._rebuild_indexes
+        try:
+            for asset_id, table in iterator:
+                if table.empty:
+                    continue
+                if drop_indexes:
+                    # only drop the indexes once we know there is something
+                    # to write, empty writes are used to ensure the table.
+                    self._drop_indexes()
+                    drop_indexes = False
+                # when writing to db, drop timezone, will crash otherwise
                 table.index = table.index.tz_localize(None)
-                table.to_sql('ohlcv_daily', self.conn, if_exists='append')
+                batch.append(table)
+                batch_len += len(table)
+                if batch_len >= self._batch_size:
+                    self._flush(batch)
+                    batch = []
+                    batch_len = 0
+
+            if batch:
+                self._flush(batch)
+        finally:
+            if self._rebuild_indexes and not drop_indexes:
+                self._create_indexes()
+
+    def _drop_indexes(self):
+        with self.conn.begin() as conn:
+            for index in self._indexes:
+                conn.execute('DROP INDEX IF EXISTS {}'.format(index.name))
+
+    def _create_indexes(self):
+        with self.conn.begin() as conn:
+            for index in self._indexes:
+                conn.execute(
+                    'CREATE INDEX IF NOT EXISTS {} ON {} ({})'.format(
+                        index.name,
+                        TABLE,
+                        ', '.join(column.name for column in index.columns),
+                    )
+                )
+
+    def _flush(self, tables):
+        """
+        Write a batch of per-sid frames to the db in one go.
+        """
+        frame = pd.concat(tables).reset_index()
+        frame = frame.reindex(columns=list(WRITE_COLUMNS))
+        # the volume column is a bigint, COPY doesn't accept '100.0'.
+        frame['volume'] = frame['volume'].fillna(0).round().astype(np.int64)
+        # write the plain date, matching the DATE column in postgres.
+        frame['day'] = frame['day'].dt.date
+
+        if self.conn.dialect.name == 'postgresql':
+            self._copy_to_postgres(frame)
+        else:
+            # e.g. a sqlite stand-in, which has no COPY.
+            frame.to_sql(TABLE, self.conn, if_exists='append', index=False)
+
+    def _copy_to_postgres(self, frame):
+        buf = StringIO()
+        frame.to_csv(buf, header=False, index=False)
+        buf.seek(0)
+
+        raw_conn = self.conn.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.copy_expert(
+                'COPY {} ({}) FROM STDIN WITH (FORMAT csv)'.format(
+                    TABLE,
+                    ', '.join(WRITE_COLUMNS),
+                ),
+                buf,
+            )
+            raw_conn.commit()
+        finally:
+            raw_conn.close()
 
     def _ensure_sessions_consistency(self, data_slice, invalid_data_behavior):
         """
@@ -711,14 +1183,17 @@ class PSQLDailyBarWriter(object):
         return val
 
     @expect_element(invalid_data_behavior={'warn', 'raise', 'ignore'})
-    def _write_to_postgres(self, sid, data: pd.DataFrame, invalid_data_behavior):
+    def _write_to_postgres(self, sid, data: pd.DataFrame, invalid_data_behavior, existing_edge_days=None):
 
         result = self._format_df_columns_and_index(data, sid)
         if not result.empty:
             # set proper id
             data['id'] = sid
 
-            edge_days = self._get_exisiting_data_dates_from_db(sid)
+            if existing_edge_days is None:
+                edge_days = self._get_exisiting_data_dates_from_db(sid)
+            else:
+                edge_days = self._edge_days_for_sid(existing_edge_days, sid)
 
             if not self._data_for_sid_already_exist_in_db(edge_days):
                 # this asset is still not in the DB. we write everything we got
@@ -755,7 +1230,7 @@ class PSQLDailyBarWriter(object):
                                f"and not consistent. will not be written to db.")
                 consistent_data = False
         if not after_slice.empty:
-            forward_gap = len(self._calendar.sessions_in_range(last_day, after_slice.index[-1]))
+            forward_gap = len(self._calendar.sessions_in_range(last_day, after_slice.index[0].tz_localize(None)))
             if forward_gap != 2:
                 logger.warning(f"data for {sid} contains forward gaps {forward_gap} "
                                f"and not consistent. will not be written to db.")
@@ -790,6 +1265,30 @@ class PSQLDailyBarWriter(object):
         )
         return edge_days
 
+    def _get_existing_data_dates_for_all_sids(self):
+        """
+        query the db once and get the dates (start and end) for data stored in db for every sid
+        :return: DataFrame of last_day, first_day indexed by sid
+        """
+        return pd.read_sql(
+            'SELECT id, MAX(day) as last_day, MIN(day) as first_day '
+            'FROM ohlcv_daily GROUP BY id',
+            self.conn,
+            parse_dates=['last_day', 'first_day'],
+            index_col='id',
+        )
+
+    def _edge_days_for_sid(self, existing_edge_days, sid):
+        """
+        get the edge days of a single sid, in the same structure as _get_exisiting_data_dates_from_db
+        """
+        if sid in existing_edge_days.index:
+            row = existing_edge_days.loc[sid]
+            last_day, first_day = row['last_day'], row['first_day']
+        else:
+            last_day = first_day = NaT
+        return pd.DataFrame({'last_day': [last_day], 'first_day': [first_day]})
+
     def _format_df_columns_and_index(self, data: pd.DataFrame, sid):
         """
         make sure that the data received is in the structure we expect columns and index wise.
@@ -0,0 +1,211 @@
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from threading import Lock, Thread
+
+from logbook import Logger
+import numpy as np
+import pandas as pd
+
+from zipline.data.bar_reader import OHLCV
+
+log = Logger('RealtimeBars')
+
+DEFAULT_CAPACITY = 500
+
+_FIELD_IX = {field: ix for ix, field in enumerate(OHLCV)}
+
+
+class MinuteBarRingBuffer(object):
+    """
+    In memory store of the most recent minute bars of live streamed symbols.
+
+    Every symbol gets a fixed size ring buffer of ``capacity`` bars, the
+    oldest bars are overwritten once it is full. The buffer is updated from
+    a consumer thread and read from the algorithm thread.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The number of bars kept for each symbol.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._capacity = capacity
+        self._lock = Lock()
+        # symbol -> minute labels (ns since epoch) and ohlcv values
+        self._dts = {}
+        self._values = {}
+        # symbol -> number of bars ever written
+        self._counts = {}
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    def __contains__(self, symbol):
+        return self._counts.get(symbol, 0) > 0
+
+    def _ensure_symbol(self, symbol):
+        if symbol not in self._counts:
+            self._dts[symbol] = np.zeros(self._capacity, dtype='int64')
+            self._values[symbol] = np.full(
+                (self._capacity, len(OHLCV)), np.nan,
+            )
+            self._counts[symbol] = 0
+
+    def _last_dt(self, symbol):
+        count = self._counts[symbol]
+        if not count:
+            return None
+        return self._dts[symbol][(count - 1) % self._capacity]
+
+    def update(self, symbol, dt, open, high, low, close, volume):
+        """
+        Add a bar. A bar for the minute of the most recent bar replaces it,
+        bars older than that are ignored.
+        """
+        dt = pd.Timestamp(dt).value
+        with self._lock:
+            self._ensure_symbol(symbol)
+            count = self._counts[symbol]
+            last_dt = self._last_dt(symbol)
+            if last_dt is not None and dt < last_dt:
+                return
+            if last_dt is None or dt > last_dt:
+                count += 1
+                self._counts[symbol] = count
+            ix = (count - 1) % self._capacity
+            self._dts[symbol][ix] = dt
+            self._values[symbol][ix] = open, high, low, close, volume
+
+    def extend(self, symbol, bars):
+        """
+        Add the bars of a frame with ohlcv columns, e.g. to seed the buffer
+        with the bars fetched before subscribing to the stream. Only the bars
+        after the most recent one are added.
+        """
+        dts = pd.DatetimeIndex(bars.index)
+        if dts.tz is not None:
+            dts = dts.tz_convert('UTC')
+        dts = dts.asi8
+        values = bars.reindex(columns=OHLCV).values.astype('float64')
+        with self._lock:
+            self._ensure_symbol(symbol)
+            last_dt = self._last_dt(symbol)
+            if last_dt is not None:
+                newer = dts > last_dt
+                dts, values = dts[newer], values[newer]
+            dts, values = dts[-self._capacity:], values[-self._capacity:]
+
+            count = self._counts[symbol]
+            ix = np.arange(count, count + len(dts)) % self._capacity
+            self._dts[symbol][ix] = dts
+            self._values[symbol][ix] = values
+            self._counts[symbol] = count + len(dts)
+
+    def _ordered(self, symbol):
+        """
+        The bars of ``symbol``, oldest first. Must be called with the lock
+        held.
+        """
+        count = self._counts.get(symbol, 0)
+        if count <= self._capacity:
+            return self._dts[symbol][:count], self._values[symbol][:count]
+        start = count % self._capacity
+        order = np.r_[start:self._capacity, 0:start]
+        return self._dts[symbol][order], self._values[symbol][order]
+
+    def bars(self, symbols, bar_count=None):
+        """
+        The buffered bars of ``symbols``.
+
+        Returns
+        -------
+        bars : pd.DataFrame
+            Frame indexed by minute, with the symbols as level 0 and the ohlcv
+            fields as level 1 of the columns, like
+            ``Broker.get_realtime_bars``.
+        """
+        frames = []
+        with self._lock:
+            for symbol in symbols:
+                if symbol in self:
+                    dts, values = self._ordered(symbol)
+                else:
+                    dts, values = np.array([], dtype='int64'), np.empty((0, 5))
+                frames.append(pd.DataFrame(
+                    values,
+                    index=pd.DatetimeIndex(dts, tz='UTC'),
+                    columns=OHLCV,
+                ))
+        df = pd.concat(frames, axis=1, keys=list(symbols))
+        if bar_count is not None:
+            df = df.iloc[-bar_count:]
+        return df
+
+    def spot_value(self, symbol, field):
+        """
+        The ``field`` of the most recent bar of ``symbol``, ``field`` is one
+        of the ohlcv fields, 'price' or 'last_traded'.
+
+        Raises
+        ------
+        KeyError
+            If there are no bars for ``symbol``.
+        """
+        with self._lock:
+            if symbol not in self:
+                raise KeyError(symbol)
+            ix = (self._counts[symbol] - 1) % self._capacity
+            if field == 'last_traded':
+                return pd.Timestamp(self._dts[symbol][ix], tz='UTC')
+            if field == 'price':
+                field = 'close'
+            value = self._values[symbol][ix, _FIELD_IX[field]]
+        if field == 'volume':
+            return int(value)
+        return value
+
+    def last_traded_dt(self, symbol):
+        return self.spot_value(symbol, 'last_traded')
+
+
+class BarQueueConsumer(Thread):
+    """
+    Thread moving the bars a stream puts on ``queue`` into ``buffer``.
+
+    Bars are ``(symbol, dt, open, high, low, close, volume)`` tuples, a
+    ``None`` stops the consumer.
+    """
+
+    def __init__(self, queue, buffer):
+        super(BarQueueConsumer, self).__init__(name='BarQueueConsumer')
+        self.daemon = True
+        self._queue = queue
+        self._buffer = buffer
+
+    def run(self):
+        while True:
+            bar = self._queue.get()
+            try:
+                if bar is None:
+                    return
+                self._buffer.update(*bar)
+            except Exception as e:
+                log.error('Dropping bar {}: {}'.format(bar, e))
+            finally:
+                self._queue.task_done()
+
+    def stop(self):
+        self._queue.put(None)
+        self.join()
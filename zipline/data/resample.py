@@ -28,6 +28,7 @@ from zipline.data._resample import (
 from zipline.data.bar_reader import NoDataOnDate
 from zipline.data.minute_bars import MinuteBarReader
 from zipline.data.session_bars import SessionBarReader
+from zipline.utils.cache import dataframe_cache
 from zipline.utils.memoize import lazyval
 
 _MINUTE_TO_SESSION_OHCLV_HOW = OrderedDict((
@@ -38,6 +39,12 @@ _MINUTE_TO_SESSION_OHCLV_HOW = OrderedDict((
     ('volume', 'sum'),
 ))
 
+_OHLCV = list(_MINUTE_TO_SESSION_OHCLV_HOW)
+
+# The number of sessions resampled at once when writing the session bars of
+# assets to the cache directory of a MinuteResampleSessionBarReader.
+_CACHE_CHUNK_SESSIONS = 63
+
 
 def minute_frame_to_session_frame(minute_frame, calendar):
 
@@ -100,6 +107,156 @@ def minute_to_session(column, close_locs, data, out):
     return out
 
 
+def minute_to_session_2d(column, close_locs, data, out):
+    """
+    Resample a 2-D array with the minute data of many assets into an array
+    with session data, reducing every asset at once.
+
+    The values are the same as the ones of :func:`minute_to_session` applied
+    to each column.
+
+    Parameters
+    ----------
+    column : str
+        The `open`, `high`, `low`, `close`, or `volume` column.
+    close_locs : array[intp]
+        The locations in `data` which are the market close minutes.
+    data : array[float64|uint32]
+        The minute data to be sampled into session data, with shape
+        (minutes, assets).
+        The first row should align with the market open of the first session,
+        containing values for all minutes for all sessions. With the last row
+        being the market close of the last session.
+    out : array[float64|uint32]
+        The output array into which to write the sampled sessions, with shape
+        (sessions, assets).
+    """
+    if not len(close_locs):
+        return out
+
+    data = data[:close_locs[-1] + 1]
+    open_locs = np.empty_like(close_locs)
+    open_locs[0] = 0
+    open_locs[1:] = close_locs[:-1] + 1
+
+    if column == 'open' or column == 'close':
+        minutes = np.arange(len(data))[:, np.newaxis]
+        has_value = ~np.isnan(data)
+        if column == 'open':
+            # The first minute with a value at or after each minute.
+            locs = np.where(has_value, minutes, len(data))
+            locs = np.minimum.accumulate(locs[::-1], axis=0)[::-1][open_locs]
+            found = locs <= close_locs[:, np.newaxis]
+        else:
+            # The last minute with a value at or before each minute.
+            locs = np.where(has_value, minutes, -1)
+            locs = np.maximum.accumulate(locs, axis=0)[close_locs]
+            found = locs >= open_locs[:, np.newaxis]
+        values = data[np.where(found, locs, 0), np.arange(data.shape[1])]
+        out[...] = np.where(found, values, np.nan)
+    elif column == 'high':
+        # Like the 1-D kernel, start from -1 and skip the missing minutes.
+        highs = np.maximum.reduceat(
+            np.where(np.isnan(data), -1, data),
+            open_locs,
+            axis=0,
+        )
+        highs = np.maximum(highs, -1)
+        out[...] = np.where(highs == -1, np.nan, highs)
+    elif column == 'low':
+        max_float = np.finfo(np.float64).max
+        lows = np.minimum.reduceat(
+            np.where(np.isnan(data), max_float, data),
+            open_locs,
+            axis=0,
+        )
+        lows = np.minimum(lows, max_float)
+        out[...] = np.where(lows == max_float, np.nan, lows)
+    elif column == 'volume':
+        out[...] = np.add.reduceat(data, open_locs, axis=0, dtype=np.uint32)
+    return out
+
+
+class _SessionAggregates(object):
+    """
+    The running aggregation of one field over a session, for each asset seen
+    so far in the session.
+
+    ``positions`` maps each asset to its position in ``last_visited``, the
+    last minute aggregated for the asset as an int, and ``values``, the
+    aggregation up to that minute.
+    """
+    NOT_VISITED = -1
+
+    def __init__(self, session, market_open, fill_value, dtype):
+        self.session = session
+        self.market_open = market_open
+        self.fill_value = fill_value
+        self.positions = {}
+        self.last_visited = np.empty(0, dtype=np.int64)
+        self.values = np.empty(0, dtype=dtype)
+
+    def positions_of(self, assets):
+        positions = self.positions
+        out = np.array(
+            [positions.setdefault(asset, len(positions)) for asset in assets],
+            dtype=np.intp,
+        )
+
+        capacity = len(self.values)
+        if len(positions) > capacity:
+            capacity = max(len(positions), 2 * capacity)
+            last_visited = np.full(capacity, self.NOT_VISITED, dtype=np.int64)
+            last_visited[:len(self.last_visited)] = self.last_visited
+            values = np.full(
+                capacity,
+                self.fill_value,
+                dtype=self.values.dtype,
+            )
+            values[:len(self.values)] = self.values
+            self.last_visited = last_visited
+            self.values = values
+
+        return out
+
+
+def _aggregate_open(window, values):
+    # The first open of the session is kept once it is seen.
+    has_value = ~np.isnan(window)
+    first = window[has_value.argmax(axis=0), np.arange(window.shape[1])]
+    first[~has_value.any(axis=0)] = np.nan
+    return np.where(np.isnan(values), first, values)
+
+
+def _aggregate_high(window, values):
+    return np.fmax(values, np.fmax.reduce(window, axis=0))
+
+
+def _aggregate_low(window, values):
+    return np.fmin(values, np.fmin.reduce(window, axis=0))
+
+
+def _aggregate_close(window, values):
+    has_value = ~np.isnan(window)
+    last_locs = len(window) - 1 - has_value[::-1].argmax(axis=0)
+    last = window[last_locs, np.arange(window.shape[1])]
+    return np.where(has_value.any(axis=0), last, values)
+
+
+def _aggregate_volume(window, values):
+    return values + np.nansum(window, axis=0).astype(np.int64)
+
+
+# field -> (aggregate function, value before any minute, dtype)
+_AGGREGATIONS = {
+    'open': (_aggregate_open, np.nan, np.float64),
+    'high': (_aggregate_high, np.nan, np.float64),
+    'low': (_aggregate_low, np.nan, np.float64),
+    'close': (_aggregate_close, np.nan, np.float64),
+    'volume': (_aggregate_volume, 0, np.int64),
+}
+
+
 class DailyHistoryAggregator(object):
     """
     Converts minute pricing data into a daily summary, to be used for the
@@ -119,23 +276,16 @@ class DailyHistoryAggregator(object):
         self._minute_reader = minute_reader
         self._trading_calendar = trading_calendar
 
-        # The caches are structured as (date, market_open, entries), where
-        # entries is a dict of asset -> (last_visited_dt, value)
+        # The aggregations of the current session of each field, as a
+        # _SessionAggregates.
         #
-        # Whenever an aggregation method determines the current value,
-        # the entry for the respective asset should be overwritten with a new
-        # entry for the current dt.value (int) and aggregation value.
+        # Each call aggregates, for all of the requested assets at once, the
+        # minutes after the last minute aggregated for each asset up to the
+        # requested dt, so that walking forward through a session only reads
+        # the new minute.
         #
-        # When the requested dt's date is different from date the cache is
-        # flushed, so that the cache entries do not grow unbounded.
-        #
-        # Example cache:
-        # cache = (date(2016, 3, 17),
-        #          pd.Timestamp('2016-03-17 13:31', tz='UTC'),
-        #          {
-        #              1: (1458221460000000000, np.nan),
-        #              2: (1458221460000000000, 42.0),
-        #         })
+        # When the requested dt's session is different from the session of
+        # the aggregation it is dropped, so that it does not grow unbounded.
         self._caches = {
             'open': None,
             'high': None,
@@ -148,21 +298,79 @@ class DailyHistoryAggregator(object):
         # creating new Timestamps.
         self._one_min = pd.Timedelta('1 min').value
 
-    def _prelude(self, dt, field):
+    def _aggregate(self, field, assets, dt):
+        aggregate, fill_value, dtype = _AGGREGATIONS[field]
+
         session = self._trading_calendar.minute_to_session_label(dt)
-        dt_value = dt.value
         cache = self._caches[field]
-        if cache is None or cache[0] != session:
-            market_open = self._market_opens.loc[session]
-            cache = self._caches[field] = (session, market_open, {})
-
-        _, market_open, entries = cache
-        market_open = market_open.tz_localize('UTC')
-        if dt != market_open:
-            prev_dt = dt_value - self._one_min
-        else:
-            prev_dt = None
-        return market_open, prev_dt, dt_value, entries
+        if cache is None or cache.session != session:
+            market_open = self._market_opens.loc[session].tz_localize('UTC')
+            cache = self._caches[field] = _SessionAggregates(
+                session,
+                market_open,
+                fill_value,
+                dtype,
+            )
+
+        out = np.full(len(assets), fill_value, dtype=dtype)
+        alive = np.array(
+            [asset.is_alive_for_session(session) for asset in assets],
+            dtype=bool,
+        )
+        if not alive.any():
+            return out
+
+        alive_assets = [
+            asset for asset, is_alive in zip(assets, alive) if is_alive
+        ]
+        positions = cache.positions_of(alive_assets)
+        last_visited = cache.last_visited[positions]
+        values = cache.values[positions]
+
+        dt_value = dt.value
+        stale = last_visited != dt_value
+        if stale.any():
+            last_visited = last_visited[stale]
+            # Start over from the market open for the assets not seen yet in
+            # the session, or seen at a later minute.
+            restart = (
+                (last_visited == _SessionAggregates.NOT_VISITED) |
+                (last_visited > dt_value)
+            )
+            stale_values = values[stale]
+            stale_values[restart] = fill_value
+            starts = np.where(
+                restart,
+                cache.market_open.value,
+                last_visited + self._one_min,
+            )
+
+            window_start = pd.Timestamp(starts.min(), tz='UTC')
+            window = self._minute_reader.load_raw_arrays(
+                [field],
+                window_start,
+                dt,
+                [asset for asset, s in zip(alive_assets, stale) if s],
+            )[0]
+            if (starts != starts[0]).any():
+                # Drop the minutes already aggregated for each asset.
+                minutes = self._trading_calendar.minutes_in_range(
+                    window_start,
+                    dt,
+                )
+                aggregated = minutes.asi8[:, np.newaxis] < starts
+                window = np.where(
+                    aggregated,
+                    0 if field == 'volume' else np.nan,
+                    window,
+                )
+
+            values[stale] = aggregate(window, stale_values)
+            cache.values[positions[stale]] = values[stale]
+            cache.last_visited[positions[stale]] = dt_value
+
+        out[alive] = values
+        return out
 
     def opens(self, assets, dt):
         """
@@ -177,64 +385,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'open')
-
-        opens = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                opens.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'open')
-                entries[asset] = (dt_value, val)
-                opens.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, first_open = entries[asset]
-                    if last_visited_dt == dt_value:
-                        opens.append(first_open)
-                        continue
-                    elif not pd.isnull(first_open):
-                        opens.append(first_open)
-                        entries[asset] = (dt_value, first_open)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['open'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0]
-                        nonnan = window[~pd.isnull(window)]
-                        if len(nonnan):
-                            val = nonnan[0]
-                        else:
-                            val = np.nan
-                        entries[asset] = (dt_value, val)
-                        opens.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['open'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0]
-                    nonnan = window[~pd.isnull(window)]
-                    if len(nonnan):
-                        val = nonnan[0]
-                    else:
-                        val = np.nan
-                    entries[asset] = (dt_value, val)
-                    opens.append(val)
-                    continue
-        return np.array(opens)
+        return self._aggregate('open', assets, dt)
 
     def highs(self, assets, dt):
         """
@@ -246,64 +397,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'high')
-
-        highs = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                highs.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'high')
-                entries[asset] = (dt_value, val)
-                highs.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_max = entries[asset]
-                    if last_visited_dt == dt_value:
-                        highs.append(last_max)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        curr_val = self._minute_reader.get_value(
-                            asset, dt, 'high')
-                        if pd.isnull(curr_val):
-                            val = last_max
-                        elif pd.isnull(last_max):
-                            val = curr_val
-                        else:
-                            val = max(last_max, curr_val)
-                        entries[asset] = (dt_value, val)
-                        highs.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['high'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0].T
-                        val = np.nanmax(np.append(window, last_max))
-                        entries[asset] = (dt_value, val)
-                        highs.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['high'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0].T
-                    val = np.nanmax(window)
-                    entries[asset] = (dt_value, val)
-                    highs.append(val)
-                    continue
-        return np.array(highs)
+        return self._aggregate('high', assets, dt)
 
     def lows(self, assets, dt):
         """
@@ -315,59 +409,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'low')
-
-        lows = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                lows.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'low')
-                entries[asset] = (dt_value, val)
-                lows.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_min = entries[asset]
-                    if last_visited_dt == dt_value:
-                        lows.append(last_min)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        curr_val = self._minute_reader.get_value(
-                            asset, dt, 'low')
-                        val = np.nanmin([last_min, curr_val])
-                        entries[asset] = (dt_value, val)
-                        lows.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['low'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0].T
-                        val = np.nanmin(np.append(window, last_min))
-                        entries[asset] = (dt_value, val)
-                        lows.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['low'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0].T
-                    val = np.nanmin(window)
-                    entries[asset] = (dt_value, val)
-                    lows.append(val)
-                    continue
-        return np.array(lows)
+        return self._aggregate('low', assets, dt)
 
     def closes(self, assets, dt):
         """
@@ -381,69 +423,7 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=float64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'close')
-
-        closes = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        def _get_filled_close(asset):
-            """
-            Returns the most recent non-nan close for the asset in this
-            session. If there has been no data in this session on or before the
-            `dt`, returns `nan`
-            """
-            window = self._minute_reader.load_raw_arrays(
-                ['close'],
-                market_open,
-                dt,
-                [asset],
-            )[0]
-            try:
-                return window[~np.isnan(window)][-1]
-            except IndexError:
-                return np.NaN
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                closes.append(np.NaN)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'close')
-                entries[asset] = (dt_value, val)
-                closes.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_close = entries[asset]
-                    if last_visited_dt == dt_value:
-                        closes.append(last_close)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'close')
-                        if pd.isnull(val):
-                            val = last_close
-                        entries[asset] = (dt_value, val)
-                        closes.append(val)
-                        continue
-                    else:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'close')
-                        if pd.isnull(val):
-                            val = _get_filled_close(asset)
-                        entries[asset] = (dt_value, val)
-                        closes.append(val)
-                        continue
-                except KeyError:
-                    val = self._minute_reader.get_value(
-                        asset, dt, 'close')
-                    if pd.isnull(val):
-                        val = _get_filled_close(asset)
-                    entries[asset] = (dt_value, val)
-                    closes.append(val)
-                    continue
-        return np.array(closes)
+        return self._aggregate('close', assets, dt)
 
     def volumes(self, assets, dt):
         """
@@ -455,66 +435,61 @@ class DailyHistoryAggregator(object):
         -------
         np.array with dtype=int64, in order of assets parameter.
         """
-        market_open, prev_dt, dt_value, entries = self._prelude(dt, 'volume')
-
-        volumes = []
-        session_label = self._trading_calendar.minute_to_session_label(dt)
-
-        for asset in assets:
-            if not asset.is_alive_for_session(session_label):
-                volumes.append(0)
-                continue
-
-            if prev_dt is None:
-                val = self._minute_reader.get_value(asset, dt, 'volume')
-                entries[asset] = (dt_value, val)
-                volumes.append(val)
-                continue
-            else:
-                try:
-                    last_visited_dt, last_total = entries[asset]
-                    if last_visited_dt == dt_value:
-                        volumes.append(last_total)
-                        continue
-                    elif last_visited_dt == prev_dt:
-                        val = self._minute_reader.get_value(
-                            asset, dt, 'volume')
-                        val += last_total
-                        entries[asset] = (dt_value, val)
-                        volumes.append(val)
-                        continue
-                    else:
-                        after_last = pd.Timestamp(
-                            last_visited_dt + self._one_min, tz='UTC')
-                        window = self._minute_reader.load_raw_arrays(
-                            ['volume'],
-                            after_last,
-                            dt,
-                            [asset],
-                        )[0]
-                        val = np.nansum(window) + last_total
-                        entries[asset] = (dt_value, val)
-                        volumes.append(val)
-                        continue
-                except KeyError:
-                    window = self._minute_reader.load_raw_arrays(
-                        ['volume'],
-                        market_open,
-                        dt,
-                        [asset],
-                    )[0]
-                    val = np.nansum(window)
-                    entries[asset] = (dt_value, val)
-                    volumes.append(val)
-                    continue
-        return np.array(volumes)
+        return self._aggregate('volume', assets, dt)
 
 
 class MinuteResampleSessionBarReader(SessionBarReader):
+    """
+    A session bar reader which resamples the bars of a minute bar reader.
 
-    def __init__(self, calendar, minute_bar_reader):
+    Parameters
+    ----------
+    calendar : TradingCalendar
+        The calendar of the sessions.
+    minute_bar_reader : MinuteBarReader
+        The reader of the minute bars to resample.
+    cache_dir : str, optional
+        A directory where the session bars of all of the sessions of an asset
+        are written the first time the asset is read. Later reads, including
+        the ones of other readers with the same directory, load them from
+        there instead of resampling the minutes again. The directory must
+        only be used with the minute bars of one ingestion.
+    """
+
+    def __init__(self, calendar, minute_bar_reader, cache_dir=None):
         self._calendar = calendar
         self._minute_bar_reader = minute_bar_reader
+        if cache_dir is not None:
+            cache_dir = dataframe_cache(
+                cache_dir,
+                clean_on_failure=False,
+                serialization='pickle',
+            )
+        self._session_bar_cache = cache_dir
+
+    @lazyval
+    def _all_close_locs(self):
+        """
+        The location of the close of every session of the calendar in all of
+        the minutes of the calendar.
+        """
+        cal = self._calendar
+        return cal.all_minutes.searchsorted(
+            pd.to_datetime(cal.schedule.market_close.values, utc=True),
+        )
+
+    def _close_locs(self, start_session, end_session):
+        """
+        The locations of the session closes in the minutes from the open of
+        ``start_session`` to the close of ``end_session``.
+        """
+        sessions = self._calendar.all_sessions
+        start = sessions.get_loc(start_session)
+        end = sessions.get_loc(end_session)
+
+        all_close_locs = self._all_close_locs
+        range_open_loc = all_close_locs[start - 1] + 1 if start else 0
+        return all_close_locs[start:end + 1] - range_open_loc
 
     def _get_resampled(self, columns, start_session, end_session, assets):
         range_open = self._calendar.session_open(start_session)
@@ -526,38 +501,90 @@ class MinuteResampleSessionBarReader(SessionBarReader):
             range_close,
             assets,
         )
-
-        # Get the index of the close minute for each session in the range.
-        # If the range contains only one session, the only close in the range
-        # is the last minute in the data. Otherwise, we need to get all the
-        # session closes and find their indices in the range of minutes.
-        if start_session == end_session:
-            close_ilocs = np.array([len(minute_data[0]) - 1], dtype=np.int64)
-        else:
-            minutes = self._calendar.minutes_in_range(
-                range_open,
-                range_close,
-            )
-            session_closes = self._calendar.session_closes_in_range(
-                start_session,
-                end_session,
-            )
-            close_ilocs = minutes.searchsorted(pd.to_datetime(session_closes.values, utc=True))
+        close_locs = self._close_locs(start_session, end_session)
 
         results = []
-        shape = (len(close_ilocs), len(assets))
+        shape = (len(close_locs), len(assets))
 
-        for col in columns:
-            if col != 'volume':
+        for column, data in zip(columns, minute_data):
+            if column != 'volume':
                 out = np.full(shape, np.nan)
             else:
                 out = np.zeros(shape, dtype=np.uint32)
-            results.append(out)
+            results.append(minute_to_session_2d(column, close_locs, data, out))
 
-        for i in range(len(assets)):
-            for j, column in enumerate(columns):
-                data = minute_data[j][:, i]
-                minute_to_session(column, close_ilocs, data, results[j][:, i])
+        return results
+
+    def _cached_session_bars(self, assets):
+        """
+        The session bars of all of the sessions of the reader for each of the
+        given assets, read from the cache directory or resampled and written
+        there.
+        """
+        cache = self._session_bar_cache
+        sessions = self.sessions
+
+        frames = {}
+        missing = []
+        for asset in assets:
+            sid = int(asset)
+            if sid in frames:
+                continue
+            try:
+                frame = cache[str(sid)]
+            except KeyError:
+                frame = None
+            # The sessions differ when the minute bars were updated.
+            if frame is None or not frame.index.equals(sessions):
+                missing.append(asset)
+                frame = None
+            frames[sid] = frame
+
+        if missing:
+            # Resample the missing assets a few sessions at a time to bound
+            # the size of the minute data in memory.
+            chunks = [
+                self._get_resampled(
+                    _OHLCV,
+                    chunk_sessions[0],
+                    chunk_sessions[-1],
+                    missing,
+                )
+                for chunk_sessions in (
+                    sessions[i:i + _CACHE_CHUNK_SESSIONS]
+                    for i in range(0, len(sessions), _CACHE_CHUNK_SESSIONS)
+                )
+            ]
+            for i, asset in enumerate(missing):
+                frame = pd.DataFrame(
+                    {
+                        column: np.concatenate([
+                            chunk[j][:, i] for chunk in chunks
+                        ])
+                        for j, column in enumerate(_OHLCV)
+                    },
+                    index=sessions,
+                    columns=_OHLCV,
+                )
+                cache[str(int(asset))] = frames[int(asset)] = frame
+
+        return frames
+
+    def _get_cached(self, columns, start_session, end_session, assets):
+        frames = self._cached_session_bars(assets)
+
+        start = self.sessions.get_loc(start_session)
+        end = self.sessions.get_loc(end_session) + 1
+
+        results = []
+        for column in columns:
+            out = np.empty(
+                (end - start, len(assets)),
+                dtype=np.uint32 if column == 'volume' else np.float64,
+            )
+            for i, asset in enumerate(assets):
+                out[:, i] = frames[int(asset)][column].values[start:end]
+            results.append(out)
 
         return results
 
@@ -566,6 +593,8 @@ class MinuteResampleSessionBarReader(SessionBarReader):
         return self._calendar
 
     def load_raw_arrays(self, columns, start_dt, end_dt, sids):
+        if self._session_bar_cache is not None:
+            return self._get_cached(columns, start_dt, end_dt, sids)
         return self._get_resampled(columns, start_dt, end_dt, sids)
 
     def get_value(self, sid, session, colname):
@@ -573,7 +602,9 @@ class MinuteResampleSessionBarReader(SessionBarReader):
         # tight loop.
         # This was developed to complete interface, but has not been tuned
         # for real world use.
-        return self._get_resampled([colname], session, session, [sid])[0][0][0]
+        return self.load_raw_arrays(
+            [colname], session, session, [sid],
+        )[0][0][0]
 
     @lazyval
     def sessions(self):
@@ -8,7 +8,6 @@ import pandas as pd
 from six import itervalues
 
 from zipline._protocol cimport InnerPosition
-from zipline.assets._assets cimport Future
 
 
 cpdef update_position_last_sale_prices(positions, get_price, dt):
@@ -37,6 +36,35 @@ cpdef update_position_last_sale_prices(positions, get_price, dt):
             inner_position.last_sale_date = dt
 
 
+cpdef set_position_last_sale_prices(positions,
+                                    np.ndarray[np.float64_t] prices,
+                                    dt):
+    """Set the positions' last sale prices from an array of prices.
+
+    Parameters
+    ----------
+    positions : list[Position]
+        The positions to update.
+    prices : np.ndarray[float64]
+        The price of each position, in the same order as ``positions``.
+    dt : pd.Timestamp
+        The dt to set as the last sale date if the price is not nan.
+    """
+    cdef InnerPosition inner_position
+    cdef np.float64_t last_sale_price
+    cdef Py_ssize_t ix = 0
+
+    for outer_position in positions:
+        inner_position = outer_position.inner_position
+
+        last_sale_price = prices[ix]
+        ix += 1
+
+        if last_sale_price == last_sale_price:
+            inner_position.last_sale_price = last_sale_price
+            inner_position.last_sale_date = dt
+
+
 @cython.final
 cdef class PositionStats:
     """Computed values from the current positions.
@@ -112,136 +140,52 @@ cdef class PositionStats:
         return self
 
 
-cpdef calculate_position_tracker_stats(positions, PositionStats stats):
+cpdef calculate_position_tracker_stats(sids,
+                                       exposure,
+                                       is_future,
+                                       PositionStats stats):
     """Calculate various stats about the current positions.
 
     Parameters
     ----------
-    positions : OrderedDict
-        The ordered dictionary of positions.
-
-    Returns
-    -------
-    position_stats : PositionStats
-        The computed statistics.
+    sids : np.ndarray[int64]
+        The sid of each position.
+    exposure : np.ndarray[float64]
+        The exposure of each position.
+    is_future : np.ndarray[bool]
+        Whether each position is in a future. Futures don't have an inherent
+        position value.
+    stats : PositionStats
+        The stats to update.
     """
-    cdef Py_ssize_t npos = len(positions)
-    cdef np.ndarray[np.int64_t] index
-    cdef np.ndarray[np.float64_t] position_exposure
-
-    cdef np.ndarray[np.int64_t] old_index = stats.underlying_index_array
-    cdef np.ndarray[np.float64_t] old_position_exposure = (
-        stats.underlying_value_array
-    )
-
-    cdef np.float64_t value
-    cdef np.float64_t exposure
-
-    cdef np.float64_t net_value
-    cdef np.float64_t gross_value
-    cdef np.float64_t long_value = 0.0
-    cdef np.float64_t short_value = 0.0
-
-    cdef np.float64_t net_exposure
-    cdef np.float64_t gross_exposure
-    cdef np.float64_t long_exposure = 0.0
-    cdef np.float64_t short_exposure = 0.0
-
-    cdef np.uint64_t longs_count = 0
-    cdef np.uint64_t shorts_count = 0
-
-    # attempt to reuse the memory of the old exposure series
-    if len(old_index) < npos:
-        # we don't have enough space in the cached buffer, allocate a new
-        # array
-        stats.underlying_index_array = index = np.empty(npos, dtype='int64')
-        stats.underlying_value_array = position_exposure = np.empty(
-            npos,
-            dtype='float64',
-        )
-
-        stats.position_exposure_array = position_exposure
-        # create a new series to expose the arrays
-        stats.position_exposure_series = pd.Series(
-            position_exposure,
-            index=index,
-        )
-    elif len(old_index) > npos:
-        # we have more space than needed, slice off the extra but leave it
-        # available
-        index = old_index[:npos]
-        position_exposure = old_position_exposure[:npos]
-
-        stats.position_exposure_array = position_exposure
-        # create a new series with the sliced arrays
-        stats.position_exposure_series = pd.Series(
-            position_exposure,
-            index=index,
-        )
-    else:
-        # we have exactly the right amount of space, no slicing or allocation
-        # needed
-        index = old_index
-        position_exposure = old_position_exposure
-
-        stats.position_exposure_array = position_exposure
-        stats.position_exposure_series = pd.Series(
-            position_exposure,
-            index=index,
-        )
-
-    cdef InnerPosition position
-    cdef Py_ssize_t ix = 0
-
-    for outer_position in itervalues(positions):
-        position = outer_position.inner_position
-
-        # NOTE: this loop does a lot of stuff!
-        # we call this function every time the portfolio value is needed,
-        # which is at least once per simulation day, so let's not iterate
-        # through every single position multiple times.
-        exposure = position.amount * position.last_sale_price
-
-        if type(position.asset) is Future:
-            # Futures don't have an inherent position value.
-            value = 0
-
-            # unchecked cast, this is safe because we do a type check above
-            exposure *= position.asset.price_multiplier
-        else:
-            value = exposure
-
-        if exposure > 0:
-            longs_count += 1
-            long_value += value
-            long_exposure += exposure
-        elif exposure < 0:
-            shorts_count += 1
-            short_value += value
-            short_exposure += exposure
-
-        with cython.boundscheck(False), cython.wraparound(False):
-            index[ix] = position.asset.sid
-            position_exposure[ix] = exposure
-
-        ix += 1
-
-    net_value = long_value + short_value
-    gross_value = long_value - short_value
-
-    net_exposure = long_exposure + short_exposure
-    gross_exposure = long_exposure - short_exposure
-
-    stats.gross_exposure = gross_exposure
-    stats.gross_value = gross_value
+    cdef np.float64_t long_value
+    cdef np.float64_t short_value
+    cdef np.float64_t long_exposure
+    cdef np.float64_t short_exposure
+
+    longs = exposure > 0
+    shorts = exposure < 0
+    value = np.where(is_future, 0.0, exposure)
+
+    long_value = value[longs].sum()
+    short_value = value[shorts].sum()
+    long_exposure = exposure[longs].sum()
+    short_exposure = exposure[shorts].sum()
+
+    stats.gross_exposure = long_exposure - short_exposure
+    stats.gross_value = long_value - short_value
     stats.long_exposure = long_exposure
     stats.long_value = long_value
-    stats.longs_count = longs_count
-    stats.net_exposure = net_exposure
-    stats.net_value = net_value
+    stats.longs_count = np.count_nonzero(longs)
+    stats.net_exposure = long_exposure + short_exposure
+    stats.net_value = long_value + short_value
     stats.short_exposure = short_exposure
     stats.short_value = short_value
-    stats.shorts_count = shorts_count
+    stats.shorts_count = np.count_nonzero(shorts)
+
+    stats.underlying_index_array = sids
+    stats.underlying_value_array = stats.position_exposure_array = exposure
+    stats.position_exposure_series = pd.Series(exposure, index=sids)
 
 
 cpdef minute_annual_volatility(np.ndarray[np.int64_t] date_labels,
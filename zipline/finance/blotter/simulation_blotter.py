@@ -338,13 +338,61 @@ class SimulationBlotter(Blotter):
         commissions = []
 
         if self.open_orders:
+            # The orders of all of the assets of a type share their slippage
+            # and commission models, simulate them together.
+            orders_by_type = defaultdict(list)
+            for asset, asset_orders in iteritems(self.open_orders):
+                if asset_orders:
+                    orders_by_type[type(asset)].append((asset, asset_orders))
+
+            fills = {}
+            for asset_type, orders_by_asset in iteritems(orders_by_type):
+                slippage = self.slippage_models[asset_type]
+                if not slippage._fills_orders_with_arrays():
+                    # A custom model may fill an order more than once and
+                    # look at ``order.filled`` in between, simulate it while
+                    # book-keeping below.
+                    continue
+
+                asset_fills = slippage.simulate_batch(
+                    bar_data,
+                    orders_by_asset,
+                )
+                if not asset_fills:
+                    continue
+
+                orders, txns = zip(*asset_fills)
+                if len(set(map(id, orders))) == len(orders):
+                    commission = self.commission_models[asset_type]
+                    costs = commission.calculate_batch(orders, txns).tolist()
+                else:
+                    # A model filled an order more than once, its later
+                    # commissions depend on the earlier fills.
+                    costs = [None] * len(orders)
+                for order, txn, cost in zip(orders, txns, costs):
+                    fills.setdefault(order.asset, []).append(
+                        (order, txn, cost),
+                    )
+
+            # Book-keep the fills in the order of the open orders.
             for asset, asset_orders in iteritems(self.open_orders):
                 slippage = self.slippage_models[type(asset)]
+                if slippage._fills_orders_with_arrays():
+                    asset_fills = fills.get(asset, ())
+                else:
+                    asset_fills = (
+                        (order, txn, None)
+                        for order, txn in
+                        slippage.simulate(bar_data, asset, asset_orders)
+                    )
 
-                for order, txn in \
-                        slippage.simulate(bar_data, asset, asset_orders):
-                    commission = self.commission_models[type(asset)]
-                    additional_commission = commission.calculate(order, txn)
+                for order, txn, additional_commission in asset_fills:
+                    if additional_commission is None:
+                        commission = self.commission_models[type(asset)]
+                        additional_commission = commission.calculate(
+                            order,
+                            txn,
+                        )
 
                     if additional_commission > 0:
                         commissions.append({
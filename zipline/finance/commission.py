@@ -15,6 +15,7 @@
 from abc import abstractmethod
 from collections import defaultdict
 
+import numpy as np
 from six import with_metaclass
 from toolz import merge
 
@@ -22,6 +23,7 @@ from zipline.assets import Equity, Future
 from zipline.finance.constants import FUTURE_EXCHANGE_FEES_BY_SYMBOL
 from zipline.finance.shared import AllowedAssetMarker, FinancialModelMeta
 from zipline.utils.dummy import DummyMapping
+from zipline.utils.metautils import defining_class
 
 DEFAULT_PER_SHARE_COST = 0.001               # 0.1 cents per share
 DEFAULT_PER_CONTRACT_COST = 0.85             # $0.85 per future contract
@@ -29,6 +31,15 @@ DEFAULT_PER_DOLLAR_COST = 0.0015             # 0.15 cents per dollar
 DEFAULT_MINIMUM_COST_PER_EQUITY_TRADE = 0.0  # $0 per trade
 DEFAULT_MINIMUM_COST_PER_FUTURE_TRADE = 0.0  # $0 per trade
 
+# The state of an order and its transaction which commissions depend on, see
+# CommissionModel.calculate_batch.
+FILL_DTYPE = np.dtype([
+    ('commission', 'float64'),
+    ('filled', 'float64'),
+    ('amount', 'float64'),
+    ('price', 'float64'),
+])
+
 
 class CommissionModel(with_metaclass(FinancialModelMeta)):
     """Abstract base class for commission models.
@@ -72,6 +83,49 @@ class CommissionModel(with_metaclass(FinancialModelMeta)):
         """
         raise NotImplementedError('calculate')
 
+    def calculate_batch(self, orders, transactions):
+        """
+        Calculate the amount of commission to charge on many orders, each as a
+        result of one transaction.
+
+        Parameters
+        ----------
+        orders : sequence[zipline.finance.order.Order]
+            The orders being processed.
+        transactions : sequence[zipline.finance.transaction.Transaction]
+            The transaction of each order.
+
+        Returns
+        -------
+        amounts_charged : np.ndarray[float64]
+            The same values as calling :meth:`calculate` with each order and
+            its transaction.
+
+        Notes
+        -----
+        Models which define ``calculate_arrays`` next to their
+        :meth:`calculate` compute all of the commissions with array
+        operations.
+        """
+        if 'calculate_arrays' in vars(defining_class(type(self),
+                                                     'calculate')):
+            fills = np.array(
+                [
+                    (order.commission, order.filled, txn.amount, txn.price)
+                    for order, txn in zip(orders, transactions)
+                ],
+                dtype=FILL_DTYPE,
+            )
+            return self.calculate_arrays(orders, fills)
+
+        return np.array(
+            [
+                self.calculate(order, txn)
+                for order, txn in zip(orders, transactions)
+            ],
+            dtype='float64',
+        )
+
 
 class NoCommission(CommissionModel):
     """Model commissions as free.
@@ -85,6 +139,10 @@ class NoCommission(CommissionModel):
     def calculate(order, transaction):
         return 0.0
 
+    @staticmethod
+    def calculate_arrays(orders, fills):
+        return np.zeros(len(fills))
+
 
 class EquityCommissionModel(with_metaclass(AllowedAssetMarker,
                                            CommissionModel)):
@@ -141,6 +199,33 @@ def calculate_per_unit_commission(order,
             return per_unit_total - order.commission
 
 
+def calculate_per_unit_commissions(fills,
+                                   cost_per_unit,
+                                   initial_commission,
+                                   min_trade_cost):
+    """
+    Array version of :func:`calculate_per_unit_commission`, ``fills`` is an
+    array of ``FILL_DTYPE`` and the costs may be arrays with one entry per
+    fill.
+    """
+    additional_commission = np.abs(fills['amount'] * cost_per_unit)
+
+    per_unit_total = \
+        np.abs(fills['filled'] * cost_per_unit) + \
+        additional_commission + \
+        initial_commission
+
+    return np.where(
+        fills['commission'] == 0,
+        np.maximum(min_trade_cost, additional_commission + initial_commission),
+        np.where(
+            per_unit_total < min_trade_cost,
+            0.0,
+            per_unit_total - fills['commission'],
+        ),
+    )
+
+
 class PerShare(EquityCommissionModel):
     """
     Calculates a commission for a transaction based on a per share cost with
@@ -186,6 +271,14 @@ class PerShare(EquityCommissionModel):
             min_trade_cost=self.min_trade_cost,
         )
 
+    def calculate_arrays(self, orders, fills):
+        return calculate_per_unit_commissions(
+            fills=fills,
+            cost_per_unit=self.cost_per_share,
+            initial_commission=0,
+            min_trade_cost=self.min_trade_cost,
+        )
+
 
 class PerContract(FutureCommissionModel):
     """
@@ -276,6 +369,21 @@ class PerContract(FutureCommissionModel):
             min_trade_cost=self.min_trade_cost,
         )
 
+    def calculate_arrays(self, orders, fills):
+        root_symbols = [order.asset.root_symbol for order in orders]
+        return calculate_per_unit_commissions(
+            fills=fills,
+            cost_per_unit=np.array(
+                [self._cost_per_contract[s] for s in root_symbols],
+                dtype='float64',
+            ),
+            initial_commission=np.array(
+                [self._exchange_fee[s] for s in root_symbols],
+                dtype='float64',
+            ),
+            min_trade_cost=self.min_trade_cost,
+        )
+
 
 class PerTrade(CommissionModel):
     """
@@ -318,6 +426,9 @@ class PerTrade(CommissionModel):
             # commission.
             return 0.0
 
+    def calculate_arrays(self, orders, fills):
+        return np.where(fills['commission'] == 0, self.cost, 0.0)
+
 
 class PerFutureTrade(PerContract):
     """
@@ -380,3 +491,7 @@ class PerDollar(EquityCommissionModel):
         """
         cost_per_share = transaction.price * self.cost_per_dollar
         return abs(transaction.amount) * cost_per_share
+
+    def calculate_arrays(self, orders, fills):
+        cost_per_share = fills['price'] * self.cost_per_dollar
+        return np.abs(fills['amount']) * cost_per_share
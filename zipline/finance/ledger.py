@@ -32,12 +32,19 @@ from .position import Position
 from ._finance_ext import (
     PositionStats,
     calculate_position_tracker_stats,
+    set_position_last_sale_prices,
     update_position_last_sale_prices,
 )
 
 log = logbook.Logger('Performance')
 
 
+PositionArrays = namedtuple(
+    'PositionArrays',
+    'positions assets sids amounts last_sale_prices multipliers is_future',
+)
+
+
 class PositionTracker(object):
     """The current state of the positions held.
 
@@ -59,6 +66,10 @@ class PositionTracker(object):
         self._dirty_stats = True
         self._stats = PositionStats.new()
 
+        # the positions in array form, rebuilt when positions are opened,
+        # closed or resized.
+        self._arrays = None
+
     def update_position(self,
                         asset,
                         amount=None,
@@ -66,6 +77,7 @@ class PositionTracker(object):
                         last_sale_date=None,
                         cost_basis=None):
         self._dirty_stats = True
+        self._arrays = None
 
         if asset not in self.positions:
             position = Position(asset)
@@ -94,6 +106,7 @@ class PositionTracker(object):
 
     def execute_transaction(self, txn):
         self._dirty_stats = True
+        self._arrays = None
 
         asset = txn.asset
 
@@ -139,6 +152,7 @@ class PositionTracker(object):
         for asset, ratio in splits:
             if asset in self.positions:
                 self._dirty_stats = True
+                self._arrays = None
 
                 # Make the position object handle the split. It returns the
                 # leftover cash from a fractional share, if there is any.
@@ -216,6 +230,9 @@ class PositionTracker(object):
             stock_payments = []
 
         for stock_payment in stock_payments:
+            self._dirty_stats = True
+            self._arrays = None
+
             payment_asset = stock_payment['payment_asset']
             share_count = stock_payment['share_count']
             # note we create a Position for stock dividend if we don't
@@ -268,6 +285,41 @@ class PositionTracker(object):
             if pos.amount != 0
         ]
 
+    def _position_arrays(self):
+        """The positions in array form, in the order of ``self.positions``.
+        """
+        arrays = self._arrays
+        if arrays is None:
+            positions = list(itervalues(self.positions))
+            assets = np.empty(len(positions), dtype=object)
+            assets[:] = [position.asset for position in positions]
+            is_future = np.array(
+                [type(asset) is Future for asset in assets],
+                dtype=bool,
+            )
+            self._arrays = arrays = PositionArrays(
+                positions=positions,
+                assets=assets,
+                sids=np.array([asset.sid for asset in assets], dtype='int64'),
+                amounts=np.array(
+                    [position.amount for position in positions],
+                    dtype='float64',
+                ),
+                last_sale_prices=np.array(
+                    [position.last_sale_price for position in positions],
+                    dtype='float64',
+                ),
+                multipliers=np.array(
+                    [
+                        asset.price_multiplier if future else 1.0
+                        for asset, future in zip(assets, is_future)
+                    ],
+                    dtype='float64',
+                ),
+                is_future=is_future,
+            )
+        return arrays
+
     def sync_last_sale_prices(self,
                               dt,
                               data_portal,
@@ -283,16 +335,22 @@ class PositionTracker(object):
                 perspective_dt=dt,
                 data_frequency=self.data_frequency,
             )
+            update_position_last_sale_prices(self.positions, get_price, dt)
+            self._arrays = None
+            return
 
-        else:
-            get_price = partial(
-                data_portal.get_scalar_asset_spot_value,
-                field='price',
-                dt=dt,
-                data_frequency=self.data_frequency,
-            )
+        arrays = self._position_arrays()
+        if not len(arrays.positions):
+            return
 
-        update_position_last_sale_prices(self.positions, get_price, dt)
+        # read the prices of all of the positions at once.
+        prices = data_portal.get_spot_prices(
+            arrays.assets,
+            dt,
+            self.data_frequency,
+        )
+        set_position_last_sale_prices(arrays.positions, prices, dt)
+        np.copyto(arrays.last_sale_prices, prices, where=~np.isnan(prices))
 
     @property
     def stats(self):
@@ -309,7 +367,13 @@ class PositionTracker(object):
         the stats may have changed.
         """
         if self._dirty_stats:
-            calculate_position_tracker_stats(self.positions, self._stats)
+            arrays = self._position_arrays()
+            calculate_position_tracker_stats(
+                arrays.sids,
+                arrays.amounts * arrays.last_sale_prices * arrays.multipliers,
+                arrays.is_future,
+                self._stats,
+            )
             self._dirty_stats = False
 
         return self._stats
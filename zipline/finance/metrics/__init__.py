@@ -12,6 +12,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from functools import partial
+
 import empyrical
 
 from zipline.utils.deprecate import deprecated
@@ -34,6 +36,8 @@ from .metric import (
     PNL,
     Returns,
     ReturnsStatistic,
+    RunningAlphaBeta,
+    RunningReturnsStatistics,
     SimpleLedgerField,
     StartOfPeriodLedgerField,
     Transactions,
@@ -50,10 +54,29 @@ register('none', set)
 
 
 @register('default')
-def default_metrics():
-    return {
+def default_metrics(exact=False):
+    """The default metrics.
+
+    Parameters
+    ----------
+    exact : bool, optional
+        Recompute the cumulative risk metrics from all of the returns at every
+        bar instead of updating them incrementally. This is much slower for
+        long backtests but matches the empyrical functions exactly.
+    """
+    if exact:
+        risk_metrics = {
+            ReturnsStatistic(empyrical.annual_volatility, 'algo_volatility'),
+            AlphaBeta(),
+            ReturnsStatistic(empyrical.sharpe_ratio, 'sharpe'),
+            ReturnsStatistic(empyrical.sortino_ratio, 'sortino'),
+            ReturnsStatistic(empyrical.max_drawdown),
+        }
+    else:
+        risk_metrics = {RunningReturnsStatistics(), RunningAlphaBeta()}
+
+    return risk_metrics | {
         Returns(),
-        ReturnsStatistic(empyrical.annual_volatility, 'algo_volatility'),
         BenchmarkReturnsAndVolatility(),
         PNL(),
         CashFlow(),
@@ -92,11 +115,6 @@ def default_metrics():
         DailyLedgerField('account.gross_leverage'),
         DailyLedgerField('account.net_leverage'),
 
-        AlphaBeta(),
-        ReturnsStatistic(empyrical.sharpe_ratio, 'sharpe'),
-        ReturnsStatistic(empyrical.sortino_ratio, 'sortino'),
-
-        ReturnsStatistic(empyrical.max_drawdown),
         MaxLeverage(),
 
         # Please kill these!
@@ -107,6 +125,9 @@ def default_metrics():
     }
 
 
+register('default_exact', partial(default_metrics, exact=True))
+
+
 @register('classic')
 @deprecated(
     'The original risk packet has been deprecated and will be removed in a '
@@ -14,6 +14,7 @@
 # limitations under the License.
 import datetime
 from functools import partial
+import math
 import operator as op
 
 from dateutil.relativedelta import relativedelta
@@ -464,6 +465,177 @@ class AlphaBeta(object):
     end_of_session = end_of_bar
 
 
+# The number of sessions in a year used by empyrical to annualize daily
+# statistics.
+_ANNUALIZATION_FACTOR = 252
+
+
+def _finite_or_none(value):
+    return value if np.isfinite(value) else None
+
+
+def _add_return(state, r):
+    """Fold the return ``r`` into the running state of
+    ``RunningReturnsStatistics``.
+
+    The state is ``(count, mean, m2, downside, cumulative, peak, drawdown)``
+    where ``m2`` is the sum of squared deviations from the mean and
+    ``downside`` the sum of the squared negative returns. Like empyrical,
+    nan returns are skipped.
+    """
+    if math.isnan(r):
+        return state
+    count, mean, m2, downside, cumulative, peak, drawdown = state
+    count += 1
+    delta = r - mean
+    mean += delta / count
+    m2 += delta * (r - mean)
+    if r < 0:
+        downside += r * r
+    cumulative *= 1 + r
+    peak = max(peak, cumulative)
+    drawdown = min(drawdown, (cumulative - peak) / peak)
+    return count, mean, m2, downside, cumulative, peak, drawdown
+
+
+def _add_return_pair(state, r, f):
+    """Fold the algorithm return ``r`` and the benchmark return ``f`` into
+    the running state of ``RunningAlphaBeta``.
+
+    The state is ``(count, mean_r, mean_f, m2_f, comoment)``, pairs where
+    either return is nan are skipped.
+    """
+    if math.isnan(r) or math.isnan(f):
+        return state
+    count, mean_r, mean_f, m2_f, comoment = state
+    count += 1
+    mean_r += (r - mean_r) / count
+    delta_f = f - mean_f
+    mean_f += delta_f / count
+    m2_f += delta_f * (f - mean_f)
+    comoment += delta_f * (r - mean_r)
+    return count, mean_r, mean_f, m2_f, comoment
+
+
+class RunningReturnsStatistics(object):
+    """Cumulative volatility, Sharpe ratio, Sortino ratio and max drawdown of
+    the algorithm returns, updated in constant time at every bar.
+
+    The running moments and drawdown of the completed sessions are kept, and
+    only the returns of the current session are added to them at each bar.
+    The results match ``ReturnsStatistic`` with the corresponding empyrical
+    functions up to floating point error.
+    """
+    def start_of_simulation(self, *args):
+        self._sessions = 0
+        self._state = (0, 0.0, 0.0, 0.0, 1.0, 1.0, 0.0)
+
+    def end_of_bar(self,
+                   packet,
+                   ledger,
+                   dt,
+                   session_ix,
+                   data_portal):
+        returns = ledger.daily_returns_array
+
+        # the returns of the sessions before session_ix don't change anymore.
+        state = self._state
+        for r in returns[self._sessions:session_ix]:
+            state = _add_return(state, float(r))
+        self._state = state
+        self._sessions = session_ix
+
+        count, mean, m2, downside, _, _, drawdown = _add_return(
+            state,
+            float(returns[session_ix]),
+        )
+
+        volatility = sharpe = sortino = None
+        if session_ix > 0 and count > 1:
+            std = math.sqrt(m2 / (count - 1))
+            volatility = std * math.sqrt(_ANNUALIZATION_FACTOR)
+            if std:
+                sharpe = _finite_or_none(
+                    mean / std * math.sqrt(_ANNUALIZATION_FACTOR),
+                )
+            if downside:
+                sortino = _finite_or_none(
+                    mean * math.sqrt(_ANNUALIZATION_FACTOR) /
+                    math.sqrt(downside / count),
+                )
+
+        risk = packet['cumulative_risk_metrics']
+        risk['algo_volatility'] = volatility
+        risk['sharpe'] = sharpe
+        risk['sortino'] = sortino
+        risk['max_drawdown'] = _finite_or_none(drawdown)
+
+    end_of_session = end_of_bar
+
+
+class RunningAlphaBeta(object):
+    """Cumulative alpha and beta to the benchmark, updated in constant time
+    at every bar.
+
+    The results match ``AlphaBeta`` up to floating point error.
+    """
+    def start_of_simulation(self,
+                            ledger,
+                            emission_rate,
+                            trading_calendar,
+                            sessions,
+                            benchmark_source):
+        self._daily_returns_array = benchmark_source.daily_returns(
+            sessions[0],
+            sessions[-1],
+        ).values
+        self._sessions = 0
+        self._state = (0, 0.0, 0.0, 0.0, 0.0)
+
+    def end_of_bar(self,
+                   packet,
+                   ledger,
+                   dt,
+                   session_ix,
+                   data_portal):
+        returns = ledger.daily_returns_array
+        benchmark_returns = self._daily_returns_array
+
+        state = self._state
+        for ix in range(self._sessions, session_ix):
+            state = _add_return_pair(
+                state,
+                float(returns[ix]),
+                float(benchmark_returns[ix]),
+            )
+        self._state = state
+        self._sessions = session_ix
+
+        count, mean_r, mean_f, m2_f, comoment = _add_return_pair(
+            state,
+            float(returns[session_ix]),
+            float(benchmark_returns[session_ix]),
+        )
+
+        alpha = beta = None
+        # empyrical treats near constant benchmark returns as having no
+        # variance.
+        if session_ix > 0 and count and m2_f / count >= 1.0e-30:
+            beta = comoment / m2_f
+            try:
+                alpha = _finite_or_none(
+                    (1 + mean_r - beta * mean_f) ** _ANNUALIZATION_FACTOR - 1,
+                )
+            except OverflowError:
+                pass
+
+        risk = packet['cumulative_risk_metrics']
+        risk['alpha'] = alpha
+        risk['beta'] = beta
+
+    end_of_session = end_of_bar
+
+
 class MaxLeverage(object):
     """Tracks the maximum account leverage.
     """
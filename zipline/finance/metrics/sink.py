@@ -0,0 +1,255 @@
+"""
+Columnar storage of the daily perf packets of a simulation.
+
+Holding on to every perf packet and building the daily stats from a list of
+nested dicts at the end of a simulation uses a lot of memory for long
+backtests with many positions. ``DailyPerfSink`` keeps the scalar fields of
+the daily packets in preallocated arrays and the positions, orders and
+transactions in append-only columns, which can be spilled to an HDF5 file as
+the simulation runs.
+"""
+import numpy as np
+import pandas as pd
+from six import iteritems
+import tables
+
+#: The fields of the daily perf packets which hold lists of records.
+RECORD_FIELDS = frozenset(['positions', 'orders', 'transactions'])
+
+
+class _Missing(object):
+    """Marks a key missing from a record.
+    """
+    def __reduce__(self):
+        # spilled records are pickled, unpickle as the module level instance.
+        return '_MISSING'
+
+    def __repr__(self):
+        return '<missing>'
+
+
+_MISSING = _Missing()
+
+
+class _RecordColumns(object):
+    """Append-only columns of the records of one field, e.g. the positions,
+    with the number of records of each session.
+    """
+    def __init__(self):
+        self._columns = {}
+        self._keys = []
+        self._size = 0
+        self.counts = []
+
+    def append(self, ix, records):
+        # sessions without records.
+        self.counts.extend([0] * (ix - len(self.counts)))
+        columns = self._columns
+        for record in records:
+            for key, value in iteritems(record):
+                try:
+                    column = columns[key]
+                except KeyError:
+                    column = columns[key] = [_MISSING] * self._size
+                    self._keys.append(key)
+                column.append(value)
+            self._size += 1
+            for key in self._keys:
+                column = columns[key]
+                if len(column) < self._size:
+                    column.append(_MISSING)
+        self.counts.append(len(records))
+
+    def chunk(self):
+        """The columns of the records appended since the last ``clear``, and
+        their length.
+        """
+        return self._columns, self._size
+
+    def clear(self):
+        self._columns = {key: [] for key in self._keys}
+        self._size = 0
+
+    def records(self, chunks):
+        """Rebuild the lists of records of each session from the spilled
+        chunks and the records in memory.
+        """
+        keys = self._keys
+        values = {key: [] for key in keys}
+        for columns, size in chunks + [self.chunk()]:
+            for key in keys:
+                # keys first seen after a chunk was spilled are missing from
+                # it.
+                values[key].extend(columns.get(key, [_MISSING] * size))
+
+        rows = zip(*(values[key] for key in keys))
+        records = [
+            {k: v for k, v in zip(keys, row) if v is not _MISSING}
+            for row in rows
+        ]
+        out = []
+        start = 0
+        for count in self.counts:
+            out.append(records[start:start + count])
+            start += count
+        return out
+
+
+class DailyPerfSink(object):
+    """Collects the daily perf packets of a simulation and builds the daily
+    stats from them on demand.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        The expected number of sessions, the scalar columns grow past it.
+    spill_path : str, optional
+        The path of an HDF5 file where the positions, orders and transactions
+        are written every ``spill_every`` sessions instead of being held in
+        memory.
+    spill_every : int, optional
+        The number of sessions between writes to ``spill_path``.
+    """
+    def __init__(self, capacity=0, spill_path=None, spill_every=252):
+        self._capacity = max(capacity, 1)
+        self._size = 0
+        # column name -> (values, has_value), values is float64 once a float
+        # is stored, object otherwise.
+        self._columns = {}
+        self._records = {}
+        # the names of the columns in the order they were first seen.
+        self._names = []
+
+        self._spill_path = spill_path
+        self._spill_every = spill_every
+        self._spilled = 0
+        self._store = None
+
+    def __len__(self):
+        return self._size
+
+    @staticmethod
+    def daily_row(packet):
+        """The row of the daily stats of a daily perf packet.
+        """
+        row = packet['daily_perf'].copy()
+        row.update(row.pop('recorded_vars'))
+        row.update(packet['cumulative_risk_metrics'])
+        return row
+
+    def append(self, packet):
+        """Add a daily perf packet.
+        """
+        if self._size == self._capacity:
+            self._grow()
+        ix = self._size
+        self._size += 1
+
+        for name, value in iteritems(self.daily_row(packet)):
+            if name not in self._columns and name not in self._records:
+                self._names.append(name)
+            if name in RECORD_FIELDS and isinstance(value, list):
+                try:
+                    columns = self._records[name]
+                except KeyError:
+                    columns = self._records[name] = _RecordColumns()
+                columns.append(ix, value)
+            else:
+                self._set(name, ix, value)
+
+        if (self._spill_path is not None and
+                self._size - self._spilled >= self._spill_every):
+            self._spill()
+
+    def _grow(self):
+        self._capacity *= 2
+        for name, (values, has_value) in iteritems(self._columns):
+            grown = np.full(self._capacity, np.nan, dtype=values.dtype)
+            grown[:len(values)] = values
+            self._columns[name] = grown, has_value
+
+    def _set(self, name, ix, value):
+        try:
+            values, has_value = self._columns[name]
+        except KeyError:
+            values = np.full(self._capacity, np.nan, dtype=object)
+            has_value = False
+
+        is_float = isinstance(value, (float, np.floating))
+        if values.dtype == object:
+            if is_float and not has_value:
+                # the first value of the column, store it as floats.
+                values = values.astype('float64')
+        elif not (is_float or value is None):
+            values = values.astype(object)
+
+        if value is None and values.dtype != object:
+            values[ix] = np.nan
+        else:
+            values[ix] = value
+        self._columns[name] = values, has_value or value is not None
+
+    def _spill(self):
+        if self._store is None:
+            self._store = tables.open_file(self._spill_path, mode='w')
+        for name, columns in iteritems(self._records):
+            path = '/' + name
+            if path in self._store:
+                chunks = self._store.get_node(path)
+            else:
+                # rows of pickled columns, the records hold arbitrary objects.
+                chunks = self._store.create_vlarray(
+                    '/', name, tables.ObjectAtom(),
+                )
+            chunks.append(columns.chunk())
+            columns.clear()
+        self._spilled = self._size
+
+    def _read_records(self, name):
+        columns = self._records[name]
+        chunks = []
+        path = '/' + name
+        if self._store is not None and path in self._store:
+            chunks.extend(self._store.get_node(path).read())
+
+        out = np.empty(self._size, dtype=object)
+        for ix, records in enumerate(columns.records(chunks)):
+            out[ix] = records
+        # sessions after the last records.
+        for ix in range(len(columns.counts), self._size):
+            out[ix] = []
+        return out
+
+    def daily_stats(self):
+        """The daily stats of the packets added so far.
+
+        Returns
+        -------
+        daily_stats : pd.DataFrame
+            The same frame as one built from the list of rows of the daily
+            packets.
+        """
+        size = self._size
+        data = {}
+        for name in self._names:
+            if name in self._records:
+                data[name] = self._read_records(name)
+                continue
+            values = self._columns[name][0][:size]
+            if values.dtype == object:
+                # let pandas infer the type of the column like it does for
+                # rows.
+                values = values.tolist()
+            data[name] = values
+
+        index = pd.DatetimeIndex(
+            data['period_close'] if 'period_close' in data else [],
+        )
+        return pd.DataFrame(data, index=index, columns=self._names)
+
+    def close(self):
+        """Close the spill file.
+        """
+        if self._store is not None:
+            self._store.close()
+            self._store = None
@@ -31,6 +31,7 @@ from zipline.utils.cache import ExpiringCache
 from zipline.utils.dummy import DummyMapping
 from zipline.utils.input_validation import (expect_bounded,
                                             expect_strictly_bounded)
+from zipline.utils.metautils import defining_class
 
 SELL = 1 << 0
 BUY = 1 << 1
@@ -42,6 +43,16 @@ SQRT_252 = math.sqrt(252)
 DEFAULT_EQUITY_VOLUME_SLIPPAGE_BAR_LIMIT = 0.025
 DEFAULT_FUTURE_VOLUME_SLIPPAGE_BAR_LIMIT = 0.05
 
+# One open order of each asset being filled in a bar, see
+# SlippageModel.simulate_batch. ``asset`` is the index of the order's asset in
+# the batch and ``limit`` is nan for orders without a limit price.
+ORDER_BOOK_DTYPE = np.dtype([
+    ('asset', 'int64'),
+    ('open_amount', 'float64'),
+    ('direction', 'float64'),
+    ('limit', 'float64'),
+])
+
 
 class LiquidityExceeded(Exception):
     pass
@@ -80,6 +91,32 @@ def fill_price_worse_than_limit_price(fill_price, order):
     return False
 
 
+def fill_prices_worse_than_limit_prices(fill_prices, orders):
+    """
+    Array version of :func:`fill_price_worse_than_limit_price`.
+
+    Parameters
+    ----------
+    fill_prices: np.ndarray[float64]
+        The prices to check.
+
+    orders: np.ndarray[ORDER_BOOK_DTYPE]
+        The orders whose limit prices to check.
+
+    Returns
+    -------
+    np.ndarray[bool]: Whether each fill price is above the limit price (for a
+    buy) or below the limit price (for a sell).
+    """
+    # comparisons with the nan limits of orders without a limit are False.
+    limits = orders['limit']
+    directions = orders['direction']
+    return (
+        ((directions > 0) & (fill_prices > limits)) |
+        ((directions < 0) & (fill_prices < limits))
+    )
+
+
 class SlippageModel(with_metaclass(FinancialModelMeta)):
     """
     Abstract base class for slippage models.
@@ -210,6 +247,122 @@ class SlippageModel(with_metaclass(FinancialModelMeta)):
                 self._volume_for_bar += abs(txn.amount)
                 yield order, txn
 
+    def simulate_batch(self, data, orders_by_asset):
+        """
+        Simulate the open orders of many assets in the current bar.
+
+        Parameters
+        ----------
+        data : zipline.protocol.BarData
+            The data for the given bar.
+        orders_by_asset : list[(zipline.assets.Asset, list[Order])]
+            The open orders of each asset.
+
+        Returns
+        -------
+        fills : list[(Order, zipline.finance.transaction.Transaction)]
+            The same orders and transactions, in the same order, as calling
+            :meth:`simulate` for each asset in turn.
+
+        Notes
+        -----
+        Models which define :meth:`fill_orders` next to their
+        :meth:`process_order` read the bars of all of the assets with one call
+        to ``data.current`` and fill the first open order of every asset, then
+        the second one, and so on, with array operations.
+
+        Other models raise ``NotImplementedError``, iterate :meth:`simulate`
+        for them instead. A model may fill an order more than once in a bar,
+        looking at ``order.filled`` in between, so each fill has to be
+        book-kept before the next one is simulated.
+        """
+        if not self._fills_orders_with_arrays():
+            raise NotImplementedError('simulate_batch')
+
+        fills = [[] for _ in orders_by_asset]
+        if not orders_by_asset:
+            return []
+
+        bar = data.current(
+            [asset for asset, _ in orders_by_asset],
+            ['volume', 'close'],
+        )
+        volumes = bar['volume'].values.astype('float64')
+        prices = bar['close'].values.astype('float64')
+        dt = data.current_dt
+
+        self._volume_for_bar = 0
+        volume_for_bar = np.zeros(len(orders_by_asset))
+        # The position of the next order to look at in each list of orders.
+        next_order = [0] * len(orders_by_asset)
+
+        # Like ``simulate``, skip the assets without volume or a price.
+        remaining = np.flatnonzero((volumes != 0) & ~np.isnan(prices))
+        while len(remaining):
+            book = []
+            book_orders = []
+            for ix in remaining:
+                asset_orders = orders_by_asset[ix][1]
+                position = next_order[ix]
+                while position < len(asset_orders):
+                    order = asset_orders[position]
+                    position += 1
+                    if order.open_amount == 0:
+                        continue
+
+                    order.check_triggers(prices[ix], dt)
+                    if order.triggered:
+                        book.append((
+                            ix,
+                            order.open_amount,
+                            order.direction,
+                            order.limit or np.nan,
+                        ))
+                        book_orders.append(order)
+                        break
+                next_order[ix] = position
+
+            if not book:
+                break
+
+            book = np.array(book, dtype=ORDER_BOOK_DTYPE)
+            assets = book['asset']
+            execution_prices, execution_amounts, liquidity_exceeded = \
+                self.fill_orders(
+                    prices[assets],
+                    volumes[assets],
+                    volume_for_bar[assets],
+                    book,
+                )
+
+            for ix, order, price, amount in zip(assets.tolist(),
+                                                book_orders,
+                                                execution_prices.tolist(),
+                                                execution_amounts.tolist()):
+                if not np.isnan(price):
+                    txn = create_transaction(order, dt, price, amount)
+                    fills[ix].append((order, txn))
+            volume_for_bar[assets] += np.abs(np.trunc(execution_amounts))
+
+            # There is at most one order of each asset in the book.
+            remaining = np.array([
+                ix for ix, exceeded in zip(assets.tolist(),
+                                           liquidity_exceeded.tolist())
+                if not exceeded and
+                next_order[ix] < len(orders_by_asset[ix][1])
+            ], dtype='int64')
+
+        return [fill for asset_fills in fills for fill in asset_fills]
+
+    def _fills_orders_with_arrays(self):
+        # ``fill_orders`` has to come from the same class as the
+        # ``process_order`` it mirrors, a subclass may override the latter.
+        cls = type(self)
+        return (
+            defining_class(cls, 'simulate') is SlippageModel and
+            'fill_orders' in vars(defining_class(cls, 'process_order'))
+        )
+
     def asdict(self):
         return self.__dict__
 
@@ -337,6 +490,63 @@ class VolumeShareSlippage(SlippageModel):
             math.copysign(cur_volume, order.direction)
         )
 
+    def fill_orders(self, prices, volumes, volume_for_bar, orders):
+        """
+        Array version of :meth:`process_order` for one order of each of many
+        assets.
+
+        Parameters
+        ----------
+        prices : np.ndarray[float64]
+            The close price of the asset of each order.
+        volumes : np.ndarray[float64]
+            The volume of the asset of each order.
+        volume_for_bar : np.ndarray[float64]
+            The number of shares already filled for the asset of each order in
+            the current bar.
+        orders : np.ndarray[ORDER_BOOK_DTYPE]
+            The orders to fill.
+
+        Returns
+        -------
+        execution_prices : np.ndarray[float64]
+            The price of each fill, nan for the orders which don't fill.
+        execution_amounts : np.ndarray[float64]
+            The signed number of shares of each fill.
+        liquidity_exceeded : np.ndarray[bool]
+            Whether no more orders should be filled for the asset of each
+            order.
+        """
+        max_volume = self.volume_limit * volumes
+
+        remaining_volume = max_volume - volume_for_bar
+        liquidity_exceeded = remaining_volume < 1
+
+        cur_volume = np.trunc(
+            np.minimum(remaining_volume, np.abs(orders['open_amount'])),
+        )
+        total_volume = volume_for_bar + cur_volume
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_share = np.minimum(total_volume / volumes,
+                                      self.volume_limit)
+
+        simulated_impact = volume_share ** 2 \
+            * np.copysign(self.price_impact, orders['direction']) \
+            * prices
+        impacted_prices = prices + simulated_impact
+
+        filled = ~(
+            liquidity_exceeded |
+            (cur_volume < 1) |
+            fill_prices_worse_than_limit_prices(impacted_prices, orders)
+        )
+        return (
+            np.where(filled, impacted_prices, np.nan),
+            np.where(filled, np.copysign(cur_volume, orders['direction']), 0),
+            liquidity_exceeded,
+        )
+
 
 class FixedSlippage(SlippageModel):
     """
@@ -674,3 +884,25 @@ class FixedBasisPointsSlippage(SlippageModel):
             price + price * (self.percentage * order.direction),
             shares_to_fill * order.direction
         )
+
+    def fill_orders(self, prices, volumes, volume_for_bar, orders):
+        """
+        Array version of :meth:`process_order`, see
+        :meth:`VolumeShareSlippage.fill_orders`.
+        """
+        max_volume = np.trunc(self.volume_limit * volumes)
+
+        shares_to_fill = np.minimum(np.abs(orders['open_amount']),
+                                    max_volume - volume_for_bar)
+        liquidity_exceeded = shares_to_fill == 0
+
+        directions = orders['direction']
+        return (
+            np.where(
+                liquidity_exceeded,
+                np.nan,
+                prices + prices * (self.percentage * directions),
+            ),
+            np.where(liquidity_exceeded, 0, shares_to_fill * directions),
+            liquidity_exceeded,
+        )
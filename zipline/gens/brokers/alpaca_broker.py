@@ -11,7 +11,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Thread
+from time import perf_counter
+
 import alpaca_trade_api as tradeapi
+from zipline.data.realtime_bars import (
+    DEFAULT_CAPACITY,
+    BarQueueConsumer,
+    MinuteBarRingBuffer,
+)
 from zipline.gens.brokers.broker import Broker
 import zipline.protocol as zp
 from zipline.finance.order import (Order as ZPOrder,
@@ -23,6 +34,7 @@ from zipline.finance.execution import (MarketOrder,
 from zipline.finance.transaction import Transaction
 from zipline.api import symbol as symbol_lookup
 from zipline.errors import SymbolNotFound
+from zipline.utils.cache import ExpiringCache
 import pandas as pd
 import numpy as np
 import uuid
@@ -36,6 +48,15 @@ if sys.version_info > (3,):
 log = Logger('Alpaca Broker')
 NY = 'America/New_York'
 
+# Alpaca max symbols per 1 barset request
+MAX_SYMBOLS_PER_REQUEST = 200
+QUOTE_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'price',
+                'last_traded')
+# max concurrent get_last_trade calls when syncing positions
+DEFAULT_SYNC_WORKERS = 8
+# streamed bars which ended longer ago than this are not served
+DEFAULT_MAX_BAR_AGE = pd.Timedelta('2 min')
+
 
 class ALPACABroker(Broker):
     '''
@@ -44,16 +65,111 @@ class ALPACABroker(Broker):
     set via environment variables (APCA_API_KEY_ID and APCA_API_SECRET_KEY).
     Orders are identified by the UUID (v4) generated here and
     associated in the broker side using client_order_id attribute.
-    Currently this class makes use of REST API only, but websocket
-    streaming can possibly used too.
+    With ``stream_bars`` the minute bars of the subscribed assets are
+    streamed over the alpaca websocket into a ring buffer of
+    ``bar_buffer_size`` bars per asset (seeded with the bars fetched through
+    REST), and spot values, last traded dts and minute history are served
+    from it. Assets are subscribed the first time they are asked for. When
+    the latest streamed bar of an asset ended more than ``max_bar_age`` ago
+    the values are fetched through REST instead, and the stale assets are
+    subscribed again.
+
+    Otherwise spot values are served from a snapshot of the latest minute bar of every
+    symbol asked for so far. The snapshot is fetched with one batched
+    request, and is valid until the end of the minute it was fetched in, or
+    for ``quote_ttl`` if shorter. ``quote_cache_hits`` and
+    ``quote_cache_misses`` count the lookups answered from the snapshot and
+    the ones that needed a new one.
     '''
 
-    def __init__(self):
+    def __init__(self,
+                 uri=None,
+                 quote_ttl=pd.Timedelta('1 min'),
+                 stream_bars=False,
+                 bar_buffer_size=DEFAULT_CAPACITY,
+                 max_bar_age=DEFAULT_MAX_BAR_AGE,
+                 sync_workers=DEFAULT_SYNC_WORKERS):
         self._api = tradeapi.REST()
+        self._sync_workers = sync_workers
+        self._quote_ttl = quote_ttl
+        self._quotes = ExpiringCache()
+        self._quote_symbols = set()
+        self.quote_cache_hits = 0
+        self.quote_cache_misses = 0
+
+        self._bars = None
+        self._max_bar_age = max_bar_age
+        self._resubscribed_at = pd.Timestamp(0, tz='UTC')
+        if stream_bars:
+            bar_queue = Queue()
+            self._bars = MinuteBarRingBuffer(bar_buffer_size)
+            self._bar_consumer = BarQueueConsumer(bar_queue, self._bars)
+            self._bar_stream = AlpacaBarStream(bar_queue)
+            self._bar_consumer.start()
+            self._bar_stream.start()
+        self._streamed_symbols = set()
 
     def subscribe_to_market_data(self, asset):
-        '''Do nothing to comply the interface'''
-        pass
+        '''
+        Include the asset in the batched spot value snapshots, and stream its
+        bars if streaming
+        '''
+        self._quote_symbols.add(asset.symbol)
+        self._stream_symbols([asset.symbol])
+
+    def _stream_symbols(self, symbols):
+        '''
+        Seed the ring buffer with the latest bars of the symbols not streamed
+        yet, and subscribe to their bars.
+        '''
+        if self._bars is None:
+            return False
+        new_symbols = sorted(set(symbols) - self._streamed_symbols)
+        for i in range(0, len(new_symbols), MAX_SYMBOLS_PER_REQUEST):
+            chunk = new_symbols[i:i + MAX_SYMBOLS_PER_REQUEST]
+            barset = self._api.get_barset(chunk, '1Min',
+                                          limit=self._bars.capacity)
+            bars = barset.df
+            for symbol in chunk:
+                if symbol in bars.columns.get_level_values(0):
+                    self._bars.extend(symbol, bars[symbol].dropna())
+            self._bar_stream.subscribe(chunk)
+            self._streamed_symbols.update(chunk)
+        return True
+
+    def _streamed(self, symbols):
+        '''
+        Whether the bars of the symbols are served from the stream: they are
+        streamed, and the latest bar of each is recent. Otherwise the caller
+        falls back to REST.
+        '''
+        if not self._stream_symbols(symbols):
+            return False
+        if not all(symbol in self._bars for symbol in symbols):
+            return False
+        now = pd.Timestamp.utcnow()
+        # bars are labeled with the minute they start
+        oldest = now - self._max_bar_age - pd.Timedelta('1 min')
+        stale = [symbol for symbol in symbols
+                 if self._bars.last_traded_dt(symbol) < oldest]
+        if stale:
+            self._resubscribe(stale, now)
+            return False
+        return True
+
+    def _resubscribe(self, symbols, now):
+        '''
+        Subscribe again to the bars of symbols which stopped updating, which
+        reconnects the stream if it dropped. At most once every
+        ``max_bar_age``, as the bars also stop outside of the market hours.
+        '''
+        if now - self._resubscribed_at < self._max_bar_age:
+            return
+        log.warn('No bars streamed recently for {}, subscribing again'.format(
+            ', '.join(symbols),
+        ))
+        self._resubscribed_at = now
+        self._bar_stream.subscribe(symbols)
 
     def subscribed_assets(self):
         '''Do nothing to comply the interface'''
@@ -199,82 +315,180 @@ class ALPACABroker(Broker):
             return
 
     def get_last_traded_dt(self, asset):
+        if self._streamed([asset.symbol]):
+            return self._bars.last_traded_dt(asset.symbol)
         quote = self._api.get_quote(asset.symbol)
         return pd.Timestamp(quote.last_timestamp)
 
     def get_spot_value(self, assets, field, dt, data_frequency):
-        assert(field in (
-            'open', 'high', 'low', 'close', 'volume', 'price', 'last_traded'))
+        assert(field in QUOTE_FIELDS)
         assets_is_scalar = not isinstance(assets, (list, set, tuple))
         if assets_is_scalar:
             symbols = [assets.symbol]
         else:
             symbols = [asset.symbol for asset in assets]
-        if field in ('price', 'last_traded'):
+
+        if self._streamed(symbols):
+            values = [self._bars.spot_value(symbol, field)
+                      for symbol in symbols]
+            return values[0] if assets_is_scalar else values
+
+        quotes = self._get_quotes(symbols)
+        values = [quotes[symbol][field] for symbol in symbols]
+        if assets_is_scalar:
+            return values[0]
+        return values
+
+    def _get_quotes(self, symbols):
+        '''
+        The latest quote of each of the symbols, from the snapshot if it is
+        still valid. Otherwise a new snapshot of all the symbols asked for so
+        far is fetched.
+        '''
+        now = pd.Timestamp.utcnow()
+        quotes = {}
+        try:
+            for symbol in symbols:
+                quotes[symbol] = self._quotes.get(symbol, now)
+        except KeyError:
+            self.quote_cache_misses += 1
+            self._quote_symbols.update(symbols)
+            self._refresh_quotes(now)
+            quotes = {}
+            for symbol in symbols:
+                try:
+                    quotes[symbol] = self._quotes.get(symbol, now)
+                except KeyError:
+                    # the snapshot failed, it is fetched again on the next
+                    # lookup
+                    quotes[symbol] = self._bar2quote(None)
+            return quotes
+        self.quote_cache_hits += 1
+        return quotes
+
+    def _refresh_quotes(self, now):
+        expires = min(now + self._quote_ttl,
+                      now.floor('min') + pd.Timedelta('1 min'))
+        symbols = sorted(self._quote_symbols)
+        for i in range(0, len(symbols), MAX_SYMBOLS_PER_REQUEST):
+            chunk = symbols[i:i + MAX_SYMBOLS_PER_REQUEST]
             try:
-                last_trade = self._api.get_last_trade(symbols[0])
-                return last_trade.price
-            except:
-                return np.nan
-
-        bars = self._api.get_barset(symbols, '1Min', limit=1).df
-        if bars.empty:
-            return np.nan
-        if not np.isnan(bars[assets.symbol][field]).all():
-            return float(bars[assets.symbol][field])
-        # if assets_is_scalar:
-        #     if len(bars_list) == 0:
-        #         return np.nan
-        #     return bars_list[0].bars[-1]._raw[field]
-        # bars_map = {a.symbol: a for a in bars_list}
-        # return [
-        #     bars_map[symbol].bars[-1]._raw[field]
-        #     for symbol in symbols
-        # ]
+                barset = self._api.get_barset(chunk, '1Min', limit=1)
+            except Exception as e:
+                # leave the chunk out of the snapshot so that it is retried
+                log.error(e)
+                continue
+            for symbol in chunk:
+                bars = barset.get(symbol)
+                self._quotes.set(
+                    symbol,
+                    self._bar2quote(bars[-1] if bars else None),
+                    expires,
+                )
+
+    @staticmethod
+    def _bar2quote(bar):
+        if bar is None:
+            quote = dict.fromkeys(QUOTE_FIELDS, np.nan)
+            quote['last_traded'] = pd.NaT
+            return quote
+        quote = {
+            'open': float(bar.o),
+            'high': float(bar.h),
+            'low': float(bar.l),
+            'close': float(bar.c),
+            'volume': int(bar.v),
+            'last_traded': pd.Timestamp(bar.t),
+        }
+        quote['price'] = quote['close']
+        return quote
+
+    def _last_sale_dates(self, symbols):
+        """
+        The last traded dt of each symbol, from the quote snapshot (or the
+        streamed bars). The symbols without a recent bar fall back to
+        get_last_trade, called concurrently.
+        """
+        if not symbols:
+            return {}
+        if self._streamed(symbols):
+            dates = {symbol: self._bars.last_traded_dt(symbol)
+                     for symbol in symbols}
+        else:
+            dates = {symbol: quote['last_traded']
+                     for symbol, quote in self._get_quotes(symbols).items()}
+
+        missing = [symbol for symbol in symbols
+                   if pd.isnull(dates.get(symbol, pd.NaT))]
+        if missing:
+            with ThreadPoolExecutor(
+                    max_workers=min(self._sync_workers, len(missing))) as pool:
+                trades = pool.map(self._api.get_last_trade, missing)
+                for symbol, trade in zip(missing, trades):
+                    dates[symbol] = trade.timestamp
+        return dates
 
     def _get_positions_from_broker(self):
         """
         get the positions from the broker and update zipline objects ( the ledger )
         should be used once at startup and once every time we want to refresh the positions array
         """
+        started = perf_counter()
         cur_pos_in_tracker = self.metrics_tracker.positions
         positions = self._api.list_positions()
+        fetched = perf_counter()
+
+        updates = []
         for ap_position in positions:
-            # ap_position = positions[symbol]
+            if int(ap_position.qty) == 0:
+                continue
             try:
-                z_position = zp.Position(zp.InnerPosition(symbol_lookup(ap_position.symbol)))
-                editable_position = zp.MutableView(z_position)
+                asset = symbol_lookup(ap_position.symbol)
             except SymbolNotFound:
                 # The symbol might not have been ingested to the db therefore
                 # it needs to be skipped.
                 log.warning('Wanted to subscribe to %s, but this asset is probably not ingested' % ap_position.symbol)
                 continue
-            if int(ap_position.qty) == 0:
-                continue
-            editable_position._underlying_position.amount = int(ap_position.qty)
-            editable_position._underlying_position.cost_basis = float(ap_position.avg_entry_price)
-            editable_position._underlying_position.last_sale_price = float(ap_position.current_price)
-            editable_position._underlying_position.last_sale_date = self._api.get_last_trade(ap_position.symbol).timestamp
-            
-            self.metrics_tracker.update_position(z_position.asset,
-                                                 amount=z_position.amount,
-                                                 last_sale_price=z_position.last_sale_price,
-                                                 last_sale_date=z_position.last_sale_date,
-                                                 cost_basis=z_position.cost_basis)
-
-        # now let's sync the positions in the internal zipline objects
-        position_names = [p.symbol for p in positions]
-        assets_to_update = []  # separate list to not change list while iterating
-        for asset in cur_pos_in_tracker:
-            if asset.symbol not in position_names:
-                assets_to_update.append(asset)
-        for asset in assets_to_update:
+            updates.append((asset, ap_position))
+
+        last_sale_dates = self._last_sale_dates(
+            [asset.symbol for asset, _ in updates],
+        )
+        priced = perf_counter()
+
+        # apply everything to the ledger in one pass: the broker positions,
+        # and the removal of the positions the broker doesn't have anymore.
+        for asset, ap_position in updates:
+            self.metrics_tracker.update_position(
+                asset,
+                amount=int(ap_position.qty),
+                last_sale_price=float(ap_position.current_price),
+                last_sale_date=last_sale_dates[asset.symbol],
+                cost_basis=float(ap_position.avg_entry_price),
+            )
+
+        position_names = {p.symbol for p in positions}
+        # separate list to not change the positions while iterating
+        assets_to_remove = [asset for asset in cur_pos_in_tracker
+                            if asset.symbol not in position_names]
+        for asset in assets_to_remove:
             # deleting object from the metrics_tracker as its not in the portfolio
             self.metrics_tracker.update_position(asset,
                                                  amount=0)
         # for some reason, the metrics tracker has self.positions AND self.portfolio.positions. let's make sure
         # these objects are consistent
-        self.metrics_tracker._ledger._portfolio.positions = self.metrics_tracker.positions                                                 
+        self.metrics_tracker._ledger._portfolio.positions = self.metrics_tracker.positions
+        applied = perf_counter()
+
+        log.debug(
+            'Synced {} positions: list positions {:.3f}s, last sale dates '
+            '{:.3f}s, ledger update {:.3f}s'.format(
+                len(updates),
+                fetched - started,
+                priced - fetched,
+                applied - priced,
+            )
+        )
 
     def get_realtime_bars(self, assets, data_frequency):
         # TODO: cache the result. The caller
@@ -287,7 +501,72 @@ class ALPACABroker(Broker):
         else:
             symbols = [asset.symbol for asset in assets]
         timeframe = '1D' if is_daily else '1Min'
-        df = self._api.get_barset(symbols, timeframe, limit=500).df
+        if not is_daily and self._streamed(symbols):
+            df = self._bars.bars(symbols)
+            df.index = df.index.tz_convert(NY)
+        else:
+            df = self._api.get_barset(symbols, timeframe, limit=500).df
         if not is_daily:
             df = df.between_time("09:30", "16:00")
         return df
+
+
+class AlpacaBarStream(Thread):
+    '''
+    Thread running the alpaca websocket connection in its own event loop.
+    The minute bars of the subscribed symbols are put on ``queue`` as
+    ``(symbol, dt, open, high, low, close, volume)`` tuples.
+    '''
+
+    def __init__(self, queue, data_stream='alpacadatav1'):
+        super(AlpacaBarStream, self).__init__(name='AlpacaBarStream')
+        self.daemon = True
+        self._queue = queue
+        self._data_stream = data_stream
+        self._loop = asyncio.new_event_loop()
+        self._conn = None
+
+    def run(self):
+        asyncio.set_event_loop(self._loop)
+        conn = tradeapi.StreamConn(data_stream=self._data_stream)
+
+        @conn.on(r'^AM\..+$')
+        async def on_minute_bar(conn, channel, bar):
+            self._queue.put(_bar2event(channel, bar))
+
+        self._conn = conn
+        self._loop.run_forever()
+
+    def subscribe(self, symbols):
+        channels = ['AM.' + symbol for symbol in symbols]
+        self._loop.call_soon_threadsafe(self._subscribe, channels)
+
+    def _subscribe(self, channels):
+        self._loop.create_task(self._conn.subscribe(channels))
+
+
+def _bar2event(channel, bar):
+    '''
+    the minute bar messages of the alpaca data stream use the polygon field
+    names, the entity attributes are parsed lazily so the raw message is used.
+    '''
+    raw = getattr(bar, '_raw', bar)
+
+    def field(*keys):
+        for key in keys:
+            if key in raw:
+                return raw[key]
+        return np.nan
+
+    start = field('start', 's')
+    if isinstance(start, (int, long, float)):
+        start = pd.Timestamp(start, unit='ms', tz='UTC')
+    return (
+        channel.split('.', 1)[1],
+        pd.Timestamp(start),
+        float(field('open', 'o')),
+        float(field('high', 'h')),
+        float(field('low', 'l')),
+        float(field('close', 'c')),
+        float(field('volume', 'v')),
+    )
@@ -10,7 +10,9 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from time import sleep
+import signal
+from threading import Event, current_thread, main_thread
+from time import monotonic
 
 from logbook import Logger
 import pandas as pd
@@ -25,6 +27,40 @@ from zipline.gens.sim_engine import (
 
 log = Logger('Realtime Clock')
 
+_1_MINUTE = pd.Timedelta('1 minute')
+
+
+def _to_utc(dts):
+    dts = pd.DatetimeIndex(dts)
+    if dts.tz is None:
+        return dts.tz_localize('UTC')
+    return dts.tz_convert('UTC')
+
+
+class SystemTimeSource(object):
+    """
+    The wall and monotonic clocks of the machine, with a sleep that can be
+    woken up early.
+    """
+
+    def __init__(self):
+        self._wakeup = Event()
+
+    def now(self):
+        return pd.Timestamp.utcnow()
+
+    def monotonic(self):
+        return monotonic()
+
+    def sleep(self, seconds):
+        """
+        Sleep for ``seconds``. Returns True when woken up before that.
+        """
+        return self._wakeup.wait(seconds)
+
+    def wake(self):
+        self._wakeup.set()
+
 
 class RealtimeClock(object):
     """
@@ -37,8 +73,21 @@ class RealtimeClock(object):
     MinuteSimulationClock yields a new event on every iteration (regardless of
     wall clock).
 
+    The clock sleeps until the scheduled time of the next event, measured
+    with a monotonic clock. When the algorithm falls behind, the missed
+    minutes are skipped and the current minute is emitted right away.
+    ``last_bar_delay`` and ``max_bar_delay`` tell how late the bars fired.
+
     The :param:`time_skew` parameter represents the time difference between
     the Broker and the live trading machine's clock.
+
+    The :param:`time_source` parameter is the source of the current time and
+    of the sleeps, :class:`SystemTimeSource` by default.
+
+    The :param:`stop_poll_interval` parameter is how often the
+    ``stop_execution_callback`` is checked while sleeping. ``shutdown`` (also
+    called on SIGTERM while iterating in the main thread) wakes the clock up
+    right away and stops it.
     """
 
     def __init__(self,
@@ -50,23 +99,85 @@ class RealtimeClock(object):
                  time_skew=pd.Timedelta("0s"),
                  is_broker_alive=None,
                  execution_id=None,
-                 stop_execution_callback=None):
-        today = pd.to_datetime('now', utc=True).date()
-        beginning_of_today = pd.to_datetime(today, utc=True)
+                 stop_execution_callback=None,
+                 time_source=None,
+                 stop_poll_interval=pd.Timedelta("1s")):
+        self._time = time_source or SystemTimeSource()
+        today = self._time.now().normalize()
+
+        execution_opens = _to_utc(execution_opens)
+        execution_closes = _to_utc(execution_closes)
+        before_trading_start_minutes = _to_utc(before_trading_start_minutes)
 
-        self.sessions = sessions[(beginning_of_today <= sessions)]
-        self.execution_opens = execution_opens[(beginning_of_today.tz_localize(None) <= execution_opens)]
-        self.execution_closes = execution_closes[(beginning_of_today.tz_localize(None) <= execution_closes)]
+        self.sessions = sessions[(today <= sessions)]
+        self.execution_opens = execution_opens[(today <= execution_opens)]
+        self.execution_closes = execution_closes[(today <= execution_closes)]
         self.before_trading_start_minutes = before_trading_start_minutes[
-            (beginning_of_today <= before_trading_start_minutes)]
+            (today <= before_trading_start_minutes)]
 
         self.minute_emission = minute_emission
         self.time_skew = time_skew
         self.is_broker_alive = is_broker_alive or (lambda: True)
         self._last_emit = None
-        self._before_trading_start_bar_yielded = False
         self._execution_id = execution_id
         self._stop_execution_callback = stop_execution_callback
+        self._stop_poll_interval = stop_poll_interval.total_seconds()
+        self._shutdown = False
+
+        self.last_bar_delay = None
+        self.max_bar_delay = None
+
+    def shutdown(self):
+        """
+        Stop the clock, waking it up if it is sleeping.
+        """
+        self._shutdown = True
+        self._time.wake()
+
+    def _should_stop(self):
+        if self._shutdown:
+            return True
+        if self._stop_execution_callback:
+            return bool(self._stop_execution_callback(self._execution_id))
+        return False
+
+    def _server_time(self):
+        return self._time.now() + self.time_skew
+
+    def _sleep_until(self, server_time):
+        """
+        Sleep until the server clock reaches ``server_time``.
+
+        Returns False when the clock was stopped instead.
+        """
+        remaining = (server_time - self._server_time()).total_seconds()
+        deadline = self._time.monotonic() + remaining
+        while remaining > 0:
+            if self._should_stop():
+                return False
+            if self._stop_execution_callback:
+                remaining = min(remaining, self._stop_poll_interval)
+            if self._time.sleep(remaining) and self._shutdown:
+                return False
+            remaining = deadline - self._time.monotonic()
+        return not self._should_stop()
+
+    def _record_delay(self, minute):
+        delay = self._server_time() - minute
+        self.last_bar_delay = delay
+        if self.max_bar_delay is None or delay > self.max_bar_delay:
+            self.max_bar_delay = delay
+        log.debug('Bar {} fired {:.3f}s after its scheduled time'.format(
+            minute, delay.total_seconds()))
+
+    def _handle_signals(self):
+        """
+        Shut the clock down on SIGTERM, returns the handler to restore.
+        """
+        if current_thread() is not main_thread():
+            return None
+        return signal.signal(signal.SIGTERM,
+                             lambda signum, frame: self.shutdown())
 
     def __iter__(self):
         # yield from self.work_when_out_of_trading_hours()
@@ -75,55 +186,53 @@ class RealtimeClock(object):
         if not len(self.sessions):
             return
 
-        for index, session in enumerate(self.sessions):
-            self._before_trading_start_bar_yielded = False
+        previous_handler = self._handle_signals()
+        try:
+            for event in self._events():
+                yield event
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
 
+    def _events(self):
+        for index, session in enumerate(self.sessions):
             yield session, SESSION_START
 
-            if self._stop_execution_callback:
-                if self._stop_execution_callback(self._execution_id):
-                    break
+            before_trading_start = self.before_trading_start_minutes[index]
+            execution_open = self.execution_opens[index]
+            execution_close = self.execution_closes[index]
 
-            while self.is_broker_alive():
-                if self._stop_execution_callback:  # put it here too, to break inner loop as well
-                    if self._stop_execution_callback(self._execution_id):
-                        break
-                current_time = pd.to_datetime('now', utc=True)
-                server_time = (current_time + self.time_skew).floor('1 min')
+            # started mid-day: begin with the current minute
+            minute = max(execution_open, self._server_time().floor('1 min'))
+            if before_trading_start <= minute:
+                if not self._sleep_until(before_trading_start):
+                    return
+                self._last_emit = max(before_trading_start,
+                                      self._server_time().floor('1 min'))
+                yield self._last_emit, BEFORE_TRADING_START_BAR
+                before_trading_start = None
+                minute = max(execution_open,
+                             self._server_time().floor('1 min'))
 
-                if (server_time >= self.before_trading_start_minutes[index] and
-                        not self._before_trading_start_bar_yielded):
-                    self._last_emit = server_time
-                    self._before_trading_start_bar_yielded = True
-                    yield server_time, BEFORE_TRADING_START_BAR
-                elif (server_time < self.execution_opens[index].tz_localize('UTC') and index == 0) or \
-                        (self.execution_closes[index - 1].tz_localize('UTC') <= server_time <
-                         self.execution_opens[index].tz_localize('UTC')):
-                    # sleep anywhere between yesterday's close and today's open
-                    sleep(1)
-                elif (self.execution_opens[index].tz_localize('UTC') <= server_time <
-                      self.execution_closes[index].tz_localize('UTC')):
-                    if (self._last_emit is None or
-                            server_time - self._last_emit >=
-                            pd.Timedelta('1 minute')):
-                        self._last_emit = server_time
-                        yield server_time, BAR
-                        if self.minute_emission:
-                            yield server_time, MINUTE_END
-                    else:
-                        sleep(1)
-                elif server_time == self.execution_closes[index].tz_localize('UTC'):
-                    self._last_emit = server_time
-                    yield server_time, BAR
-                    if self.minute_emission:
-                        yield server_time, MINUTE_END
-                    yield server_time, SESSION_END
-                    break
-                elif server_time > self.execution_closes[index].tz_localize('UTC'):
+            while minute <= execution_close:
+                if not self._sleep_until(minute):
+                    return
+                if not self.is_broker_alive():
                     break
-                else:
-                    # We should never end up in this branch
-                    raise RuntimeError("Invalid state in RealtimeClock")
+                self._record_delay(minute)
+                self._last_emit = minute
+                if before_trading_start is not None and \
+                        minute >= before_trading_start:
+                    before_trading_start = None
+                    yield minute, BEFORE_TRADING_START_BAR
+                yield minute, BAR
+                if self.minute_emission:
+                    yield minute, MINUTE_END
+                if minute == execution_close:
+                    yield minute, SESSION_END
+                # when the algorithm fell behind, skip to the current minute
+                minute = max(minute + _1_MINUTE,
+                             self._server_time().floor('1 min'))
 
     def work_when_out_of_trading_hours(self):
         """
@@ -176,4 +285,4 @@ class RealtimeClock(object):
                     counter += 1
                     if self.minute_emission:
                         yield server_time, MINUTE_END
-                sleep(0.5)
+                self._time.sleep(0.5)
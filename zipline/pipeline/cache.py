@@ -0,0 +1,425 @@
+"""
+On disk cache of pipeline results, shared between runs.
+
+Results are stored per pipeline, per version of the input data and per
+domain, each entry holding the output of a single ``run_pipeline`` call
+in a directory of ``.npy`` files, one per column plus the index. An entry
+is reused for any date range it covers, the least recently used entries
+are removed once the cache grows past its maximum size.
+"""
+from hashlib import sha1
+import json
+import os
+from shutil import rmtree
+from types import CodeType, FunctionType, ModuleType
+
+from logbook import Logger
+import numpy as np
+import pandas as pd
+
+from zipline.utils.cache import working_dir
+from zipline.utils.paths import ensure_directory
+
+from .term import Term
+
+log = Logger('PipelineResultCache')
+
+#: The default maximum size of a cache, in bytes.
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+
+_META = 'meta.json'
+_INDEX_ARRAYS = ('dates', 'sids', 'date_codes', 'asset_codes')
+
+
+class UnstableFingerprint(ValueError):
+    """Raised when an object has no representation that is stable across
+    processes.
+    """
+
+
+def _code_fingerprint(code):
+    consts = tuple(
+        _code_fingerprint(c) if isinstance(c, CodeType) else repr(c)
+        for c in code.co_consts
+    )
+    return sha1(
+        code.co_code + repr((consts, code.co_names)).encode('utf-8'),
+    ).hexdigest()
+
+
+def _code_names(code):
+    """The global and attribute names used by ``code`` and the code nested
+    in it.
+    """
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names |= _code_names(const)
+    return names
+
+
+def _unwrap_descriptor(value):
+    """The function of a method, property or lazyval, ``value`` otherwise.
+    """
+    for attr in ('__func__', 'fget', '_get'):
+        func = getattr(value, attr, None)
+        if func is not None:
+            return func
+    return value
+
+
+def _class_attrs(cls):
+    """The attributes of a term class which determine what it computes.
+    """
+    attrs = {
+        name: _unwrap_descriptor(value)
+        for name, value in vars(cls).items()
+        if not (name.startswith('__') and name.endswith('__') or
+                name.startswith('_abc_'))
+    }
+    # inherited compute functions count as well.
+    for name in ('compute', 'compute_all'):
+        attrs[name] = getattr(cls, name, None)
+    return attrs
+
+
+def _reference_fingerprint(value, module, _seen):
+    """The fingerprint of a global referenced by a function of ``module``.
+
+    Modules, and functions and classes of other modules, are identified by
+    their name, only the code of ``module`` is walked.
+    """
+    if isinstance(value, ModuleType):
+        return ('module', value.__name__)
+    if isinstance(value, (type, FunctionType)) and \
+            value.__module__ != module:
+        return ('name', value.__module__, value.__qualname__)
+    return _fingerprint(value, _seen)
+
+
+def _fingerprint(obj, _seen=None):
+    """A representation of ``obj`` that is equal for equal objects in
+    different processes.
+    """
+    if _seen is None:
+        _seen = {}
+    key = id(obj)
+    if key in _seen:
+        return _seen[key][1]
+    # a reference to obj from within itself, e.g. the ``__class__`` closure
+    # of a method calling super().
+    _seen[key] = obj, ('cycle',)
+
+    if isinstance(obj, Term):
+        # everything that identifies a term is stored on the instance,
+        # the terms it depends on are fingerprinted recursively.
+        attrs = {
+            k: v for k, v in vars(obj).items()
+            if k not in ('__doc__', '_subclass_called_super_validate')
+        }
+        result = ('term', _fingerprint(type(obj), _seen),
+                  _fingerprint(attrs, _seen))
+    elif isinstance(obj, type):
+        # the attributes and the compute functions of term classes are part
+        # of the fingerprint so that changing a CustomFactor invalidates its
+        # results, datasets specialized to a domain hold it as a class
+        # attribute.
+        if issubclass(obj, Term):
+            attrs = _class_attrs(obj)
+            attrs['__bases__'] = tuple(
+                _reference_fingerprint(base, obj.__module__, _seen)
+                for base in obj.__bases__
+            )
+        else:
+            attrs = {'domain': vars(obj).get('domain')}
+        result = ('type', obj.__module__, obj.__qualname__,
+                  _fingerprint(attrs, _seen))
+    elif isinstance(obj, FunctionType):
+        # the globals and closures a function uses change what it computes
+        # as much as its code.
+        globals_ = {
+            name: _reference_fingerprint(
+                obj.__globals__[name], obj.__module__, _seen,
+            )
+            for name in _code_names(obj.__code__)
+            if name in obj.__globals__
+        }
+        cells = []
+        for cell in obj.__closure__ or ():
+            try:
+                contents = cell.cell_contents
+            except ValueError:
+                # an empty cell
+                contents = None
+            cells.append(_fingerprint(contents, _seen))
+        result = ('function', obj.__module__, obj.__qualname__,
+                  _code_fingerprint(obj.__code__),
+                  _fingerprint(globals_, _seen), tuple(cells))
+    elif isinstance(obj, dict):
+        result = ('dict', tuple(sorted(
+            ((_fingerprint(k, _seen), _fingerprint(v, _seen))
+             for k, v in obj.items()),
+            key=repr,
+        )))
+    elif isinstance(obj, (tuple, list)):
+        result = (type(obj).__name__,
+                  tuple(_fingerprint(v, _seen) for v in obj))
+    elif isinstance(obj, (set, frozenset)):
+        result = ('set', tuple(sorted(
+            (_fingerprint(v, _seen) for v in obj),
+            key=repr,
+        )))
+    elif isinstance(obj, (np.ndarray, pd.Index)):
+        # the repr of large arrays is truncated.
+        values = np.asarray(obj)
+        if values.dtype == object:
+            digest = sha1(repr(values.tolist()).encode('utf-8')).hexdigest()
+        else:
+            digest = sha1(np.ascontiguousarray(values).tobytes()).hexdigest()
+        result = ('array', str(values.dtype), values.shape, digest)
+    else:
+        result = repr(obj)
+        if ' at 0x' in result:
+            if not hasattr(obj, '__dict__'):
+                raise UnstableFingerprint(result)
+            result = ('object', _fingerprint(type(obj), _seen),
+                      _fingerprint(vars(obj), _seen))
+
+    # hold on to obj so that its id isn't reused during the walk.
+    _seen[key] = obj, result
+    return result
+
+
+def pipeline_fingerprint(pipeline):
+    """
+    A hash of the columns and screen of ``pipeline`` that is stable across
+    processes.
+
+    Raises
+    ------
+    UnstableFingerprint
+        If a term of the pipeline holds an object without a stable
+        representation.
+    """
+    return sha1(repr(_fingerprint(
+        (pipeline.columns, pipeline.screen),
+    )).encode('utf-8')).hexdigest()
+
+
+class PipelineResultCache(object):
+    """
+    On disk cache of the results of ``run_pipeline``.
+
+    Parameters
+    ----------
+    path : str
+        The directory holding the cache.
+    data_version : str
+        Identifies the data the pipelines are computed from, e.g. the
+        ingestion of the bundle. Results computed from a different version
+        are never returned.
+    max_size : int, optional
+        The size in bytes past which the least recently used results are
+        removed.
+    """
+
+    def __init__(self, path, data_version, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.data_version = data_version
+        self.max_size = max_size
+        ensure_directory(path)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, pipeline, domain):
+        """
+        The key of the results of ``pipeline`` over ``domain``, None if the
+        pipeline can't be fingerprinted.
+        """
+        try:
+            fingerprint = pipeline_fingerprint(pipeline)
+        except UnstableFingerprint as e:
+            log.warn('Not caching the results of a pipeline, {} has no '
+                     'stable representation.'.format(e))
+            return None
+        return sha1(repr((
+            fingerprint, self.data_version, _fingerprint(domain),
+        )).encode('utf-8')).hexdigest()
+
+    def _entries(self, key=None):
+        """
+        The (path, start_date, end_date) of the complete entries of ``key``,
+        or of every key.
+        """
+        keys = [key] if key is not None else os.listdir(self.path)
+        for k in keys:
+            key_path = os.path.join(self.path, k)
+            if not os.path.isdir(key_path):
+                continue
+            for name in os.listdir(key_path):
+                path = os.path.join(key_path, name)
+                try:
+                    with open(os.path.join(path, _META)) as f:
+                        meta = json.load(f)
+                except (IOError, OSError, ValueError):
+                    # entries without metadata are still being written.
+                    continue
+                yield (
+                    path,
+                    pd.Timestamp(meta['start_date'], tz='UTC'),
+                    pd.Timestamp(meta['end_date'], tz='UTC'),
+                )
+
+    def get(self, pipeline, domain, start_date, end_date, asset_finder):
+        """
+        The results of ``pipeline`` from ``start_date`` to ``end_date``, from
+        any stored result covering these dates.
+
+        Raises
+        ------
+        KeyError
+            If no stored result covers the dates.
+        """
+        key = self.key(pipeline, domain)
+        if key is not None:
+            for path, start, end in self._entries(key):
+                if start <= start_date and end_date <= end:
+                    result = self._read(path, start_date, end_date,
+                                        asset_finder)
+                    # the modification time of the metadata orders the
+                    # entries for eviction.
+                    os.utime(os.path.join(path, _META), None)
+                    self.hits += 1
+                    return result
+        self.misses += 1
+        raise KeyError((key, start_date, end_date))
+
+    def set(self, pipeline, domain, start_date, end_date, result):
+        """
+        Store the results of ``pipeline`` from ``start_date`` to
+        ``end_date``.
+        """
+        key = self.key(pipeline, domain)
+        if key is None:
+            return
+        path = os.path.join(self.path, key, '{}_{}'.format(
+            start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d'),
+        ))
+        columns = []
+        with working_dir(path) as wd:
+            index = result.index
+            dates, assets = index.levels
+            date_codes, asset_codes = index.codes
+            np.save(wd.getpath('dates.npy'),
+                    pd.DatetimeIndex(dates).asi8)
+            np.save(wd.getpath('sids.npy'),
+                    np.array([a.sid for a in assets], dtype='int64'))
+            np.save(wd.getpath('date_codes.npy'),
+                    np.asarray(date_codes, dtype='int64'))
+            np.save(wd.getpath('asset_codes.npy'),
+                    np.asarray(asset_codes, dtype='int64'))
+
+            for i, name in enumerate(result.columns):
+                values = result[name].values
+                filename = 'column_{}.npy'.format(i)
+                if isinstance(values, pd.Categorical):
+                    np.save(wd.getpath(filename), values.codes)
+                    np.save(wd.getpath('categories_{}.npy'.format(i)),
+                            np.asarray(values.categories, dtype=object),
+                            allow_pickle=True)
+                    kind = 'categorical'
+                else:
+                    np.save(wd.getpath(filename), values,
+                            allow_pickle=values.dtype == object)
+                    kind = 'array'
+                columns.append({'name': name, 'kind': kind})
+
+        # the metadata is written last, it marks the entry as complete.
+        meta_path = os.path.join(path, _META)
+        with open(meta_path + '.tmp', 'w') as f:
+            json.dump(
+                {
+                    'start_date': str(start_date.date()),
+                    'end_date': str(end_date.date()),
+                    'columns': columns,
+                },
+                f,
+            )
+        os.rename(meta_path + '.tmp', meta_path)
+        self.evict()
+
+    def _read(self, path, start_date, end_date, asset_finder):
+        arrays = {
+            name: np.load(os.path.join(path, name + '.npy'))
+            for name in _INDEX_ARRAYS
+        }
+        with open(os.path.join(path, _META)) as f:
+            meta = json.load(f)
+
+        dates = pd.DatetimeIndex(arrays['dates'], tz='UTC')
+        # the date level of a stored result may miss the sessions without
+        # rows, ``end_date`` isn't necessarily one of the stored dates.
+        first = dates.searchsorted(start_date)
+        last = dates.searchsorted(end_date, side='right') - 1
+        date_codes = arrays['date_codes']
+        rows = (date_codes >= first) & (date_codes <= last)
+
+        index = pd.MultiIndex(
+            levels=[
+                dates[first:last + 1],
+                np.array(asset_finder.retrieve_all(arrays['sids'])),
+            ],
+            codes=[date_codes[rows] - first, arrays['asset_codes'][rows]],
+        )
+
+        data = {}
+        for i, column in enumerate(meta['columns']):
+            values = np.load(
+                os.path.join(path, 'column_{}.npy'.format(i)),
+                allow_pickle=True,
+            )[rows]
+            if column['kind'] == 'categorical':
+                categories = np.load(
+                    os.path.join(path, 'categories_{}.npy'.format(i)),
+                    allow_pickle=True,
+                )
+                values = pd.Categorical.from_codes(values, categories)
+            data[column['name']] = values
+
+        return pd.DataFrame(
+            data,
+            index=index,
+            columns=[column['name'] for column in meta['columns']],
+        )
+
+    @staticmethod
+    def _entry_size(path):
+        return sum(
+            os.path.getsize(os.path.join(path, name))
+            for name in os.listdir(path)
+        )
+
+    @property
+    def size(self):
+        """The size of the stored results, in bytes.
+        """
+        return sum(self._entry_size(path) for path, _, _ in self._entries())
+
+    def evict(self):
+        """
+        Remove the least recently used results until the cache is smaller
+        than its maximum size.
+        """
+        entries = sorted(
+            (os.path.getmtime(os.path.join(path, _META)),
+             self._entry_size(path),
+             path)
+            for path, _, _ in self._entries()
+        )
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            log.debug('Evicting pipeline results {}'.format(path))
+            rmtree(path)
+            size -= entry_size
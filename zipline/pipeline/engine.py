@@ -51,12 +51,24 @@ implements the following algorithm for executing pipelines:
 
    This logic lives in SimplePipelineEngine.compute_chunk.
 
+   If the engine has more than one worker, terms whose inputs are all in
+   the workspace are loaded or computed concurrently on a pool of threads
+   instead, see SimplePipelineEngine._compute_terms_concurrently.
+
 7. Extract the pipeline's outputs from the workspace and convert them
    into "narrow" format, with output labels dictated by the Pipeline's
    screen. This logic lives in SimplePipelineEngine._to_narrow.
 """
 from abc import ABCMeta, abstractmethod
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from functools import partial
+from heapq import heapify, heappop, heappush
+from multiprocessing import get_context
+import os
+import warnings
+
+import pandas as pd
 
 from six import iteritems, with_metaclass, viewkeys
 from numpy import array, arange
@@ -65,6 +77,7 @@ from toolz import groupby
 
 from zipline.lib.adjusted_array import ensure_adjusted_array, ensure_ndarray
 from zipline.errors import NoFurtherDataError
+from zipline.utils.compat import ExitStack
 from zipline.utils.input_validation import expect_types
 from zipline.utils.numpy_utils import (
     as_column,
@@ -74,9 +87,11 @@ from zipline.utils.numpy_utils import (
 from zipline.utils.pandas_utils import explode
 from zipline.utils.string_formatting import bulleted_list
 
-from .domain import Domain, GENERIC
+from .domain import Domain, GENERIC, US_EQUITIES
 from .graph import maybe_specialize
-from .hooks import DelegatingHooks
+from .data import USEquityPricing
+from .hooks import DelegatingHooks, NoHooks
+from .loaders import USEquityPricingLoader
 from .term import AssetExists, InputDates, LoadableTerm
 
 from zipline.utils.date_utils import compute_date_range_chunks
@@ -247,6 +262,10 @@ class SimplePipelineEngine(PipelineEngine):
     default_hooks : list, optional
         List of hooks that should be used to instrument all pipelines executed
         by this engine.
+    workers : int, optional
+        Number of threads loading and computing independent terms
+        concurrently. By default terms are computed one at a time, in
+        execution order.
 
     See Also
     --------
@@ -258,10 +277,12 @@ class SimplePipelineEngine(PipelineEngine):
         '_root_mask_term',
         '_root_mask_dates_term',
         '_populate_initial_workspace',
+        '_workers',
     )
 
     @expect_types(
         default_domain=Domain,
+        workers=int,
         __funcname='SimplePipelineEngine',
     )
     def __init__(self,
@@ -269,7 +290,8 @@ class SimplePipelineEngine(PipelineEngine):
                  asset_finder,
                  default_domain=GENERIC,
                  populate_initial_workspace=None,
-                 default_hooks=None):
+                 default_hooks=None,
+                 workers=1):
 
         self._get_loader = get_loader
         self._finder = asset_finder
@@ -287,12 +309,15 @@ class SimplePipelineEngine(PipelineEngine):
         else:
             self._default_hooks = list(default_hooks)
 
+        self._workers = workers
+
     def run_chunked_pipeline(self,
                              pipeline,
                              start_date,
                              end_date,
                              chunksize,
-                             hooks=None):
+                             hooks=None,
+                             workers=1):
         """
         Compute values for ``pipeline`` from ``start_date`` to ``end_date``, in
         date chunks of size ``chunksize``.
@@ -312,6 +337,10 @@ class SimplePipelineEngine(PipelineEngine):
             The number of days to execute at a time.
         hooks : list[implements(PipelineHooks)], optional
             Hooks for instrumenting Pipeline execution.
+        workers : int, optional
+            The number of processes computing chunks at the same time. The
+            processes are forked, so this is only supported on platforms with
+            the ``fork`` start method.
 
         Returns
         -------
@@ -342,7 +371,12 @@ class SimplePipelineEngine(PipelineEngine):
 
         run_pipeline = partial(self._run_pipeline_impl, pipeline, hooks=hooks)
         with hooks.running_pipeline(pipeline, start_date, end_date):
-            chunks = [run_pipeline(s, e) for s, e in ranges]
+            if workers > 1:
+                chunks = self._run_chunks_in_processes(
+                    pipeline, ranges, hooks, workers,
+                )
+            else:
+                chunks = [run_pipeline(s, e) for s, e in ranges]
 
         if len(chunks) == 1:
             # OPTIMIZATION: Don't make an extra copy in `categorical_df_concat`
@@ -354,6 +388,49 @@ class SimplePipelineEngine(PipelineEngine):
         nonempty_chunks = [c for c in chunks if len(c)]
         return categorical_df_concat(nonempty_chunks, inplace=True)
 
+    def _run_chunks_in_processes(self, pipeline, ranges, hooks, workers):
+        """
+        Compute the chunks of ``pipeline`` over the date ``ranges`` on a pool
+        of ``workers`` processes.
+
+        The processes are forked, they inherit the engine and the pipeline
+        instead of pickling them and reopen the data of the engine with
+        ``_reopen``. Only the dates of the chunks and their results are sent
+        between processes. Results are received in date order, each chunk is
+        reported to ``hooks`` until its result is received, without the terms
+        computed by the process.
+        """
+        if type(self)._reopen is SimplePipelineEngine._reopen:
+            warnings.warn(
+                '{} does not override _reopen, the processes computing the '
+                'chunks of the pipeline share its open files and database '
+                'connections.'.format(type(self).__name__),
+                RuntimeWarning,
+                stacklevel=3,
+            )
+        ranges = list(ranges)
+        context = get_context('fork')
+        processes = min(workers, len(ranges))
+        with context.Pool(processes,
+                          initializer=_init_chunk_process,
+                          initargs=(self, pipeline)) as pool:
+            results = pool.imap(_run_chunk_in_process, ranges)
+            chunks = []
+            for start_date, end_date in ranges:
+                with hooks.computing_chunk([], start_date, end_date):
+                    chunks.append(next(results))
+        return chunks
+
+    def _reopen(self):
+        """
+        Reopen the data read by this engine in a process forked by
+        ``run_chunked_pipeline``.
+
+        Readers holding open files or database connections should be reopened
+        from their paths, the default implementation does nothing and
+        ``run_chunked_pipeline`` warns that the processes share them.
+        """
+
     def run_pipeline(self, pipeline, start_date, end_date, hooks=None):
         """
         Compute values for ``pipeline`` from ``start_date`` to ``end_date``.
@@ -662,76 +739,216 @@ class SimplePipelineEngine(PipelineEngine):
             (t for t in execution_order if t in will_be_loaded),
         )
 
+        if self._workers > 1:
+            self._compute_terms_concurrently(
+                graph,
+                dates,
+                sids,
+                workspace,
+                refcounts,
+                execution_order,
+                loader_groups,
+                loader_group_key,
+                hooks,
+            )
+        else:
+            for term in execution_order:
+                # `term` may have been supplied in `initial_workspace`, or we
+                # may have loaded `term` as part of a batch with another term
+                # coming from the same loader (see note on loader_group_key
+                # above). In either case, we already have the term computed,
+                # so don't recompute.
+                if term in workspace:
+                    continue
+
+                # Asset labels are always the same, but date labels vary by
+                # how many extra rows are needed.
+                mask, mask_dates = graph.mask_and_dates_for_term(
+                    term,
+                    self._root_mask_term,
+                    workspace,
+                    dates,
+                )
+
+                if isinstance(term, LoadableTerm):
+                    loader = get_loader(term)
+                    to_load = sorted(
+                        loader_groups[loader_group_key(term)],
+                        key=lambda t: t.dataset
+                    )
+                    self._ensure_can_load(loader, to_load)
+                    with hooks.loading_terms(to_load):
+                        loaded = loader.load_adjusted_array(
+                            domain, to_load, mask_dates, sids, mask,
+                        )
+                    _check_loaded(loaded, to_load)
+                    workspace.update(loaded)
+                else:
+                    with hooks.computing_term(term):
+                        workspace[term] = term._compute(
+                            self._inputs_for_term(
+                                term,
+                                workspace,
+                                graph,
+                                domain,
+                                refcounts,
+                            ),
+                            mask_dates,
+                            sids,
+                            mask,
+                        )
+                    if term.ndim == 2:
+                        assert workspace[term].shape == mask.shape
+                    else:
+                        assert workspace[term].shape == (mask.shape[0], 1)
+
+                    # Decref dependencies of ``term``, and clear any terms
+                    # whose refcounts hit 0.
+                    for garbage in graph.decref_dependencies(term, refcounts):
+                        del workspace[garbage]
+
+        # At this point, all the output terms are in the workspace.
+        out = {}
+        graph_extra_rows = graph.extra_rows
+        for name, term in iteritems(graph.outputs):
+            # Truncate off extra rows from outputs.
+            out[name] = workspace[term][graph_extra_rows[term]:]
+
+        return out
+
+    def _compute_terms_concurrently(self,
+                                    graph,
+                                    dates,
+                                    sids,
+                                    workspace,
+                                    refcounts,
+                                    execution_order,
+                                    loader_groups,
+                                    loader_group_key,
+                                    hooks):
+        """
+        Compute the terms of ``execution_order`` into ``workspace`` on a pool
+        of ``self._workers`` threads.
+
+        Each loader group is loaded, and every other term is computed, by a
+        task that starts as soon as the tasks producing its inputs are done,
+        so loads overlap with computations and independent terms are computed
+        at the same time. Ready tasks start in execution order.
+
+        Only ``load_adjusted_array`` and ``_compute`` run on the pool. Inputs
+        are gathered, results stored, refcounts decremented and hooks entered
+        and exited on the calling thread. Refcounts are decremented when a
+        task is done, so an input is only traversed without a copy by the
+        last of its consumers.
+        """
+        get_loader = self._get_loader
+        domain = graph.domain
+        workers = self._workers
+        position = {term: i for i, term in enumerate(execution_order)}
+
+        # A task is the tuple of the terms it produces.
+        tasks = []
+        task_of = {}
         for term in execution_order:
-            # `term` may have been supplied in `initial_workspace`, or we may
-            # have loaded `term` as part of a batch with another term coming
-            # from the same loader (see note on loader_group_key above). In
-            # either case, we already have the term computed, so don't
-            # recompute.
-            if term in workspace:
+            if term in workspace or term in task_of:
                 continue
-
-            # Asset labels are always the same, but date labels vary by how
-            # many extra rows are needed.
+            if isinstance(term, LoadableTerm):
+                task = tuple(sorted(
+                    loader_groups[loader_group_key(term)],
+                    key=lambda t: t.dataset
+                ))
+            else:
+                task = (term,)
+            tasks.append(task)
+            for t in task:
+                task_of[t] = task
+
+        waiting_on = {}
+        dependents = defaultdict(list)
+        for task in tasks:
+            waiting_on[task] = {
+                task_of[parent]
+                for term in task
+                for parent, _ in graph.graph.in_edges([term])
+                if parent in task_of
+            } - {task}
+            for dependency in waiting_on[task]:
+                dependents[dependency].append(task)
+
+        # Tasks are never compared, positions are unique.
+        ready = [(position[t[0]], t) for t in tasks if not waiting_on[t]]
+        heapify(ready)
+        running = {}
+
+        def start(pool, task):
+            term = task[0]
             mask, mask_dates = graph.mask_and_dates_for_term(
                 term,
                 self._root_mask_term,
                 workspace,
                 dates,
             )
-
+            stack = ExitStack()
             if isinstance(term, LoadableTerm):
                 loader = get_loader(term)
-                to_load = sorted(
-                    loader_groups[loader_group_key(term)],
-                    key=lambda t: t.dataset
-                )
+                to_load = list(task)
                 self._ensure_can_load(loader, to_load)
-                with hooks.loading_terms(to_load):
-                    loaded = loader.load_adjusted_array(
-                        domain, to_load, mask_dates, sids, mask,
-                    )
-                assert set(loaded) == set(to_load), (
-                    'loader did not return an AdjustedArray for each column\n'
-                    'expected: %r\n'
-                    'got:      %r' % (
-                        sorted(to_load, key=repr),
-                        sorted(loaded, key=repr),
-                    )
+                stack.enter_context(hooks.loading_terms(to_load))
+                future = pool.submit(
+                    loader.load_adjusted_array,
+                    domain, to_load, mask_dates, sids, mask,
                 )
-                workspace.update(loaded)
             else:
-                with hooks.computing_term(term):
-                    workspace[term] = term._compute(
-                        self._inputs_for_term(
-                            term,
-                            workspace,
-                            graph,
-                            domain,
-                            refcounts,
-                        ),
-                        mask_dates,
-                        sids,
-                        mask,
-                    )
+                inputs = self._inputs_for_term(
+                    term,
+                    workspace,
+                    graph,
+                    domain,
+                    refcounts,
+                )
+                stack.enter_context(hooks.computing_term(term))
+                future = pool.submit(
+                    term._compute, inputs, mask_dates, sids, mask,
+                )
+            running[future] = task, mask, stack
+
+        def finish(task, mask, result):
+            term = task[0]
+            if isinstance(term, LoadableTerm):
+                _check_loaded(result, task)
+                workspace.update(result)
+            else:
                 if term.ndim == 2:
-                    assert workspace[term].shape == mask.shape
+                    assert result.shape == mask.shape
                 else:
-                    assert workspace[term].shape == (mask.shape[0], 1)
-
-                # Decref dependencies of ``term``, and clear any terms
-                # whose refcounts hit 0.
+                    assert result.shape == (mask.shape[0], 1)
+                workspace[term] = result
                 for garbage in graph.decref_dependencies(term, refcounts):
                     del workspace[garbage]
 
-        # At this point, all the output terms are in the workspace.
-        out = {}
-        graph_extra_rows = graph.extra_rows
-        for name, term in iteritems(graph.outputs):
-            # Truncate off extra rows from outputs.
-            out[name] = workspace[term][graph_extra_rows[term]:]
-
-        return out
+            for dependent in dependents[task]:
+                waiting_on[dependent].remove(task)
+                if not waiting_on[dependent]:
+                    heappush(ready, (position[dependent[0]], dependent))
+
+        with ThreadPoolExecutor(workers) as pool:
+            try:
+                while ready or running:
+                    while ready and len(running) < workers:
+                        start(pool, heappop(ready)[1])
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in sorted(
+                            done, key=lambda f: position[running[f][0][0]]):
+                        task, mask, stack = running.pop(future)
+                        with stack:
+                            result = future.result()
+                        finish(task, mask, result)
+            finally:
+                # Exit the hooks of the tasks still running if one failed.
+                wait(running)
+                for _, _, stack in running.values():
+                    stack.close()
 
     def _to_narrow(self, terms, data, mask, dates, assets):
         """
@@ -910,6 +1127,106 @@ class SimplePipelineEngine(PipelineEngine):
                 )
 
 
+class BundlePipelineEngine(SimplePipelineEngine):
+    """
+    A SimplePipelineEngine computing ``EquityPricing`` data from an ingested
+    bundle.
+
+    Parameters
+    ----------
+    bundle : str
+        The name of the bundle.
+    environ : mapping, optional
+        The environment variables. Defaults of os.environ.
+    timestamp : datetime, optional
+        The timestamp of the ingestion to read. Defaults to the current time,
+        so that every process of ``run_chunked_pipeline`` reads the same
+        ingestion.
+    default_domain : zipline.pipeline.domain.Domain, optional
+        Domain of pipelines without one. Defaults to US_EQUITIES.
+    **kwargs
+        Forwarded to SimplePipelineEngine.
+
+    Notes
+    -----
+    The readers of the bundle are reopened from their paths in each process
+    of ``run_chunked_pipeline``.
+    """
+    def __init__(self,
+                 bundle,
+                 environ=None,
+                 timestamp=None,
+                 default_domain=US_EQUITIES,
+                 **kwargs):
+        self._bundle = bundle
+        self._environ = environ if environ is not None else os.environ
+        self._timestamp = (
+            timestamp if timestamp is not None else pd.Timestamp.utcnow()
+        )
+        super(BundlePipelineEngine, self).__init__(
+            get_loader=self._choose_loader,
+            asset_finder=None,
+            default_domain=default_domain,
+            **kwargs
+        )
+        self._reopen()
+
+    def _choose_loader(self, column):
+        if column in USEquityPricing.columns:
+            return self._pricing_loader
+        raise ValueError(
+            "No PipelineLoader registered for column %s." % column
+        )
+
+    def _reopen(self):
+        # zipline.data.bundles registers every bundle on import, it isn't
+        # needed by the other engines.
+        from zipline.data import bundles
+
+        bundle_data = bundles.load(
+            self._bundle,
+            self._environ,
+            self._timestamp,
+        )
+        self._finder = bundle_data.asset_finder
+        self._pricing_loader = USEquityPricingLoader.without_fx(
+            bundle_data.equity_daily_bar_reader,
+            bundle_data.adjustment_reader,
+        )
+
+
+# The engine and pipeline of a process forked by
+# SimplePipelineEngine._run_chunks_in_processes.
+_chunk_process_state = {}
+
+
+def _init_chunk_process(engine, pipeline):
+    engine._reopen()
+    _chunk_process_state['engine'] = engine
+    _chunk_process_state['pipeline'] = pipeline
+
+
+def _run_chunk_in_process(dates):
+    start_date, end_date = dates
+    return _chunk_process_state['engine']._run_pipeline_impl(
+        _chunk_process_state['pipeline'],
+        start_date,
+        end_date,
+        NoHooks(),
+    )
+
+
+def _check_loaded(loaded, to_load):
+    assert set(loaded) == set(to_load), (
+        'loader did not return an AdjustedArray for each column\n'
+        'expected: %r\n'
+        'got:      %r' % (
+            sorted(to_load, key=repr),
+            sorted(loaded, key=repr),
+        )
+    )
+
+
 def _pipeline_output_index(dates, assets, mask):
     """
     Create a MultiIndex for a pipeline output.
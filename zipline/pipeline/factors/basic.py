@@ -11,6 +11,7 @@ from numpy import (
     full,
     isnan,
     log,
+    newaxis,
     NINF,
     sqrt,
     sum as np_sum,
@@ -56,6 +57,9 @@ class Returns(CustomFactor):
     def compute(self, today, assets, out, close):
         out[:] = (close[-1] - close[0]) / close[0]
 
+    def compute_all(self, dates, assets, out, close):
+        out[:] = (close[:, -1] - close[:, 0]) / close[:, 0]
+
 
 class PercentChange(SingleInputMixin, CustomFactor):
     """
@@ -112,6 +116,9 @@ class SimpleMovingAverage(SingleInputMixin, CustomFactor):
     def compute(self, today, assets, out, data):
         out[:] = nanmean(data, axis=0)
 
+    def compute_all(self, dates, assets, out, data):
+        out[:] = nanmean(data, axis=1)
+
 
 class WeightedAverageValue(CustomFactor):
     """
@@ -124,6 +131,9 @@ class WeightedAverageValue(CustomFactor):
     def compute(self, today, assets, out, base, weight):
         out[:] = nansum(base * weight, axis=0) / nansum(weight, axis=0)
 
+    def compute_all(self, dates, assets, out, base, weight):
+        out[:] = nansum(base * weight, axis=1) / nansum(weight, axis=1)
+
 
 class VWAP(WeightedAverageValue):
     """
@@ -170,6 +180,9 @@ class AverageDollarVolume(CustomFactor):
     def compute(self, today, assets, out, close, volume):
         out[:] = nansum(close * volume, axis=0) / len(close)
 
+    def compute_all(self, dates, assets, out, close, volume):
+        out[:] = nansum(close * volume, axis=1) / close.shape[1]
+
 
 def exponential_weights(length, decay_rate):
     """
@@ -396,6 +409,13 @@ class ExponentialWeightedMovingAverage(_ExponentialWeightedFactor):
             weights=exponential_weights(len(data), decay_rate),
         )
 
+    def compute_all(self, dates, assets, out, data, decay_rate):
+        out[:] = average(
+            data,
+            axis=1,
+            weights=exponential_weights(data.shape[1], decay_rate),
+        )
+
 
 class ExponentialWeightedMovingStdDev(_ExponentialWeightedFactor):
     """
@@ -440,6 +460,22 @@ class ExponentialWeightedMovingStdDev(_ExponentialWeightedFactor):
         )
         out[:] = sqrt(variance * bias_correction)
 
+    def compute_all(self, dates, assets, out, data, decay_rate):
+        weights = exponential_weights(data.shape[1], decay_rate)
+
+        mean = average(data, axis=1, weights=weights)
+        variance = average(
+            (data - mean[:, newaxis]) ** 2,
+            axis=1,
+            weights=weights,
+        )
+
+        squared_weight_sum = (np_sum(weights) ** 2)
+        bias_correction = (
+            squared_weight_sum / (squared_weight_sum - np_sum(weights ** 2))
+        )
+        out[:] = sqrt(variance * bias_correction)
+
 
 class LinearWeightedMovingAverage(SingleInputMixin, CustomFactor):
     """
@@ -491,6 +527,9 @@ class AnnualizedVolatility(CustomFactor):
     def compute(self, today, assets, out, returns, annualization_factor):
         out[:] = nanstd(returns, axis=0) * (annualization_factor ** .5)
 
+    def compute_all(self, dates, assets, out, returns, annualization_factor):
+        out[:] = nanstd(returns, axis=1) * (annualization_factor ** .5)
+
 
 class PeerCount(SingleInputMixin, CustomFactor):
     """
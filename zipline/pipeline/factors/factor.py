@@ -6,7 +6,21 @@ from numbers import Number
 from math import ceil
 from textwrap import dedent
 
-from numpy import empty_like, inf, isnan, nan, where
+from numpy import (
+    arange,
+    broadcast_to,
+    ceil as np_ceil,
+    empty,
+    empty_like,
+    inf,
+    isnan,
+    maximum,
+    minimum,
+    nan,
+    newaxis,
+    not_equal,
+    where,
+)
 from scipy.stats import rankdata
 
 from zipline.utils.compat import wraps
@@ -15,7 +29,10 @@ from zipline.errors import (
     UnknownRankMethod,
     UnsupportedDataType,
 )
-from zipline.lib.normalize import naive_grouped_rowwise_apply
+from zipline.lib.normalize import (
+    naive_grouped_rowwise_apply,
+    segmented_grouped_rowwise_apply,
+)
 from zipline.lib.rank import masked_rankdata_2d, rankdata_1d_descending
 from zipline.pipeline.api_utils import restrict_to_dtype
 from zipline.pipeline.classifiers import Classifier, Everything, Quantiles
@@ -65,6 +82,7 @@ from zipline.utils.numpy_utils import (
     bool_dtype,
     coerce_to_dtype,
     float64_dtype,
+    int64_dtype,
     is_missing,
 )
 from zipline.utils.sharedoc import templated_docstring
@@ -1450,17 +1468,25 @@ class GroupedRowTransform(Factor):
         group_labels, null_label = self.inputs[1]._to_integral(arrays[1])
         # Make a copy with the null code written to masked locations.
         group_labels = where(mask, group_labels, null_label)
-        return where(
-            group_labels != null_label,
-            naive_grouped_rowwise_apply(
+
+        transform_2d = _GROUPED_ROW_TRANSFORMS_2D.get(self._transform)
+        if transform_2d is not None:
+            result = segmented_grouped_rowwise_apply(
+                data=data,
+                group_labels=group_labels,
+                func=transform_2d,
+                func_args=self._transform_args,
+                out=empty_like(data, dtype=self.dtype),
+            )
+        else:
+            result = naive_grouped_rowwise_apply(
                 data=data,
                 group_labels=group_labels,
                 func=self._transform,
                 func_args=self._transform_args,
                 out=empty_like(data, dtype=self.dtype),
-            ),
-            self.missing_value,
-        )
+            )
+        return where(group_labels != null_label, result, self.missing_value)
 
     @property
     def transform_name(self):
@@ -1888,3 +1914,124 @@ def winsorize(row, min_percentile, max_percentile):
             a[idx[upper_cutoff:start_of_nans]] = a[idx[upper_cutoff - 1]]
 
     return a
+
+
+# 2D versions of the functions above, applied to many row groups of the same
+# length at once by ``segmented_grouped_rowwise_apply``. Each row of the input
+# is a group, the results are the same as the ones of the 1D functions.
+def demean_2d(rows):
+    return rows - nanmean(rows, axis=1)[:, newaxis]
+
+
+def zscore_2d(rows):
+    return (
+        (rows - nanmean(rows, axis=1)[:, newaxis]) /
+        nanstd(rows, axis=1)[:, newaxis]
+    )
+
+
+def _sorted_by_row(rows, kind='quicksort'):
+    """The argsort of each row, and the rows sorted by it.
+    """
+    row_idx = arange(len(rows))[:, newaxis]
+    idx = rows.argsort(axis=1, kind=kind)
+    return row_idx, idx, rows[row_idx, idx]
+
+
+def rankdata_2d(rows, method):
+    """
+    2D version of scipy.stats.rankdata, ranks each row with the nans sorted
+    last and each nan counted as a distinct value.
+    """
+    # rankdata only needs a stable sort to break the ties of 'ordinal'.
+    kind = 'mergesort' if method == 'ordinal' else 'quicksort'
+    row_idx, idx, sorted_rows = _sorted_by_row(rows, kind=kind)
+    positions = arange(rows.shape[1])
+
+    if method == 'ordinal':
+        sorted_ranks = broadcast_to(positions + 1.0, rows.shape)
+    else:
+        # Whether each sorted value differs from the one before it.
+        first_of_value = empty(rows.shape, dtype=bool)
+        first_of_value[:, :1] = True
+        not_equal(sorted_rows[:, 1:], sorted_rows[:, :-1],
+                  out=first_of_value[:, 1:])
+
+        if method == 'dense':
+            sorted_ranks = first_of_value.cumsum(axis=1)
+        else:
+            last_of_value = empty_like(first_of_value)
+            last_of_value[:, :-1] = first_of_value[:, 1:]
+            last_of_value[:, -1:] = True
+
+            # The position of the first and the last value of each run of
+            # equal values.
+            first = maximum.accumulate(
+                where(first_of_value, positions, 0),
+                axis=1,
+            )
+            last = minimum.accumulate(
+                where(last_of_value, positions, rows.shape[1])[:, ::-1],
+                axis=1,
+            )[:, ::-1]
+            if method == 'min':
+                sorted_ranks = first + 1
+            elif method == 'max':
+                sorted_ranks = last + 1
+            else:
+                sorted_ranks = .5 * (first + last + 2)
+
+    out = empty(rows.shape, dtype=float64_dtype)
+    out[row_idx, idx] = sorted_ranks
+    return out
+
+
+def rankdata_2d_descending(rows, method):
+    """
+    2D version of rankdata_1d_descending.
+    """
+    return rankdata_2d(-(rows.view(float64_dtype)), method)
+
+
+def winsorize_2d(rows, min_percentile, max_percentile):
+    a = rows.copy()
+    nonnan_count = rows.shape[1] - isnan(rows).sum(axis=1)
+
+    # NOTE: argsort() sorts nans to the end of the rows.
+    row_idx, idx, sorted_rows = _sorted_by_row(rows)
+    positions = empty(rows.shape, dtype=int64_dtype)
+    positions[row_idx, idx] = arange(rows.shape[1])
+    row_idx = row_idx[:, 0]
+
+    if min_percentile > 0:
+        lower_cutoff = (min_percentile * nonnan_count).astype(int64_dtype)
+        below = positions < lower_cutoff[:, newaxis]
+        a[below] = broadcast_to(
+            sorted_rows[row_idx, lower_cutoff][:, newaxis],
+            rows.shape,
+        )[below]
+
+    if max_percentile < 1:
+        upper_cutoff = np_ceil(
+            nonnan_count * max_percentile,
+        ).astype(int64_dtype)
+        above = (
+            (positions >= upper_cutoff[:, newaxis]) &
+            (positions < nonnan_count[:, newaxis])
+        )
+        a[above] = broadcast_to(
+            sorted_rows[row_idx, maximum(upper_cutoff - 1, 0)][:, newaxis],
+            rows.shape,
+        )[above]
+
+    return a
+
+
+# The 2D versions of the functions passed to GroupedRowTransform.
+_GROUPED_ROW_TRANSFORMS_2D = {
+    demean: demean_2d,
+    zscore: zscore_2d,
+    winsorize: winsorize_2d,
+    rankdata: rankdata_2d,
+    rankdata_1d_descending: rankdata_2d_descending,
+}
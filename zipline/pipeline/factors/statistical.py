@@ -1,10 +1,6 @@
 from numexpr import evaluate
 import numpy as np
-from numpy import broadcast_arrays
-from scipy.stats import (
-    linregress,
-    spearmanr,
-)
+from scipy.stats import t as t_distribution
 
 from zipline.assets import Asset
 from zipline.errors import IncompatibleTerms
@@ -95,6 +91,9 @@ class RollingPearson(_RollingCorrelation):
             out=out,
         )
 
+    # The vectorized statistics also compute stacks of windows.
+    compute_all = compute
+
 
 class RollingSpearman(_RollingCorrelation):
     """
@@ -133,13 +132,9 @@ class RollingSpearman(_RollingCorrelation):
     window_safe = True
 
     def compute(self, today, assets, out, base_data, target_data):
-        # If `target_data` is a Slice or single column of data, broadcast it
-        # out to the same shape as `base_data`, then compute column-wise. This
-        # is efficient because each column of the broadcasted array only refers
-        # to a single memory location.
-        target_data = broadcast_arrays(target_data, base_data)[0]
-        for i in range(len(out)):
-            out[i] = spearmanr(base_data[:, i], target_data[:, i])[0]
+        vectorized_spearman_r(base_data, target_data, out=out)
+
+    compute_all = compute
 
 
 class RollingLinearRegression(CustomFactor):
@@ -194,29 +189,17 @@ class RollingLinearRegression(CustomFactor):
         )
 
     def compute(self, today, assets, out, dependent, independent):
-        alpha = out.alpha
-        beta = out.beta
-        r_value = out.r_value
-        p_value = out.p_value
-        stderr = out.stderr
-
-        def regress(y, x):
-            regr_results = linregress(y=y, x=x)
-            # `linregress` returns its results in the following order:
-            # slope, intercept, r-value, p-value, stderr
-            alpha[i] = regr_results[1]
-            beta[i] = regr_results[0]
-            r_value[i] = regr_results[2]
-            p_value[i] = regr_results[3]
-            stderr[i] = regr_results[4]
-
-        # If `independent` is a Slice or single column of data, broadcast it
-        # out to the same shape as `dependent`, then compute column-wise. This
-        # is efficient because each column of the broadcasted array only refers
-        # to a single memory location.
-        independent = broadcast_arrays(independent, dependent)[0]
-        for i in range(len(out)):
-            regress(y=dependent[:, i], x=independent[:, i])
+        alpha, beta, r_value, p_value, stderr = vectorized_linregress(
+            dependent,
+            independent,
+        )
+        out.alpha[:] = alpha
+        out.beta[:] = beta
+        out.r_value[:] = r_value
+        out.p_value[:] = p_value
+        out.stderr[:] = stderr
+
+    compute_all = compute
 
 
 class RollingPearsonOfReturns(RollingPearson):
@@ -545,6 +528,8 @@ class SimpleBeta(CustomFactor, StandardOutputs):
             out=out,
         )
 
+    compute_all = compute
+
     def graph_repr(self):
         return "{}({!r}, {}, {})".format(
             type(self).__name__,
@@ -591,14 +576,19 @@ def vectorized_beta(dependents, independent, allowed_missing, out=None):
     -------
     slopes : np.array[M]
         Linear regression coefficients for each column of ``dependents``.
+
+    Notes
+    -----
+    Stacks of windows, e.g. arrays of shape ``(D, N, M)`` and ``(D, N, 1)``,
+    are regressed along their second to last axis, giving slopes of shape
+    ``(D, M)``.
     """
     # Cache these as locals since we're going to call them multiple times.
     nan = np.nan
     isnan = np.isnan
-    N, M = dependents.shape
 
     if out is None:
-        out = np.full(M, nan)
+        out = np.full(_reduced_shape(dependents), nan)
 
     # Copy N times as a column vector and fill with nans to have the same
     # missing value pattern as the dependent variable.
@@ -645,23 +635,23 @@ def vectorized_beta(dependents, independent, allowed_missing, out=None):
     # center `independent`.
 
     # shape: (N, M)
-    ind_residual = independent - nanmean(independent, axis=0)
+    ind_residual = independent - _expand(nanmean(independent, axis=-2))
 
     # shape: (M,)
-    covariances = nanmean(ind_residual * dependents, axis=0)
+    covariances = nanmean(ind_residual * dependents, axis=-2)
 
     # We end up with different variances in each column here because each
     # column may have a different subset of the data dropped due to missing
     # data in the corresponding dependent column.
     # shape: (M,)
-    independent_variances = nanmean(ind_residual ** 2, axis=0)
+    independent_variances = nanmean(ind_residual ** 2, axis=-2)
 
     # shape: (M,)
     np.divide(covariances, independent_variances, out=out)
 
     # Write nans back to locations where we have more then allowed number of
     # missing entries.
-    nanlocs = isnan(independent).sum(axis=0) > allowed_missing
+    nanlocs = isnan(independent).sum(axis=-2) > allowed_missing
     out[nanlocs] = nan
 
     return out
@@ -691,6 +681,11 @@ def vectorized_pearson_r(dependents, independents, allowed_missing, out=None):
     correlations : np.array[M]
         Pearson correlation coefficients for each column of ``dependents``.
 
+    Notes
+    -----
+    Stacks of windows are correlated along their second to last axis, as in
+    :func:`vectorized_beta`.
+
     See Also
     --------
     :class:`zipline.pipeline.factors.RollingPearson`
@@ -698,10 +693,9 @@ def vectorized_pearson_r(dependents, independents, allowed_missing, out=None):
     """
     nan = np.nan
     isnan = np.isnan
-    N, M = dependents.shape
 
     if out is None:
-        out = np.full(M, nan)
+        out = np.full(_reduced_shape(dependents), nan)
 
     if allowed_missing > 0:
         # If we're handling nans robustly, we need to mask both arrays to
@@ -717,18 +711,18 @@ def vectorized_pearson_r(dependents, independents, allowed_missing, out=None):
 
     # Pearson R is Cov(X, Y) / StdDev(X) * StdDev(Y)
     # c.f. https://en.wikipedia.org/wiki/Pearson_correlation_coefficient
-    ind_residual = independents - mean(independents, axis=0)
-    dep_residual = dependents - mean(dependents, axis=0)
+    ind_residual = independents - _expand(mean(independents, axis=-2))
+    dep_residual = dependents - _expand(mean(dependents, axis=-2))
 
-    ind_variance = mean(ind_residual ** 2, axis=0)
-    dep_variance = mean(dep_residual ** 2, axis=0)
+    ind_variance = mean(ind_residual ** 2, axis=-2)
+    dep_variance = mean(dep_residual ** 2, axis=-2)
 
-    covariances = mean(ind_residual * dep_residual, axis=0)
+    covariances = mean(ind_residual * dep_residual, axis=-2)
 
     evaluate(
         'where(mask, nan, cov / sqrt(ind_variance * dep_variance))',
         local_dict={'cov': covariances,
-                    'mask': isnan(independents).sum(axis=0) > allowed_missing,
+                    'mask': isnan(independents).sum(axis=-2) > allowed_missing,
                     'nan': np.nan,
                     'ind_variance': ind_variance,
                     'dep_variance': dep_variance},
@@ -736,3 +730,155 @@ def vectorized_pearson_r(dependents, independents, allowed_missing, out=None):
         out=out,
     )
     return out
+
+
+def vectorized_spearman_r(dependents, independents, out=None):
+    """
+    Compute Spearman's rank correlation coefficient between columns of
+    ``dependents`` and ``independents``.
+
+    Parameters
+    ----------
+    dependents : np.array[N, M]
+        Array with columns of data to be correlated with ``independents``.
+    independents : np.array[N, M] or np.array[N, 1]
+        Independent variable(s) of the correlation. If a single column is
+        passed, it is broadcast to the shape of ``dependents``.
+    out : np.array[M] or None, optional
+        Output array into which to write results.  If None, a new array is
+        created and returned.
+
+    Returns
+    -------
+    correlations : np.array[M]
+        Spearman correlation coefficients for each column of ``dependents``.
+        Columns with a missing (NaN) observation produce NaN, as
+        :func:`scipy.stats.spearmanr` does.
+
+    See Also
+    --------
+    :class:`zipline.pipeline.factors.RollingSpearman`
+    :class:`zipline.pipeline.factors.RollingSpearmanOfReturns`
+    """
+    # Spearman's rho is Pearson's r of the ranks of the data.
+    return vectorized_pearson_r(
+        _average_ranks(dependents),
+        _average_ranks(independents),
+        allowed_missing=0,
+        out=out,
+    )
+
+
+def vectorized_linregress(dependents, independents):
+    """
+    Compute ordinary least-squares regressions predicting the columns of
+    ``dependents`` from the columns of ``independents``.
+
+    Parameters
+    ----------
+    dependents : np.array[N, M]
+        Array with columns of data to be regressed against ``independents``.
+    independents : np.array[N, M] or np.array[N, 1]
+        Independent variable(s) of the regression. If a single column is
+        passed, it is broadcast to the shape of ``dependents``.
+
+    Returns
+    -------
+    alpha, beta, r_value, p_value, stderr : np.array[M]
+        The intercept, slope, correlation coefficient, two-sided p-value of
+        a zero slope and standard error of the slope of the regression of
+        each column of ``dependents``, as computed by
+        :func:`scipy.stats.linregress`. Columns with a missing (NaN)
+        observation produce NaN.
+
+    See Also
+    --------
+    :class:`zipline.pipeline.factors.RollingLinearRegression`
+    :class:`zipline.pipeline.factors.RollingLinearRegressionOfReturns`
+    """
+    N = dependents.shape[-2]
+    # Degrees of freedom of the t-statistic of the slope.
+    df = N - 2
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ind_mean = independents.mean(axis=-2)
+        dep_mean = dependents.mean(axis=-2)
+        ind_residual = independents - _expand(ind_mean)
+        dep_residual = dependents - _expand(dep_mean)
+
+        ind_variance = (ind_residual ** 2).mean(axis=-2)
+        dep_variance = (dep_residual ** 2).mean(axis=-2)
+        covariances = (ind_residual * dep_residual).mean(axis=-2)
+
+        r_denominator = np.sqrt(ind_variance * dep_variance)
+        # The correlation is undefined if either variable is constant.
+        r_value = np.clip(covariances / r_denominator, -1.0, 1.0)
+        r_value[r_denominator == 0.0] = 0.0
+
+        beta = covariances / ind_variance
+        alpha = dep_mean - beta * ind_mean
+
+        if df == 0:
+            # A line goes through any two points.
+            p_value = np.where(
+                dependents[..., 0, :] == dependents[..., 1, :], 1.0, 0.0,
+            )
+            stderr = np.zeros_like(beta)
+        else:
+            TINY = 1.0e-20
+            t = r_value * np.sqrt(
+                df / ((1.0 - r_value + TINY) * (1.0 + r_value + TINY))
+            )
+            p_value = 2 * t_distribution.sf(np.abs(t), df)
+            stderr = np.sqrt(
+                (1 - r_value ** 2) * dep_variance / ind_variance / df
+            )
+
+    return alpha, beta, r_value, p_value, stderr
+
+
+def _reduced_shape(array):
+    """The shape of ``array`` reduced along its second to last axis.
+    """
+    return array.shape[:-2] + array.shape[-1:]
+
+
+def _expand(reduced):
+    """Insert back the axis ``reduced`` was reduced along, for broadcasting.
+    """
+    return np.expand_dims(reduced, -2)
+
+
+def _average_ranks(data):
+    """
+    Rank the values of ``data`` along its second to last axis, giving tied
+    values the average of their ranks and leaving missing values as NaN.
+
+    This matches :func:`scipy.stats.rankdata` applied to each column.
+    """
+    data = np.asarray(data, dtype=float64_dtype)
+    # Rank every column of a 2D array of shape (N, columns).
+    moved = np.moveaxis(data, -2, 0)
+    values = moved.reshape(moved.shape[0], -1)
+    N, num_columns = values.shape
+
+    columns = np.arange(num_columns)
+    order = values.argsort(axis=0, kind='mergesort')
+    sorted_values = values[order, columns]
+
+    # Each run of equal values spans the positions from its first to its
+    # last, the average rank of the run is the mean of the two.
+    positions = np.broadcast_to(np.arange(N)[:, np.newaxis], values.shape)
+    starts = np.ones(values.shape, dtype=bool)
+    starts[1:] = sorted_values[1:] != sorted_values[:-1]
+    ends = np.ones(values.shape, dtype=bool)
+    ends[:-1] = starts[1:]
+    first = np.maximum.accumulate(np.where(starts, positions, 0), axis=0)
+    last = np.minimum.accumulate(
+        np.where(ends, positions, N - 1)[::-1], axis=0,
+    )[::-1]
+
+    ranks = np.empty_like(values)
+    ranks[order, columns] = (first + last) / 2.0 + 1
+    ranks[np.isnan(values)] = np.nan
+    return np.moveaxis(ranks.reshape(moved.shape), 0, -2)
@@ -1,3 +1,5 @@
+from collections import namedtuple
+
 import numpy as np
 import pandas as pd
 
@@ -16,6 +18,7 @@ from zipline.pipeline.loaders.utils import (
     next_event_indexer,
     previous_event_indexer,
 )
+from zipline.utils.memoize import lazyval
 
 
 def required_event_fields(next_value_columns, previous_value_columns):
@@ -58,6 +61,74 @@ def validate_column_specs(events, next_value_columns, previous_value_columns):
         )
 
 
+_SidIndex = namedtuple('_SidIndex', [
+    # The sids with events, sorted.
+    'sids',
+    # The events of sids[i] are positions[starts[i]:stops[i]].
+    'starts',
+    'stops',
+    # The positions of the events grouped by sid, in event date order within
+    # a sid.
+    'positions',
+    # The event dates and timestamps of the events in positions, as ns.
+    'event_dates',
+    'timestamps',
+    # The latest date on which the event, or an earlier event of the sid,
+    # stops being the previous event, and the earliest date on which the
+    # event, or a later event of the sid, becomes the previous event.
+    'max_superseded',
+    'min_known',
+])
+
+
+def _grouped_accumulate(ufunc, groups, values):
+    """
+    Accumulate ``values`` with ``np.maximum`` or ``np.minimum`` within each
+    run of equal ``groups``, which must be ascending.
+    """
+    uniques, ranks = np.unique(values, return_inverse=True)
+    # The keys of a group are all larger than the keys of earlier groups.
+    offsets = groups * len(uniques)
+    return uniques[ufunc.accumulate(offsets + ranks) - offsets]
+
+
+def _index_events_by_sid(sids, event_dates, timestamps):
+    """
+    Build the :class:`_SidIndex` of events with the given sids, event dates
+    and timestamps, sorted by event date.
+    """
+    positions = np.argsort(sids, kind='mergesort')
+    sids = sids[positions]
+    event_dates = pd.DatetimeIndex(event_dates).asi8[positions]
+    timestamps = pd.DatetimeIndex(timestamps).asi8[positions]
+
+    new_sid = np.ones(len(sids), dtype=bool)
+    new_sid[1:] = sids[1:] != sids[:-1]
+    starts = np.flatnonzero(new_sid)
+    stops = np.append(starts[1:], len(sids))[:len(starts)]
+    groups = np.cumsum(new_sid) - 1
+
+    known = np.maximum(event_dates, timestamps)
+    # An event is the previous event until the next event of its sid becomes
+    # known, the last event of a sid stays the previous event.
+    superseded = np.empty_like(known)
+    superseded[:-1] = known[1:]
+    superseded[stops - 1] = np.iinfo(np.int64).max
+
+    return _SidIndex(
+        sids=sids[starts],
+        starts=starts,
+        stops=stops,
+        positions=positions,
+        event_dates=event_dates,
+        timestamps=timestamps,
+        max_superseded=_grouped_accumulate(np.maximum, groups, superseded),
+        min_known=_grouped_accumulate(
+            np.minimum, groups[::-1], known[::-1],
+        )[::-1],
+    )
+
+
 class EventsLoader(implements(PipelineLoader)):
     """
     Base class for PipelineLoaders that supports loading the next and previous
@@ -145,23 +216,101 @@ class EventsLoader(implements(PipelineLoader)):
         groups = groupby(next_or_previous, requested_columns)
         return groups.get('next', ()), groups.get('previous', ())
 
+    @lazyval
+    def _sid_index(self):
+        """
+        The events grouped by sid, computed once so that each load only looks
+        at the events of the requested sids.
+        """
+        return _index_events_by_sid(
+            self.events[SID_FIELD_NAME],
+            self.events[EVENT_DATE_FIELD_NAME],
+            self.events[TS_FIELD_NAME],
+        )
+
+    def _event_positions(self, sids, relevant):
+        """
+        The positions of the events of ``sids`` for which ``relevant``, a
+        function of the ``_SidIndex`` and the locations of the events of
+        ``sids`` in it, is True, in event date order.
+        """
+        index = self._sid_index
+        sids = np.asarray(sids)
+        ixs = index.sids.searchsorted(sids)
+        found = ixs < len(index.sids)
+        found[found] = index.sids[ixs[found]] == sids[found]
+        ixs = ixs[found]
+
+        # Concatenate the ranges of the events of each sid.
+        lengths = index.stops[ixs] - index.starts[ixs]
+        ends = np.cumsum(lengths)
+        locs = (
+            np.repeat(index.starts[ixs] - ends + lengths, lengths) +
+            np.arange(ends[-1] if len(ends) else 0)
+        )
+        locs = locs[relevant(index, locs)]
+        return np.sort(index.positions[locs])
+
+    def _indexer_for_positions(self, indexer, positions, *args):
+        """
+        Call ``indexer`` with the events at ``positions`` and map its output
+        back to positions in ``self.events``.
+        """
+        events = self.events
+        subset_indexer = indexer(*args + (
+            events[EVENT_DATE_FIELD_NAME][positions],
+            events[TS_FIELD_NAME][positions],
+            events[SID_FIELD_NAME][positions],
+        ))
+        out = np.full_like(subset_indexer, -1)
+        found = subset_indexer >= 0
+        out[found] = positions[subset_indexer[found]]
+        return out
+
     def next_event_indexer(self, dates, data_query_cutoff, sids):
-        return next_event_indexer(
+        if not len(dates):
+            return np.empty((0, len(sids)), dtype=np.int64)
+
+        # Only events which occur on or after the first date and which we
+        # learn about before the last cutoff can be a next event.
+        first_date = dates[0].value
+        last_cutoff = data_query_cutoff[-1].value
+
+        def relevant(index, locs):
+            return (
+                (index.event_dates[locs] >= first_date) &
+                (index.timestamps[locs] < last_cutoff)
+            )
+
+        return self._indexer_for_positions(
+            next_event_indexer,
+            self._event_positions(sids, relevant),
             dates,
             data_query_cutoff,
             sids,
-            self.events[EVENT_DATE_FIELD_NAME],
-            self.events[TS_FIELD_NAME],
-            self.events[SID_FIELD_NAME],
         )
 
     def previous_event_indexer(self, data_query_time, sids):
-        return previous_event_indexer(
+        if not len(data_query_time):
+            return np.empty((0, len(sids)), dtype=np.int64)
+
+        # Drop the leading events of each sid which are superseded before the
+        # first cutoff and the trailing events which only become known after
+        # the last cutoff. Neither changes the previous events in between.
+        first_cutoff = data_query_time[0].value
+        last_cutoff = data_query_time[-1].value
+
+        def relevant(index, locs):
+            return (
+                (index.max_superseded[locs] >= first_cutoff) &
+                (index.min_known[locs] < last_cutoff)
+            )
+
+        return self._indexer_for_positions(
+            previous_event_indexer,
+            self._event_positions(sids, relevant),
             data_query_time,
             sids,
-            self.events[EVENT_DATE_FIELD_NAME],
-            self.events[TS_FIELD_NAME],
-            self.events[SID_FIELD_NAME],
         )
 
     def load_next_events(self,
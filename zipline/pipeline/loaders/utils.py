@@ -22,6 +22,48 @@ def validate_event_metadata(event_dates,
         )
 
 
+def _events_by_sid(sid_ixs, *ixs):
+    """
+    Group the events by sid, keeping the events of each sid in their order.
+
+    Returns the positions of the events in sid order, followed by the sid
+    column and each of ``ixs`` in that order. Events whose sid is not in the
+    output, marked with a column of -1, are dropped.
+    """
+    order = np.flatnonzero(sid_ixs >= 0)
+    order = order[np.argsort(sid_ixs[order], kind='mergesort')]
+    return (order, sid_ixs[order]) + tuple(ix[order] for ix in ixs)
+
+
+def _sid_ixs(all_sids, event_sids):
+    """The column of each event, or -1 for events of sids not in all_sids.
+    """
+    event_sids = np.asarray(event_sids)
+    sid_ixs = np.asarray(all_sids).searchsorted(event_sids)
+    found = sid_ixs < len(all_sids)
+    found[found] = np.asarray(all_sids)[sid_ixs[found]] == event_sids[found]
+    return np.where(found, sid_ixs, -1)
+
+
+def _run_starts(*columns):
+    """Whether each row starts a run of equal rows of ``columns``.
+    """
+    out = np.ones(len(columns[0]), dtype=bool)
+    for column in columns:
+        out[1:] &= column[1:] == column[:-1]
+    out[1:] = ~out[1:]
+    return out
+
+
+def _unordered_sids(sids, values):
+    """
+    The sids of consecutive events in sid order for which ``values`` is not
+    ascending.
+    """
+    same_sid = sids[1:] == sids[:-1]
+    return np.unique(sids[1:][same_sid & (values[1:] < values[:-1])])
+
+
 def next_event_indexer(all_dates,
                        data_query_cutoff,
                        all_sids,
@@ -58,23 +100,46 @@ def next_event_indexer(all_dates,
         ``event_{dates,timestamps,sids}``.
     """
     validate_event_metadata(event_dates, event_timestamps, event_sids)
-    out = np.full((len(all_dates), len(all_sids)), -1, dtype=np.int64)
+    num_dates, num_sids = len(all_dates), len(all_sids)
+    out = np.full((num_dates, num_sids), -1, dtype=np.int64)
 
-    sid_ixs = all_sids.searchsorted(event_sids)
+    sid_ixs = _sid_ixs(all_sids, event_sids)
     # side='right' here ensures that we include the event date itself
     # if it's in all_dates.
     dt_ixs = all_dates.searchsorted(event_dates, side='right')
     ts_ixs = data_query_cutoff.searchsorted(event_timestamps, side='right')
 
-    # Walk backward through the events, writing the index of the event into
-    # slots ranging from the event's timestamp to its asof.  This depends for
+    order, sid_ixs_by_sid, dt_ixs_by_sid, ts_ixs_by_sid = _events_by_sid(
+        sid_ixs, dt_ixs, ts_ixs,
+    )
+    if not len(order) or not out.size:
+        return out
+
+    # Write the first event of each sid and date on the last date before it
+    # occurs and carry it backward, so that each date holds the first event
+    # of the sid which occurs after it. It is the next event if we know about
+    # it by then, otherwise no event is as long as the timestamps of the sid
+    # are sorted like its event dates.
+    first = _run_starts(sid_ixs_by_sid, dt_ixs_by_sid) & (dt_ixs_by_sid > 0)
+    upcoming = np.full_like(out, len(sid_ixs))
+    upcoming[dt_ixs_by_sid[first] - 1, sid_ixs_by_sid[first]] = order[first]
+    upcoming = np.minimum.accumulate(upcoming[::-1], axis=0)[::-1]
+
+    known_ixs = np.append(ts_ixs, num_dates)[upcoming]
+    known = known_ixs <= np.arange(num_dates)[:, np.newaxis]
+    out = np.where(known, upcoming, -1)
+
+    # For the sids with an event learned about before an earlier one, walk
+    # backward through their events, writing the index of the event into
+    # slots ranging from the event's timestamp to its asof. This depends for
     # correctness on the fact that event_dates is sorted in ascending order,
     # because we need to overwrite later events with earlier ones if their
     # eligible windows overlap.
-    for i in range(len(event_sids) - 1, -1, -1):
-        start_ix = ts_ixs[i]
-        end_ix = dt_ixs[i]
-        out[start_ix:end_ix, sid_ixs[i]] = i
+    unordered = _unordered_sids(sid_ixs_by_sid, ts_ixs_by_sid)
+    if len(unordered):
+        out[:, unordered] = -1
+        for i in np.flatnonzero(np.in1d(sid_ixs, unordered))[::-1]:
+            out[ts_ixs[i]:dt_ixs[i], sid_ixs[i]] = i
 
     return out
 
@@ -114,27 +179,42 @@ def previous_event_indexer(data_query_cutoff_times,
         ``event_{dates,timestamps,sids}``.
     """
     validate_event_metadata(event_dates, event_timestamps, event_sids)
-    out = np.full(
-        (len(data_query_cutoff_times), len(all_sids)),
-        -1,
-        dtype=np.int64,
-    )
+    num_dates, num_sids = len(data_query_cutoff_times), len(all_sids)
+    out = np.full((num_dates, num_sids), -1, dtype=np.int64)
 
     eff_dts = np.maximum(event_dates, event_timestamps)
-    sid_ixs = all_sids.searchsorted(event_sids)
+    sid_ixs = _sid_ixs(all_sids, event_sids)
     dt_ixs = data_query_cutoff_times.searchsorted(eff_dts, side='right')
 
-    # Walk backwards through the events, writing the index of the event into
-    # slots ranging from max(event_date, event_timestamp) to the start of the
-    # previously-written event.  This depends for correctness on the fact that
-    # event_dates is sorted in ascending order, because we need to have written
-    # later events so we know where to stop forward-filling earlier events.
-    last_written = {}
-    for i in range(len(event_dates) - 1, -1, -1):
-        sid_ix = sid_ixs[i]
-        dt_ix = dt_ixs[i]
-        out[dt_ix:last_written.get(sid_ix, None), sid_ix] = i
-        last_written[sid_ix] = dt_ix
+    order, sid_ixs_by_sid, dt_ixs_by_sid = _events_by_sid(
+        sid_ixs, dt_ixs,
+    )
+    if not len(order) or not out.size:
+        return out
+
+    # Write the last event of each sid and date on the date it became known
+    # and carry it forward, as long as the events of the sid become known in
+    # the order of their event dates.
+    last = np.roll(_run_starts(sid_ixs_by_sid, dt_ixs_by_sid), -1)
+    last &= dt_ixs_by_sid < num_dates
+    out[dt_ixs_by_sid[last], sid_ixs_by_sid[last]] = order[last]
+    np.maximum.accumulate(out, axis=0, out=out)
+
+    # For the other sids, walk backwards through their events, writing the
+    # index of the event into slots ranging from max(event_date,
+    # event_timestamp) to the start of the previously-written event.  This
+    # depends for correctness on the fact that event_dates is sorted in
+    # ascending order, because we need to have written later events so we
+    # know where to stop forward-filling earlier events.
+    unordered = _unordered_sids(sid_ixs_by_sid, dt_ixs_by_sid)
+    if len(unordered):
+        out[:, unordered] = -1
+        last_written = {}
+        for i in np.flatnonzero(np.in1d(sid_ixs, unordered))[::-1]:
+            sid_ix = sid_ixs[i]
+            dt_ix = dt_ixs[i]
+            out[dt_ix:last_written.get(sid_ix, None), sid_ix] = i
+            last_written[sid_ix] = dt_ix
     return out
 
 
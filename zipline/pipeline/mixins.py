@@ -8,6 +8,7 @@ from abc import abstractmethod
 
 from numpy import (
     array,
+    empty,
     full,
     recarray,
     searchsorted,
@@ -25,7 +26,8 @@ from zipline.errors import (
 from zipline.lib.labelarray import LabelArray, labelarray_where
 from zipline.utils.context_tricks import nop_context
 from zipline.utils.input_validation import expect_dtypes, expect_types
-from zipline.utils.numpy_utils import bool_dtype
+from zipline.utils.metautils import defining_class
+from zipline.utils.numpy_utils import bool_dtype, categorical_dtype
 from zipline.utils.pandas_utils import nearest_unequal_elements
 
 
@@ -36,6 +38,10 @@ from .downsample_helpers import (
 from .sentinels import NotSpecified
 from .term import Term
 
+# The approximate number of bytes of stacked input windows passed to each
+# call of ``compute_all``.
+COMPUTE_ALL_BLOCK_BYTES = 64 * 1024 ** 2
+
 
 class PositiveWindowLengthMixin(Term):
     """
@@ -107,6 +113,15 @@ class CustomTermMixin(Term):
     Implements `_compute` in terms of a user-defined `compute` function, which
     is mapped over the input windows.
 
+    Subclasses may also define a vectorized
+    ``compute_all(self, dates, assets, out, *inputs)``, which is called with
+    the windows of a block of dates stacked into 3-D arrays of shape
+    ``(len(dates), window_length, len(assets))`` and a 2-D ``out``. It
+    computes every asset, values of assets outside of the mask are replaced
+    with the missing value afterwards. ``compute_all`` is only used if it is
+    defined by the same class as ``compute``, or a subclass of it, for 2-D
+    terms without categorical inputs.
+
     Used by CustomFactor, CustomFilter, CustomClassifier, etc.
     """
     ctx = nop_context
@@ -193,7 +208,77 @@ class CustomTermMixin(Term):
                 inputs.append(window[:, column_mask])
         return inputs
 
+    def _uses_compute_all(self):
+        cls = type(self)
+        if getattr(cls, 'compute_all', None) is None or self.ndim != 2:
+            return False
+        if any(t.dtype == categorical_dtype for t in self.inputs + (self,)):
+            return False
+        return issubclass(
+            defining_class(cls, 'compute_all'),
+            defining_class(cls, 'compute'),
+        )
+
     def _compute(self, windows, dates, assets, mask):
+        """
+        Call the user's `compute` function on each window with a pre-built
+        output array, or its `compute_all` function on blocks of windows.
+        """
+        if self._uses_compute_all():
+            return self._compute_all(windows, dates, assets, mask)
+        return self._compute_by_date(windows, dates, assets, mask)
+
+    def _compute_all(self, windows, dates, assets, mask):
+        """
+        Call the user's `compute_all` function on blocks of dates, with the
+        windows of every date of a block stacked.
+
+        The windows are copied out of the iterators date by date, because the
+        adjustments known on a date are applied to the window buffers in
+        place.
+        """
+        out = self._allocate_output(windows, mask.shape)
+        if not len(dates):
+            return out
+
+        compute_all = self.compute_all
+        params = self.params
+
+        current = [next(window) for window in windows]
+        row_bytes = sum(window.nbytes for window in current) or 1
+        block_size = min(
+            len(dates),
+            max(1, COMPUTE_ALL_BLOCK_BYTES // row_bytes),
+        )
+        blocks = [
+            empty((block_size,) + window.shape, dtype=window.dtype)
+            for window in current
+        ]
+
+        with self.ctx:
+            filled = 0
+            for idx in range(len(dates)):
+                if idx:
+                    current = [next(window) for window in windows]
+                for block, window in zip(blocks, current):
+                    block[filled] = window
+                filled += 1
+
+                if filled == block_size or idx == len(dates) - 1:
+                    rows = slice(idx + 1 - filled, idx + 1)
+                    compute_all(
+                        dates[rows],
+                        assets,
+                        out[rows],
+                        *[block[:filled] for block in blocks],
+                        **params
+                    )
+                    filled = 0
+
+        out[~mask] = self.missing_value
+        return out
+
+    def _compute_by_date(self, windows, dates, assets, mask):
         """
         Call the user's `compute` function on each window with a pre-built
         output array.
@@ -43,7 +43,10 @@ def check_and_create_connection(path, require_exists):
     if require_exists:
         verify_sqlite_path_exists(path)
 
-    return sqlite3.connect(path)
+    # Readers are shared with the threads loading pipeline terms concurrently
+    # or prefetching pipeline results, sqlite serializes the use of a
+    # connection from several threads.
+    return sqlite3.connect(path, check_same_thread=False)
 
 
 def check_and_create_engine(path, require_exists):
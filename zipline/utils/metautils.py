@@ -109,3 +109,18 @@ def with_metaclasses(metaclasses, *bases):
     instead of inlining their super class by name.
     """
     return six.with_metaclass(compose_types(*metaclasses), *bases)
+
+
+def defining_class(cls, name):
+    """
+    The class in the mro of ``cls`` whose body defines the attribute ``name``,
+    or None if no class defines it.
+
+    This tells whether an optional method, e.g. an array implementation of
+    another one, was written next to the method a subclass actually
+    inherits.
+    """
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return klass
+    return None
@@ -27,6 +27,7 @@ from zipline.data.data_portal import DataPortal
 from zipline.data.data_portal_live import DataPortalLive
 from zipline.finance import metrics
 from zipline.finance.trading import SimulationParameters
+from zipline.pipeline.cache import DEFAULT_MAX_SIZE, PipelineResultCache
 from zipline.pipeline.data import USEquityPricing
 from zipline.pipeline.loaders import USEquityPricingLoader
 
@@ -92,7 +93,11 @@ def _run(handle_data,
          performance_callback,
          stop_execution_callback,
          teardown,
-         execution_id):
+         execution_id,
+         pipeline_cache_dir=None,
+         pipeline_cache_size=DEFAULT_MAX_SIZE,
+         pipeline_prefetch=None,
+         perf_spill_path=None):
     """Run a backtest for the given algorithm.
 
     This is shared between the cli and :func:`zipline.run_algo`.
@@ -107,6 +112,10 @@ def _run(handle_data,
         execution will be aborted.
     teardown - algo method like handle_data() or before_trading_start() that is called when the algo execution stops
     execution_id - unique id to identify this execution (backtest or live instance)
+    pipeline_cache_dir - directory where pipeline results are cached between runs
+    pipeline_cache_size - the size in bytes of the pipeline cache
+    pipeline_prefetch - the fraction of a pipeline chunk after which the next one is computed in the background
+    perf_spill_path - HDF5 file where the positions, orders and transactions of the daily perf are written
 
     """
 
@@ -233,6 +242,14 @@ def _run(handle_data,
         except ValueError as e:
             raise _RunAlgoError(str(e))
 
+    pipeline_result_cache = None
+    if pipeline_cache_dir is not None:
+        pipeline_result_cache = PipelineResultCache(
+            pipeline_cache_dir,
+            bundles.ingestion_version(bundle, bundle_data, environ),
+            max_size=pipeline_cache_size,
+        )
+
     TradingAlgorithmClass = (partial(LiveTradingAlgorithm,
                                      broker=broker,
                                      state_filename=state_filename,
@@ -260,6 +277,9 @@ def _run(handle_data,
             benchmark_sid=benchmark_sid,
             performance_callback=performance_callback,
             stop_execution_callback=stop_execution_callback,
+            pipeline_result_cache=pipeline_result_cache,
+            pipeline_prefetch=pipeline_prefetch,
+            perf_spill_path=perf_spill_path,
             **{
                 'initialize': initialize,
                 'handle_data': handle_data,
@@ -371,7 +391,11 @@ def run_algorithm(start,
                   stop_execution_callback=None,
                   execution_id=None,
                   state_filename=None,
-                  realtime_bar_target=None
+                  realtime_bar_target=None,
+                  pipeline_cache_dir=None,
+                  pipeline_cache_size=DEFAULT_MAX_SIZE,
+                  pipeline_prefetch=None,
+                  perf_spill_path=None,
                   ):
     """
     Run a trading algorithm.
@@ -444,6 +468,21 @@ def run_algorithm(start,
     execution_id : unique id to identify this execution instance (backtest or live) will be used to mark and get logs
                    for this specific execution instance.
     state_filename : path to pickle file storing the algorithm "context" (similar to self)
+    pipeline_cache_dir : str, optional
+        Directory where pipeline results are cached between runs over the
+        same bundle ingestion. By default pipeline results are not cached
+        between runs.
+    pipeline_cache_size : int, optional
+        The size in bytes past which the least recently used pipeline results
+        are removed from ``pipeline_cache_dir``.
+    pipeline_prefetch : float, optional
+        The fraction of the sessions of a pipeline chunk after which the next
+        chunk starts being computed in the background, between 0 and 1. By
+        default chunks are computed when they are first needed.
+    perf_spill_path : str, optional
+        The path of an HDF5 file where the positions, orders and transactions
+        of the daily performance are written during the simulation instead of
+        being held in memory.
 
     Returns
     -------
@@ -486,7 +525,11 @@ def run_algorithm(start,
         realtime_bar_target=realtime_bar_target,
         performance_callback=performance_callback,
         stop_execution_callback=stop_execution_callback,
-        execution_id=execution_id
+        execution_id=execution_id,
+        pipeline_cache_dir=pipeline_cache_dir,
+        pipeline_cache_size=pipeline_cache_size,
+        pipeline_prefetch=pipeline_prefetch,
+        perf_spill_path=perf_spill_path,
     )
 
 